@@ -0,0 +1,65 @@
+"""slot epoch columns
+
+Revision ID: 3b9e27c4d1a5
+Revises: f6c8f45208da
+Create Date: 2026-10-16 09:12:40.318251
+
+Adds virtual slot_epoch/slot_date (and slot_hour on observations) columns
+derived from the ISO slot_start, plus an index on slot_epoch so date-range
+queries become index range scans. SQLite computes the values for existing
+rows when the index is built, so no separate data backfill is needed.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9e27c4d1a5"
+down_revision: str | Sequence[str] | None = "f6c8f45208da"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SLOT_EPOCH_SQL = "CAST(strftime('%s', slot_start) AS INTEGER)"
+SLOT_DATE_SQL = "substr(slot_start, 1, 10)"
+SLOT_HOUR_SQL = "CAST(substr(slot_start, 12, 2) AS INTEGER)"
+
+SLOT_TABLES = ("slot_observations", "slot_forecasts", "slot_plans")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in SLOT_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "slot_epoch",
+                sa.Integer(),
+                sa.Computed(SLOT_EPOCH_SQL, persisted=False),
+                nullable=True,
+            ),
+        )
+        op.add_column(
+            table,
+            sa.Column(
+                "slot_date", sa.String(), sa.Computed(SLOT_DATE_SQL, persisted=False), nullable=True
+            ),
+        )
+        op.create_index(op.f(f"ix_{table}_slot_epoch"), table, ["slot_epoch"], unique=False)
+    op.add_column(
+        "slot_observations",
+        sa.Column(
+            "slot_hour", sa.Integer(), sa.Computed(SLOT_HOUR_SQL, persisted=False), nullable=True
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("slot_observations", "slot_hour")
+    for table in reversed(SLOT_TABLES):
+        op.drop_index(op.f(f"ix_{table}_slot_epoch"), table_name=table)
+        op.drop_column(table, "slot_date")
+        op.drop_column(table, "slot_epoch")
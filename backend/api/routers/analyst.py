@@ -9,7 +9,7 @@ from typing import Any
 
 from fastapi import APIRouter
 
-from inputs import load_yaml
+from backend.core.async_io import load_config_cached
 
 logger = logging.getLogger("darkstar.api.analyst")
 
@@ -19,7 +19,7 @@ router = APIRouter(prefix="/api/analyst", tags=["analyst"])
 def _get_strategy_advice() -> dict[str, Any]:
     """Generate strategy advice based on current conditions."""
     try:
-        config = load_yaml("config.yaml")
+        config = load_config_cached()
         s_index_cfg = config.get("s_index", {})
         risk_appetite = s_index_cfg.get("risk_appetite", 3)
 
@@ -5,7 +5,8 @@ from typing import Any, cast
 from fastapi import APIRouter, Body, HTTPException
 from ruamel.yaml import YAML
 
-from inputs import load_home_assistant_config, load_notifications_config, load_yaml
+from backend.core.async_io import aload_config, run_blocking
+from inputs import load_home_assistant_config, load_notifications_config
 
 logger = logging.getLogger("darkstar.api.config")
 
@@ -20,10 +21,10 @@ router = APIRouter(tags=["config"])
 async def get_config() -> dict[str, Any]:
     """Get sanitized config."""
     try:
-        conf: dict[str, Any] = load_yaml("config.yaml") or {}
+        conf: dict[str, Any] = await aload_config()
 
         # Merge Home Assistant secrets
-        ha_secrets = load_home_assistant_config()
+        ha_secrets = await run_blocking(load_home_assistant_config)
         if ha_secrets:
             if "home_assistant" not in conf:
                 conf["home_assistant"] = {}
@@ -31,7 +32,7 @@ async def get_config() -> dict[str, Any]:
             cast("dict[str, Any]", conf["home_assistant"]).update(ha_secrets)
 
         # Merge Notification secrets
-        notif_secrets = load_notifications_config()
+        notif_secrets = await run_blocking(load_notifications_config)
         if notif_secrets:
             if "notifications" not in conf:
                 conf["notifications"] = {}
@@ -181,6 +182,11 @@ async def save_config(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
         with config_path.open("w", encoding="utf-8") as f:
             yaml_handler.dump(data, f)  # type: ignore
 
+        # Entity/config health depends on the saved config; don't serve a stale result
+        from backend.health import invalidate_health_cache
+
+        invalidate_health_cache()
+
         # Return success with any warnings
         if warnings:
             return {"status": "success", "warnings": warnings}  # type: ignore[return-value]
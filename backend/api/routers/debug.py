@@ -4,19 +4,19 @@ Debug API Router - Rev ARC1
 Provides debug endpoints for logs, history, and diagnostics.
 """
 
-import json
 import logging
 from datetime import UTC, datetime, timedelta
-from pathlib import Path
 from typing import Any, cast
 
 import aiosqlite
 import pytz
 from fastapi import APIRouter, HTTPException, Query, Request
 
+from backend.core.async_io import aload_config, run_blocking
 from backend.core.logging import get_ring_buffer
+from backend.core.schedule_store import get_schedule_repository
 from backend.learning import get_learning_engine
-from inputs import get_dummy_load_profile, get_load_profile_from_ha, load_yaml
+from inputs import get_dummy_load_profile, get_load_profile_from_ha
 
 logger = logging.getLogger("darkstar.api.debug")
 
@@ -34,9 +34,10 @@ _ring_buffer_handler = get_ring_buffer()
 async def debug_data() -> dict[str, Any]:
     """Return comprehensive planner debug data from schedule.json."""
     try:
-        schedule_path = Path("schedule.json")
-        with schedule_path.open() as f:
-            data = json.load(f)
+        repo = get_schedule_repository("schedule.json")
+        if not repo.exists():
+            raise FileNotFoundError("schedule.json not found")
+        data = (await run_blocking(repo.get)).payload
 
         debug_section = data.get("debug", {})
         if not debug_section:
@@ -169,6 +170,49 @@ async def get_performance_metrics(days: int = Query(7, ge=1, le=90)) -> dict[str
         return {"soc_series": [], "cost_series": []}
 
 
+@router.get(
+    "/api/performance/solver",
+    summary="Get Solver Cache Stats",
+    description="Kepler result-cache hit/miss counters and warm-start statistics.",
+)
+async def get_solver_stats() -> dict[str, Any]:
+    """Return Kepler result-cache and warm-start statistics."""
+    from planner.solver.result_cache import result_cache
+    from planner.solver.warm_start import warm_start_cache
+
+    return {
+        "result_cache": result_cache.stats(),
+        "warm_start": warm_start_cache.stats(),
+    }
+
+
+@router.get(
+    "/api/performance/models",
+    summary="Get Model Registry Stats",
+    description="Loaded ML models with version, load time and memory footprint.",
+)
+async def get_model_registry_stats() -> dict[str, Any]:
+    """Return in-process model registry statistics."""
+    from ml.model_registry import model_registry
+
+    return model_registry.stats()
+
+
+@router.get(
+    "/api/performance/dispatch",
+    summary="Get Executor Dispatch Stats",
+    description="Per-entity HA service-call retries and latency histograms.",
+)
+async def get_dispatch_stats() -> dict[str, Any]:
+    """Return the executor's HA dispatch statistics."""
+    from backend.api.routers.executor import get_executor_instance
+
+    executor = get_executor_instance()
+    if executor is None or executor.dispatcher is None:
+        return {"mode": "not_initialized"}
+    return executor.dispatcher.dispatch_stats()
+
+
 @router.get(
     "/api/debug/load_profile",
     summary="Debug Load Profile",
@@ -177,9 +221,9 @@ async def get_performance_metrics(days: int = Query(7, ge=1, le=90)) -> dict[str
 async def debug_load_profile() -> dict[str, Any]:
     """Debug endpoint to test HA load profile fetching."""
     try:
-        conf = load_yaml("config.yaml") or {}
+        conf = await aload_config()
         try:
-            profile = get_load_profile_from_ha(conf)
+            profile = await run_blocking(get_load_profile_from_ha, conf)
             return {
                 "source": "ha",
                 "profile_sum": sum(profile),
@@ -277,7 +321,7 @@ async def scheduler_debug_status() -> dict[str, Any]:
 
     # Load config to show what scheduler reads
     try:
-        config = load_yaml("config.yaml") or {}
+        config = await aload_config()
         automation = config.get("automation", {})
         schedule_cfg = automation.get("schedule", {})
         scheduler_config = {
@@ -352,7 +396,7 @@ async def executor_debug_status() -> dict[str, Any]:
 
     # Load config to compare
     try:
-        config = load_yaml("config.yaml") or {}
+        config = await aload_config()
         executor_cfg = config.get("executor", {})
         config_enabled = executor_cfg.get("enabled", False)
     except Exception:
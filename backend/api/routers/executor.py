@@ -7,6 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from ruamel.yaml import YAML
 
+from backend.core.async_io import aload_config
+
 if TYPE_CHECKING:
     from executor import ExecutorEngine
 
@@ -393,12 +395,9 @@ async def get_notifications() -> dict[str, Any]:
             "on_error": cfg.on_error,
         }
 
-    # Fallback to config file
+    # Fallback to config file (cached, parsed off the loop)
     try:
-        yaml_handler = YAML()
-        config_path = Path("config.yaml")
-        with config_path.open(encoding="utf-8") as f:
-            config = cast("dict[str, Any]", yaml_handler.load(f) or {})  # type: ignore
+        config = await aload_config("config.yaml")
 
         executor_cfg = cast("dict[str, Any]", config.get("executor", {}))
         notify_cfg = cast("dict[str, Any]", executor_cfg.get("notifications", {}))
@@ -12,9 +12,9 @@ import requests
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from backend.core.async_io import load_config_cached
 from backend.learning import LearningEngine, get_learning_engine
 from backend.strategy.history import get_strategy_history
-from inputs import load_yaml
 from ml.api import get_forecast_slots_async
 from ml.weather import get_weather_volatility  # pyright: ignore [reportUnknownVariableType]
 
@@ -34,7 +34,7 @@ def _get_timezone() -> pytz.BaseTzInfo:
     except Exception:
         pass
     try:
-        cfg = load_yaml("config.yaml")
+        cfg = load_config_cached()
         return pytz.timezone(cfg.get("timezone", "Europe/Stockholm"))
     except Exception:
         return pytz.timezone("Europe/Stockholm")
@@ -47,7 +47,7 @@ def _get_engine_and_config() -> tuple[LearningEngine | None, dict[str, Any]]:
     except Exception as exc:
         logger.warning("Failed to get learning engine: %s", exc)
     try:
-        config = load_yaml("config.yaml")
+        config = load_config_cached()
     except Exception:
         config = {}
     return engine, config
@@ -180,25 +180,21 @@ async def _fetch_correction_history(
     if not engine or not hasattr(engine, "store"):
         return []
 
-    tz = engine.timezone if hasattr(engine, "timezone") else _get_timezone()
-    now = datetime.now(tz)
-    cutoff_date = (now - timedelta(days=14)).strftime("%Y-%m-%d")
+    cutoff = engine.store.cutoff_epoch(14)
     active_version = config.get("forecasting", {}).get("active_forecast_version", "aurora")
 
     def fetch():
         with engine.store.Session() as session:
-            # Group by DATE(slot_start)
-            # In SQLite, we can use func.date() or substring if dates are ISO. 
-            # Models store slot_start as string ISO.
+            # Group by the local slot date (indexed slot_epoch range for the cutoff)
             stmt = (
                 select(
-                    func.date(SlotForecast.slot_start).label("date"),
+                    SlotForecast.slot_date.label("date"),
                     func.sum(func.abs(SlotForecast.pv_correction_kwh)).label("pv_corr"),
                     func.sum(func.abs(SlotForecast.load_correction_kwh)).label("load_corr"),
                 )
                 .where(
                     SlotForecast.forecast_version == active_version,
-                    func.date(SlotForecast.slot_start) >= cutoff_date,
+                    SlotForecast.slot_epoch >= cutoff,
                 )
                 .group_by("date")
                 .order_by("date")
@@ -1,3 +1,5 @@
+import asyncio
+import copy
 import json
 import logging
 import math
@@ -5,11 +7,15 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, cast
 
+import numpy as np
+import pandas as pd
 import pytz
 from fastapi import APIRouter
 
 # Local imports (using absolute paths relative to project root)
-from inputs import get_nordpool_data, load_yaml
+from backend.core.async_io import aload_config, run_blocking
+from backend.core.schedule_store import get_schedule_repository
+from inputs import get_nordpool_data
 
 # executor/history needs access
 # We might need to adjust python path in dev-backend.sh if not matching
@@ -63,12 +69,12 @@ async def get_schedule() -> dict[str, Any]:
         return cached
 
     try:
-        schedule_path = Path("schedule.json")
-        if schedule_path.exists():
-            with schedule_path.open() as f:
-                data = json.load(f)
-        else:
+        repo = get_schedule_repository("schedule.json")
+        if not repo.exists():
             return {"schedule": [], "meta": {}}
+        payload = (await run_blocking(repo.get)).payload
+        # Shallow-copy slots: the price overlay below must not touch the shared snapshot
+        data = {**payload, "schedule": [dict(s) for s in payload.get("schedule", [])]}
     except Exception as exc:
         logger.error(f"Failed to load schedule.json: {exc}")
         return {"schedule": [], "meta": {}}
@@ -78,11 +84,11 @@ async def get_schedule() -> dict[str, Any]:
         price_map: dict[datetime, float] = {}
         try:
             # We assume config.yaml is in root
-            price_slots = get_nordpool_data("config.yaml")
+            price_slots = await run_blocking(get_nordpool_data, "config.yaml")
             tz = pytz.timezone("Europe/Stockholm")  # Default fallback
 
             # Try to read timezone from config
-            config = load_yaml("config.yaml")
+            config = await aload_config()
             if "timezone" in config:
                 tz = pytz.timezone(str(config["timezone"]))
 
@@ -138,7 +144,7 @@ async def schedule_today_with_history() -> dict[str, Any]:
     import aiosqlite
 
     try:
-        config = load_yaml("config.yaml")
+        config = await aload_config()
         tz_name = str(config.get("timezone", "Europe/Stockholm"))
         tz = pytz.timezone(tz_name)
     except Exception:
@@ -149,182 +155,112 @@ async def schedule_today_with_history() -> dict[str, Any]:
 
     # 1. Load schedule.json
     schedule_map: dict[datetime, dict[str, Any]] = {}
+    schedule_version: tuple[int, int] | None = None
     try:
-        schedule_path = Path("schedule.json")
-        if schedule_path.exists():
-            with schedule_path.open() as f:
-                payload = json.load(f)
-            for slot in payload.get("schedule", []):
-                start_str = slot.get("start_time")
-                if not start_str:
-                    continue
-                try:
-                    start = datetime.fromisoformat(str(start_str).replace("Z", "+00:00"))
-                    local = tz.localize(start) if start.tzinfo is None else start.astimezone(tz)
-                    tomorrow_local = today_local + timedelta(days=1)
-                    # Include today AND tomorrow for 48h view compatibility
-                    if local.date() not in (today_local, tomorrow_local):
-                        continue
-                    schedule_map[local.replace(tzinfo=None)] = slot
-                except Exception:
-                    continue
+        # Include today AND tomorrow for 48h view compatibility
+        window_start = tz.localize(datetime.combine(today_local, datetime.min.time()))
+        window_end = tz.localize(
+            datetime.combine(today_local + timedelta(days=2), datetime.min.time())
+        )
+        snapshot = await run_blocking(get_schedule_repository("schedule.json").get)
+        schedule_version = snapshot.version
+        for local, slot in snapshot.index(tz.zone).between(window_start, window_end):
+            schedule_map[local.replace(tzinfo=None)] = slot
     except Exception:
         pass
 
-    # 2. Load History (aiosqlite)
+    # 2-4. History, forecasts and planned actions: one connection, reads issued together
     exec_map: dict[datetime, dict[str, Any]] = {}
-    try:
-        db_path_str = str(config.get("learning", {}).get("sqlite_path", "data/planner_learning.db"))
-        db_path = Path(db_path_str)
-        if db_path.exists():
-            async with aiosqlite.connect(str(db_path)) as conn:
-                conn.row_factory = aiosqlite.Row
-
-                # Query window: Today start to Now
-                today_start = tz.localize(datetime.combine(today_local, datetime.min.time()))
-                now_dt = datetime.now(tz)
-
-                query = """
-                    SELECT
-                        slot_start, slot_end,
-                        batt_charge_kwh, batt_discharge_kwh, soc_end_percent, water_kwh,
-                        import_kwh, export_kwh,
-                        import_price_sek_kwh
-                    FROM slot_observations
-                    WHERE slot_start >= ? AND slot_start < ?
-                    ORDER BY slot_start ASC
-                """
-                async with conn.execute(
-                    query, (today_start.isoformat(), now_dt.isoformat())
-                ) as cursor:
-                    async for row in cursor:
-                        try:
-                            # Parse Timestamp
-                            s_start = datetime.fromisoformat(str(row["slot_start"]))
-                            s_end = datetime.fromisoformat(str(row["slot_end"]))
-
-                            # Normalize key
-                            local_start = s_start if s_start.tzinfo else tz.localize(s_start)
-                            local_end = s_end if s_end.tzinfo else tz.localize(s_end)
-                            key = local_start.astimezone(tz).replace(tzinfo=None)
-
-                            # Calculate Duration (hours)
-                            duration_hours = (local_end - local_start).total_seconds() / 3600.0
-                            if duration_hours <= 0:
-                                duration_hours = 0.25  # Fallback 15 mins
-
-                            # Kw calculation: kWh / hours = kW
-                            # water_kwh -> water_heating_kw
-                            water_kw = float(row["water_kwh"] or 0.0) / duration_hours
-
-                            # batt_charge_kwh -> actual_charge_kw
-                            charge_kwh = float(row["batt_charge_kwh"] or 0.0)
-                            charge_kw = charge_kwh / duration_hours
-
-                            # batt_discharge_kwh -> actual_discharge_kw (for export/discharge slots)
-                            discharge_kwh = float(row["batt_discharge_kwh"] or 0.0)
-                            discharge_kw = discharge_kwh / duration_hours
-
-                            # export_kwh for display
-                            export_kwh = float(row["export_kwh"] or 0.0)
-
-                            exec_map[key] = {
-                                "actual_charge_kw": round(charge_kw, 3),
-                                "actual_discharge_kw": round(discharge_kw, 3),
-                                "actual_export_kwh": round(export_kwh, 3),
-                                "actual_soc": float(row["soc_end_percent"] or 0.0),
-                                "water_heating_kw": round(water_kw, 3),
-                                "import_price_sek_kwh": float(row["import_price_sek_kwh"] or 0.0),
-                            }
-                        except Exception:
-                            continue
+    forecast_map: dict[datetime, dict[str, float]] = {}
+    planned_map: dict[datetime, dict[str, float]] = {}
 
-    except Exception as e:
-        logger.warning(f"Failed to load History: {e}")
+    db_path = Path(str(config.get("learning", {}).get("sqlite_path", "data/planner_learning.db")))
+    active_version = str(config.get("forecasting", {}).get("active_forecast_version", "aurora"))
+
+    # Served from cache until the DB or schedule.json changes (plan save, observation insert)
+    cache_key = (
+        tz.zone,
+        today_local,
+        str(db_path),
+        active_version,
+        _file_version(db_path),
+        _file_version(Path(f"{db_path}-wal")),
+        schedule_version,
+    )
+    cached = _today_cache.get("today_with_history")
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
 
-    # 3. Forecast Map (aiosqlite)
-    forecast_map: dict[datetime, dict[str, float]] = {}
-    try:
-        db_path_str = str(config.get("learning", {}).get("sqlite_path", "data/planner_learning.db"))
-        db_path = Path(db_path_str)
-        active_version = str(config.get("forecasting", {}).get("active_forecast_version", "aurora"))
-        if db_path.exists():
-            async with aiosqlite.connect(str(db_path)) as conn:
-                conn.row_factory = aiosqlite.Row
-                today_iso = tz.localize(
-                    datetime.combine(today_local, datetime.min.time())
-                ).isoformat()
-                async with conn.execute(
-                    "SELECT slot_start, pv_forecast_kwh, load_forecast_kwh FROM slot_forecasts WHERE slot_start >= ? AND forecast_version = ?",
-                    (today_iso, active_version),
-                ) as cursor:
-                    async for row in cursor:
-                        try:
-                            st = datetime.fromisoformat(str(row["slot_start"]))
-                            st_local = st if st.tzinfo else tz.localize(st)
-                            forecast_map[st_local.astimezone(tz).replace(tzinfo=None)] = {
-                                "pv_forecast_kwh": float(row["pv_forecast_kwh"] or 0),
-                                "load_forecast_kwh": float(row["load_forecast_kwh"] or 0),
-                            }
-                        except Exception:
-                            pass
-        logger.info(
-            f"Loaded {len(forecast_map)} forecast slots for {today_local} (ver={active_version})"
-        )
-    except Exception as e:
-        logger.warning(f"Failed to load forecast map: {e}")
+    if db_path.exists():
+        today_start = tz.localize(datetime.combine(today_local, datetime.min.time()))
+        today_iso = today_start.isoformat()
+        now_iso = datetime.now(tz).isoformat()
 
-    # 4. Planned Actions Map (slot_plans table)
-    planned_map: dict[datetime, dict[str, float]] = {}
-    try:
-        db_path_str = str(config.get("learning", {}).get("sqlite_path", "data/planner_learning.db"))
-        db_path = Path(db_path_str)
-        if db_path.exists():
+        rows: list[Any] = [[], [], []]
+        try:
             async with aiosqlite.connect(str(db_path)) as conn:
-                conn.row_factory = aiosqlite.Row
-                today_iso = tz.localize(
-                    datetime.combine(today_local, datetime.min.time())
-                ).isoformat()
-
-                query = """
-                    SELECT
-                        slot_start,
-                        planned_charge_kwh,
-                        planned_discharge_kwh,
-                        planned_soc_percent,
-                        planned_export_kwh,
-                        planned_water_heating_kwh
-                    FROM slot_plans
-                    WHERE slot_start >= ?
-                    ORDER BY slot_start ASC
-                """
-
-                async with conn.execute(query, (today_iso,)) as cursor:
-                    async for row in cursor:
-                        try:
-                            st = datetime.fromisoformat(str(row["slot_start"]))
-                            st_local = st if st.tzinfo else tz.localize(st)
-                            key = st_local.astimezone(tz).replace(tzinfo=None)
-
-                            # Convert kWh to kW (slot_plans stores kWh, frontend expects kW)
-                            duration_hours = 0.25  # 15-min slots
-
-                            planned_map[key] = {
-                                "battery_charge_kw": float(row["planned_charge_kwh"] or 0.0)
-                                / duration_hours,
-                                "battery_discharge_kw": float(row["planned_discharge_kwh"] or 0.0)
-                                / duration_hours,
-                                "soc_target_percent": float(row["planned_soc_percent"] or 0.0),
-                                "export_kwh": float(row["planned_export_kwh"] or 0.0),
-                                "water_heating_kw": float(row["planned_water_heating_kwh"] or 0.0)
-                                / duration_hours,
-                            }
-                        except Exception:
-                            continue
-
-        logger.info(f"Loaded {len(planned_map)} planned slots for {today_local}")
-    except Exception as e:
-        logger.warning(f"Failed to load planned map: {e}")
+                rows = await asyncio.gather(
+                    conn.execute_fetchall(
+                        """
+                        SELECT
+                            slot_start, slot_end,
+                            batt_charge_kwh, batt_discharge_kwh, soc_end_percent, water_kwh,
+                            export_kwh, import_price_sek_kwh
+                        FROM slot_observations
+                        WHERE slot_start >= ? AND slot_start < ?
+                        ORDER BY slot_start ASC
+                        """,
+                        (today_iso, now_iso),
+                    ),
+                    conn.execute_fetchall(
+                        "SELECT slot_start, pv_forecast_kwh, load_forecast_kwh FROM slot_forecasts WHERE slot_start >= ? AND forecast_version = ?",
+                        (today_iso, active_version),
+                    ),
+                    conn.execute_fetchall(
+                        """
+                        SELECT
+                            slot_start,
+                            planned_charge_kwh,
+                            planned_discharge_kwh,
+                            planned_soc_percent,
+                            planned_export_kwh,
+                            planned_water_heating_kwh
+                        FROM slot_plans
+                        WHERE slot_start >= ?
+                        ORDER BY slot_start ASC
+                        """,
+                        (today_iso,),
+                    ),
+                    return_exceptions=True,
+                )
+        except Exception as e:
+            logger.warning(f"Failed to open learning DB: {e}")
+        obs_rows, fc_rows, plan_rows = rows
+
+        try:
+            if isinstance(obs_rows, BaseException):
+                raise obs_rows
+            exec_map = _history_map(obs_rows, tz)
+        except Exception as e:
+            logger.warning(f"Failed to load History: {e}")
+
+        try:
+            if isinstance(fc_rows, BaseException):
+                raise fc_rows
+            forecast_map = _forecast_map(fc_rows, tz)
+            logger.info(
+                f"Loaded {len(forecast_map)} forecast slots for {today_local} (ver={active_version})"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load forecast map: {e}")
+
+        try:
+            if isinstance(plan_rows, BaseException):
+                raise plan_rows
+            planned_map = _planned_map(plan_rows, tz)
+            logger.info(f"Loaded {len(planned_map)} planned slots for {today_local}")
+        except Exception as e:
+            logger.warning(f"Failed to load planned map: {e}")
 
     # 5. Merge
     all_keys = sorted(set(schedule_map.keys()) | set(exec_map.keys()) | set(planned_map.keys()))
@@ -394,7 +330,160 @@ async def schedule_today_with_history() -> dict[str, Any]:
     )
 
     result_data = {"date": today_local.isoformat(), "slots": merged_slots}
-    return cast("dict[str, Any]", _clean_nans(result_data))
+    result = cast("dict[str, Any]", _clean_nans(result_data))
+    _today_cache["today_with_history"] = (cache_key, result)
+    return result
+
+
+# Last merged today_with_history result, keyed by the inputs it was built from
+_today_cache: dict[str, tuple[tuple[Any, ...], dict[str, Any]]] = {}
+
+
+def _file_version(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if missing. WAL commits touch the -wal file."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _localize_iso(values: pd.Series, tz: Any) -> pd.Series:
+    """
+    Parse ISO timestamps into tz-aware local times in one vectorized pass.
+
+    Strings with an offset are converted to tz; naive strings are taken as local
+    wall time (non-DST on ambiguous hours, like pytz localize). Unparseable → NaT.
+    """
+    s = values.astype("string")
+    has_offset = s.str.contains(r"(?:[+-]\d{2}:?\d{2}|Z)$", regex=True, na=False)
+    naive = ~has_offset & s.notna()
+    out = pd.Series(pd.NaT, index=s.index, dtype=pd.DatetimeTZDtype(tz=tz))
+    if has_offset.any():
+        out[has_offset] = pd.to_datetime(
+            s[has_offset], utc=True, errors="coerce", format="ISO8601"
+        ).dt.tz_convert(tz)
+    if naive.any():
+        parsed = pd.to_datetime(s[naive], errors="coerce", format="ISO8601")
+        out[naive] = parsed.dt.tz_localize(
+            tz, ambiguous=np.zeros(len(parsed), dtype=bool), nonexistent="shift_forward"
+        )
+    return out
+
+
+def _local_keys(local: pd.Series) -> list[datetime]:
+    """Naive local datetimes used as merge keys."""
+    return list(pd.DatetimeIndex(local.dt.tz_localize(None)).to_pydatetime())
+
+
+def _history_map(rows: Any, tz: Any) -> dict[datetime, dict[str, Any]]:
+    df = pd.DataFrame(
+        list(rows),
+        columns=[
+            "slot_start",
+            "slot_end",
+            "batt_charge_kwh",
+            "batt_discharge_kwh",
+            "soc_end_percent",
+            "water_kwh",
+            "export_kwh",
+            "import_price_sek_kwh",
+        ],
+    )
+    if df.empty:
+        return {}
+
+    start = _localize_iso(df["slot_start"], tz)
+    end = _localize_iso(df["slot_end"], tz)
+    valid = (start.notna() & end.notna()).to_numpy()
+
+    # Duration in hours; non-positive spans fall back to 15 minutes
+    hours = ((end - start).dt.total_seconds() / 3600.0).to_numpy(dtype=float, na_value=0.0)
+    hours = np.where(hours > 0, hours, 0.25)
+
+    def col(name: str) -> np.ndarray:
+        return df[name].fillna(0.0).to_numpy(dtype=float)
+
+    # kWh / hours = kW
+    charge_kw = col("batt_charge_kwh") / hours
+    discharge_kw = col("batt_discharge_kwh") / hours
+    water_kw = col("water_kwh") / hours
+    export_kwh = col("export_kwh")
+    soc = col("soc_end_percent")
+    price = col("import_price_sek_kwh")
+
+    exec_map: dict[datetime, dict[str, Any]] = {}
+    for i, key in enumerate(_local_keys(start)):
+        if not valid[i]:
+            continue
+        exec_map[key] = {
+            "actual_charge_kw": round(float(charge_kw[i]), 3),
+            "actual_discharge_kw": round(float(discharge_kw[i]), 3),
+            "actual_export_kwh": round(float(export_kwh[i]), 3),
+            "actual_soc": float(soc[i]),
+            "water_heating_kw": round(float(water_kw[i]), 3),
+            "import_price_sek_kwh": float(price[i]),
+        }
+    return exec_map
+
+
+def _forecast_map(rows: Any, tz: Any) -> dict[datetime, dict[str, float]]:
+    df = pd.DataFrame(list(rows), columns=["slot_start", "pv_forecast_kwh", "load_forecast_kwh"])
+    if df.empty:
+        return {}
+
+    start = _localize_iso(df["slot_start"], tz)
+    valid = start.notna().to_numpy()
+    pv = df["pv_forecast_kwh"].fillna(0.0).to_numpy(dtype=float)
+    load = df["load_forecast_kwh"].fillna(0.0).to_numpy(dtype=float)
+
+    return {
+        key: {"pv_forecast_kwh": float(pv[i]), "load_forecast_kwh": float(load[i])}
+        for i, key in enumerate(_local_keys(start))
+        if valid[i]
+    }
+
+
+def _planned_map(rows: Any, tz: Any) -> dict[datetime, dict[str, float]]:
+    df = pd.DataFrame(
+        list(rows),
+        columns=[
+            "slot_start",
+            "planned_charge_kwh",
+            "planned_discharge_kwh",
+            "planned_soc_percent",
+            "planned_export_kwh",
+            "planned_water_heating_kwh",
+        ],
+    )
+    if df.empty:
+        return {}
+
+    start = _localize_iso(df["slot_start"], tz)
+    valid = start.notna().to_numpy()
+
+    def col(name: str) -> np.ndarray:
+        return df[name].fillna(0.0).to_numpy(dtype=float)
+
+    # Convert kWh to kW (slot_plans stores kWh for 15-min slots, frontend expects kW)
+    duration_hours = 0.25
+    charge_kw = col("planned_charge_kwh") / duration_hours
+    discharge_kw = col("planned_discharge_kwh") / duration_hours
+    soc = col("planned_soc_percent")
+    export_kwh = col("planned_export_kwh")
+    water_kw = col("planned_water_heating_kwh") / duration_hours
+
+    return {
+        key: {
+            "battery_charge_kw": float(charge_kw[i]),
+            "battery_discharge_kw": float(discharge_kw[i]),
+            "soc_target_percent": float(soc[i]),
+            "export_kwh": float(export_kwh[i]),
+            "water_heating_kw": float(water_kw[i]),
+        }
+        for i, key in enumerate(_local_keys(start))
+        if valid[i]
+    }
 
 
 @router.post(
@@ -406,13 +495,12 @@ async def save_schedule(request_body: dict[str, Any]) -> dict[str, str]:
     """Save manual schedule overrides."""
     try:
         schedule_path = Path("schedule.json")
+        repo = get_schedule_repository(schedule_path)
 
-        # Load existing schedule
-        if schedule_path.exists():
-            with schedule_path.open() as f:
-                existing = json.load(f)
-        else:
-            existing = {"schedule": [], "meta": {}}
+        # Load existing schedule (deep copy: overrides must not leak into the shared snapshot)
+        existing = copy.deepcopy((await run_blocking(repo.get)).payload)
+        existing.setdefault("schedule", [])
+        existing.setdefault("meta", {})
 
         # Merge overrides
         overrides = request_body.get("overrides", [])
@@ -427,8 +515,12 @@ async def save_schedule(request_body: dict[str, Any]) -> dict[str, str]:
             existing["meta"]["last_manual_override"] = datetime.now().isoformat()
 
         # Write back
-        with schedule_path.open("w") as f:
-            json.dump(existing, f, indent=2, default=str)
+        def _write() -> None:
+            with schedule_path.open("w") as f:
+                json.dump(existing, f, indent=2, default=str)
+
+        await run_blocking(_write)
+        repo.publish(existing)
 
         logger.info("Schedule saved with %d overrides", len(overrides))
         return {"status": "success", "message": f"Saved {len(overrides)} overrides"}
@@ -1,9 +1,7 @@
 import asyncio
-import json
 import logging
 import traceback
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Any, cast
 
 import httpx
@@ -11,13 +9,13 @@ import pytz
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from backend.core.async_io import aload_config, run_blocking
+from backend.core.schedule_store import get_schedule_repository
 from inputs import (
     async_get_ha_entity_state,
     async_get_ha_sensor_float,
     get_async_ha_client,
-    get_home_assistant_sensor_float,
     load_home_assistant_config,
-    load_yaml,
     make_ha_headers,
 )
 
@@ -136,7 +134,7 @@ async def get_ha_entity(entity_id: str) -> dict[str, Any]:
 async def get_ha_average(entity_id: str | None = None, hours: int = 24) -> dict[str, Any]:
     """Calculate average value for an entity over the last N hours."""
     from backend.core.cache import cache
-    from inputs import get_load_profile_from_ha, load_yaml
+    from inputs import get_load_profile_from_ha
 
     # Check cache first
     cache_key = f"ha_average:{entity_id}:{hours}"
@@ -146,7 +144,7 @@ async def get_ha_average(entity_id: str | None = None, hours: int = 24) -> dict[
 
     if not entity_id:
         # Default to load power sensor
-        config = load_yaml("config.yaml")
+        config = await aload_config()
         sensors: dict[str, Any] = config.get("input_sensors", {})
         entity_id = cast("str | None", sensors.get("load_power"))
 
@@ -158,8 +156,9 @@ async def get_ha_average(entity_id: str | None = None, hours: int = 24) -> dict[
     # Fallback to static profile if history unavailable/zero
     if avg_val == 0.0:
         try:
-            config = load_yaml("config.yaml")
-            profile = get_load_profile_from_ha(config)
+            config = await aload_config()
+            # Sync requests.get with a 30s timeout: keep it off the event loop
+            profile = await run_blocking(get_load_profile_from_ha, config)
             if profile:
                 avg_val = sum(profile) / len(profile)
         except Exception as e:
@@ -287,7 +286,7 @@ async def get_performance_data(days: int = 7) -> dict[str, Any]:
 )
 async def get_water_today() -> dict[str, Any]:
     """Get today's water heating energy usage."""
-    config = load_yaml("config.yaml")
+    config = await aload_config()
 
     # Check if water heater feature is enabled
     system_config: dict[str, Any] = config.get("system", {})
@@ -402,7 +401,7 @@ async def cancel_water_boost() -> dict[str, str]:
 )
 async def get_energy_today() -> dict[str, float]:
     """Get today's energy summary from HA sensors in parallel."""
-    config = load_yaml("config.yaml")
+    config = await aload_config()
     sensors: dict[str, Any] = config.get("input_sensors", {})
 
     # Define keys we want to fetch
@@ -462,14 +461,14 @@ async def get_energy_range(period: str = "today") -> dict[str, Any]:
     from backend.learning import get_learning_engine
     from backend.learning.models import SlotObservation
 
-    config = load_yaml("config.yaml")
+    config = await aload_config()
     sensors: dict[str, Any] = config.get("input_sensors", {})
 
-    def get_val(key: str, default: float = 0.0) -> float:
+    async def get_val(key: str, default: float = 0.0) -> float:
         eid = sensors.get(key)
         if not eid:
             return default
-        return get_home_assistant_sensor_float(str(eid)) or default
+        return await async_get_ha_sensor_float(str(eid)) or default
 
     # All periods now query the database for financial metrics
     try:
@@ -557,13 +556,23 @@ async def get_energy_range(period: str = "today") -> dict[str, Any]:
         # For "today", overlay real-time HA sensor values for energy totals
         # This ensures dashboard shows up-to-date energy values even if DB lags
         if period == "today":
-            ha_grid_imp = get_val("today_grid_import")
-            ha_grid_exp = get_val("today_grid_export")
-            ha_pv = get_val("today_pv_production")
-            ha_load = get_val("today_load_consumption")
-            ha_batt_chg = get_val("today_battery_charge")
-            ha_batt_dis = get_val("today_battery_discharge")
-            ha_water = get_val("water_heater_consumption")
+            (
+                ha_grid_imp,
+                ha_grid_exp,
+                ha_pv,
+                ha_load,
+                ha_batt_chg,
+                ha_batt_dis,
+                ha_water,
+            ) = await asyncio.gather(
+                get_val("today_grid_import"),
+                get_val("today_grid_export"),
+                get_val("today_pv_production"),
+                get_val("today_load_consumption"),
+                get_val("today_battery_charge"),
+                get_val("today_battery_discharge"),
+                get_val("water_heater_consumption"),
+            )
 
             # Use HA values if they're larger (more current) than DB values
             grid_imp_kwh = max(grid_imp_kwh, ha_grid_imp)
@@ -704,10 +713,12 @@ async def run_simulation() -> dict[str, Any]:
     try:
         from planner.simulation import simulate_schedule  # pyright: ignore [reportMissingImports]
 
-        with Path("schedule.json").open() as f:
-            schedule = json.load(f)
+        repo = get_schedule_repository("schedule.json")
+        if not repo.exists():
+            raise FileNotFoundError("schedule.json not found")
+        schedule = (await run_blocking(repo.get)).payload
 
-        config = load_yaml("config.yaml")
+        config = await aload_config()
         initial_state: dict[str, Any] = {}  # Simplified simulation
 
         result = simulate_schedule(schedule, config, initial_state)
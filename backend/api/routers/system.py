@@ -9,10 +9,8 @@ import yaml
 from fastapi import APIRouter, HTTPException
 
 from backend.api.models.system import LogInfoResponse, StatusResponse, VersionResponse
-from inputs import (
-    async_get_ha_sensor_float,
-    load_yaml,
-)
+from backend.core.async_io import aload_config, run_blocking
+from inputs import async_get_ha_sensor_float
 
 logger = logging.getLogger("darkstar.api.system")
 router = APIRouter(tags=["system"])
@@ -81,7 +79,8 @@ def _get_git_version() -> str:
 )
 async def get_version() -> VersionResponse:
     """Return the current system version."""
-    return VersionResponse(version=_get_git_version())
+    # Shells out to git: keep it off the event loop
+    return VersionResponse(version=await run_blocking(_get_git_version))
 
 
 @router.get(
@@ -92,7 +91,7 @@ async def get_version() -> VersionResponse:
 )
 async def get_system_status() -> StatusResponse:
     """Get instantaneous system status (SoC, Power Flow) using parallel async fetching."""
-    config = load_yaml("config.yaml")
+    config = await aload_config()
     sensors: dict[str, Any] = config.get("input_sensors", {})
 
     # Define keys to fetch
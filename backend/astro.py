@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 
+import numpy as np
+import pandas as pd
 import pytz
 from astral import LocationInfo
 from astral.sun import sun
@@ -61,3 +63,34 @@ class SunCalculator:
         effective_sunset = sunset + timedelta(minutes=buffer_minutes)
 
         return effective_sunrise <= dt <= effective_sunset
+
+    def daylight_mask(
+        self, times: pd.DatetimeIndex | pd.Series, buffer_minutes: int = 30
+    ) -> np.ndarray:
+        """
+        Vectorized is_sun_up for many timestamps.
+
+        Sunrise/sunset are computed once per calendar day instead of once per
+        timestamp. Returns a boolean array aligned with ``times``.
+        """
+        index = pd.DatetimeIndex(times)
+        if index.tz is None:
+            index = index.tz_localize(pytz.timezone(self.timezone))
+
+        mask = np.zeros(len(index), dtype=bool)
+        if len(index) == 0:
+            return mask
+
+        buffer = pd.Timedelta(minutes=buffer_minutes)
+        days = index.normalize()
+        for day in days.unique():
+            sun_times = self.get_sun_times(day.to_pydatetime())
+            if not sun_times:
+                continue  # Same as is_sun_up: no sun times means dark
+            sunrise, sunset = sun_times
+            selected = days == day
+            stamps = index[selected]
+            mask[selected] = (stamps >= pd.Timestamp(sunrise) - buffer) & (
+                stamps <= pd.Timestamp(sunset) + buffer
+            )
+        return mask
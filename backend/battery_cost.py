@@ -13,9 +13,10 @@ Algorithm (weighted average):
 import logging
 from datetime import datetime
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
 
+from backend.core.db import get_engine
 from backend.learning.models import BatteryCost
 
 # Default cost when no data is available (conservative to prevent aggressive export)
@@ -38,9 +39,7 @@ class BatteryCostTracker:
         self.db_path = db_path
         self.capacity_kwh = capacity_kwh
 
-        # Initialize SQLAlchemy
-        connect_args = {"check_same_thread": False, "timeout": 30.0}
-        self.engine = create_engine(f"sqlite:///{db_path}", connect_args=connect_args)
+        self.engine = get_engine(db_path)
         self.Session = sessionmaker(bind=self.engine)
 
         # Table is managed by Alembic, but we can ensure it exists for standalone tests
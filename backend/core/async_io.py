@@ -0,0 +1,125 @@
+"""
+Async I/O helpers for FastAPI handlers.
+
+Handlers run on the event loop that also drives Socket.IO pushes, so any
+blocking call (sync HA requests, YAML parsing, file reads) stalls every other
+client. This module gives handlers:
+
+- run_blocking(): run a sync function on a dedicated, bounded thread pool
+  (kept separate from the loop's default executor so slow HA calls cannot
+  starve asyncio.to_thread users such as the planner).
+- aload_config() / load_config_cached(): config.yaml parsed once per mtime
+  change; a cache hit costs one stat().
+- aread_text() / aread_json(): file reads off the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import functools
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import yaml
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Upper bound on concurrent blocking calls issued from request handlers
+BLOCKING_IO_WORKERS = 4
+
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="api-blocking-io"
+)
+
+
+async def run_blocking[T](func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function on the bounded I/O pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(func, *args, **kwargs))
+
+
+def _file_version(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _parse_yaml(path: Path) -> dict[str, Any]:
+    try:
+        with path.open(encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+    except FileNotFoundError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class _YamlCache:
+    """Parsed YAML documents keyed by path, invalidated on mtime/size change."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[tuple[int, int] | None, dict[str, Any]]] = {}
+
+    def lookup(self, path: Path) -> tuple[tuple[int, int] | None, dict[str, Any] | None]:
+        version = _file_version(path)
+        with self._lock:
+            entry = self._entries.get(str(path))
+        if entry is not None and entry[0] == version:
+            return version, entry[1]
+        return version, None
+
+    def load(self, path: Path, version: tuple[int, int] | None) -> dict[str, Any]:
+        data = {} if version is None else _parse_yaml(path)
+        with self._lock:
+            self._entries[str(path)] = (version, data)
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_yaml_cache = _YamlCache()
+
+
+def load_config_cached(path: str | Path = "config.yaml") -> dict[str, Any]:
+    """
+    Sync cached config loader for helpers called from handlers.
+
+    Returns a private copy, so callers may mutate it freely.
+    """
+    p = Path(path)
+    version, data = _yaml_cache.lookup(p)
+    if data is None:
+        data = _yaml_cache.load(p, version)
+    return copy.deepcopy(data)
+
+
+async def aload_config(path: str | Path = "config.yaml") -> dict[str, Any]:
+    """Async cached config loader; only a changed file is parsed (off the loop)."""
+    p = Path(path)
+    version, data = _yaml_cache.lookup(p)
+    if data is None:
+        data = await run_blocking(_yaml_cache.load, p, version)
+    return copy.deepcopy(data)
+
+
+def invalidate_config_cache() -> None:
+    _yaml_cache.clear()
+
+
+async def aread_text(path: str | Path, encoding: str = "utf-8") -> str:
+    """Read a text file without blocking the event loop."""
+    return await run_blocking(Path(path).read_text, encoding=encoding)
+
+
+async def aread_json(path: str | Path) -> Any:
+    """Read and parse a JSON file without blocking the event loop."""
+    return json.loads(await aread_text(path))
@@ -0,0 +1,116 @@
+"""
+SQLite Engine Registry
+
+One pooled SQLAlchemy engine per database file, shared by every module in the
+process (LearningStore, ExecutionHistory, BatteryCostTracker, the ML helpers).
+
+The executor thread, the recorder and the API all write to the learning
+database. Separate engines per instance, and raw sqlite3 handles opened in
+rollback-journal mode, made readers and writers block each other ("database is
+locked"). The registry switches each file to WAL once and applies the same
+connection pragmas to pooled and raw connections alike.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Engine, create_engine, event
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger("darkstar.db")
+
+BUSY_TIMEOUT_S = 30.0
+# Negative cache_size is in KiB (16 MiB page cache per connection)
+CACHE_SIZE_KIB = 16 * 1024
+MMAP_SIZE_BYTES = 64 * 1024 * 1024
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+_lock = threading.Lock()
+_engines: dict[str, Engine] = {}
+_wal_paths: set[str] = set()
+
+
+def _key(db_path: str | os.PathLike[str]) -> str:
+    path = os.fspath(db_path)
+    return path if path == ":memory:" else str(Path(path).resolve())
+
+
+def _apply_pragmas(conn: sqlite3.Connection, key: str) -> None:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT_S * 1000)}")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        cursor.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+        if key == ":memory:" or key in _wal_paths:
+            return
+        # journal_mode is persistent in the file, so this only runs once per path
+        mode = cursor.execute("PRAGMA journal_mode = WAL").fetchone()
+        if mode and str(mode[0]).lower() == "wal":
+            _wal_paths.add(key)
+        else:
+            logger.warning("Could not enable WAL for %s (journal_mode=%s)", key, mode)
+    finally:
+        cursor.close()
+
+
+def get_engine(db_path: str | os.PathLike[str]) -> Engine:
+    """Return the shared engine for a SQLite file, creating it on first use."""
+    key = _key(db_path)
+    with _lock:
+        engine = _engines.get(key)
+        if engine is not None:
+            return engine
+
+        kwargs: dict[str, Any] = {
+            # Shared across the FastAPI threadpool, executor and recorder threads
+            "connect_args": {"check_same_thread": False, "timeout": BUSY_TIMEOUT_S},
+        }
+        if key != ":memory:":
+            kwargs.update(pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW)
+        engine = create_engine(f"sqlite:///{key}", **kwargs)
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_conn: sqlite3.Connection, _record: Any) -> None:
+            _apply_pragmas(dbapi_conn, key)
+
+        _engines[key] = engine
+        logger.debug("Created SQLite engine for %s", key)
+        return engine
+
+
+@contextmanager
+def connect(db_path: str | os.PathLike[str]) -> Iterator[sqlite3.Connection]:
+    """
+    Raw sqlite3 connection with the registry pragmas applied.
+
+    Commits on success, rolls back on error and always closes (unlike
+    ``with sqlite3.connect(...)``, which leaves the handle open).
+    """
+    key = _key(db_path)
+    conn = sqlite3.connect(key, timeout=BUSY_TIMEOUT_S)
+    try:
+        _apply_pragmas(conn, key)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection and forget the engines (shutdown/tests)."""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _wal_paths.clear()
@@ -0,0 +1,117 @@
+"""
+Home Assistant Entity State Cache
+
+Thread-safe store of the latest HA entity states, kept current by the
+WebSocket client (backend/ha_socket.py) from its subscribe_entities feed.
+The set of tracked entities is also what the client asks HA to send, so
+registering a new entity triggers a re-subscription.
+
+Readers such as the executor call get() and fall back to REST only when an
+entry is missing or stale. An entry counts as fresh only while the WebSocket
+is connected (a disconnect drops everything, since events may have been
+missed) and for at most max_age_s seconds after its last update.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Upper bound on how long an unchanged entity is trusted without a REST refresh
+DEFAULT_MAX_AGE_S = 300.0
+
+
+class EntityStateCache:
+    """Latest HA state dicts by entity_id with staleness timestamps."""
+
+    def __init__(self, max_age_s: float = DEFAULT_MAX_AGE_S) -> None:
+        self._lock = threading.Lock()
+        self._states: dict[str, tuple[dict[str, Any], float]] = {}
+        self._tracked: set[str] = set()
+        self._tracked_version = 0
+        self._live = False
+        self.max_age_s = max_age_s
+        self.hits = 0
+        self.misses = 0
+
+    def track(self, entity_ids: Iterable[str | None]) -> None:
+        """Register entities a reader wants kept (the WebSocket ignores the rest)."""
+        with self._lock:
+            before = len(self._tracked)
+            self._tracked.update(e for e in entity_ids if e)
+            if len(self._tracked) != before:
+                self._tracked_version += 1
+
+    def is_tracked(self, entity_id: str) -> bool:
+        return entity_id in self._tracked
+
+    @property
+    def tracked_version(self) -> int:
+        """Bumped whenever the tracked set changes."""
+        return self._tracked_version
+
+    def tracked(self) -> frozenset[str]:
+        with self._lock:
+            return frozenset(self._tracked)
+
+    def set_live(self, live: bool) -> None:
+        """Mark the WebSocket feed up or down; going down drops every entry."""
+        with self._lock:
+            self._live = live
+            if not live:
+                self._states.clear()
+
+    def update(self, entity_id: str, state: dict[str, Any] | None) -> None:
+        """Store a state dict as received from HA (None removes the entity)."""
+        with self._lock:
+            if state is None:
+                self._states.pop(entity_id, None)
+            else:
+                self._states[entity_id] = (state, time.monotonic())
+
+    def get(self, entity_id: str, max_age_s: float | None = None) -> dict[str, Any] | None:
+        """Return the cached state dict, or None if missing, stale or not live."""
+        limit = self.max_age_s if max_age_s is None else max_age_s
+        with self._lock:
+            entry = self._states.get(entity_id) if self._live else None
+            if entry is not None and time.monotonic() - entry[1] <= limit:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def age_s(self, entity_id: str) -> float | None:
+        """Seconds since the entity was last updated, or None if unknown."""
+        with self._lock:
+            entry = self._states.get(entity_id)
+        return None if entry is None else time.monotonic() - entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._tracked.clear()
+            self._tracked_version += 1
+            self._live = False
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "live": self._live,
+                "entries": len(self._states),
+                "tracked": len(self._tracked),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "max_age_s": self.max_age_s,
+            }
+
+
+# Process-wide instance (executor and WebSocket client run in the API process)
+entity_state_cache = EntityStateCache()
@@ -0,0 +1,195 @@
+"""
+Schedule Repository
+
+Memory-resident view of schedule.json shared by the executor, the planner and
+the API. The file is parsed once per mtime change (or taken directly from the
+planner via publish()) and every slot's start/end is parsed once into sorted
+epoch arrays, so current-slot and range lookups are binary searches instead of
+a json.load plus ISO parsing on every call.
+
+Snapshots are read-only by convention: callers that need to modify slots must
+copy them first.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytz
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOT = timedelta(minutes=15)
+
+
+def _parse_ts(value: Any, tz: pytz.BaseTzInfo) -> datetime:
+    """Parse a schedule timestamp into an aware datetime in tz."""
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return tz.localize(ts) if ts.tzinfo is None else ts.astimezone(tz)
+
+
+@dataclass(frozen=True)
+class ScheduleIndex:
+    """Slots of one schedule snapshot, sorted by start time for one timezone."""
+
+    slots: list[dict[str, Any]]
+    starts: list[datetime]
+    start_epochs: np.ndarray
+    end_epochs: np.ndarray
+
+    @classmethod
+    def build(cls, raw_slots: list[dict[str, Any]], tz: pytz.BaseTzInfo) -> ScheduleIndex:
+        parsed: list[tuple[datetime, datetime, dict[str, Any]]] = []
+        for slot in raw_slots:
+            start_val = slot.get("start_time")
+            if not start_val:
+                continue
+            # Prefer end_time_kepler (correct) over end_time (sometimes has wrong TZ offset)
+            end_val = slot.get("end_time_kepler") or slot.get("end_time")
+            try:
+                start = _parse_ts(start_val, tz)
+                end = _parse_ts(end_val, tz) if end_val else start + DEFAULT_SLOT
+            except (TypeError, ValueError) as e:
+                logger.warning("Failed to parse slot: %s", e)
+                continue
+            if end <= start:
+                logger.warning("Invalid end_time %s <= start_time %s, using 15min slot", end, start)
+                end = start + DEFAULT_SLOT
+            parsed.append((start, end, slot))
+
+        # Stable sort keeps file order for duplicate starts (first one wins)
+        parsed.sort(key=lambda item: item[0])
+        return cls(
+            slots=[p[2] for p in parsed],
+            starts=[p[0] for p in parsed],
+            start_epochs=np.array([p[0].timestamp() for p in parsed], dtype=np.float64),
+            end_epochs=np.array([p[1].timestamp() for p in parsed], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def slot_at(self, when: datetime) -> tuple[dict[str, Any], datetime] | None:
+        """Return (slot, start) for the slot containing `when`, or None."""
+        t = when.timestamp()
+        # First slot whose start equals the last start <= t (earliest in file order)
+        pos = int(np.searchsorted(self.start_epochs, t, side="right")) - 1
+        if pos < 0:
+            return None
+        pos = int(np.searchsorted(self.start_epochs, self.start_epochs[pos], side="left"))
+        if t < self.end_epochs[pos]:
+            return self.slots[pos], self.starts[pos]
+        return None
+
+    def between(self, start: datetime, end: datetime) -> list[tuple[datetime, dict[str, Any]]]:
+        """Return (start, slot) pairs with start <= slot start < end, in time order."""
+        lo = int(np.searchsorted(self.start_epochs, start.timestamp(), side="left"))
+        hi = int(np.searchsorted(self.start_epochs, end.timestamp(), side="left"))
+        return [(self.starts[i], self.slots[i]) for i in range(lo, hi)]
+
+
+@dataclass
+class ScheduleSnapshot:
+    """One version of schedule.json plus its lazily built per-timezone indexes."""
+
+    payload: dict[str, Any]
+    version: tuple[int, int] | None = None  # (mtime_ns, size) of the file it came from
+    _indexes: dict[str, ScheduleIndex] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def slots(self) -> list[dict[str, Any]]:
+        return self.payload.get("schedule", []) or []
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return self.payload.get("meta", {}) or {}
+
+    def index(self, tz_name: str) -> ScheduleIndex:
+        with self._lock:
+            idx = self._indexes.get(tz_name)
+            if idx is None:
+                idx = ScheduleIndex.build(self.slots, pytz.timezone(tz_name))
+                self._indexes[tz_name] = idx
+            return idx
+
+
+_EMPTY: dict[str, Any] = {"schedule": [], "meta": {}}
+
+
+class ScheduleRepository:
+    """Caches the parsed schedule file, re-reading it only when its mtime changes."""
+
+    def __init__(self, path: str | Path = "schedule.json") -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._snapshot: ScheduleSnapshot | None = None
+        self.loads = 0
+
+    def _stat_version(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def exists(self) -> bool:
+        return self._stat_version() is not None
+
+    def get(self) -> ScheduleSnapshot:
+        """Return the current snapshot, re-parsing the file if it changed on disk."""
+        version = self._stat_version()
+        with self._lock:
+            snap = self._snapshot
+            if snap is not None and snap.version == version:
+                return snap
+            if version is None:
+                snap = ScheduleSnapshot(payload=_EMPTY, version=None)
+            else:
+                try:
+                    with self.path.open(encoding="utf-8") as f:
+                        payload = json.load(f)
+                    self.loads += 1
+                except (OSError, ValueError) as e:
+                    logger.error("Failed to load schedule: %s", e)
+                    # Keep serving the last good snapshot while a write is in flight
+                    if snap is not None and snap.version is not None:
+                        return snap
+                    payload = _EMPTY
+                snap = ScheduleSnapshot(payload=payload, version=version)
+            self._snapshot = snap
+            return snap
+
+    def publish(self, payload: dict[str, Any]) -> None:
+        """Install a schedule that was just written to disk, skipping the re-parse."""
+        with self._lock:
+            self._snapshot = ScheduleSnapshot(payload=payload, version=self._stat_version())
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+
+_repositories: dict[str, ScheduleRepository] = {}
+_repositories_lock = threading.Lock()
+
+
+def get_schedule_repository(path: str | Path = "schedule.json") -> ScheduleRepository:
+    """Return the process-wide repository for a schedule file path."""
+    key = str(Path(path).resolve())
+    with _repositories_lock:
+        repo = _repositories.get(key)
+        if repo is None:
+            repo = ScheduleRepository(key)
+            _repositories[key] = repo
+        return repo
@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import threading
+import time
 from typing import Any
 
 from backend.core.websockets import ws_manager
@@ -22,9 +25,103 @@ def emit_status_update(status_data: dict[str, Any]):
 
 def emit_live_metrics(live_data: dict[str, Any]):
     """Broadcast live metrics (Thread-safe)."""
-    # live_data is typed as dict[str, Any]
-    _LATEST_METRICS.update(live_data)
-    ws_manager.emit_sync("live_metrics", live_data)
+    # Routed through the coalescer so its record of sent values stays accurate
+    live_metrics_publisher.publish(live_data)
+
+
+# Default flush interval for coalesced live metrics (dashboard.live_metrics_interval_ms)
+LIVE_METRICS_INTERVAL_S = 0.5
+
+_MISSING = object()
+
+
+class LiveMetricsCoalescer:
+    """
+    Coalesces high-rate live metric updates into periodic Socket.IO frames.
+
+    publish() merges values into a pending dict (dropping ones equal to what
+    clients already have) and arms one flush on the server loop; the flush
+    sends everything pending as a single live_metrics frame, at most once per
+    interval. Thread-safe: publish() is called from the HA WebSocket thread.
+    """
+
+    def __init__(self, interval_s: float = LIVE_METRICS_INTERVAL_S) -> None:
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._pending: dict[str, Any] = {}
+        self._sent: dict[str, Any] = {}
+        self._flush_armed = False
+        self._last_flush = 0.0
+        self.events_in = 0
+        self.values_dropped = 0
+        self.frames_out = 0
+        # Strong refs to in-flight emits so they are not garbage collected early
+        self._emit_tasks: set[asyncio.Future[Any]] = set()
+
+    def publish(self, data: dict[str, Any]) -> None:
+        """Queue values for the next frame."""
+        with self._lock:
+            self.events_in += 1
+            for key, value in data.items():
+                if key not in self._pending and self._sent.get(key, _MISSING) == value:
+                    self.values_dropped += 1
+                    continue
+                self._pending[key] = value
+            if not self._pending or self._flush_armed:
+                return
+            self._flush_armed = True
+            delay = max(0.0, self._last_flush + self.interval_s - time.monotonic())
+        self._arm(delay)
+
+    def _arm(self, delay: float) -> None:
+        loop = ws_manager.loop
+        if loop is None or loop.is_closed():
+            # No server loop (startup/tests): flush inline
+            self.flush()
+            return
+        try:
+            loop.call_soon_threadsafe(loop.call_later, delay, self._flush_on_loop)
+        except RuntimeError:
+            self.flush()
+
+    def _flush_on_loop(self) -> None:
+        frame = self.take_frame()
+        if frame:
+            task = asyncio.ensure_future(ws_manager.emit("live_metrics", frame))
+            self._emit_tasks.add(task)
+            task.add_done_callback(self._emit_tasks.discard)
+
+    def take_frame(self) -> dict[str, Any]:
+        """Detach the pending values as one frame and record them as sent."""
+        with self._lock:
+            frame, self._pending = self._pending, {}
+            self._flush_armed = False
+            self._last_flush = time.monotonic()
+            if frame:
+                self._sent.update(frame)
+                self.frames_out += 1
+        if frame:
+            _LATEST_METRICS.update(frame)
+        return frame
+
+    def flush(self) -> None:
+        """Send pending values now (from any thread)."""
+        frame = self.take_frame()
+        if frame:
+            ws_manager.emit_sync("live_metrics", frame)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "interval_ms": round(self.interval_s * 1000),
+                "events_in": self.events_in,
+                "values_dropped": self.values_dropped,
+                "frames_out": self.frames_out,
+                "pending": len(self._pending),
+            }
+
+
+live_metrics_publisher = LiveMetricsCoalescer()
 
 
 def emit_plan_updated():
@@ -2,14 +2,89 @@ import asyncio
 import json
 import logging
 import threading
+import time
+from collections.abc import Callable
 from datetime import UTC, datetime
+from typing import Any
 
 import websockets
 
+from backend.core.entity_cache import entity_state_cache
 from inputs import load_home_assistant_config, load_yaml
 
 logger = logging.getLogger("darkstar.ha_socket")
 
+# How often an idle listen loop wakes up to pick up entity-set changes
+SUBSCRIPTION_CHECK_S = 1.0
+
+
+def _iso_ts(value: Any) -> str | None:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(float(value), UTC).isoformat()
+
+
+class CompressedStateDecoder:
+    """
+    Rebuild full HA state dicts from subscribe_entities events.
+
+    HA sends {"a": {entity_id: state}} for the initial snapshot (and entities
+    that appear later), {"c": {entity_id: {"+": changed, "-": {"a": [attrs]}}}}
+    for diffs and {"r": [entity_id]} for removals, with state keys shortened
+    to s/a/c/lc/lu and timestamps as epoch floats.
+    """
+
+    def __init__(self):
+        self._states: dict[str, dict[str, Any]] = {}
+
+    def reset(self) -> None:
+        self._states.clear()
+
+    def apply(self, event: dict[str, Any]) -> list[tuple[str, dict[str, Any] | None]]:
+        """Apply one event; return (entity_id, state) pairs, None for removals."""
+        changes: list[tuple[str, dict[str, Any] | None]] = []
+
+        for entity_id, compressed in (event.get("a") or {}).items():
+            last_changed = _iso_ts(compressed.get("lc"))
+            state = {
+                "entity_id": entity_id,
+                "state": compressed.get("s"),
+                "attributes": compressed.get("a") or {},
+                "last_changed": last_changed,
+                "last_updated": _iso_ts(compressed["lu"]) if "lu" in compressed else last_changed,
+            }
+            self._states[entity_id] = state
+            changes.append((entity_id, state))
+
+        for entity_id, diff in (event.get("c") or {}).items():
+            prev = self._states.get(entity_id)
+            if prev is None:
+                continue  # Diff for an entity we never saw in full
+            added = diff.get("+") or {}
+            removed = diff.get("-") or {}
+            # Build a new dict: readers (entity cache) may still hold the old one
+            state = dict(prev)
+            if "s" in added:
+                state["state"] = added["s"]
+            if "a" in added or "a" in removed:
+                attributes = dict(prev["attributes"])
+                attributes.update(added.get("a") or {})
+                for key in removed.get("a") or ():
+                    attributes.pop(key, None)
+                state["attributes"] = attributes
+            if "lc" in added:
+                state["last_changed"] = state["last_updated"] = _iso_ts(added["lc"])
+            elif "lu" in added:
+                state["last_updated"] = _iso_ts(added["lu"])
+            self._states[entity_id] = state
+            changes.append((entity_id, state))
+
+        for entity_id in event.get("r") or ():
+            self._states.pop(entity_id, None)
+            changes.append((entity_id, None))
+
+        return changes
+
 
 class HAWebSocketClient:
     def __init__(self):
@@ -20,12 +95,36 @@ class HAWebSocketClient:
         self.monitored_entities = self._get_monitored_entities()
         self.running = False
 
+        # Server-side filtering: HA only sends the entities we subscribe to.
+        # "entities" uses subscribe_entities; "state_changed" is the firehose
+        # fallback for HA versions without it.
+        self.subscription_mode = "entities"
+        self._entities_version = 0
+        self._sub_id: int | None = None
+        self._sub_key: tuple[int, int] | None = None
+        self._states_id: int | None = None
+        self._subscribed: frozenset[str] = frozenset()
+        self._decoder = CompressedStateDecoder()
+        # Extra consumers of every received state (e.g. the stream recorder)
+        self.state_listeners: list[Callable[[str, dict[str, Any] | None], None]] = []
+        self._conn_started: float | None = None
+        self._conn_messages = 0
+        self._conn_bytes = 0
+
         # Runtime Statistics (Production Observability)
         self.stats = {
             "connected_at": None,
             "disconnected_at": None,
             "messages_received": 0,
+            "bytes_received": 0,
+            "decode_ms": 0.0,
             "last_message_at": None,
+            "subscription": {
+                "mode": None,
+                "entities": 0,
+                "subscribed_at": None,
+                "resubscribes": 0,
+            },
             "events_processed": 0,
             "metrics_emitted": 0,
             "last_emit_at": None,
@@ -44,7 +143,8 @@ class HAWebSocketClient:
             logger.debug(f"HA WebSocket URL: {self.url}")
 
     def _load_config(self):
-        """Load HA connection parameters from secrets.yaml."""
+        """Load HA connection parameters from secrets.yaml and dashboard settings."""
+        self._load_live_metrics_interval()
         try:
             self.config = load_home_assistant_config()
             base_url = self.config.get("url", "")
@@ -73,6 +173,22 @@ class HAWebSocketClient:
             self.url = "/api/websocket"
             self.token = None
 
+    def _load_live_metrics_interval(self):
+        """Apply dashboard.live_metrics_interval_ms to the live_metrics coalescer."""
+        # Live metrics flush cadence (fast power sensors update every 1-5s)
+        from backend.events import LIVE_METRICS_INTERVAL_S, live_metrics_publisher
+
+        try:
+            interval_ms = (
+                load_yaml("config.yaml").get("dashboard", {}).get("live_metrics_interval_ms")
+            )
+            live_metrics_publisher.interval_s = (
+                float(interval_ms) / 1000.0 if interval_ms is not None else LIVE_METRICS_INTERVAL_S
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Invalid live metrics interval, using default: {e}")
+            live_metrics_publisher.interval_s = LIVE_METRICS_INTERVAL_S
+
     def _get_monitored_entities(self) -> dict[str, str]:
         # Load config to map entity_id -> metric_key
         try:
@@ -124,6 +240,120 @@ class HAWebSocketClient:
             logger.error(f"❌ Failed to load monitored entities: {e}", exc_info=True)
             return {}
 
+    def _next_id(self) -> int:
+        msg_id = self.id_counter
+        self.id_counter += 1
+        return msg_id
+
+    def _wanted_entities(self) -> frozenset[str]:
+        """Entities HA should send: live metrics plus whatever the state cache tracks."""
+        return frozenset(e for e in self.monitored_entities if e) | entity_state_cache.tracked()
+
+    async def _subscribe(self, ws) -> None:
+        """(Re)subscribe to the current entity set, dropping any previous subscription."""
+        self._sub_key = (self._entities_version, entity_state_cache.tracked_version)
+        sub_stats = self.stats["subscription"]
+        if self._sub_id is not None:
+            await ws.send(
+                json.dumps(
+                    {
+                        "id": self._next_id(),
+                        "type": "unsubscribe_events",
+                        "subscription": self._sub_id,
+                    }
+                )
+            )
+            self._sub_id = None
+            sub_stats["resubscribes"] += 1
+
+        self._decoder.reset()
+        self._states_id = None
+        self._subscribed = self._wanted_entities()
+        sub_stats["mode"] = self.subscription_mode
+        sub_stats["entities"] = len(self._subscribed)
+        sub_stats["subscribed_at"] = datetime.now(UTC).isoformat()
+
+        if not self._subscribed:
+            # An empty entity_ids list would subscribe to every entity
+            logger.warning("⚠️ No HA entities to subscribe to - waiting for configuration")
+            return
+
+        self._sub_id = self._next_id()
+        if self.subscription_mode == "entities":
+            await ws.send(
+                json.dumps(
+                    {
+                        "id": self._sub_id,
+                        "type": "subscribe_entities",
+                        "entity_ids": sorted(self._subscribed),
+                    }
+                )
+            )
+        else:
+            await ws.send(
+                json.dumps(
+                    {"id": self._sub_id, "type": "subscribe_events", "event_type": "state_changed"}
+                )
+            )
+            # Get initial states (Rev U2); subscribe_entities sends these itself
+            self._states_id = self._next_id()
+            await ws.send(json.dumps({"id": self._states_id, "type": "get_states"}))
+        logger.info(
+            f"Subscribed to {len(self._subscribed)} HA entities (mode={self.subscription_mode})"
+        )
+
+    def _dispatch_state(self, entity_id: str, state: dict[str, Any] | None) -> None:
+        if entity_id not in self._subscribed:
+            return
+        if entity_state_cache.is_tracked(entity_id):
+            entity_state_cache.update(entity_id, state)
+        if entity_id in self.monitored_entities:
+            self._handle_state_change(entity_id, state)
+        for listener in self.state_listeners:
+            try:
+                listener(entity_id, state)
+            except Exception as e:
+                logger.error(f"State listener failed for {entity_id}: {e}", exc_info=True)
+
+    async def _handle_message(self, ws, data: dict[str, Any]) -> None:
+        msg_type = data.get("type")
+        msg_id = data.get("id")
+
+        if msg_type == "result":
+            if msg_id == self._sub_id and not data.get("success", True):
+                if self.subscription_mode == "entities":
+                    # HA older than 2022.4 has no subscribe_entities
+                    logger.warning(
+                        f"subscribe_entities rejected ({data.get('error')}), "
+                        "falling back to state_changed events"
+                    )
+                    self.subscription_mode = "state_changed"
+                    self._sub_id = None
+                    await self._subscribe(ws)
+                else:
+                    logger.error(f"HA subscription failed: {data.get('error')}")
+            elif msg_id is not None and msg_id == self._states_id:
+                # Handle the get_states response (legacy mode only)
+                logger.info("DIAG: Received get_states result - processing initial states")
+                for state in data.get("result") or []:
+                    self._dispatch_state(state.get("entity_id"), state)
+            return
+
+        # Events from a subscription we already replaced are dropped
+        if msg_type != "event" or msg_id != self._sub_id:
+            return
+
+        event = data.get("event", {})
+        if self.subscription_mode == "entities":
+            t0 = time.perf_counter()
+            changes = self._decoder.apply(event)
+            self.stats["decode_ms"] += (time.perf_counter() - t0) * 1000.0
+            for entity_id, state in changes:
+                self._dispatch_state(entity_id, state)
+        else:
+            event_data = event.get("data", {})
+            self._dispatch_state(event_data.get("entity_id"), event_data.get("new_state"))
+
     async def connect(self):
         while self.running:
             try:
@@ -144,67 +374,58 @@ class HAWebSocketClient:
 
                     logger.info("HA Authenticated")
 
-                    # Subscribe to state_changed
-                    sub_id = self.id_counter
-                    self.id_counter += 1
-                    await ws.send(
-                        json.dumps(
-                            {
-                                "id": sub_id,
-                                "type": "subscribe_events",
-                                "event_type": "state_changed",
-                            }
-                        )
-                    )
-
-                    # Get initial states (Rev U2)
-                    states_id = self.id_counter
-                    self.id_counter += 1
-                    await ws.send(json.dumps({"id": states_id, "type": "get_states"}))
+                    # New connection: no subscription survives a reconnect
+                    self._sub_id = None
+                    await self._subscribe(ws)
 
                     # Listen loop
                     logger.info("DIAG: Entering listen loop")
                     self.stats["connected_at"] = datetime.now(UTC).isoformat()
                     self.stats["disconnected_at"] = None
+                    self._conn_started = time.monotonic()
+                    self._conn_messages = 0
+                    self._conn_bytes = 0
                     rx_count = 0
+                    entity_state_cache.set_live(True)
 
                     while self.running:
-                        msg = await ws.recv()
+                        # Monitored entities reloaded or the executor tracked new ones
+                        if self._sub_key != (
+                            self._entities_version,
+                            entity_state_cache.tracked_version,
+                        ):
+                            await self._subscribe(ws)
+
+                        try:
+                            msg = await asyncio.wait_for(ws.recv(), timeout=SUBSCRIPTION_CHECK_S)
+                        except TimeoutError:
+                            continue
+
                         rx_count += 1
+                        self._conn_messages += 1
+                        self._conn_bytes += len(msg)
                         self.stats["messages_received"] += 1
+                        self.stats["bytes_received"] += len(msg)
                         self.stats["last_message_at"] = datetime.now(UTC).isoformat()
 
+                        t0 = time.perf_counter()
                         data = json.loads(msg)
+                        self.stats["decode_ms"] += (time.perf_counter() - t0) * 1000.0
 
                         # DIAG(Prob): Log first 5 messages to verify data flow
                         if rx_count <= 5:
                             logger.info(
-                                f"DIAG: WebSocket RX type={data.get('type')} id={data.get('id')} event={data.get('event', {}).get('event_type')}"
-                            )
-
-                        # Handle the get_states response
-                        if data.get("id") == states_id and data.get("type") == "result":
-                            logger.info(
-                                "DIAG: Received get_states result - processing initial states"
+                                f"DIAG: WebSocket RX type={data.get('type')} id={data.get('id')}"
                             )
-                            results = data.get("result", [])
-                            for state in results:
-                                entity_id = state.get("entity_id")
-                                if entity_id in self.monitored_entities:
-                                    self._handle_state_change(entity_id, state)
-                            continue
-
-                        if data.get("type") == "event":
-                            event = data.get("event", {})
-                            entity_id = event.get("data", {}).get("entity_id")
-                            new_state = event.get("data", {}).get("new_state", {})
 
-                            if entity_id in self.monitored_entities:
-                                self._handle_state_change(entity_id, new_state)
+                        await self._handle_message(ws, data)
 
             except Exception as e:
                 logger.error(f"HA WebSocket error: {e}")
+                # Events may be missed while reconnecting; readers fall back to REST
+                entity_state_cache.set_live(False)
                 await asyncio.sleep(5)
+        entity_state_cache.set_live(False)
 
     def _handle_state_change(self, entity_id, new_state):
         if not new_state:
@@ -278,11 +499,11 @@ class HAWebSocketClient:
                 payload["grid_kw"] = i - e
 
             # Import here to avoid circular imports at module level
-            from backend.events import emit_live_metrics
+            from backend.events import live_metrics_publisher
 
-            # DIAG: Log every emission for now to prove data flow
-            logger.info(f"DIAG: Emitting live_metrics for {key} raw={state_val} val={value}")
-            emit_live_metrics(payload)
+            # Coalesced: clients get one merged frame per interval, not one per event
+            logger.debug("Publishing live_metrics for %s raw=%s val=%s", key, state_val, value)
+            live_metrics_publisher.publish(payload)
 
             # Update Runtime Stats
             self.stats["metrics_emitted"] += 1
@@ -327,6 +548,20 @@ class HAWebSocketClient:
         logger.info("Reloading HA configuration...")
         self._load_config()
         self.monitored_entities = self._get_monitored_entities()
+        # The listen loop re-subscribes with the new entity set
+        self._entities_version += 1
+
+    def traffic_stats(self) -> dict[str, Any]:
+        """Message throughput and decode cost for the current connection."""
+        messages = self.stats["messages_received"]
+        elapsed = time.monotonic() - self._conn_started if self._conn_started else 0.0
+        return {
+            "messages_per_s": round(self._conn_messages / elapsed, 3) if elapsed else 0.0,
+            "bytes_per_s": round(self._conn_bytes / elapsed, 1) if elapsed else 0.0,
+            "avg_decode_us": round(self.stats["decode_ms"] * 1000.0 / messages, 1)
+            if messages
+            else 0.0,
+        }
 
 
 # Global instance
@@ -352,8 +587,19 @@ def reload_ha_socket_client():
         _ha_client.reload_monitored_entities()
 
 
+def add_state_listener(listener: Callable[[str, dict[str, Any] | None], None]) -> bool:
+    """Register a callback for every state the running client receives."""
+    if _ha_client is None:
+        return False
+    _ha_client.state_listeners.append(listener)
+    return True
+
+
 def get_ha_socket_status() -> dict:
     """Return diagnostic info about HA WebSocket connection."""
+    from backend.events import live_metrics_publisher
+    from backend.stream_recorder import get_stream_recorder_status
+
     if _ha_client is None:
         return {"status": "not_started", "monitored_entities": {}}
 
@@ -363,6 +609,10 @@ def get_ha_socket_status() -> dict:
         "url": _ha_client.url,
         "monitored_entities": _ha_client.monitored_entities,
         "stats": _ha_client.stats,
+        "traffic": _ha_client.traffic_stats(),
+        "entity_cache": entity_state_cache.stats(),
+        "live_metrics": live_metrics_publisher.stats(),
+        "stream_recorder": get_stream_recorder_status(),
         "config": {
             "has_token": bool(_ha_client.token),
             "token_len": len(_ha_client.token) if _ha_client.token else 0,
@@ -5,7 +5,9 @@ Centralized health monitoring for Darkstar.
 Validates HA connection, entity availability, config validity, and planner metrics via SQLite.
 """
 
+import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +19,12 @@ import yaml
 
 logger = logging.getLogger(__name__)
 
+# Max simultaneous GET /api/states/{entity_id} requests during entity validation
+ENTITY_CHECK_CONCURRENCY = 8
+
+# How long a health result is served before a background refresh is started
+HEALTH_CACHE_TTL_S = 30.0
+
 
 @dataclass
 class HealthIssue:
@@ -379,44 +387,49 @@ class HealthChecker:
                 if entity_id:
                     entities_to_check.append((entity_id, f"executor.{key}"))
 
-        # Check each entity
+        # Check entities concurrently over one pooled client, bounded so a large
+        # config doesn't open dozens of simultaneous connections to HA
         headers = {"Authorization": f"Bearer {token}"}
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            for entity_id, config_key in entities_to_check:
-                try:
-                    response = await client.get(
-                        f"{url}/api/states/{entity_id}",
-                        headers=headers,
-                    )
+        semaphore = asyncio.Semaphore(ENTITY_CHECK_CONCURRENCY)
 
-                    if response.status_code == 404:
-                        issues.append(
-                            HealthIssue(
-                                category="entity",
-                                severity="critical",
-                                message=f"Entity not found: {entity_id}",
-                                guidance=f"Check that '{entity_id}' exists in Home Assistant. Update {config_key} in config.yaml if renamed.",
-                                entity_id=entity_id,
-                            )
-                        )
-                    elif response.status_code == 200:
-                        # Check for unavailable state
-                        state_data = response.json()
-                        state_value = state_data.get("state")
-                        if state_value == "unavailable":
-                            issues.append(
-                                HealthIssue(
-                                    category="entity",
-                                    severity="warning",
-                                    message=f"Entity unavailable: {entity_id}",
-                                    guidance=f"The entity '{entity_id}' exists but is currently unavailable. Check your device/integration.",
-                                    entity_id=entity_id,
-                                )
-                            )
+        async def check_one(
+            client: httpx.AsyncClient, entity_id: str, config_key: str
+        ) -> HealthIssue | None:
+            async with semaphore:
+                try:
+                    response = await client.get(f"{url}/api/states/{entity_id}", headers=headers)
                 except httpx.RequestError:
                     # Connection issues already reported in check_ha_connection
-                    pass
+                    return None
+
+            if response.status_code == 404:
+                return HealthIssue(
+                    category="entity",
+                    severity="critical",
+                    message=f"Entity not found: {entity_id}",
+                    guidance=f"Check that '{entity_id}' exists in Home Assistant. Update {config_key} in config.yaml if renamed.",
+                    entity_id=entity_id,
+                )
+            if response.status_code == 200:
+                # Check for unavailable state
+                state_data = response.json()
+                if state_data.get("state") == "unavailable":
+                    return HealthIssue(
+                        category="entity",
+                        severity="warning",
+                        message=f"Entity unavailable: {entity_id}",
+                        guidance=f"The entity '{entity_id}' exists but is currently unavailable. Check your device/integration.",
+                        entity_id=entity_id,
+                    )
+            return None
+
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            results = await asyncio.gather(
+                *(check_one(client, eid, key) for eid, key in entities_to_check)
+            )
 
+        # gather preserves input order, so issues stay in config order
+        issues.extend(issue for issue in results if issue is not None)
         return issues
 
     def check_executor(self) -> list[HealthIssue]:
@@ -455,7 +468,57 @@ class HealthChecker:
         return issues
 
 
-async def get_health_status(config_path: str = "config.yaml") -> HealthStatus:
-    """Convenience function to get current health status."""
+_cached_status: dict[str, tuple[HealthStatus, float]] = {}
+_refresh_tasks: dict[str, asyncio.Task[HealthStatus]] = {}
+# Bumped by invalidate_health_cache(); refreshes started earlier are not cached
+_cache_generation = 0
+
+
+async def _refresh_health_status(config_path: str, generation: int) -> HealthStatus:
     checker = HealthChecker(config_path)
-    return await checker.check_all()
+    status = await checker.check_all()
+    if generation == _cache_generation:
+        _cached_status[config_path] = (status, time.monotonic())
+    return status
+
+
+def _start_refresh(config_path: str) -> asyncio.Task[HealthStatus]:
+    """Start (or join) the single in-flight refresh for a config path."""
+    task = _refresh_tasks.get(config_path)
+    if task is None or task.done():
+        task = asyncio.create_task(_refresh_health_status(config_path, _cache_generation))
+        task.add_done_callback(_log_refresh_failure)
+        _refresh_tasks[config_path] = task
+    return task
+
+
+def _log_refresh_failure(task: asyncio.Task[HealthStatus]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background health refresh failed: %s", task.exception())
+
+
+async def get_health_status(config_path: str = "config.yaml") -> HealthStatus:
+    """
+    Convenience function to get current health status.
+
+    Results are cached for HEALTH_CACHE_TTL_S. After that the last status is
+    still served while one background refresh runs, so dashboard polling only
+    waits on HA when there is no previous result at all.
+    """
+    cached = _cached_status.get(config_path)
+    if cached is None:
+        return await asyncio.shield(_start_refresh(config_path))
+
+    status, checked_at = cached
+    if time.monotonic() - checked_at > HEALTH_CACHE_TTL_S:
+        _start_refresh(config_path)
+    return status
+
+
+def invalidate_health_cache() -> None:
+    """Drop cached health results (e.g. after a config change)."""
+    global _cache_generation
+    _cache_generation += 1
+    # In-flight refreshes may have read the old config: stop joining them
+    _refresh_tasks.clear()
+    _cached_status.clear()
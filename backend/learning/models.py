@@ -1,8 +1,25 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text, UniqueConstraint, text
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+# Derived slot columns (virtual, computed by SQLite from the local ISO slot_start).
+# Range filters on slot_epoch use its index; DATE()/strftime() on slot_start cannot,
+# and SQLite evaluates those in UTC rather than local time.
+SLOT_EPOCH_SQL = "CAST(strftime('%s', slot_start) AS INTEGER)"
+SLOT_DATE_SQL = "substr(slot_start, 1, 10)"
+SLOT_HOUR_SQL = "CAST(substr(slot_start, 12, 2) AS INTEGER)"
+
 
 class Base(DeclarativeBase):
     pass
@@ -29,6 +46,11 @@ class SlotObservation(Base):
     created_at: Mapped[datetime | None] = mapped_column(
         DateTime, default=datetime.utcnow
     )
+    slot_epoch: Mapped[int | None] = mapped_column(
+        Integer, Computed(SLOT_EPOCH_SQL, persisted=False), index=True
+    )
+    slot_date: Mapped[str | None] = mapped_column(String, Computed(SLOT_DATE_SQL, persisted=False))
+    slot_hour: Mapped[int | None] = mapped_column(Integer, Computed(SLOT_HOUR_SQL, persisted=False))
 
 
 class SlotForecast(Base):
@@ -50,6 +72,10 @@ class SlotForecast(Base):
     created_at: Mapped[datetime | None] = mapped_column(
         DateTime, default=datetime.utcnow
     )
+    slot_epoch: Mapped[int | None] = mapped_column(
+        Integer, Computed(SLOT_EPOCH_SQL, persisted=False), index=True
+    )
+    slot_date: Mapped[str | None] = mapped_column(String, Computed(SLOT_DATE_SQL, persisted=False))
 
     __table_args__ = (UniqueConstraint("slot_start", "forecast_version"),)
 
@@ -69,6 +95,10 @@ class SlotPlan(Base):
     created_at: Mapped[datetime | None] = mapped_column(
         DateTime, default=datetime.utcnow
     )
+    slot_epoch: Mapped[int | None] = mapped_column(
+        Integer, Computed(SLOT_EPOCH_SQL, persisted=False), index=True
+    )
+    slot_date: Mapped[str | None] = mapped_column(String, Computed(SLOT_DATE_SQL, persisted=False))
 
 
 class ConfigVersion(Base):
@@ -316,3 +346,18 @@ class ExecutionLog(Base):
     source: Mapped[str] = mapped_column(String, default="native")
     executor_version: Mapped[str | None] = mapped_column(String)
     commanded_unit: Mapped[str] = mapped_column(String, default="A")
+
+
+class DayAheadPrice(Base):
+    """Raw Nordpool spot prices, one row per slot of a published delivery day."""
+
+    __tablename__ = "day_ahead_prices"
+
+    area: Mapped[str] = mapped_column(String, primary_key=True)
+    currency: Mapped[str] = mapped_column(String, primary_key=True)
+    resolution_minutes: Mapped[int] = mapped_column(Integer, primary_key=True)
+    delivery_date: Mapped[str] = mapped_column(String, primary_key=True)
+    slot_start: Mapped[str] = mapped_column(String, primary_key=True)
+    slot_end: Mapped[str] = mapped_column(String)
+    spot_price_per_mwh: Mapped[float] = mapped_column(Float)
+    fetched_at: Mapped[str] = mapped_column(String)
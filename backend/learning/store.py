@@ -1,15 +1,17 @@
 import logging
 from collections.abc import Iterable
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any
 
 import pandas as pd
 import pytz
-from sqlalchemy import create_engine, func, select, text, cast, Integer
+from sqlalchemy import func, select, text
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker
 
+from backend.core.db import get_engine
 from backend.learning.models import (
+    DayAheadPrice,
     ReflexState,
     SlotForecast,
     SlotObservation,
@@ -19,6 +21,11 @@ from backend.learning.models import (
 
 logger = logging.getLogger("darkstar.learning.store")
 
+# Rows per executemany batch for bulk upserts (all batches share one transaction)
+UPSERT_CHUNK_SIZE = 1000
+# str() of an aware timestamp ends in an offset ("+01:00", "-0500") or "Z"
+_UTC_OFFSET_SUFFIX = r"(?:Z|[+-]\d{2}:?\d{2})$"
+
 
 class LearningStore:
     """
@@ -29,62 +36,162 @@ class LearningStore:
         self.db_path = db_path
         self.timezone = timezone
 
-        # Initialize SQLAlchemy
-        # We use check_same_thread=False for SQLite shared access in FastAPI
-        connect_args = {"check_same_thread": False, "timeout": 30.0}
-        self.engine = create_engine(f"sqlite:///{db_path}", connect_args=connect_args)
+        # Shared pooled engine (WAL) so per-run stores don't open new engines
+        self.engine = get_engine(db_path)
         self.Session = sessionmaker(bind=self.engine)
 
     # _init_schema was removed as Alembic handles migrations.
 
+    def _iso_timestamps(self, values: Iterable[Any]) -> list[str | None]:
+        """
+        Normalize timestamps to local ISO-8601 strings in one vectorized pass.
+
+        Accepts datetimes, pandas Timestamps or strings (mixed offsets are fine);
+        None/NaT stay None. Naive values are system-local wall time, as with
+        datetime.astimezone().
+        """
+        series = pd.Series(list(values), dtype=object)
+        out: list[str | None] = [None] * len(series)
+        present = series.notna().to_numpy()
+        if not present.any():
+            return out
+
+        stamps = series[present]
+        naive = ~stamps.astype(str).str.contains(_UTC_OFFSET_SUFFIX)
+        if naive.any():
+            # Rare: attach the system zone per value (DST-aware) before the vectorized parse
+            stamps = stamps.where(
+                ~naive, stamps[naive].map(lambda v: pd.Timestamp(v).to_pydatetime().astimezone())
+            )
+        local = pd.to_datetime(stamps, utc=True, format="mixed").dt.tz_convert(self.timezone)
+        base = local.dt.strftime("%Y-%m-%dT%H:%M:%S")
+        micro = local.dt.microsecond
+        fraction = ("." + micro.astype(str).str.zfill(6)).where(micro > 0, "")
+        offset = local.dt.strftime("%z")
+        iso = base + fraction + offset.str[:3] + ":" + offset.str[3:]
+
+        for pos, value in zip(present.nonzero()[0], iso.tolist(), strict=True):
+            out[pos] = value
+        return out
+
+    @staticmethod
+    def _bulk_execute(session: Any, stmt: Any, params: list[dict[str, Any]]) -> None:
+        """Run one upsert statement over all rows (executemany), chunked."""
+        # Core connection rather than ORM bulk mode, which drops None keys per row
+        connection = session.connection()
+        for i in range(0, len(params), UPSERT_CHUNK_SIZE):
+            connection.execute(stmt, params[i : i + UPSERT_CHUNK_SIZE])
+
+    def cutoff_epoch(self, days_back: int) -> int:
+        """Unix epoch of local midnight ``days_back`` days ago (for slot_epoch range filters)."""
+        day = (datetime.now(self.timezone) - timedelta(days=days_back)).date()
+        return int(pd.Timestamp(day).tz_localize(self.timezone).timestamp())
+
     def store_slot_prices(self, price_rows: Iterable[dict[str, Any]]) -> None:
         """Store slot price data (import/export SEK per kWh) using SQLAlchemy."""
         rows = list(price_rows or [])
         if not rows:
             return
 
+        starts = self._iso_timestamps(row.get("slot_start") or row.get("start_time") for row in rows)
+        ends = self._iso_timestamps(row.get("slot_end") or row.get("end_time") for row in rows)
+        params = [
+            {
+                "slot_start": slot_start,
+                "slot_end": slot_end,
+                "import_price_sek_kwh": row.get("import_price_sek_kwh"),
+                "export_price_sek_kwh": row.get("export_price_sek_kwh"),
+            }
+            for row, slot_start, slot_end in zip(rows, starts, ends, strict=True)
+            if slot_start is not None
+        ]
+        if not params:
+            return
+
+        stmt = sqlite_insert(SlotObservation)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['slot_start'],
+            set_={
+                'slot_end': func.coalesce(stmt.excluded.slot_end, SlotObservation.slot_end),
+                'import_price_sek_kwh': func.coalesce(
+                    stmt.excluded.import_price_sek_kwh,
+                    SlotObservation.import_price_sek_kwh
+                ),
+                'export_price_sek_kwh': func.coalesce(
+                    stmt.excluded.export_price_sek_kwh,
+                    SlotObservation.export_price_sek_kwh
+                )
+            }
+        )
         with self.Session() as session:
-            for row in rows:
-                slot_start = row.get("slot_start") or row.get("start_time")
-                slot_end = row.get("slot_end") or row.get("end_time")
-                if slot_start is None:
-                    continue
-
-                if isinstance(slot_start, (datetime, pd.Timestamp)):
-                    slot_start = slot_start.astimezone(self.timezone).isoformat()
-                else:
-                    slot_start = pd.to_datetime(slot_start).astimezone(self.timezone).isoformat()
-
-                if slot_end is not None:
-                    if isinstance(slot_end, (datetime, pd.Timestamp)):
-                        slot_end = slot_end.astimezone(self.timezone).isoformat()
-                    else:
-                        slot_end = pd.to_datetime(slot_end).astimezone(self.timezone).isoformat()
-
-                import_price = row.get("import_price_sek_kwh")
-                export_price = row.get("export_price_sek_kwh")
-
-                stmt = sqlite_insert(SlotObservation).values(
-                    slot_start=slot_start,
-                    slot_end=slot_end,
-                    import_price_sek_kwh=import_price,
-                    export_price_sek_kwh=export_price
+            self._bulk_execute(session, stmt, params)
+            session.commit()
+
+    def get_day_ahead_prices(
+        self, area: str, currency: str, resolution_minutes: int, delivery_date: date
+    ) -> list[dict[str, Any]]:
+        """
+        Stored spot prices for one delivery day, in Nordpool API shape.
+
+        Returns a list of {"start", "end", "value"} dicts (value per MWh),
+        ordered by start; empty if the day has not been stored.
+        """
+        with self.Session() as session:
+            rows = session.execute(
+                select(
+                    DayAheadPrice.slot_start,
+                    DayAheadPrice.slot_end,
+                    DayAheadPrice.spot_price_per_mwh,
                 )
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['slot_start'],
-                    set_={
-                        'slot_end': func.coalesce(stmt.excluded.slot_end, SlotObservation.slot_end),
-                        'import_price_sek_kwh': func.coalesce(
-                            stmt.excluded.import_price_sek_kwh,
-                            SlotObservation.import_price_sek_kwh
-                        ),
-                        'export_price_sek_kwh': func.coalesce(
-                            stmt.excluded.export_price_sek_kwh,
-                            SlotObservation.export_price_sek_kwh
-                        )
-                    }
+                .where(
+                    DayAheadPrice.area == area,
+                    DayAheadPrice.currency == currency,
+                    DayAheadPrice.resolution_minutes == resolution_minutes,
+                    DayAheadPrice.delivery_date == delivery_date.isoformat(),
                 )
-                session.execute(stmt)
+                .order_by(DayAheadPrice.slot_start)
+            ).all()
+        return [
+            {
+                "start": datetime.fromisoformat(start),
+                "end": datetime.fromisoformat(end),
+                "value": value,
+            }
+            for start, end, value in rows
+        ]
+
+    def store_day_ahead_prices(
+        self,
+        area: str,
+        currency: str,
+        resolution_minutes: int,
+        delivery_date: date,
+        values: list[dict[str, Any]],
+    ) -> None:
+        """Persist a published delivery day (Nordpool start/end/value entries)."""
+        if not values:
+            return
+
+        starts = self._iso_timestamps(v["start"] for v in values)
+        ends = self._iso_timestamps(v["end"] for v in values)
+        fetched_at = datetime.now(self.timezone).isoformat()
+        params = [
+            {
+                "area": area,
+                "currency": currency,
+                "resolution_minutes": resolution_minutes,
+                "delivery_date": delivery_date.isoformat(),
+                "slot_start": slot_start,
+                "slot_end": slot_end,
+                "spot_price_per_mwh": float(v["value"]),
+                "fetched_at": fetched_at,
+            }
+            for v, slot_start, slot_end in zip(values, starts, ends, strict=True)
+        ]
+        # Published prices never change, so existing rows are left untouched
+        stmt = sqlite_insert(DayAheadPrice).on_conflict_do_nothing()
+        with self.Session() as session:
+            self._bulk_execute(session, stmt, params)
             session.commit()
 
     def store_slot_observations(self, observations_df: pd.DataFrame) -> None:
@@ -92,60 +199,53 @@ class LearningStore:
         if observations_df.empty:
             return
 
+        records = observations_df.to_dict("records")
+        starts = self._iso_timestamps(observations_df["slot_start"])
+        ends = self._iso_timestamps(
+            observations_df["slot_end"] if "slot_end" in observations_df.columns
+            else [None] * len(observations_df)
+        )
+        params = [
+            {
+                "slot_start": slot_start,
+                "slot_end": slot_end,
+                "import_kwh": float(record.get("import_kwh", 0.0) or 0.0),
+                "export_kwh": float(record.get("export_kwh", 0.0) or 0.0),
+                "pv_kwh": float(record.get("pv_kwh", 0.0) or 0.0),
+                "load_kwh": float(record.get("load_kwh", 0.0) or 0.0),
+                "water_kwh": float(record.get("water_kwh", 0.0) or 0.0),
+                "batt_charge_kwh": record.get("batt_charge_kwh"),
+                "batt_discharge_kwh": record.get("batt_discharge_kwh"),
+                "soc_start_percent": record.get("soc_start_percent"),
+                "soc_end_percent": record.get("soc_end_percent"),
+                "import_price_sek_kwh": record.get("import_price_sek_kwh"),
+                "export_price_sek_kwh": record.get("export_price_sek_kwh"),
+                "quality_flags": record.get("quality_flags", "{}"),
+            }
+            for record, slot_start, slot_end in zip(records, starts, ends, strict=True)
+        ]
+
+        stmt = sqlite_insert(SlotObservation)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['slot_start'],
+            set_={
+                'slot_end': func.coalesce(stmt.excluded.slot_end, SlotObservation.slot_end),
+                'import_kwh': stmt.excluded.import_kwh,
+                'export_kwh': stmt.excluded.export_kwh,
+                'pv_kwh': stmt.excluded.pv_kwh,
+                'load_kwh': stmt.excluded.load_kwh,
+                'water_kwh': stmt.excluded.water_kwh,
+                'batt_charge_kwh': func.coalesce(stmt.excluded.batt_charge_kwh, SlotObservation.batt_charge_kwh),
+                'batt_discharge_kwh': func.coalesce(stmt.excluded.batt_discharge_kwh, SlotObservation.batt_discharge_kwh),
+                'soc_start_percent': func.coalesce(stmt.excluded.soc_start_percent, SlotObservation.soc_start_percent),
+                'soc_end_percent': func.coalesce(stmt.excluded.soc_end_percent, SlotObservation.soc_end_percent),
+                'import_price_sek_kwh': func.coalesce(stmt.excluded.import_price_sek_kwh, SlotObservation.import_price_sek_kwh),
+                'export_price_sek_kwh': func.coalesce(stmt.excluded.export_price_sek_kwh, SlotObservation.export_price_sek_kwh),
+                'quality_flags': stmt.excluded.quality_flags
+            }
+        )
         with self.Session() as session:
-            records = observations_df.to_dict("records")
-
-            for record in records:
-                slot_start = record["slot_start"]
-                slot_end = record.get("slot_end")
-
-                if isinstance(slot_start, (datetime, pd.Timestamp)):
-                    slot_start = slot_start.astimezone(self.timezone).isoformat()
-                else:
-                    slot_start = pd.to_datetime(slot_start).astimezone(self.timezone).isoformat()
-
-                if slot_end is not None:
-                    if isinstance(slot_end, (datetime, pd.Timestamp)):
-                        slot_end = slot_end.astimezone(self.timezone).isoformat()
-                    else:
-                        slot_end = pd.to_datetime(slot_end).astimezone(self.timezone).isoformat()
-
-                stmt = sqlite_insert(SlotObservation).values(
-                    slot_start=slot_start,
-                    slot_end=slot_end,
-                    import_kwh=float(record.get("import_kwh", 0.0) or 0.0),
-                    export_kwh=float(record.get("export_kwh", 0.0) or 0.0),
-                    pv_kwh=float(record.get("pv_kwh", 0.0) or 0.0),
-                    load_kwh=float(record.get("load_kwh", 0.0) or 0.0),
-                    water_kwh=float(record.get("water_kwh", 0.0) or 0.0),
-                    batt_charge_kwh=record.get("batt_charge_kwh"),
-                    batt_discharge_kwh=record.get("batt_discharge_kwh"),
-                    soc_start_percent=record.get("soc_start_percent"),
-                    soc_end_percent=record.get("soc_end_percent"),
-                    import_price_sek_kwh=record.get("import_price_sek_kwh"),
-                    export_price_sek_kwh=record.get("export_price_sek_kwh"),
-                    quality_flags=record.get("quality_flags", "{}")
-                )
-
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['slot_start'],
-                    set_={
-                        'slot_end': func.coalesce(stmt.excluded.slot_end, SlotObservation.slot_end),
-                        'import_kwh': stmt.excluded.import_kwh,
-                        'export_kwh': stmt.excluded.export_kwh,
-                        'pv_kwh': stmt.excluded.pv_kwh,
-                        'load_kwh': stmt.excluded.load_kwh,
-                        'water_kwh': stmt.excluded.water_kwh,
-                        'batt_charge_kwh': func.coalesce(stmt.excluded.batt_charge_kwh, SlotObservation.batt_charge_kwh),
-                        'batt_discharge_kwh': func.coalesce(stmt.excluded.batt_discharge_kwh, SlotObservation.batt_discharge_kwh),
-                        'soc_start_percent': func.coalesce(stmt.excluded.soc_start_percent, SlotObservation.soc_start_percent),
-                        'soc_end_percent': func.coalesce(stmt.excluded.soc_end_percent, SlotObservation.soc_end_percent),
-                        'import_price_sek_kwh': func.coalesce(stmt.excluded.import_price_sek_kwh, SlotObservation.import_price_sek_kwh),
-                        'export_price_sek_kwh': func.coalesce(stmt.excluded.export_price_sek_kwh, SlotObservation.export_price_sek_kwh),
-                        'quality_flags': stmt.excluded.quality_flags
-                    }
-                )
-                session.execute(stmt)
+            self._bulk_execute(session, stmt, params)
             session.commit()
 
     def store_forecasts(self, forecasts: list[dict], forecast_version: str) -> None:
@@ -153,37 +253,40 @@ class LearningStore:
         if not forecasts:
             return
 
+        params = [
+            {
+                "slot_start": forecast["slot_start"],
+                "pv_forecast_kwh": float(forecast.get("pv_forecast_kwh", 0.0) or 0.0),
+                "load_forecast_kwh": float(forecast.get("load_forecast_kwh", 0.0) or 0.0),
+                "pv_p10": forecast.get("pv_p10"),
+                "pv_p90": forecast.get("pv_p90"),
+                "load_p10": forecast.get("load_p10"),
+                "load_p90": forecast.get("load_p90"),
+                "temp_c": forecast.get("temp_c"),
+                "forecast_version": forecast_version,
+            }
+            for forecast in forecasts
+            if forecast.get("slot_start") is not None
+        ]
+        if not params:
+            return
+
+        stmt = sqlite_insert(SlotForecast)
+        # Preserve corrections on conflict
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['slot_start', 'forecast_version'],
+            set_={
+                'pv_forecast_kwh': stmt.excluded.pv_forecast_kwh,
+                'load_forecast_kwh': stmt.excluded.load_forecast_kwh,
+                'pv_p10': stmt.excluded.pv_p10,
+                'pv_p90': stmt.excluded.pv_p90,
+                'load_p10': stmt.excluded.load_p10,
+                'load_p90': stmt.excluded.load_p90,
+                'temp_c': stmt.excluded.temp_c
+            }
+        )
         with self.Session() as session:
-            for forecast in forecasts:
-                slot_start = forecast.get("slot_start")
-                if slot_start is None:
-                    continue
-
-                stmt = sqlite_insert(SlotForecast).values(
-                    slot_start=slot_start,
-                    pv_forecast_kwh=float(forecast.get("pv_forecast_kwh", 0.0) or 0.0),
-                    load_forecast_kwh=float(forecast.get("load_forecast_kwh", 0.0) or 0.0),
-                    pv_p10=forecast.get("pv_p10"),
-                    pv_p90=forecast.get("pv_p90"),
-                    load_p10=forecast.get("load_p10"),
-                    load_p90=forecast.get("load_p90"),
-                    temp_c=forecast.get("temp_c"),
-                    forecast_version=forecast_version
-                )
-                # Preserve corrections on conflict
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['slot_start', 'forecast_version'],
-                    set_={
-                        'pv_forecast_kwh': stmt.excluded.pv_forecast_kwh,
-                        'load_forecast_kwh': stmt.excluded.load_forecast_kwh,
-                        'pv_p10': stmt.excluded.pv_p10,
-                        'pv_p90': stmt.excluded.pv_p90,
-                        'load_p10': stmt.excluded.load_p10,
-                        'load_p90': stmt.excluded.load_p90,
-                        'temp_c': stmt.excluded.temp_c
-                    }
-                )
-                session.execute(stmt)
+            self._bulk_execute(session, stmt, params)
             session.commit()
 
     def store_plan(self, plan_df: pd.DataFrame) -> None:
@@ -193,44 +296,43 @@ class LearningStore:
         if plan_df.empty:
             return
 
+        records = plan_df.to_dict("records")
+        starts = self._iso_timestamps(row.get("start_time") or row.get("slot_start") for row in records)
+        params = [
+            {
+                "slot_start": slot_start,
+                "planned_charge_kwh": float(row.get("kepler_charge_kwh", 0.0) or 0.0),
+                "planned_discharge_kwh": float(row.get("kepler_discharge_kwh", 0.0) or 0.0),
+                "planned_soc_percent": float(
+                    row.get("soc_target_percent", row.get("kepler_soc_percent", 0.0)) or 0.0
+                ),
+                "planned_import_kwh": float(row.get("kepler_import_kwh", 0.0) or 0.0),
+                "planned_export_kwh": float(row.get("kepler_export_kwh", 0.0) or 0.0),
+                "planned_water_heating_kwh": float(row.get("water_heating_kw", 0.0) or 0.0) * 0.25,
+                "planned_cost_sek": float(row.get("planned_cost_sek", row.get("kepler_cost_sek", 0.0)) or 0.0),
+            }
+            for row, slot_start in zip(records, starts, strict=True)
+            if slot_start
+        ]
+        if not params:
+            return
+
+        stmt = sqlite_insert(SlotPlan)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['slot_start'],
+            set_={
+                'planned_charge_kwh': stmt.excluded.planned_charge_kwh,
+                'planned_discharge_kwh': stmt.excluded.planned_discharge_kwh,
+                'planned_soc_percent': stmt.excluded.planned_soc_percent,
+                'planned_import_kwh': stmt.excluded.planned_import_kwh,
+                'planned_export_kwh': stmt.excluded.planned_export_kwh,
+                'planned_water_heating_kwh': stmt.excluded.planned_water_heating_kwh,
+                'planned_cost_sek': stmt.excluded.planned_cost_sek,
+                'created_at': func.current_timestamp()
+            }
+        )
         with self.Session() as session:
-            records = plan_df.to_dict("records")
-            for row in records:
-                slot_start = row.get("start_time") or row.get("slot_start")
-                if not slot_start:
-                    continue
-
-                if isinstance(slot_start, (datetime, pd.Timestamp)):
-                    slot_start = slot_start.astimezone(self.timezone).isoformat()
-                else:
-                    slot_start = pd.to_datetime(slot_start).astimezone(self.timezone).isoformat()
-
-                stmt = sqlite_insert(SlotPlan).values(
-                    slot_start=slot_start,
-                    planned_charge_kwh=float(row.get("kepler_charge_kwh", 0.0) or 0.0),
-                    planned_discharge_kwh=float(row.get("kepler_discharge_kwh", 0.0) or 0.0),
-                    planned_soc_percent=float(
-                        row.get("soc_target_percent", row.get("kepler_soc_percent", 0.0)) or 0.0
-                    ),
-                    planned_import_kwh=float(row.get("kepler_import_kwh", 0.0) or 0.0),
-                    planned_export_kwh=float(row.get("kepler_export_kwh", 0.0) or 0.0),
-                    planned_water_heating_kwh=float(row.get("water_heating_kw", 0.0) or 0.0) * 0.25,
-                    planned_cost_sek=float(row.get("planned_cost_sek", row.get("kepler_cost_sek", 0.0)) or 0.0)
-                )
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['slot_start'],
-                    set_={
-                        'planned_charge_kwh': stmt.excluded.planned_charge_kwh,
-                        'planned_discharge_kwh': stmt.excluded.planned_discharge_kwh,
-                        'planned_soc_percent': stmt.excluded.planned_soc_percent,
-                        'planned_import_kwh': stmt.excluded.planned_import_kwh,
-                        'planned_export_kwh': stmt.excluded.planned_export_kwh,
-                        'planned_water_heating_kwh': stmt.excluded.planned_water_heating_kwh,
-                        'planned_cost_sek': stmt.excluded.planned_cost_sek,
-                        'created_at': func.current_timestamp()
-                    }
-                )
-                session.execute(stmt)
+            self._bulk_execute(session, stmt, params)
             session.commit()
 
     def store_training_episode(
@@ -276,22 +378,20 @@ class LearningStore:
         """
         Query slot_observations for low-SoC events during peak hours using SQLAlchemy.
         """
-        cutoff_date = (
-            (datetime.now(self.timezone) - timedelta(days=days_back)).date().isoformat()
-        )
+        cutoff = self.cutoff_epoch(days_back)
         start_hour, end_hour = peak_hours
 
         with self.Session() as session:
             stmt = select(
-                func.date(SlotObservation.slot_start),
+                SlotObservation.slot_date,
                 SlotObservation.slot_start,
                 SlotObservation.soc_end_percent
             ).where(
-                func.date(SlotObservation.slot_start) >= cutoff_date,
+                SlotObservation.slot_epoch >= cutoff,
                 SlotObservation.soc_end_percent.is_not(None),
                 SlotObservation.soc_end_percent < threshold_percent,
-                cast(func.strftime('%H', SlotObservation.slot_start), Integer) >= start_hour,
-                cast(func.strftime('%H', SlotObservation.slot_start), Integer) < end_hour
+                SlotObservation.slot_hour >= start_hour,
+                SlotObservation.slot_hour < end_hour
             ).order_by(SlotObservation.slot_start.desc())
 
             results = session.execute(stmt).all()
@@ -349,9 +449,7 @@ class LearningStore:
         """
         Compare forecast vs actual values for PV or load using SQLAlchemy.
         """
-        cutoff_date = (
-            (datetime.now(self.timezone) - timedelta(days=days_back)).date().isoformat()
-        )
+        cutoff = self.cutoff_epoch(days_back)
 
         if target == "pv":
             forecast_col = "f.pv_forecast_kwh"
@@ -374,7 +472,7 @@ class LearningStore:
                 {p90_col} as p90
             FROM slot_observations o
             JOIN slot_forecasts f ON o.slot_start = f.slot_start
-            WHERE DATE(o.slot_start) >= :cutoff
+            WHERE o.slot_epoch >= :cutoff
               AND {actual_col} IS NOT NULL
               AND {forecast_col} IS NOT NULL
             ORDER BY o.slot_start ASC
@@ -382,16 +480,14 @@ class LearningStore:
 
         # Using engine.connect() for pd.read_sql
         with self.engine.connect() as conn:
-            df = pd.read_sql(text(query), conn, params={"cutoff": cutoff_date})
+            df = pd.read_sql(text(query), conn, params={"cutoff": cutoff})
             return df
 
     def get_arbitrage_stats(self, days_back: int = 30) -> dict[str, Any]:
         """
         Calculate arbitrage statistics for ROI analysis using SQLAlchemy.
         """
-        cutoff_date = (
-            (datetime.now(self.timezone) - timedelta(days=days_back)).date().isoformat()
-        )
+        cutoff = self.cutoff_epoch(days_back)
 
         with self.Session() as session:
             stmt = select(
@@ -400,7 +496,7 @@ class LearningStore:
                 func.sum(SlotObservation.batt_charge_kwh),
                 func.sum(SlotObservation.batt_discharge_kwh)
             ).where(
-                func.date(SlotObservation.slot_start) >= cutoff_date,
+                SlotObservation.slot_epoch >= cutoff,
                 SlotObservation.export_price_sek_kwh.is_not(None),
                 SlotObservation.import_price_sek_kwh.is_not(None)
             )
@@ -424,9 +520,7 @@ class LearningStore:
         """
         Estimate effective battery capacity from discharge observations using SQLAlchemy.
         """
-        cutoff_date = (
-            (datetime.now(self.timezone) - timedelta(days=days_back)).date().isoformat()
-        )
+        cutoff = self.cutoff_epoch(days_back)
 
         with self.Session() as session:
             stmt = select(
@@ -434,7 +528,7 @@ class LearningStore:
                 SlotObservation.soc_end_percent,
                 SlotObservation.batt_discharge_kwh
             ).where(
-                func.date(SlotObservation.slot_start) >= cutoff_date,
+                SlotObservation.slot_epoch >= cutoff,
                 SlotObservation.soc_start_percent.is_not(None),
                 SlotObservation.soc_end_percent.is_not(None),
                 SlotObservation.batt_discharge_kwh.is_not(None),
@@ -466,14 +560,14 @@ class LearningStore:
 
     def calculate_metrics(self, days_back: int = 7) -> dict[str, Any]:
         """Calculate learning metrics using SQLAlchemy."""
-        cutoff_date = (datetime.now(self.timezone) - timedelta(days=days_back)).date().isoformat()
+        cutoff = self.cutoff_epoch(days_back)
         metrics = {}
 
         with self.Session() as session:
             # 1. Forecast Accuracy
             stmt_pv = select(func.avg(func.abs(SlotObservation.pv_kwh - SlotForecast.pv_forecast_kwh))).join(
                 SlotForecast, SlotObservation.slot_start == SlotForecast.slot_start
-            ).where(func.date(SlotObservation.slot_start) >= cutoff_date)
+            ).where(SlotObservation.slot_epoch >= cutoff)
 
             pv_res = session.execute(stmt_pv).scalar()
             if pv_res:
@@ -486,7 +580,7 @@ class LearningStore:
                 func.avg(func.abs(SlotObservation.soc_end_percent - SlotPlan.planned_soc_percent))
             ).join(
                 SlotPlan, SlotObservation.slot_start == SlotPlan.slot_start
-            ).where(func.date(SlotObservation.slot_start) >= cutoff_date)
+            ).where(SlotObservation.slot_epoch >= cutoff)
 
             plan_res = session.execute(stmt_plan).fetchone()
             if plan_res:
@@ -502,7 +596,7 @@ class LearningStore:
             ).join(
                 SlotPlan, SlotObservation.slot_start == SlotPlan.slot_start
             ).where(
-                func.date(SlotObservation.slot_start) >= cutoff_date,
+                SlotObservation.slot_epoch >= cutoff,
                 SlotObservation.import_price_sek_kwh.is_not(None)
             )
 
@@ -516,7 +610,7 @@ class LearningStore:
 
     def get_performance_series(self, days_back: int = 7) -> dict[str, list[dict]]:
         """Get performance time-series data using SQLAlchemy."""
-        cutoff_date = (datetime.now(self.timezone) - timedelta(days=days_back)).date().isoformat()
+        cutoff = self.cutoff_epoch(days_back)
 
         with self.Session() as session:
             # 1. SoC Series
@@ -526,21 +620,21 @@ class LearningStore:
                 SlotObservation.soc_end_percent
             ).outerjoin(
                 SlotPlan, SlotObservation.slot_start == SlotPlan.slot_start
-            ).where(func.date(SlotObservation.slot_start) >= cutoff_date).order_by(SlotObservation.slot_start.asc())
+            ).where(SlotObservation.slot_epoch >= cutoff).order_by(SlotObservation.slot_start.asc())
 
             soc_results = session.execute(stmt_soc).all()
             soc_series = [{"time": r[0], "planned": r[1], "actual": r[2]} for r in soc_results]
 
             # 2. Daily Cost Series
             stmt_cost_daily = select(
-                func.date(SlotObservation.slot_start).label("day"),
+                SlotObservation.slot_date.label("day"),
                 func.sum(SlotPlan.planned_cost_sek),
                 func.sum(SlotObservation.import_kwh * SlotObservation.import_price_sek_kwh -
                          SlotObservation.export_kwh * SlotObservation.export_price_sek_kwh)
             ).outerjoin(
                 SlotPlan, SlotObservation.slot_start == SlotPlan.slot_start
             ).where(
-                func.date(SlotObservation.slot_start) >= cutoff_date,
+                SlotObservation.slot_epoch >= cutoff,
                 SlotObservation.import_price_sek_kwh.is_not(None)
             ).group_by("day").order_by("day")
 
@@ -126,6 +126,14 @@ async def lifespan(app: FastAPI):
 
     start_ha_socket_client()
 
+    # Stream-integrated slot observations (learning.recorder_mode: stream)
+    from backend.stream_recorder import start_stream_recorder, stop_stream_recorder
+
+    try:
+        start_stream_recorder()
+    except Exception as e:
+        logger.error("Failed to start stream recorder: %s", e, exc_info=True)
+
     yield  # Server is running
 
     # Shutdown
@@ -139,6 +147,8 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error("Failed to stop executor: %s", e, exc_info=True)
 
+    stop_stream_recorder()
+
     await scheduler_service.stop()
 
 
@@ -11,6 +11,7 @@ from backend.learning.backfill import BackfillEngine
 
 # Local imports
 from backend.learning.store import LearningStore
+from backend.stream_recorder import recorder_mode
 from inputs import get_home_assistant_sensor_float
 
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
@@ -163,11 +164,17 @@ def main() -> int:
     # Track last analyst run date to run once daily at ~6 AM local
     last_analyst_date = datetime.now(tz).date()
 
+    # In stream mode the API process integrates observations from the HA WebSocket
+    polling = recorder_mode(config) != "stream"
+    if not polling:
+        print("[recorder] recorder_mode=stream: observations come from the HA WebSocket")
+
     while True:
-        try:
-            record_observation_from_current_state()
-        except Exception as exc:  # pragma: no cover - defensive logging
-            print(f"[recorder] Error while recording observation: {exc}")
+        if polling:
+            try:
+                record_observation_from_current_state()
+            except Exception as exc:  # pragma: no cover - defensive logging
+                print(f"[recorder] Error while recording observation: {exc}")
 
         # Run Analyst once per day around 6 AM local time
         now_local = datetime.now(tz)
@@ -9,9 +9,9 @@ import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
 
 from backend.core.cache import cache
+from backend.core.schedule_store import get_schedule_repository
 from backend.core.websockets import ws_manager
 
 logger = logging.getLogger("darkstar.services.planner")
@@ -109,12 +109,8 @@ class PlannerService:
 
     def _count_schedule_slots(self) -> int:
         """Count slots in schedule.json for metadata."""
-        import json
-
         try:
-            with Path("schedule.json").open() as f:
-                data = json.load(f)
-                return len(data.get("schedule", []))
+            return len(get_schedule_repository("schedule.json").get().slots)
         except Exception:
             return 0
 
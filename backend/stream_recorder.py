@@ -0,0 +1,389 @@
+"""
+Stream Recorder
+
+Slot energy recorder fed by the HA WebSocket stream, an alternative to the
+15-minute polling recorder (backend/recorder.py), which multiplies one
+instantaneous kW reading by 0.25 h. Every power update the HAWebSocketClient
+receives is integrated with the trapezoidal rule into its 15-minute slot:
+- a segment that crosses a slot boundary is split at the boundary, using
+  the linearly interpolated power there
+- signed channels (net grid, battery) are split at the zero crossing into
+  import/export and discharge/charge energy
+
+Once a slot has ended (plus a short grace period for in-flight events),
+each channel's last value is held up to the boundary. The closed slots are
+then written with one batched LearningStore.store_slot_observations call.
+The slot the recorder started in is dropped, since it was only partly
+observed.
+
+Enabled with learning.recorder_mode: stream. The standalone recorder
+process then stops polling and only runs backfill and the Analyst.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+import pytz
+
+from backend.core.entity_cache import entity_state_cache
+from backend.learning.store import LearningStore
+from inputs import load_yaml
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger("darkstar.stream_recorder")
+
+SLOT_S = 900
+# How long after a slot ends we wait for late events before closing it
+FLUSH_GRACE_S = 30.0
+
+ENERGY_KEYS = (
+    "pv_kwh",
+    "load_kwh",
+    "import_kwh",
+    "export_kwh",
+    "water_kwh",
+    "batt_charge_kwh",
+    "batt_discharge_kwh",
+)
+
+# channel -> (key for positive power, key for negative power or None to drop it)
+CHANNEL_KEYS: dict[str, tuple[str, str | None]] = {
+    "pv": ("pv_kwh", None),
+    "load": ("load_kwh", None),
+    "grid_import": ("import_kwh", None),
+    "grid_export": ("export_kwh", None),
+    # Net meter: positive = import, negative = export
+    "grid_net": ("import_kwh", "export_kwh"),
+    # Standard inverter convention: positive = discharge, negative = charge
+    "battery": ("batt_discharge_kwh", "batt_charge_kwh"),
+    "water": ("water_kwh", None),
+}
+
+_UNAVAILABLE = frozenset({"unknown", "unavailable", "none", "null", ""})
+
+
+def _slot_of(t: float) -> int:
+    return int(t // SLOT_S) * SLOT_S
+
+
+def _trapezoid_split(p0: float, p1: float, dt: float) -> tuple[float, float]:
+    """Positive and negative area (kW*s, both >= 0) of a linear segment."""
+    if p0 >= 0.0 and p1 >= 0.0:
+        return (p0 + p1) / 2.0 * dt, 0.0
+    if p0 <= 0.0 and p1 <= 0.0:
+        return 0.0, -(p0 + p1) / 2.0 * dt
+    # Sign change: split at the zero crossing
+    t_zero = dt * p0 / (p0 - p1)
+    first = p0 * t_zero / 2.0
+    second = p1 * (dt - t_zero) / 2.0
+    return (first, -second) if p0 > 0.0 else (second, -first)
+
+
+def _float_state(state: dict[str, Any] | None) -> float | None:
+    """Numeric state value, or None for unavailable/non-numeric/non-finite states."""
+    if not state:
+        return None
+    raw = state.get("state")
+    if raw is None or str(raw).lower() in _UNAVAILABLE:
+        return None
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _power_kw(state: dict[str, Any] | None) -> float | None:
+    """Parse a power sensor state to kW (W unless the unit says kW)."""
+    value = _float_state(state)
+    if value is None or state is None:
+        return None
+    unit = str((state.get("attributes") or {}).get("unit_of_measurement", "")).upper()
+    return value if unit == "KW" else value / 1000.0
+
+
+class SlotEnergyIntegrator:
+    """Trapezoidal per-slot energy totals from timestamped power samples."""
+
+    def __init__(self) -> None:
+        self._last: dict[str, tuple[float, float]] = {}
+        self._slots: dict[int, dict[str, Any]] = {}
+        self._soc_last: float | None = None
+        self._soc_carry: float | None = None
+        self._since: float | None = None
+
+    def _slot(self, slot: int) -> dict[str, Any]:
+        totals = self._slots.get(slot)
+        if totals is None:
+            totals = dict.fromkeys(ENERGY_KEYS, 0.0)
+            totals["samples"] = 0
+            self._slots[slot] = totals
+        return totals
+
+    def _integrate(self, channel: str, t0: float, p0: float, t1: float, p1: float) -> None:
+        pos_key, neg_key = CHANNEL_KEYS[channel]
+        start, end_t = t0, t1
+        while start < end_t:
+            slot = _slot_of(start)
+            stop = min(end_t, slot + SLOT_S)
+            p_start = p0 + (p1 - p0) * (start - t0) / (t1 - t0)
+            p_stop = p1 if stop == end_t else p0 + (p1 - p0) * (stop - t0) / (t1 - t0)
+            pos, neg = _trapezoid_split(p_start, p_stop, stop - start)
+            totals = self._slot(slot)
+            totals[pos_key] += pos / 3600.0
+            if neg_key is not None:
+                totals[neg_key] += neg / 3600.0
+            start = stop
+
+    def observe(self, channel: str, t: float, kw: float) -> None:
+        """Add a power sample (kW) for a channel at epoch time t."""
+        if self._since is None:
+            self._since = t
+        last = self._last.get(channel)
+        if last is not None:
+            if t < last[0]:
+                return  # Out of order; the held value already covers it
+            if t > last[0]:
+                self._integrate(channel, last[0], last[1], t, kw)
+        self._last[channel] = (t, kw)
+        self._slot(_slot_of(t))["samples"] += 1
+
+    def observe_soc(self, t: float, percent: float) -> None:
+        """Track battery SoC so each slot gets its start and end percentage."""
+        totals = self._slot(_slot_of(t))
+        totals.setdefault("soc_start_percent", self._soc_last)
+        totals["soc_end_percent"] = percent
+        self._soc_last = percent
+
+    def close_slots(self, now: float) -> list[dict[str, Any]]:
+        """
+        Finish every slot that ended at or before `now` and return one row per
+        slot, oldest first. Channels are held at their last value up to the
+        boundary. Slots that started before the first sample are dropped.
+        """
+        current = _slot_of(now)
+        for channel, (t, kw) in list(self._last.items()):
+            if t < current:
+                self._integrate(channel, t, kw, current, kw)
+                self._last[channel] = (current, kw)
+
+        rows: list[dict[str, Any]] = []
+        for slot in sorted(s for s in self._slots if s < current):
+            totals = self._slots.pop(slot)
+            soc_start = totals.get("soc_start_percent")
+            if soc_start is None:
+                soc_start = self._soc_carry
+            soc_end = totals.get("soc_end_percent", self._soc_carry)
+            self._soc_carry = soc_end
+            if self._since is None or slot < self._since:
+                continue  # Only partly observed
+            rows.append(
+                {
+                    "slot_start": datetime.fromtimestamp(slot, UTC),
+                    "slot_end": datetime.fromtimestamp(slot + SLOT_S, UTC),
+                    **{key: totals[key] for key in ENERGY_KEYS},
+                    "soc_start_percent": soc_start,
+                    "soc_end_percent": soc_end,
+                    "quality_flags": json.dumps(
+                        {"source": "ha_stream", "samples": totals["samples"]}
+                    ),
+                }
+            )
+        return rows
+
+    def pending_slots(self) -> int:
+        return len(self._slots)
+
+
+def _channel_map(config: dict[str, Any]) -> dict[str, str]:
+    """entity_id -> channel, from the same input_sensors the polling recorder reads."""
+    sensors = config.get("input_sensors", {}) or {}
+    meter_type = (config.get("system", {}) or {}).get("grid_meter_type", "net")
+    keys = {
+        "pv_power": "pv",
+        "load_power": "load",
+        "battery_power": "battery",
+        "water_power": "water",
+    }
+    if meter_type == "dual":
+        keys["grid_import_power"] = "grid_import"
+        keys["grid_export_power"] = "grid_export"
+    else:
+        keys["grid_power"] = "grid_net"
+    return {sensors[key]: channel for key, channel in keys.items() if sensors.get(key)}
+
+
+class StreamRecorder:
+    """Feeds WebSocket states into a SlotEnergyIntegrator and flushes closed slots."""
+
+    def __init__(
+        self,
+        config: dict[str, Any],
+        store: LearningStore | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.channels = _channel_map(config)
+        self.soc_entity = (config.get("input_sensors", {}) or {}).get("battery_soc")
+        if store is None:
+            db_path = config.get("learning", {}).get("sqlite_path", "data/planner_learning.db")
+            tz = pytz.timezone(config.get("timezone", "Europe/Stockholm"))
+            store = LearningStore(db_path, tz)
+        self.store = store
+        self.integrator = SlotEnergyIntegrator()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: list[dict[str, Any]] = []
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stats: dict[str, Any] = {
+            "samples": 0,
+            "rows_written": 0,
+            "flushes": 0,
+            "write_errors": 0,
+            "last_flush_at": None,
+        }
+
+    def entities(self) -> list[str]:
+        return [*self.channels, *([self.soc_entity] if self.soc_entity else [])]
+
+    def on_state(self, entity_id: str, state: dict[str, Any] | None) -> None:
+        """HAWebSocketClient state listener (runs on the WebSocket thread)."""
+        channel = self.channels.get(entity_id)
+        if channel is not None:
+            value = _power_kw(state)
+        elif entity_id == self.soc_entity:
+            value = _float_state(state)  # Percentage, not a power reading
+        else:
+            return
+        if value is None:
+            return
+        now = self._clock()
+        with self._lock:
+            if channel is None:
+                self.integrator.observe_soc(now, value)
+            else:
+                self.integrator.observe(channel, now, value)
+            self.stats["samples"] += 1
+
+    def flush(self, now: float | None = None) -> int:
+        """Write every closed slot in one batch; returns the number of rows written."""
+        now = self._clock() if now is None else now
+        with self._lock:
+            self._pending.extend(self.integrator.close_slots(now - FLUSH_GRACE_S))
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+
+        try:
+            self.store.store_slot_observations(pd.DataFrame(rows))
+        except Exception as e:
+            logger.error("Failed to store %d slot observation(s), will retry: %s", len(rows), e)
+            with self._lock:
+                self._pending = rows + self._pending
+                self.stats["write_errors"] += 1
+            return 0
+
+        with self._lock:
+            self.stats["rows_written"] += len(rows)
+            self.stats["flushes"] += 1
+            self.stats["last_flush_at"] = datetime.now(UTC).isoformat()
+        last = rows[-1]
+        logger.info(
+            "Recorded %d slot(s) up to %s: PV=%.3fkWh Load=%.3fkWh Import=%.3fkWh SoC=%s%%",
+            len(rows),
+            last["slot_start"].isoformat(),
+            last["pv_kwh"],
+            last["load_kwh"],
+            last["import_kwh"],
+            last["soc_end_percent"],
+        )
+        return len(rows)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            now = self._clock()
+            wake = _slot_of(now - FLUSH_GRACE_S) + SLOT_S + FLUSH_GRACE_S
+            if self._stop_event.wait(max(1.0, wake - now)):
+                break
+            try:
+                self.flush()
+            except Exception as e:  # pragma: no cover - defensive logging
+                logger.error("Stream recorder flush failed: %s", e, exc_info=True)
+
+    def start(self) -> None:
+        # Make sure the WebSocket subscribes to every entity we integrate
+        entity_state_cache.track(self.entities())
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Stream-Recorder")
+        self._thread.start()
+        logger.info("Stream recorder started for %d entities", len(self.entities()))
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "entities": self.entities(),
+                "open_slots": self.integrator.pending_slots(),
+                "pending_rows": len(self._pending),
+            }
+
+
+def recorder_mode(config: dict[str, Any]) -> str:
+    """learning.recorder_mode: "poll" (default) or "stream"."""
+    return str((config.get("learning", {}) or {}).get("recorder_mode", "poll")).lower()
+
+
+# Global instance (runs in the API process next to the WebSocket client)
+_stream_recorder: StreamRecorder | None = None
+
+
+def start_stream_recorder() -> StreamRecorder | None:
+    """Start the stream recorder if enabled in config.yaml and the WebSocket is up."""
+    global _stream_recorder
+    from backend.ha_socket import add_state_listener
+
+    config = load_yaml("config.yaml")
+    if recorder_mode(config) != "stream" or _stream_recorder is not None:
+        return _stream_recorder
+
+    recorder = StreamRecorder(config)
+    if not recorder.entities():
+        logger.warning("Stream recorder enabled but no power sensors configured")
+        return None
+    if not add_state_listener(recorder.on_state):
+        logger.warning("Stream recorder not started: HA WebSocket client is not running")
+        return None
+    recorder.start()
+    _stream_recorder = recorder
+    return recorder
+
+
+def stop_stream_recorder() -> None:
+    """Stop the recorder thread and write any slots that closed before shutdown."""
+    if _stream_recorder is not None:
+        _stream_recorder.stop()
+        try:
+            _stream_recorder.flush()
+        except Exception as e:
+            logger.error("Stream recorder final flush failed: %s", e, exc_info=True)
+
+
+def get_stream_recorder_status() -> dict[str, Any]:
+    if _stream_recorder is None:
+        return {"status": "not_started"}
+    return {"status": "running", **_stream_recorder.status()}
@@ -5,6 +5,7 @@ import copy
 import math
 import sqlite3
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -55,30 +56,26 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--step-minutes", type=int, default=15, help="Simulation increment in minutes."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Replay days in parallel worker processes. Each day then starts from the "
+            "recorded SoC instead of the previous day's simulated SoC (default: 1)."
+        ),
+    )
     return parser
 
 
-def main() -> int:
-    parser = _build_arg_parser()
-    args = parser.parse_args()
-
-    try:
-        with Path("config.yaml").open(encoding="utf-8") as fp:
-            base_config = yaml.safe_load(fp) or {}
-    except FileNotFoundError:
-        print("config.yaml not found. Please run from project root.")
-        return 1
-
-    timezone_name = base_config.get("timezone", "Europe/Stockholm")
-    start_time = _localize_datetime(args.start_date, timezone_name)
-    end_time = _localize_datetime(args.end_date, timezone_name)
-
-    if end_time <= start_time:
-        print("Error: end-date must be later than start-date.")
-        return 1
-
-    sim_config = _build_sim_config(base_config)
-    temp_config_path = _write_temp_config(sim_config)
+def _run_window(
+    temp_config_path: str,
+    sim_config: dict,
+    start_time: datetime,
+    end_time: datetime,
+    step_minutes: int,
+) -> None:
+    """Replay one contiguous window, carrying the projected SoC from step to step."""
     previous_engine = None
 
     try:
@@ -113,7 +110,7 @@ def main() -> int:
         initial_state = loader.get_initial_state_from_history(start_time)
 
         current = start_time
-        step = timedelta(minutes=args.step_minutes)
+        step = timedelta(minutes=step_minutes)
 
         while current < end_time:
             input_data = loader.get_window_inputs(current)
@@ -252,6 +249,85 @@ def main() -> int:
 
     finally:
         learning._learning_engine = previous_engine
+
+
+def _run_day_windows(
+    temp_config_path: str,
+    sim_config: dict,
+    start_time: datetime,
+    end_time: datetime,
+    step_minutes: int,
+    workers: int,
+    timezone_name: str,
+) -> None:
+    """
+    Replay day-sized windows in parallel worker processes.
+
+    Each day starts from the recorded SoC at midnight instead of the SoC
+    carried over from the previous simulated day, which is what makes the
+    days independent.
+    """
+    windows = []
+    window_start = start_time
+    while window_start < end_time:
+        next_midnight = _localize_datetime(
+            datetime.combine(window_start.date() + timedelta(days=1), datetime.min.time()),
+            timezone_name,
+        )
+        window_end = min(end_time, next_midnight)
+        windows.append((window_start, window_end))
+        window_start = window_end
+
+    print(f"[simulation] Replaying {len(windows)} day windows on {workers} workers.")
+    with ProcessPoolExecutor(max_workers=min(workers, len(windows))) as pool:
+        futures = {
+            pool.submit(
+                _run_window, temp_config_path, sim_config, w_start, w_end, step_minutes
+            ): w_start
+            for w_start, w_end in windows
+        }
+        for future in as_completed(futures):
+            future.result()
+            print(f"[simulation] Finished window {futures[future].date().isoformat()}.")
+
+
+def main() -> int:
+    parser = _build_arg_parser()
+    args = parser.parse_args()
+
+    try:
+        with Path("config.yaml").open(encoding="utf-8") as fp:
+            base_config = yaml.safe_load(fp) or {}
+    except FileNotFoundError:
+        print("config.yaml not found. Please run from project root.")
+        return 1
+
+    timezone_name = base_config.get("timezone", "Europe/Stockholm")
+    start_time = _localize_datetime(args.start_date, timezone_name)
+    end_time = _localize_datetime(args.end_date, timezone_name)
+
+    if end_time <= start_time:
+        print("Error: end-date must be later than start-date.")
+        return 1
+
+    sim_config = _build_sim_config(base_config)
+    temp_config_path = _write_temp_config(sim_config)
+
+    try:
+        if args.workers > 1:
+            _run_day_windows(
+                temp_config_path,
+                sim_config,
+                start_time,
+                end_time,
+                args.step_minutes,
+                args.workers,
+                timezone_name,
+            )
+        else:
+            _run_window(temp_config_path, sim_config, start_time, end_time, args.step_minutes)
+
+    finally:
         if Path(temp_config_path).exists():
             Path(temp_config_path).unlink()
 
@@ -4,22 +4,35 @@ Action Dispatcher
 Executes actions by calling Home Assistant services.
 Handles idempotent execution (skip if already set) and
 notification dispatch per action type.
+
+The executor tick uses the concurrent path: one state snapshot, no-op writes
+dropped, independent service calls sent in parallel over a pooled
+httpx.AsyncClient. The sync HAClient remains for single actions (water
+boost, notifications) and for dispatchers built without an async client.
 """
 
+import asyncio
+import bisect
 import logging
+import threading
 import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, TypeGuard
 
+import httpx
 import requests
 
+from backend.core.entity_cache import entity_state_cache
+
 from .config import ExecutorConfig
 from .controller import ControllerDecision
 
 logger = logging.getLogger(__name__)
 
 
-def _is_entity_configured(entity: str | None) -> bool:
+def _is_entity_configured(entity: str | None) -> TypeGuard[str]:
     """Check if an entity ID is properly configured.
 
     Returns False if entity is:
@@ -34,6 +47,14 @@ def _is_entity_configured(entity: str | None) -> bool:
     return stripped != "" and stripped.lower() != "none"
 
 
+def _float_or_none(value: str | None) -> float | None:
+    """Parse a numeric HA state; None for missing or non-numeric states."""
+    try:
+        return float(value) if value else None
+    except (ValueError, TypeError):
+        return None
+
+
 @dataclass
 class ActionResult:
     """Result of executing an action."""
@@ -201,6 +222,266 @@ class HAClient:
         return self.call_service(domain, svc_name, data=payload)
 
 
+# Upper bounds (ms) of the per-entity latency histogram buckets
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Failures worth retrying: the request never reached HA, or HA was briefly unavailable
+_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+_RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (counts per upper bound in ms)."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [str(b) for b in LATENCY_BUCKETS_MS] + ["+Inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+            "count": self.total,
+            "avg_ms": round(self.sum_ms / self.total, 1) if self.total else 0.0,
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class DispatchStats:
+    """Per-entity service-call counters and latency histograms (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entities: dict[str, dict[str, Any]] = {}
+        self.snapshots = 0
+        self.snapshot_cache_hits = 0
+        self.snapshot_fetches = 0
+        self.snapshot_latency = LatencyHistogram()
+
+    def _entity(self, entity_id: str) -> dict[str, Any]:
+        entry = self._entities.get(entity_id)
+        if entry is None:
+            entry = {
+                "calls": 0,
+                "failures": 0,
+                "retries": 0,
+                "noop_skips": 0,
+                "latency": LatencyHistogram(),
+            }
+            self._entities[entity_id] = entry
+        return entry
+
+    def record_call(self, entity_id: str, ms: float, attempts: int, success: bool) -> None:
+        with self._lock:
+            entry = self._entity(entity_id)
+            entry["calls"] += 1
+            entry["retries"] += attempts - 1
+            if not success:
+                entry["failures"] += 1
+            entry["latency"].observe(ms)
+
+    def record_skip(self, entity_id: str) -> None:
+        with self._lock:
+            self._entity(entity_id)["noop_skips"] += 1
+
+    def record_snapshot(self, ms: float, cache_hits: int, fetched: int) -> None:
+        with self._lock:
+            self.snapshots += 1
+            self.snapshot_cache_hits += cache_hits
+            self.snapshot_fetches += fetched
+            self.snapshot_latency.observe(ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "snapshots": self.snapshots,
+                "snapshot_cache_hits": self.snapshot_cache_hits,
+                "snapshot_fetches": self.snapshot_fetches,
+                "snapshot_latency_ms": self.snapshot_latency.as_dict(),
+                "entities": {
+                    entity_id: {
+                        **{k: v for k, v in entry.items() if k != "latency"},
+                        "latency_ms": entry["latency"].as_dict(),
+                    }
+                    for entity_id, entry in sorted(self._entities.items())
+                },
+            }
+
+
+class AsyncHAClient:
+    """
+    Pooled async Home Assistant REST client used by ActionDispatcher.execute.
+
+    Keeps one httpx.AsyncClient (keep-alive connection pool) per event loop and
+    bounds the number of requests in flight, so a slow HA is not flooded.
+    Service calls are retried only when the request never reached HA or HA
+    answered 502/503/504; a timeout is not retried since the call may have
+    been applied.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        timeout: float = 10.0,
+        max_concurrency: int = 4,
+        retries: int = 1,
+        retry_backoff_s: float = 0.25,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.retry_backoff_s = retry_backoff_s
+        self._transport = transport
+        self.stats = DispatchStats()
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_client(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """Return the pool for the running loop (both are bound to the loop that made them)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._semaphore is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.token}",
+                    "Content-Type": "application/json",
+                },
+                timeout=self.timeout,
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    async def get_state_value(self, entity_id: str) -> str | None:
+        """Get just the state value of an entity (None on any error)."""
+        client, semaphore = self._ensure_client()
+        try:
+            async with semaphore:
+                response = await client.get(f"/api/states/{entity_id}")
+            response.raise_for_status()
+            return response.json().get("state")
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error("Failed to get state of %s: %s", entity_id, e)
+            return None
+
+    async def get_state_values(self, entity_ids: list[str]) -> dict[str, str | None]:
+        """Fetch several entity states concurrently."""
+        values = await asyncio.gather(*(self.get_state_value(e) for e in entity_ids))
+        return dict(zip(entity_ids, values, strict=True))
+
+    async def call_service(
+        self,
+        domain: str,
+        service: str,
+        entity_id: str | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> bool:
+        """Call a Home Assistant service, retrying transient failures."""
+        client, semaphore = self._ensure_client()
+        payload = dict(data or {})
+        if entity_id:
+            payload["entity_id"] = entity_id
+
+        start = time.perf_counter()
+        attempts = 0
+        success = False
+        while True:
+            attempts += 1
+            retry = attempts <= self.retries
+            try:
+                async with semaphore:
+                    response = await client.post(f"/api/services/{domain}/{service}", json=payload)
+                if response.status_code in _RETRYABLE_STATUS and retry:
+                    await asyncio.sleep(self.retry_backoff_s * attempts)
+                    continue
+                response.raise_for_status()
+                success = True
+            except _RETRYABLE_ERRORS as e:
+                if retry:
+                    await asyncio.sleep(self.retry_backoff_s * attempts)
+                    continue
+                logger.error(
+                    "Failed to call service %s.%s on %s: %s", domain, service, entity_id, e
+                )
+            except httpx.HTTPError as e:
+                logger.error(
+                    "Failed to call service %s.%s on %s: %s", domain, service, entity_id, e
+                )
+            break
+
+        self.stats.record_call(
+            entity_id or f"{domain}.{service}",
+            (time.perf_counter() - start) * 1000.0,
+            attempts,
+            success,
+        )
+        return success
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+
+@dataclass
+class _PendingWrite:
+    """A service call an action decided to make, plus how to report its outcome."""
+
+    action_type: str
+    domain: str
+    service: str
+    entity_id: str
+    data: dict[str, Any]
+    finish: Callable[[bool], ActionResult]
+
+
+# Inverter writes that must follow a work mode change (the mode resets limits on some models)
+_AFTER_WORK_MODE = frozenset(
+    {"grid_charging", "charge_limit", "discharge_limit", "max_export_power"}
+)
+
+StateReader = Callable[[str], str | None]
+
+
+def _unknown_state(entity_id: str) -> str | None:
+    return None
+
+
+def _outside_running_loop[T](func: Callable[..., T], *args: Any) -> T:
+    """
+    Call func, from a worker thread if this thread is running an event loop.
+
+    The dispatcher drives its own loop with run_until_complete(), which cannot
+    nest inside a running loop (e.g. pause() or shutdown from an API handler).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return func(*args)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="executor-dispatch") as pool:
+        return pool.submit(func, *args).result()
+
+
 class ActionDispatcher:
     """
     Dispatches actions to Home Assistant based on controller decisions.
@@ -209,6 +490,16 @@ class ActionDispatcher:
     - Idempotent execution (skip if already at target)
     - Configurable notifications per action type
     - Action result tracking
+
+    With an AsyncHAClient, execute() reads every entity it needs in one
+    batch (WebSocket cache first, concurrent REST for the rest), drops no-op
+    writes against that snapshot and sends the remaining service calls
+    concurrently. Only the inverter ordering is kept: work mode is applied
+    before grid charging and the charge/discharge/export limits, and when the
+    mode changes those writes are always sent. The async work runs on an
+    event loop owned by the dispatcher, so the connection pool survives
+    across ticks (callers already on an event loop have it driven from a
+    worker thread).
     """
 
     def __init__(
@@ -216,10 +507,14 @@ class ActionDispatcher:
         ha_client: HAClient,
         config: ExecutorConfig,
         shadow_mode: bool = False,
+        async_client: AsyncHAClient | None = None,
     ):
         self.ha = ha_client
         self.config = config
         self.shadow_mode = shadow_mode
+        self.async_ha = async_client
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_lock = threading.Lock()
 
     def execute(self, decision: ControllerDecision) -> list[ActionResult]:
         """
@@ -231,47 +526,233 @@ class ActionDispatcher:
         Returns:
             List of ActionResult for each action attempted
         """
-        results: list[ActionResult] = []
+        if self.async_ha is None:
+            return [self._apply(step) for step in self._plan(decision, self.ha.get_state_value)]
+
+        return _outside_running_loop(self._execute_async, decision)
+
+    def _execute_async(self, decision: ControllerDecision) -> list[ActionResult]:
+        """Snapshot read + concurrent writes on the dispatcher's own loop."""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+            snapshot = self._loop.run_until_complete(
+                self._read_snapshot(self._snapshot_entities(decision))
+            )
+            # A mode change resets limits on some inverters, so the pre-write
+            # snapshot cannot prove the writes that follow it are no-ops
+            steps = list(self._plan(decision, snapshot.get, after_mode_read=_unknown_state))
+            writes = [s for s in steps if isinstance(s, _PendingWrite)]
+            outcomes = self._loop.run_until_complete(self._send_writes(writes))
+
+        # Notifications are blocking calls, so results are finished off the loop
+        done = dict(zip(map(id, writes), outcomes, strict=True))
+        return [
+            step if isinstance(step, ActionResult) else step.finish(done[id(step)])
+            for step in steps
+        ]
+
+    def _plan(
+        self,
+        decision: ControllerDecision,
+        read: StateReader,
+        after_mode_read: StateReader | None = None,
+    ) -> Iterator[ActionResult | _PendingWrite]:
+        """
+        Decide each action in execution order, reading current states via `read`.
+
+        If the work mode is about to change, the inverter writes that follow it
+        read their current state via `after_mode_read` instead (when given).
+        """
+        inverter_read = read
 
         # 1. Set work mode (Rev O1)
         if self.config.has_battery:
-            result = self._set_work_mode(decision.work_mode)
-            results.append(result)
+            step = self._plan_work_mode(decision.work_mode, read)
+            if isinstance(step, _PendingWrite) and after_mode_read is not None:
+                inverter_read = after_mode_read
+            yield step
 
         # 2. Set grid charging (Rev O1)
         if self.config.has_battery:
-            result = self._set_grid_charging(decision.grid_charging)
-            results.append(result)
+            yield self._plan_grid_charging(decision.grid_charging, inverter_read)
 
         # 3. Set charge limit (Rev O1 + E3)
         if self.config.has_battery and decision.write_charge_current:
-            result = self._set_charge_limit(decision.charge_value, decision.control_unit)
-            results.append(result)
+            yield self._plan_charge_limit(
+                decision.charge_value, decision.control_unit, inverter_read
+            )
 
         # 4. Set discharge limit (Rev O1 + E3)
         if self.config.has_battery and decision.write_discharge_current:
-            result = self._set_discharge_limit(decision.discharge_value, decision.control_unit)
-            results.append(result)
+            yield self._plan_discharge_limit(
+                decision.discharge_value, decision.control_unit, inverter_read
+            )
 
         # 5. Set SoC target (Rev O1)
         if self.config.has_battery:
-            result = self._set_soc_target(decision.soc_target)
-            results.append(result)
+            yield self._plan_soc_target(decision.soc_target, read)
 
         # 6. Set water heater target (Rev O1)
         if self.config.has_water_heater:
-            result = self.set_water_temp(decision.water_temp)
-            results.append(result)
+            yield self._plan_water_temp(decision.water_temp, read)
 
         # 7. Set max export power (Bug fix #1)
         if self.config.has_battery:
-            result = self._set_max_export_power(decision.export_power_w)
-            results.append(result)
+            yield self._plan_max_export_power(decision.export_power_w, inverter_read)
+
+    def _snapshot_entities(self, decision: ControllerDecision) -> list[str]:
+        """Entities whose current state _plan() will read for this decision."""
+        inverter = self.config.inverter
+        wanted: list[str | None] = []
+        if self.config.has_battery:
+            wanted += [
+                inverter.work_mode_entity,
+                inverter.grid_charging_entity,
+                self.config.soc_target_entity,
+                inverter.grid_max_export_power_entity,
+            ]
+            if decision.write_charge_current:
+                wanted.append(self._limit_entity("charge", decision.control_unit))
+            if decision.write_discharge_current:
+                wanted.append(self._limit_entity("discharge", decision.control_unit))
+        if self.config.has_water_heater:
+            wanted.append(self.config.water_heater.target_entity)
+        return [e for e in dict.fromkeys(wanted) if e and _is_entity_configured(e)]
+
+    async def _read_snapshot(self, entity_ids: list[str]) -> dict[str, str | None]:
+        """Current states, from the WebSocket-fed cache where fresh, else one concurrent batch."""
+        assert self.async_ha is not None
+        start = time.perf_counter()
+        snapshot: dict[str, str | None] = {}
+        missing: list[str] = []
+        for entity_id in entity_ids:
+            cached = entity_state_cache.get(entity_id)
+            if cached is not None:
+                snapshot[entity_id] = cached.get("state")
+            else:
+                missing.append(entity_id)
+        if missing:
+            snapshot.update(await self.async_ha.get_state_values(missing))
+        self.async_ha.stats.record_snapshot(
+            (time.perf_counter() - start) * 1000.0,
+            cache_hits=len(entity_ids) - len(missing),
+            fetched=len(missing),
+        )
+        return snapshot
 
-        return results
+    async def _send_writes(self, writes: list[_PendingWrite]) -> list[bool]:
+        """Send writes concurrently; inverter writes wait for the work mode change."""
+        assert self.async_ha is not None
+        ha = self.async_ha
+        outcomes: dict[int, bool] = {}
+
+        async def send(batch: list[_PendingWrite]) -> None:
+            results = await asyncio.gather(
+                *(ha.call_service(w.domain, w.service, w.entity_id, w.data) for w in batch)
+            )
+            outcomes.update(zip(map(id, batch), results, strict=True))
+
+        async def inverter_chain() -> None:
+            await send([w for w in writes if w.action_type == "work_mode"])
+            await send([w for w in writes if w.action_type in _AFTER_WORK_MODE])
+
+        independent = [
+            w
+            for w in writes
+            if w.action_type != "work_mode" and w.action_type not in _AFTER_WORK_MODE
+        ]
+        await asyncio.gather(inverter_chain(), send(independent))
+        return [outcomes[id(w)] for w in writes]
+
+    def _apply(self, step: ActionResult | _PendingWrite) -> ActionResult:
+        """Perform a planned write through the sync client."""
+        if isinstance(step, ActionResult):
+            return step
+        if step.domain == "select":
+            success = self.ha.set_select_option(step.entity_id, step.data["option"])
+        elif step.domain == "switch":
+            success = self.ha.set_switch(step.entity_id, step.service == "turn_on")
+        elif step.domain == "number":
+            success = self.ha.set_number(step.entity_id, step.data["value"])
+        elif step.domain == "input_number":
+            success = self.ha.set_input_number(step.entity_id, step.data["value"])
+        else:
+            success = self.ha.call_service(step.domain, step.service, step.entity_id, step.data)
+        return step.finish(success)
+
+    def _noop(self, entity: str) -> None:
+        if self.async_ha is not None:
+            self.async_ha.stats.record_skip(entity)
+
+    def dispatch_stats(self) -> dict[str, Any]:
+        """Per-entity retry and latency statistics of the async dispatch path."""
+        if self.async_ha is None:
+            return {"mode": "sequential"}
+        return {
+            "mode": "concurrent",
+            "max_concurrency": self.async_ha.max_concurrency,
+            "retries": self.async_ha.retries,
+            **self.async_ha.stats.as_dict(),
+        }
+
+    def close(self) -> None:
+        """Close the connection pool and the dispatcher's event loop."""
+        _outside_running_loop(self._close_loop)
+
+    def _close_loop(self) -> None:
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                return
+            if self.async_ha is not None:
+                self._loop.run_until_complete(self.async_ha.aclose())
+            self._loop.close()
+            self._loop = None
 
     def _set_work_mode(self, target_mode: str) -> ActionResult:
         """Set inverter work mode if different from current."""
+        return self._apply(self._plan_work_mode(target_mode, self.ha.get_state_value))
+
+    def _set_grid_charging(self, enabled: bool) -> ActionResult:
+        """Set grid charging switch."""
+        return self._apply(self._plan_grid_charging(enabled, self.ha.get_state_value))
+
+    def _set_charge_limit(self, value: float, unit: str) -> ActionResult:
+        """Set max charging limit (Amps or Watts)."""
+        return self._apply(self._plan_charge_limit(value, unit, self.ha.get_state_value))
+
+    def _set_discharge_limit(self, value: float, unit: str) -> ActionResult:
+        """Set max discharging limit (Amps or Watts)."""
+        return self._apply(self._plan_discharge_limit(value, unit, self.ha.get_state_value))
+
+    def _set_soc_target(self, target: int) -> ActionResult:
+        """Set SoC target."""
+        return self._apply(self._plan_soc_target(target, self.ha.get_state_value))
+
+    def set_water_temp(self, target: int) -> ActionResult:
+        """Set water heater target temperature."""
+        return self._apply(self._plan_water_temp(target, self.ha.get_state_value))
+
+    def _set_max_export_power(self, watts: float) -> ActionResult:
+        """Set max grid export power (Bug Fix #1)."""
+        return self._apply(self._plan_max_export_power(watts, self.ha.get_state_value))
+
+    def _limit_entity(self, kind: str, unit: str) -> str | None:
+        """Charge or discharge limit entity for the control unit (W = power, else current)."""
+        inverter = self.config.inverter
+        if kind == "charge":
+            return (
+                inverter.max_charging_power_entity
+                if unit == "W"
+                else inverter.max_charging_current_entity
+            )
+        return (
+            inverter.max_discharging_power_entity
+            if unit == "W"
+            else inverter.max_discharging_current_entity
+        )
+
+    def _plan_work_mode(self, target_mode: str, read: StateReader) -> ActionResult | _PendingWrite:
         start = time.time()
         entity = self.config.inverter.work_mode_entity
 
@@ -286,9 +767,10 @@ class ActionDispatcher:
             )
 
         # Get current state
-        current = self.ha.get_state_value(entity)
+        current = read(entity)
 
         if current == target_mode:
+            self._noop(entity)
             return ActionResult(
                 action_type="work_mode",
                 success=True,
@@ -311,23 +793,26 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        success = self.ha.set_select_option(entity, target_mode)
-        duration = int((time.time() - start) * 1000)
-
-        if success:
-            self._maybe_notify("work_mode", f"Work mode changed to {target_mode}")
+        def finish(success: bool) -> ActionResult:
+            duration = int((time.time() - start) * 1000)
+            if success:
+                self._maybe_notify("work_mode", f"Work mode changed to {target_mode}")
+            return ActionResult(
+                action_type="work_mode",
+                success=success,
+                message=(
+                    f"Changed {current} → {target_mode}" if success else "Failed to set work mode"
+                ),
+                previous_value=current,
+                new_value=target_mode,
+                duration_ms=duration,
+            )
 
-        return ActionResult(
-            action_type="work_mode",
-            success=success,
-            message=f"Changed {current} → {target_mode}" if success else "Failed to set work mode",
-            previous_value=current,
-            new_value=target_mode,
-            duration_ms=duration,
+        return _PendingWrite(
+            "work_mode", "select", "select_option", entity, {"option": target_mode}, finish
         )
 
-    def _set_grid_charging(self, enabled: bool) -> ActionResult:
-        """Set grid charging switch."""
+    def _plan_grid_charging(self, enabled: bool, read: StateReader) -> ActionResult | _PendingWrite:
         start = time.time()
         entity = self.config.inverter.grid_charging_entity
 
@@ -341,10 +826,11 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        current = self.ha.get_state_value(entity)
+        current = read(entity)
         target = "on" if enabled else "off"
 
         if current == target:
+            self._noop(entity)
             return ActionResult(
                 action_type="grid_charging",
                 success=True,
@@ -367,32 +853,31 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        success = self.ha.set_switch(entity, enabled)
-        duration = int((time.time() - start) * 1000)
-
-        action = "start" if enabled else "stop"
-        if success:
-            self._maybe_notify(f"charge_{action}", f"Grid charging {action}ed")
+        def finish(success: bool) -> ActionResult:
+            duration = int((time.time() - start) * 1000)
+            action = "start" if enabled else "stop"
+            if success:
+                self._maybe_notify(f"charge_{action}", f"Grid charging {action}ed")
+            return ActionResult(
+                action_type="grid_charging",
+                success=success,
+                message=(
+                    f"Changed {current} → {target}" if success else "Failed to set grid charging"
+                ),
+                previous_value=current,
+                new_value=target,
+                duration_ms=duration,
+            )
 
-        return ActionResult(
-            action_type="grid_charging",
-            success=success,
-            message=f"Changed {current} → {target}" if success else "Failed to set grid charging",
-            previous_value=current,
-            new_value=target,
-            duration_ms=duration,
-        )
+        service = "turn_on" if enabled else "turn_off"
+        return _PendingWrite("grid_charging", "switch", service, entity, {}, finish)
 
-    def _set_charge_limit(self, value: float, unit: str) -> ActionResult:
-        """Set max charging limit (Amps or Watts)."""
+    def _plan_charge_limit(
+        self, value: float, unit: str, read: StateReader
+    ) -> ActionResult | _PendingWrite:
         start = time.time()
-
-        if unit == "W":
-            entity = self.config.inverter.max_charging_power_entity
-            unit_label = "W"
-        else:
-            entity = self.config.inverter.max_charging_current_entity
-            unit_label = "A"
+        entity = self._limit_entity("charge", unit)
+        unit_label = "W" if unit == "W" else "A"
 
         if not _is_entity_configured(entity):
             logger.debug("Skipping charge_limit action: entity not configured for unit %s", unit)
@@ -404,6 +889,19 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
+        current_val = _float_or_none(read(entity))
+        if current_val == value:
+            self._noop(entity)
+            return ActionResult(
+                action_type="charge_limit",
+                success=True,
+                message=f"Already at {value} {unit_label}",
+                previous_value=current_val,
+                new_value=value,
+                skipped=True,
+                duration_ms=int((time.time() - start) * 1000),
+            )
+
         logger.info("Setting charge_limit: %.1f %s on entity: %s", value, unit_label, entity)
 
         if self.shadow_mode:
@@ -417,28 +915,28 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        success = self.ha.set_number(entity, value)
-        duration = int((time.time() - start) * 1000)
-        logger.info("Set charge_limit result: success=%s, duration=%dms", success, duration)
+        def finish(success: bool) -> ActionResult:
+            duration = int((time.time() - start) * 1000)
+            logger.info("Set charge_limit result: success=%s, duration=%dms", success, duration)
+            return ActionResult(
+                action_type="charge_limit",
+                success=success,
+                message=f"Set to {value} {unit_label}" if success else "Failed to set charge limit",
+                previous_value=current_val,
+                new_value=value,
+                duration_ms=duration,
+            )
 
-        return ActionResult(
-            action_type="charge_limit",
-            success=success,
-            message=f"Set to {value} {unit_label}" if success else "Failed to set charge limit",
-            new_value=value,
-            duration_ms=duration,
+        return _PendingWrite(
+            "charge_limit", "number", "set_value", entity, {"value": value}, finish
         )
 
-    def _set_discharge_limit(self, value: float, unit: str) -> ActionResult:
-        """Set max discharging limit (Amps or Watts)."""
+    def _plan_discharge_limit(
+        self, value: float, unit: str, read: StateReader
+    ) -> ActionResult | _PendingWrite:
         start = time.time()
-
-        if unit == "W":
-            entity = self.config.inverter.max_discharging_power_entity
-            unit_label = "W"
-        else:
-            entity = self.config.inverter.max_discharging_current_entity
-            unit_label = "A"
+        entity = self._limit_entity("discharge", unit)
+        unit_label = "W" if unit == "W" else "A"
 
         if not _is_entity_configured(entity):
             logger.debug("Skipping discharge_limit action: entity not configured for unit %s", unit)
@@ -451,6 +949,19 @@ class ActionDispatcher:
             )
 
         result_label = f"{value} {unit_label}"
+        current_val = _float_or_none(read(entity))
+        if current_val == value:
+            self._noop(entity)
+            return ActionResult(
+                action_type="discharge_limit",
+                success=True,
+                message=f"Already at {result_label}",
+                previous_value=current_val,
+                new_value=value,
+                skipped=True,
+                duration_ms=int((time.time() - start) * 1000),
+            )
+
         logger.info("Setting discharge_limit: %s on entity: %s", result_label, entity)
 
         if self.shadow_mode:
@@ -482,20 +993,25 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        success = self.ha.set_number(entity, value)
-        duration = int((time.time() - start) * 1000)
-        logger.info("Set discharge_limit result: success=%s, duration=%dms", success, duration)
+        def finish(success: bool) -> ActionResult:
+            duration = int((time.time() - start) * 1000)
+            logger.info("Set discharge_limit result: success=%s, duration=%dms", success, duration)
+            return ActionResult(
+                action_type="discharge_limit",
+                success=success,
+                message=(
+                    f"Set to {value} {unit_label}" if success else "Failed to set discharge limit"
+                ),
+                previous_value=current_val,
+                new_value=value,
+                duration_ms=duration,
+            )
 
-        return ActionResult(
-            action_type="discharge_limit",
-            success=success,
-            message=f"Set to {value} {unit_label}" if success else "Failed to set discharge limit",
-            new_value=value,
-            duration_ms=duration,
+        return _PendingWrite(
+            "discharge_limit", "number", "set_value", entity, {"value": value}, finish
         )
 
-    def _set_soc_target(self, target: int) -> ActionResult:
-        """Set SoC target."""
+    def _plan_soc_target(self, target: int, read: StateReader) -> ActionResult | _PendingWrite:
         start = time.time()
         entity = self.config.soc_target_entity
 
@@ -509,13 +1025,14 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        current = self.ha.get_state_value(entity)
+        current = read(entity)
         try:
             current_val = int(float(current)) if current else None
         except (ValueError, TypeError):
             current_val = None
 
         if current_val == target:
+            self._noop(entity)
             return ActionResult(
                 action_type="soc_target",
                 success=True,
@@ -540,25 +1057,26 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        success = self.ha.set_input_number(entity, float(target))
-        duration = int((time.time() - start) * 1000)
-
-        if success and self.config.notifications.on_soc_target_change:
-            self._send_notification(f"SoC target changed to {target}%")
+        def finish(success: bool) -> ActionResult:
+            duration = int((time.time() - start) * 1000)
+            if success and self.config.notifications.on_soc_target_change:
+                self._send_notification(f"SoC target changed to {target}%")
+            return ActionResult(
+                action_type="soc_target",
+                success=success,
+                message=(
+                    f"Changed {current_val}% → {target}%" if success else "Failed to set SoC target"
+                ),
+                previous_value=current_val,
+                new_value=target,
+                duration_ms=duration,
+            )
 
-        return ActionResult(
-            action_type="soc_target",
-            success=success,
-            message=(
-                f"Changed {current_val}% → {target}%" if success else "Failed to set SoC target"
-            ),
-            previous_value=current_val,
-            new_value=target,
-            duration_ms=duration,
+        return _PendingWrite(
+            "soc_target", "input_number", "set_value", entity, {"value": float(target)}, finish
         )
 
-    def set_water_temp(self, target: int) -> ActionResult:
-        """Set water heater target temperature."""
+    def _plan_water_temp(self, target: int, read: StateReader) -> ActionResult | _PendingWrite:
         start = time.time()
         entity = self.config.water_heater.target_entity
 
@@ -572,13 +1090,14 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        current = self.ha.get_state_value(entity)
+        current = read(entity)
         try:
             current_val = int(float(current)) if current else None
         except (ValueError, TypeError):
             current_val = None
 
         if current_val == target:
+            self._noop(entity)
             return ActionResult(
                 action_type="water_temp",
                 success=True,
@@ -603,28 +1122,33 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        success = self.ha.set_input_number(entity, float(target))
-        duration = int((time.time() - start) * 1000)
-
-        # Determine if this is start or stop
-        is_heating = target > self.config.water_heater.temp_off
-        action = "start" if is_heating else "stop"
-        if success:
-            self._maybe_notify(f"water_heat_{action}", f"Water heater target: {target}°C")
-
-        return ActionResult(
-            action_type="water_temp",
-            success=success,
-            message=(
-                f"Changed {current_val}°C → {target}°C" if success else "Failed to set water temp"
-            ),
-            previous_value=current_val,
-            new_value=target,
-            duration_ms=duration,
+        def finish(success: bool) -> ActionResult:
+            duration = int((time.time() - start) * 1000)
+            # Determine if this is start or stop
+            is_heating = target > self.config.water_heater.temp_off
+            action = "start" if is_heating else "stop"
+            if success:
+                self._maybe_notify(f"water_heat_{action}", f"Water heater target: {target}°C")
+            return ActionResult(
+                action_type="water_temp",
+                success=success,
+                message=(
+                    f"Changed {current_val}°C → {target}°C"
+                    if success
+                    else "Failed to set water temp"
+                ),
+                previous_value=current_val,
+                new_value=target,
+                duration_ms=duration,
+            )
+
+        return _PendingWrite(
+            "water_temp", "input_number", "set_value", entity, {"value": float(target)}, finish
         )
 
-    def _set_max_export_power(self, watts: float) -> ActionResult:
-        """Set max grid export power (Bug Fix #1)."""
+    def _plan_max_export_power(
+        self, watts: float, read: StateReader
+    ) -> ActionResult | _PendingWrite:
         start = time.time()
         entity = self.config.inverter.grid_max_export_power_entity
 
@@ -639,15 +1163,12 @@ class ActionDispatcher:
             )
 
         # Check current value and apply write threshold to prevent EEPROM wear
-        current = self.ha.get_state_value(entity)
-        try:
-            current_val = float(current) if current else None
-        except (ValueError, TypeError):
-            current_val = None
+        current_val = _float_or_none(read(entity))
 
         if current_val is not None:
             change = abs(watts - current_val)
             if change < self.config.controller.write_threshold_w:
+                self._noop(entity)
                 return ActionResult(
                     action_type="max_export_power",
                     success=True,
@@ -669,18 +1190,20 @@ class ActionDispatcher:
                 duration_ms=int((time.time() - start) * 1000),
             )
 
-        success = self.ha.set_number(entity, watts)
-        duration = int((time.time() - start) * 1000)
-
-        logger.info("Set max_export_power: %.0f W on %s (success=%s)", watts, entity, success)
+        def finish(success: bool) -> ActionResult:
+            duration = int((time.time() - start) * 1000)
+            logger.info("Set max_export_power: %.0f W on %s (success=%s)", watts, entity, success)
+            return ActionResult(
+                action_type="max_export_power",
+                success=success,
+                message=f"Set to {watts} W" if success else "Failed to set export power",
+                previous_value=current_val,
+                new_value=watts,
+                duration_ms=duration,
+            )
 
-        return ActionResult(
-            action_type="max_export_power",
-            success=success,
-            message=f"Set to {watts} W" if success else "Failed to set export power",
-            previous_value=current_val,
-            new_value=watts,
-            duration_ms=duration,
+        return _PendingWrite(
+            "max_export_power", "number", "set_value", entity, {"value": watts}, finish
         )
 
     def _maybe_notify(self, action_type: str, message: str) -> None:
@@ -10,13 +10,13 @@ The main executor loop that orchestrates:
 6. Logging execution history
 """
 
+import bisect
 import collections
 import contextlib
-import json
 import logging
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -25,9 +25,11 @@ import pytz
 
 # import yaml
 # Import existing HA config loader
+from backend.core.entity_cache import entity_state_cache
+from backend.core.schedule_store import get_schedule_repository
 from inputs import load_home_assistant_config
 
-from .actions import ActionDispatcher, ActionResult, HAClient
+from .actions import ActionDispatcher, ActionResult, AsyncHAClient, HAClient
 from .config import load_executor_config, load_yaml
 from .controller import ControllerDecision, make_decision
 from .history import ExecutionHistory, ExecutionRecord
@@ -42,6 +44,12 @@ logger = logging.getLogger(__name__)
 
 EXECUTOR_VERSION = "1.0.0"
 
+# Ticks slower than this are logged with their per-phase breakdown
+SLOW_TICK_S = 1.0
+
+# Minimum seconds between price refetches while the cached prices miss "now"
+PRICE_RETRY_S = 300.0
+
 
 @dataclass
 class ExecutorStatus:
@@ -60,6 +68,27 @@ class ExecutorStatus:
     last_action: str | None = None
     override_active: bool = False
     override_type: str | None = None
+    last_tick_ms: float | None = None
+    last_tick_phases_ms: dict[str, float] = field(default_factory=dict)
+    config_reloads: int = 0
+
+
+class _TickTimer:
+    """Accumulates wall time per named phase of one tick."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """Attribute the time since the previous mark to `phase`."""
+        now = time.perf_counter()
+        self.phases[phase] = round(self.phases.get(phase, 0.0) + (now - self._last) * 1000, 1)
+        self._last = now
+
+    @property
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self._start) * 1000, 1)
 
 
 class ExecutorEngine:
@@ -76,11 +105,19 @@ class ExecutorEngine:
     ):
         self.config_path = config_path
         self.secrets_path = secrets_path
+        self._config_version = self._stat_config()
         self.config = load_executor_config(config_path)
 
         # Load main config for input_sensors section
         self._full_config = load_yaml(config_path)
 
+        # Long-lived tick collaborators (rebuilt only when their inputs change)
+        self._battery_cost_tracker: Any = None
+        self._price_starts: list[float] = []
+        self._price_ends: list[float] = []
+        self._price_values: list[float] = []
+        self._prices_fetched_at: float | None = None
+
         # Initialize components
         self.history = ExecutionHistory(
             db_path=self._get_db_path(),
@@ -120,6 +157,9 @@ class ExecutorEngine:
         # Recent errors tracking (Phase 3)
         self.recent_errors = collections.deque(maxlen=10)
 
+        # Ask the HA WebSocket to keep our entities in the shared state cache
+        self._track_state_entities()
+
     def _get_db_path(self) -> str:
         """Get the path to the learning database."""
         # Use the same database as the learning engine
@@ -143,25 +183,86 @@ class ExecutorEngine:
             self.status.ha_client_initialized = False
             return False
 
+        if self.dispatcher:
+            self.dispatcher.close()
         self.ha_client = HAClient(base_url, token)
         self.dispatcher = ActionDispatcher(
             self.ha_client,
             self.config,
             shadow_mode=self.config.shadow_mode,
+            async_client=AsyncHAClient(base_url, token),
         )
         self.status.ha_client_initialized = True
         return True
 
+    def _stat_config(self) -> tuple[int, int] | None:
+        try:
+            st = Path(self.config_path).stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
     def reload_config(self) -> None:
-        """Reload configuration from config.yaml."""
+        """Reload configuration from config.yaml (explicit reload, always re-reads)."""
         with self._lock:
+            self._config_version = self._stat_config()
             self.config = load_executor_config(self.config_path)
+            self._full_config = load_yaml(self.config_path)
             self.status.enabled = self.config.enabled
             self.status.shadow_mode = self.config.shadow_mode
+            self.status.config_reloads += 1
             if self.dispatcher:
                 self.dispatcher.shadow_mode = self.config.shadow_mode
+            # Capacity or timezone may have changed
+            self._battery_cost_tracker = None
+            self._prices_fetched_at = None
+            self._track_state_entities()
             logger.info("Executor config reloaded")
 
+    def reload_config_if_changed(self) -> bool:
+        """Reload config.yaml only if its mtime/size changed; returns True if reloaded."""
+        if self._stat_config() == self._config_version:
+            return False
+        self.reload_config()
+        return True
+
+    def _track_state_entities(self) -> None:
+        """Register every entity read per tick with the shared entity state cache."""
+        input_sensors = self._full_config.get("input_sensors", {}) or {}
+        entity_state_cache.track(
+            [
+                input_sensors.get("battery_soc", "sensor.inverter_battery"),
+                input_sensors.get("pv_power", "sensor.inverter_pv_power"),
+                input_sensors.get("load_power", "sensor.inverter_load_power"),
+                input_sensors.get("grid_import_power"),
+                input_sensors.get("grid_export_power"),
+                input_sensors.get("battery_power"),
+                input_sensors.get("water_power"),
+                self.config.inverter.work_mode_entity,
+                self.config.inverter.grid_charging_entity,
+                self.config.inverter.grid_max_export_power_entity,
+                self.config.inverter.max_charging_current_entity,
+                self.config.inverter.max_discharging_current_entity,
+                self.config.inverter.max_charging_power_entity,
+                self.config.inverter.max_discharging_power_entity,
+                self.config.soc_target_entity,
+                self.config.water_heater.target_entity,
+                self.config.manual_override_entity,
+                self.config.automation_toggle_entity,
+            ]
+        )
+
+    def _get_state_value(self, entity_id: str) -> str | None:
+        """
+        Get an entity's state value, preferring the WebSocket-fed cache.
+
+        Falls back to a REST call when the cached entry is missing or stale.
+        """
+        cached = entity_state_cache.get(entity_id)
+        if cached is not None:
+            return cached.get("state")
+        return self.ha_client.get_state_value(entity_id) if self.ha_client else None
+
     def get_status(self) -> dict[str, Any]:
         """Get current executor status as a dictionary."""
         # Get current slot plan for display
@@ -207,6 +308,9 @@ class ExecutorEngine:
                 "paused": pause_status,
                 "water_boost": water_boost_status,
                 "recent_errors": list(self.recent_errors),
+                "last_tick_ms": self.status.last_tick_ms,
+                "last_tick_phases_ms": dict(self.status.last_tick_phases_ms),
+                "config_reloads": self.status.config_reloads,
                 "version": EXECUTOR_VERSION,
             }
 
@@ -241,7 +345,7 @@ class ExecutorEngine:
             # Battery Power
             batt_pwr_entity = input_sensors.get("battery_power")
             if batt_pwr_entity:
-                val = self.ha_client.get_state_value(batt_pwr_entity)
+                val = self._get_state_value(batt_pwr_entity)
                 if val and val not in ("unknown", "unavailable"):
                     with contextlib.suppress(ValueError):
                         metrics["battery_kw"] = float(val) / 1000.0  # W to kW
@@ -249,7 +353,7 @@ class ExecutorEngine:
             # Water Heater Power
             water_pwr_entity = input_sensors.get("water_power")
             if water_pwr_entity:
-                val = self.ha_client.get_state_value(water_pwr_entity)
+                val = self._get_state_value(water_pwr_entity)
                 if val and val not in ("unknown", "unavailable"):
                     with contextlib.suppress(ValueError):
                         metrics["water_kw"] = float(val) / 1000.0  # W to kW
@@ -522,11 +626,11 @@ class ExecutorEngine:
 
         try:
             self.dispatcher._send_notification(message, title=title)
-            # If data is provided, we might need a more direct HA call since _send_notification is simplified  # noqa: E501
+            # If data is provided, we might need a more direct HA call since _send_notification is simplified
             if data:
                 self.ha_client.send_notification(
                     self.config.notifications.service, title, message, data=data
-                )  # noqa: E501
+                )
             return True
         except Exception as e:
             logger.error("Failed to send notification: %s", e)
@@ -643,6 +747,8 @@ class ExecutorEngine:
         if self._thread:
             self._thread.join(timeout=5)
             logger.info("Executor stopped")
+        if self.dispatcher:
+            self.dispatcher.close()
 
     def run_once(self) -> dict[str, Any]:
         """
@@ -661,8 +767,8 @@ class ExecutorEngine:
         logger.info("Executor background loop started")
 
         while not self._stop_event.is_set():
-            # Reload config to get latest settings
-            self.reload_config()
+            # Pick up config.yaml edits (API saves also trigger an explicit reload)
+            self.reload_config_if_changed()
 
             # Check if enabled
             if not self.config.enabled:
@@ -724,8 +830,16 @@ class ExecutorEngine:
                 tick_duration = (datetime.now(tz) - tick_start).total_seconds()
 
                 # Rev PERF2: Performance Logging
-                if tick_duration > 1.0:
-                    logger.warning("\u26a0\ufe0f SLOW TICK: %.2fs (Threshold: 1.0s)", tick_duration)
+                if tick_duration > SLOW_TICK_S:
+                    slowest = sorted(
+                        self.status.last_tick_phases_ms.items(), key=lambda kv: -kv[1]
+                    )[:3]
+                    logger.warning(
+                        "\u26a0\ufe0f SLOW TICK: %.2fs (Threshold: %.1fs) slowest phases: %s",
+                        tick_duration,
+                        SLOW_TICK_S,
+                        ", ".join(f"{name}={ms:.0f}ms" for name, ms in slowest),
+                    )
                 else:
                     logger.info("Tick completed in %.2fs", tick_duration)
             except Exception as e:
@@ -766,6 +880,7 @@ class ExecutorEngine:
         7. Log execution
         """
         start_time = time.time()
+        timer = _TickTimer()
         tz = pytz.timezone(self.config.timezone)
         now = datetime.now(tz)
         now_iso = now.isoformat()
@@ -788,6 +903,7 @@ class ExecutorEngine:
                 logger.info("Executor is PAUSED - applying idle mode")
                 self._check_pause_reminder()
                 self._apply_idle_mode()
+                timer.mark("idle_mode")
                 self.status.last_run_status = "skipped"
                 self.status.last_skip_reason = "paused_idle_mode"
                 result["success"] = True
@@ -796,7 +912,8 @@ class ExecutorEngine:
 
             # 1. Check automation toggle (Rev O1)
             if self.config.automation_toggle_entity:
-                toggle_state = self.ha_client.get_state_value(self.config.automation_toggle_entity)
+                toggle_state = self._get_state_value(self.config.automation_toggle_entity)
+                timer.mark("toggle")
                 if toggle_state and toggle_state.lower() != "on":
                     logger.warning(
                         "Executor skip: Automation toggle (%s) is %s",
@@ -812,7 +929,7 @@ class ExecutorEngine:
                             {
                                 "type": "skip",
                                 "reason": "automation_disabled",
-                                "message": f"Toggle {self.config.automation_toggle_entity} is {toggle_state}",  # noqa: E501
+                                "message": f"Toggle {self.config.automation_toggle_entity} is {toggle_state}",
                             }
                         ],
                     }
@@ -822,6 +939,7 @@ class ExecutorEngine:
             # 2. Load current slot from schedule.json
             slot, slot_start = self._load_current_slot(now)
             result["slot_start"] = slot_start
+            timer.mark("load_slot")
 
             if slot:
                 self.status.current_slot = slot_start
@@ -830,12 +948,14 @@ class ExecutorEngine:
 
             # 3. Gather system state
             state = self._gather_system_state()
+            timer.mark("gather_state")
 
             # Emit live metrics for UI sparklines (Rev E1)
             try:
-                from backend.events import emit_live_metrics
+                from backend.events import live_metrics_publisher
 
-                emit_live_metrics(
+                # Through the coalescer so its sent-state matches what clients have
+                live_metrics_publisher.publish(
                     {
                         "soc": state.current_soc_percent,
                         "pv_kw": state.current_pv_kw,
@@ -849,6 +969,7 @@ class ExecutorEngine:
                 )
             except Exception as e:
                 logger.debug("Failed to emit live metrics: %s", e)
+            timer.mark("emit")
 
             # Update state with slot validity
             state.slot_exists = slot is not None
@@ -952,6 +1073,7 @@ class ExecutorEngine:
             )
 
             self.status.last_action = decision.reason
+            timer.mark("decide")
 
             # 6. Execute actions
             action_results: list[ActionResult] = []
@@ -978,6 +1100,7 @@ class ExecutorEngine:
                     }
                     for r in action_results
                 ]
+            timer.mark("dispatch")
 
             # 7. Log execution to history
             duration_ms = int((time.time() - start_time) * 1000)
@@ -1009,8 +1132,11 @@ class ExecutorEngine:
                     },
                 )
 
+            timer.mark("history")
+
             # Rev F1: Update battery cost based on charging activity
             self._update_battery_cost(state, decision, slot)
+            timer.mark("battery_cost")
 
             self.status.last_run_status = "success"
             logger.info("Executor tick completed in %dms", duration_ms)
@@ -1022,6 +1148,7 @@ class ExecutorEngine:
                 emit_status_update(self.get_status())
             except Exception as e:
                 logger.debug("Failed to emit status update: %s", e)
+            timer.mark("emit")
 
         except Exception as e:
             logger.exception("Executor tick failed: %s", e)
@@ -1037,6 +1164,9 @@ class ExecutorEngine:
             self.recent_errors.append(
                 {"timestamp": now_iso, "type": "engine_tick", "message": str(e)}
             )
+        finally:
+            self.status.last_tick_ms = timer.total_ms
+            self.status.last_tick_phases_ms = timer.phases
 
         return result
 
@@ -1046,63 +1176,23 @@ class ExecutorEngine:
 
         Returns (SlotPlan, slot_start_iso) or (None, None) if not found.
         """
-        schedule_path = self.config.schedule_path
-        if not Path(schedule_path).exists():
-            logger.warning("Schedule file not found: %s", schedule_path)
+        repo = get_schedule_repository(self.config.schedule_path)
+        if not repo.exists():
+            logger.warning("Schedule file not found: %s", self.config.schedule_path)
             return None, None
 
-        try:
-            with Path(schedule_path).open(encoding="utf-8") as f:
-                payload = json.load(f)
-            schedule = payload.get("schedule", [])
-        except Exception as e:
-            logger.error("Failed to load schedule: %s", e)
+        # Parsed once per file change; the lookup is a binary search over slot starts
+        found = repo.get().index(self.config.timezone).slot_at(now)
+        if found is None:
             return None, None
 
-        if not schedule:
+        slot_data, start = found
+        try:
+            return self._parse_slot_plan(slot_data), start.isoformat()
+        except Exception as e:
+            logger.warning("Failed to parse slot: %s", e)
             return None, None
 
-        tz = pytz.timezone(self.config.timezone)
-
-        # Find the slot that contains the current time
-        for slot_data in schedule:
-            start_str = slot_data.get("start_time")
-            # Prefer end_time_kepler (correct) over end_time (sometimes has wrong TZ offset)
-            end_str = slot_data.get("end_time_kepler") or slot_data.get("end_time")
-            if not start_str:
-                continue
-
-            try:
-                start = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-                start = tz.localize(start) if start.tzinfo is None else start.astimezone(tz)
-
-                if end_str:
-                    end = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
-                    end = tz.localize(end) if end.tzinfo is None else end.astimezone(tz)
-                    # Sanity check: if end <= start, use 15-min default
-                    if end <= start:
-                        logger.warning(
-                            "Invalid end_time %s <= start_time %s, using 15min slot",
-                            end,
-                            start,
-                        )
-                        end = start + timedelta(minutes=15)
-                else:
-                    # Default 15-minute slot
-                    end = start + timedelta(minutes=15)
-
-                # Check if current time is within this slot
-                if start <= now < end:
-                    slot = self._parse_slot_plan(slot_data)
-                    return slot, start.isoformat()
-
-            except Exception as e:
-                logger.warning("Failed to parse slot: %s", e)
-                continue
-
-        # No matching slot found
-        return None, None
-
     def _parse_slot_plan(self, slot_data: dict[str, Any]) -> SlotPlan:
         """Parse a schedule slot into a SlotPlan object."""
         # Handle both kW and kWh fields
@@ -1140,18 +1230,18 @@ class ExecutorEngine:
         try:
             # Get SoC (Rev O1)
             if self.config.has_battery:
-                soc_str = self.ha_client.get_state_value(soc_entity)
+                soc_str = self._get_state_value(soc_entity)
                 if soc_str and soc_str not in ("unknown", "unavailable"):
                     state.current_soc_percent = float(soc_str)
 
             # Get PV power (Rev O1)
             if self.config.has_solar:
-                pv_str = self.ha_client.get_state_value(pv_power_entity)
+                pv_str = self._get_state_value(pv_power_entity)
                 if pv_str and pv_str not in ("unknown", "unavailable"):
                     state.current_pv_kw = float(pv_str) / 1000  # W to kW
 
             # Get load power
-            load_str = self.ha_client.get_state_value(load_power_entity)
+            load_str = self._get_state_value(load_power_entity)
             if load_str and load_str not in ("unknown", "unavailable"):
                 state.current_load_kw = float(load_str) / 1000
 
@@ -1160,37 +1250,35 @@ class ExecutorEngine:
             export_entity = input_sensors.get("grid_export_power")
 
             if import_entity:
-                imp_str = self.ha_client.get_state_value(import_entity)
+                imp_str = self._get_state_value(import_entity)
                 if imp_str and imp_str not in ("unknown", "unavailable"):
                     state.current_import_kw = float(imp_str) / 1000
 
             if export_entity:
-                exp_str = self.ha_client.get_state_value(export_entity)
+                exp_str = self._get_state_value(export_entity)
                 if exp_str and exp_str not in ("unknown", "unavailable"):
                     state.current_export_kw = float(exp_str) / 1000
 
             # Get current work mode (only if entity configured)
             if self.config.has_battery and self.config.inverter.work_mode_entity:
-                work_mode = self.ha_client.get_state_value(self.config.inverter.work_mode_entity)
+                work_mode = self._get_state_value(self.config.inverter.work_mode_entity)
                 if work_mode:
                     state.current_work_mode = work_mode
 
             # Get grid charging state (only if entity configured)
             if self.config.has_battery and self.config.inverter.grid_charging_entity:
-                grid_charge = self.ha_client.get_state_value(
-                    self.config.inverter.grid_charging_entity
-                )
+                grid_charge = self._get_state_value(self.config.inverter.grid_charging_entity)
                 state.grid_charging_enabled = grid_charge == "on"
 
             # Get water heater temp (Rev O1, only if entity configured)
             if self.config.has_water_heater and self.config.water_heater.target_entity:
-                water_str = self.ha_client.get_state_value(self.config.water_heater.target_entity)
+                water_str = self._get_state_value(self.config.water_heater.target_entity)
                 if water_str:
                     state.current_water_temp = float(water_str)
 
             # Check manual override toggle (optional - don't fail if missing)
             if self.config.manual_override_entity:
-                manual = self.ha_client.get_state_value(self.config.manual_override_entity)
+                manual = self._get_state_value(self.config.manual_override_entity)
                 if manual is not None:
                     state.manual_override_active = manual == "on"
 
@@ -1263,15 +1351,7 @@ class ExecutorEngine:
             return
 
         try:
-            from backend.battery_cost import BatteryCostTracker
-
-            # Get battery capacity from config
-            battery_cfg = self._full_config.get("battery", {})
-            capacity_kwh = battery_cfg.get("capacity_kwh", 27.0)
-
-            # Initialize tracker
-            db_path = self._get_db_path()
-            tracker = BatteryCostTracker(db_path, capacity_kwh)
+            tracker = self._get_battery_cost_tracker()
 
             # Estimate charging this slot (5 min @ planned power)
             slot_duration_h = self.config.interval_seconds / 3600.0
@@ -1292,24 +1372,8 @@ class ExecutorEngine:
                 pv_charge_kwh = pv_surplus_kw * slot_duration_h * 0.95  # 95% efficiency
 
             # Get current import price
-            import_price = 0.5  # Default fallback
-            try:
-                from inputs import get_nordpool_data
-
-                prices = get_nordpool_data("config.yaml")
-                if prices:
-                    # Get current slot's price
-                    import pytz
-
-                    tz = pytz.timezone(self.config.timezone)
-                    now = datetime.now(tz)
-                    for p in prices:
-                        st = p.get("start_time")
-                        if st and st <= now < st + timedelta(hours=1):
-                            import_price = p.get("import_price_sek_kwh", 0.5)
-                            break
-            except Exception:
-                pass
+            now = datetime.now(pytz.timezone(self.config.timezone))
+            import_price = self._current_import_price(now)
 
             # Always update to keep energy state synced (cost only changes during charge)
             tracker.update_cost(
@@ -1321,3 +1385,56 @@ class ExecutorEngine:
 
         except Exception as e:
             logger.debug("Battery cost update skipped: %s", e)
+
+    def _get_battery_cost_tracker(self) -> Any:
+        """Return the long-lived tracker (recreated after a config reload)."""
+        if self._battery_cost_tracker is None:
+            from backend.battery_cost import BatteryCostTracker
+
+            battery_cfg = self._full_config.get("battery", {})
+            capacity_kwh = battery_cfg.get("capacity_kwh", 27.0)
+            self._battery_cost_tracker = BatteryCostTracker(self._get_db_path(), capacity_kwh)
+        return self._battery_cost_tracker
+
+    def _refresh_prices(self) -> None:
+        """Rebuild the sorted price arrays from Nordpool (cached upstream)."""
+        self._prices_fetched_at = time.monotonic()
+        try:
+            from inputs import get_nordpool_data
+
+            prices = get_nordpool_data(self.config_path)
+        except Exception as e:
+            logger.debug("Price refresh failed: %s", e)
+            return
+
+        slots = []
+        for p in prices or []:
+            st = p.get("start_time")
+            if not st:
+                continue
+            end = p.get("end_time") or st + timedelta(hours=1)
+            slots.append((st.timestamp(), end.timestamp(), p.get("import_price_sek_kwh", 0.5)))
+        slots.sort(key=lambda item: item[0])
+        self._price_starts = [item[0] for item in slots]
+        self._price_ends = [item[1] for item in slots]
+        self._price_values = [item[2] for item in slots]
+
+    def _current_import_price(self, now: datetime, default: float = 0.5) -> float:
+        """
+        Import price for the slot containing `now`.
+
+        Prices are fetched once and looked up by binary search; they are only
+        refetched when the cached range no longer covers `now` (at most every
+        PRICE_RETRY_S seconds, so a Nordpool outage cannot stall every tick).
+        """
+        t = now.timestamp()
+        pos = bisect.bisect_right(self._price_starts, t) - 1
+        if pos < 0 or t >= self._price_ends[pos]:
+            fetched_at = self._prices_fetched_at
+            if fetched_at is None or time.monotonic() - fetched_at >= PRICE_RETRY_S:
+                self._refresh_prices()
+                pos = bisect.bisect_right(self._price_starts, t) - 1
+            if pos < 0 or t >= self._price_ends[pos]:
+                return default
+        price = self._price_values[pos]
+        return default if price is None else float(price)
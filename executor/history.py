@@ -12,9 +12,10 @@ from datetime import datetime, timedelta
 from typing import Any
 
 import pytz
-from sqlalchemy import create_engine, select, delete, func, desc, text
+from sqlalchemy import select, delete, func, desc, text
 from sqlalchemy.orm import sessionmaker
 
+from backend.core.db import get_engine
 from backend.learning.models import ExecutionLog
 
 logger = logging.getLogger(__name__)
@@ -75,7 +76,7 @@ class ExecutionHistory:
     def __init__(self, db_path: str, timezone: str = "Europe/Stockholm"):
         self.db_path = db_path
         self.timezone = pytz.timezone(timezone)
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        self.engine = get_engine(db_path)
         self.Session = sessionmaker(bind=self.engine)
 
     def log_execution(self, record: ExecutionRecord) -> int:
@@ -1,5 +1,11 @@
+import asyncio
+import functools
 import math
-from datetime import datetime, timedelta
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any, cast
 
@@ -11,19 +17,44 @@ from nordpool.elspot import Prices
 from open_meteo_solar_forecast import OpenMeteoSolarForecast
 
 from backend.core.cache import cache_sync
+from backend.learning.store import LearningStore
 from ml.api import get_forecast_slots
 from ml.weather import get_weather_volatility
 
+# Per-source timeouts for optional planner inputs (a fallback is used on expiry).
+# Prices and battery SoC have no fallback: planning without them is unsafe.
+INPUT_SOURCE_TIMEOUTS_S = {
+    "ha_state": 10.0,
+    "weather_volatility": 15.0,
+    "load_profile": 35.0,
+}
+# Blocking sources run here rather than in the loop's default executor, so a
+# timed-out straggler does not hold up asyncio.run() shutdown.
+_input_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix="planner-inputs")
+
 # --- Async Helper ---
-_ha_client: httpx.AsyncClient | None = None
+# One shared client per event loop: the FastAPI loop and the planner input stage
+# (asyncio.run in a worker thread) must not share pooled connections.
+_ha_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
 
 
 async def get_async_ha_client() -> httpx.AsyncClient:
-    """Get or create singleton httpx.AsyncClient for HA."""
-    global _ha_client
-    if _ha_client is None or _ha_client.is_closed:
-        _ha_client = httpx.AsyncClient(timeout=10.0)
-    return _ha_client
+    """Get or create the shared httpx.AsyncClient for HA (one per event loop)."""
+    loop = asyncio.get_running_loop()
+    client = _ha_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=10.0)
+        _ha_clients[loop] = client
+    return client
+
+
+async def close_async_ha_client() -> None:
+    """Close the current loop's HA client (before a short-lived loop ends)."""
+    client = _ha_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
 
 
 def load_home_assistant_config() -> dict[str, Any]:
@@ -120,6 +151,12 @@ async def async_get_ha_sensor_float(entity_id: str) -> float | None:
         return None
 
 
+async def async_get_home_assistant_bool(entity_id: str) -> bool:
+    """Async variant of get_home_assistant_bool (shared HA client)."""
+    state = await async_get_ha_entity_state(entity_id)
+    return _is_true_state(entity_id, state)
+
+
 def get_ha_entity_state(entity_id: str, *, timeout: int = 10) -> dict[str, Any] | None:
     """Fetch a single entity state from Home Assistant."""
     ha_config = load_home_assistant_config()
@@ -159,6 +196,10 @@ def get_home_assistant_sensor_float(entity_id: str, *, timeout: int = 10) -> flo
 def get_home_assistant_bool(entity_id: str, *, timeout: int = 10) -> bool:
     """Return True if entity is 'on', 'true', 'armed', etc."""
     state = get_ha_entity_state(entity_id, timeout=timeout)
+    return _is_true_state(entity_id, state)
+
+
+def _is_true_state(entity_id: str, state: dict[str, Any] | None) -> bool:
     if not state:
         return False
 
@@ -240,29 +281,38 @@ def get_nordpool_data(config_path: str = "config.yaml") -> list[dict[str, Any]]:
     currency = nordpool_config.get("currency", "SEK")
     resolution_minutes = nordpool_config.get("resolution_minutes", 60)
 
+    # Published days are read from the durable price store first, so restarts
+    # and planner subprocesses only hit the API for days not yet stored.
+    tomorrow = today + timedelta(days=1)
+    price_store = _open_price_store(config, local_tz)
+    store_key = (price_area, currency, resolution_minutes)
+    today_values = _load_stored_prices(price_store, store_key, today)
+    tomorrow_values = _load_stored_prices(price_store, store_key, tomorrow)
+    stored_days = int(bool(today_values)) + int(bool(tomorrow_values))
+
     # Initialize Nordpool Prices client with currency
     prices_client = Prices(currency=currency)
 
     # Fetch prices for today AND tomorrow explicitly
     # This ensures we get ALL hours, not just past ones
-    today_values: list[dict[str, Any]] = []
-    try:
-        # Fetch TODAY's slots
-        data_today = prices_client.fetch(
-            end_date=now.date(), areas=[price_area], resolution=resolution_minutes
-        )
-        if data_today and data_today.get("areas") and data_today["areas"].get(price_area):
-            area_data = data_today["areas"][price_area]
-            today_values = cast("list[dict[str, Any]]", area_data.get("values", []))
+    if not today_values:
+        try:
+            # Fetch TODAY's slots
+            data_today = prices_client.fetch(
+                end_date=now.date(), areas=[price_area], resolution=resolution_minutes
+            )
+            if data_today and data_today.get("areas") and data_today["areas"].get(price_area):
+                area_data = data_today["areas"][price_area]
+                today_values = cast("list[dict[str, Any]]", area_data.get("values", []))
 
-        if not today_values:
-            print(f"[nordpool] Warning: Fetched today ({now.date()}) but got 0 slots")
-    except Exception as e:
-        print(f"[nordpool] Warning: Could not fetch today's prices: {e}")
+            if not today_values:
+                print(f"[nordpool] Warning: Fetched today ({now.date()}) but got 0 slots")
+            _store_published_prices(price_store, store_key, today, today_values, local_tz)
+        except Exception as e:
+            print(f"[nordpool] Warning: Could not fetch today's prices: {e}")
 
-    tomorrow_values: list[dict[str, Any]] = []
     # Only try to fetch tomorrow if it's after 13:00 (when they are usually published)
-    if now.hour >= 13:
+    if not tomorrow_values and now.hour >= 13:
         try:
             # Fetch TOMORROW's slots (latest usually returns tomorrow if available)
             data_tomorrow = prices_client.fetch(areas=[price_area], resolution=resolution_minutes)
@@ -270,8 +320,11 @@ def get_nordpool_data(config_path: str = "config.yaml") -> list[dict[str, Any]]:
             if tomorrow_areas.get(price_area):
                 area_vals = tomorrow_areas[price_area].get("values", [])
                 all_raw = cast("list[dict[str, Any]]", area_vals)
-                # Filter to only include slots after today
-                tomorrow_values = [v for v in all_raw if v["start"].date() > today]
+                # Filter to only include slots after today (API times are UTC)
+                tomorrow_values = [
+                    v for v in all_raw if v["start"].astimezone(local_tz).date() > today
+                ]
+            _store_published_prices(price_store, store_key, tomorrow, tomorrow_values, local_tz)
         except Exception as e:
             print(f"[nordpool] Warning: Could not fetch tomorrow's prices: {e}")
 
@@ -279,8 +332,9 @@ def get_nordpool_data(config_path: str = "config.yaml") -> list[dict[str, Any]]:
     all_values = today_values + tomorrow_values
 
     print(
-        f"[nordpool] Fetched {len(all_values)} total price slots "
-        f"(today: {len(today_values)}, tomorrow: {len(tomorrow_values)})"
+        f"[nordpool] Loaded {len(all_values)} total price slots "
+        f"(today: {len(today_values)}, tomorrow: {len(tomorrow_values)}, "
+        f"days from store: {stored_days})"
     )
 
     # Process the data into the required format
@@ -292,6 +346,48 @@ def get_nordpool_data(config_path: str = "config.yaml") -> list[dict[str, Any]]:
     return result
 
 
+def _open_price_store(config: dict[str, Any], local_tz: pytz.BaseTzInfo) -> LearningStore | None:
+    sqlite_path = config.get("learning", {}).get("sqlite_path", "data/planner_learning.db")
+    try:
+        return LearningStore(sqlite_path, local_tz)
+    except Exception as e:
+        print(f"[nordpool] Warning: Price store unavailable: {e}")
+        return None
+
+
+def _load_stored_prices(
+    store: LearningStore | None, key: tuple[str, str, int], day: date
+) -> list[dict[str, Any]]:
+    if store is None:
+        return []
+    try:
+        return store.get_day_ahead_prices(*key, day)
+    except Exception as e:
+        print(f"[nordpool] Warning: Could not read stored prices for {day}: {e}")
+        return []
+
+
+def _store_published_prices(
+    store: LearningStore | None,
+    key: tuple[str, str, int],
+    day: date,
+    values: list[dict[str, Any]],
+    local_tz: pytz.BaseTzInfo,
+) -> None:
+    """Persist a delivery day once it is fully published (covers local midnight to midnight)."""
+    if store is None or not values:
+        return
+    try:
+        day_start = local_tz.localize(datetime.combine(day, datetime.min.time()))
+        # Local midnight, not +24 h: DST transition days are 23 or 25 h long
+        day_end = local_tz.localize(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+        if min(v["start"] for v in values) > day_start or max(v["end"] for v in values) < day_end:
+            return
+        store.store_day_ahead_prices(*key, day, values)
+    except Exception as e:
+        print(f"[nordpool] Warning: Could not store prices for {day}: {e}")
+
+
 def _process_nordpool_data(
     all_entries: list[dict[str, Any]],
     config: dict[str, Any],
@@ -363,26 +459,34 @@ def _process_nordpool_data(
     return result
 
 
-def get_forecast_data(price_slots: list[dict[str, Any]], config: dict[str, Any]) -> dict[str, Any]:
+def get_forecast_data(
+    price_slots: list[dict[str, Any]],
+    config: dict[str, Any],
+    load_profile: list[float] | None = None,
+) -> dict[str, Any]:
     """
     Generate PV and load forecasts based on price slots and configuration.
     Synchronous wrapper that handles both DB-backed (Aurora) and async fallbacks.
-    """
-    forecasting_cfg = cast("dict[str, Any]", config.get("forecasting", {}) or {})
-    active_version = str(forecasting_cfg.get("active_forecast_version", "baseline_7_day_avg"))
 
-    if active_version == "aurora":
+    load_profile: Pre-fetched HA load profile (fetched here when None)
+    """
+    if _uses_aurora(config):
         # Aurora logic is purely synchronous (DB-backed)
-        return _get_forecast_data_aurora(price_slots, config)
+        return _get_forecast_data_aurora(price_slots, config, load_profile)
     else:
         # Fallback uses async Open-Meteo API
-        import asyncio
+        return asyncio.run(_get_forecast_data_async(price_slots, config, load_profile))
 
-        return asyncio.run(_get_forecast_data_async(price_slots, config))
+
+def _uses_aurora(config: dict[str, Any]) -> bool:
+    forecasting_cfg = cast("dict[str, Any]", config.get("forecasting", {}) or {})
+    return forecasting_cfg.get("active_forecast_version", "baseline_7_day_avg") == "aurora"
 
 
 def _get_forecast_data_aurora(
-    price_slots: list[dict[str, Any]], config: dict[str, Any]
+    price_slots: list[dict[str, Any]],
+    config: dict[str, Any],
+    load_profile: list[float] | None = None,
 ) -> dict[str, Any]:
     """Synchronous logic for Aurora DB-backed forecasts."""
     timezone_name = str(config.get("timezone", "Europe/Stockholm"))
@@ -397,10 +501,13 @@ def _get_forecast_data_aurora(
     db_slots = build_db_forecast_for_slots(price_slots, config)
 
     # 2. Fetch HA Load Baseline for fallback
-    try:
-        ha_profile = get_load_profile_from_ha(config)
-    except Exception:
-        ha_profile = [0.0] * 96
+    if load_profile is not None:
+        ha_profile = load_profile
+    else:
+        try:
+            ha_profile = get_load_profile_from_ha(config)
+        except Exception:
+            ha_profile = [0.0] * 96
 
     forecast_data: list[dict[str, Any]] = []
     if db_slots:
@@ -526,7 +633,9 @@ def _get_forecast_data_aurora(
 
 
 async def _get_forecast_data_async(
-    price_slots: list[dict[str, Any]], config: dict[str, Any]
+    price_slots: list[dict[str, Any]],
+    config: dict[str, Any],
+    load_profile: list[float] | None = None,
 ) -> dict[str, Any]:
     """
     Async logic for fallback Open-Meteo forecasts.
@@ -619,11 +728,12 @@ async def _get_forecast_data_async(
             elif last_value is not None:
                 daily_pv_forecast[target_date] = last_value
 
-    try:
-        load_profile = get_load_profile_from_ha(config)
-    except Exception as exc:
-        print(f"Warning: Failed to get HA load profile, using dummy: {exc}")
-        load_profile = get_dummy_load_profile(config)
+    if load_profile is None:
+        try:
+            load_profile = get_load_profile_from_ha(config)
+        except Exception as exc:
+            print(f"Warning: Failed to get HA load profile, using dummy: {exc}")
+            load_profile = get_dummy_load_profile(config)
 
     daily_load_total = sum(load_profile)
     daily_load_forecast: dict[str, float] = {}
@@ -677,10 +787,47 @@ def get_initial_state(config_path: str = "config.yaml") -> dict[str, Any]:
             - battery_kwh (float): Current battery energy in kWh
             - battery_cost_sek_per_kwh (float): Current average battery cost
     """
-    with Path(config_path).open() as f:
-        data = yaml.safe_load(f)
-        config: dict[str, Any] = data if isinstance(data, dict) else {}
+    config = load_yaml(config_path)
+    soc_entity_id, water_entity = _initial_state_entities(config)
+    ha_soc = get_home_assistant_sensor_float(soc_entity_id) if soc_entity_id else None
+    ha_water = get_home_assistant_sensor_float(water_entity) if water_entity else None
+    return _build_initial_state(config, soc_entity_id, ha_soc, ha_water)
+
+
+async def async_get_initial_state(config: dict[str, Any]) -> dict[str, Any]:
+    """Async variant of get_initial_state: SoC and water reads run concurrently."""
+    soc_entity_id, water_entity = _initial_state_entities(config)
+    ha_soc, ha_water = await asyncio.gather(
+        async_get_ha_sensor_float(soc_entity_id) if soc_entity_id else _none(),
+        async_get_ha_sensor_float(water_entity) if water_entity else _none(),
+    )
+    return _build_initial_state(config, soc_entity_id, ha_soc, ha_water)
+
+
+async def _none() -> None:
+    return None
 
+
+def _initial_state_entities(config: dict[str, Any]) -> tuple[str | None, str | None]:
+    """Entity IDs for the battery SoC and (if enabled) water heater energy today."""
+    # Read entity ID from config.yaml (input_sensors)
+    input_sensors = config.get("input_sensors", {})
+    soc_entity_id = input_sensors.get("battery_soc", "sensor.inverter_battery")
+
+    # Water heater energy today (Rev K18)
+    # Only fetch if water heater feature is enabled
+    water_entity = None
+    if config.get("system", {}).get("has_water_heater", False):
+        water_entity = input_sensors.get("water_heater_consumption", "sensor.vvb_energy_daily")
+    return soc_entity_id, water_entity
+
+
+def _build_initial_state(
+    config: dict[str, Any],
+    soc_entity_id: str | None,
+    ha_soc: float | None,
+    ha_water: float | None,
+) -> dict[str, Any]:
     # Use system.battery if available, otherwise fall back to battery
     battery_config = config.get("system", {}).get("battery", config.get("battery", {}))
     capacity_kwh = battery_config.get("capacity_kwh", 10.0)
@@ -688,12 +835,7 @@ def get_initial_state(config_path: str = "config.yaml") -> dict[str, Any]:
     battery_cost_sek_per_kwh = 0.20
 
     # Prefer Home Assistant SoC when available
-    # Read entity ID from config.yaml (input_sensors)
-    input_sensors = config.get("input_sensors", {})
-    soc_entity_id = input_sensors.get("battery_soc", "sensor.inverter_battery")
-
     if soc_entity_id:
-        ha_soc = get_home_assistant_sensor_float(soc_entity_id)
         if ha_soc is not None:
             battery_soc_percent = ha_soc
         else:
@@ -707,18 +849,7 @@ def get_initial_state(config_path: str = "config.yaml") -> dict[str, Any]:
     battery_soc_percent = max(0.0, min(100.0, battery_soc_percent))
     battery_kwh = capacity_kwh * battery_soc_percent / 100.0
 
-    # Water heater energy today (Rev K18)
-    # Only fetch if water heater feature is enabled
-    system_config = config.get("system", {})
-    has_water_heater = system_config.get("has_water_heater", False)
-    water_heated_today_kwh = 0.0
-
-    if has_water_heater:
-        water_entity = input_sensors.get("water_heater_consumption", "sensor.vvb_energy_daily")
-        if water_entity:
-            ha_water = get_home_assistant_sensor_float(water_entity)
-            if ha_water is not None:
-                water_heated_today_kwh = ha_water
+    water_heated_today_kwh = ha_water if ha_water is not None else 0.0
 
     return {
         "battery_soc_percent": battery_soc_percent,
@@ -731,26 +862,86 @@ def get_initial_state(config_path: str = "config.yaml") -> dict[str, Any]:
 def get_all_input_data(config_path: str = "config.yaml") -> dict[str, Any]:
     """
     Orchestrate all input data fetching.
+
+    Independent sources are fetched concurrently (see gather_input_data), so
+    a replan costs roughly the slowest upstream call rather than their sum.
     """
-    # Load config
-    with Path(config_path).open() as f:
-        config = yaml.safe_load(f)
+    return asyncio.run(gather_input_data(config_path))
 
-    # --- AUTO-RUN ML INFERENCE IF AURORA IS ACTIVE ---
-    if config.get("forecasting", {}).get("active_forecast_version") == "aurora":
-        try:
-            print("🧠 Running AURORA ML Inference Pipeline (base + correction)...")
-            from ml.pipeline import run_inference
 
-            # Rev 2.4.13: Respect configured horizon (default 2 days / 48h)
-            # Previously hardcoded to 168h (7 days), causing wasted CPU cycles.
-            learning_cfg = config.get("learning", {})
-            days = int(learning_cfg.get("horizon_days", 2))
-            hours = days * 24
+def _in_thread[T](func: Callable[..., T], *args: Any) -> Awaitable[T]:
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(_input_executor, functools.partial(func, *args))
 
-            run_inference(horizon_hours=hours, forecast_version="aurora")
-        except Exception as e:
-            print(f"⚠️ AURORA Inference Pipeline Failed: {e}")
+
+async def _timed[T](
+    timings: dict[str, float],
+    name: str,
+    source: Awaitable[T],
+    *,
+    timeout_s: float | None = None,
+    fallback: Callable[[], T] | None = None,
+) -> T:
+    """
+    Await one input source, recording its latency (ms) under ``name``.
+
+    With a fallback, a timeout or error yields fallback() instead of failing
+    the whole stage. Sources without one (prices, SoC) propagate errors.
+    """
+    start = time.perf_counter()
+    try:
+        return await asyncio.wait_for(source, timeout=timeout_s)
+    except Exception as exc:
+        if fallback is None:
+            raise
+        reason = "timed out" if isinstance(exc, TimeoutError) else f"failed: {exc}"
+        print(f"Warning: Input source '{name}' {reason}, using fallback")
+        return fallback()
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000.0, 1)
+
+
+def _run_aurora_inference(config: dict[str, Any]) -> None:
+    try:
+        print("🧠 Running AURORA ML Inference Pipeline (base + correction)...")
+        from ml.pipeline import run_inference
+
+        # Rev 2.4.13: Respect configured horizon (default 2 days / 48h)
+        # Previously hardcoded to 168h (7 days), causing wasted CPU cycles.
+        learning_cfg = config.get("learning", {})
+        days = int(learning_cfg.get("horizon_days", 2))
+        hours = days * 24
+
+        run_inference(horizon_hours=hours, forecast_version="aurora")
+    except Exception as e:
+        print(f"⚠️ AURORA Inference Pipeline Failed: {e}")
+
+
+def _load_profile_fallback(config: dict[str, Any], aurora: bool) -> list[float]:
+    # Aurora only uses the HA profile to fill gaps in its DB forecast
+    return [0.0] * 96 if aurora else get_dummy_load_profile(config)
+
+
+def _fetch_load_profile(config: dict[str, Any], aurora: bool) -> list[float]:
+    try:
+        return get_load_profile_from_ha(config)
+    except Exception as exc:
+        print(f"Warning: Failed to get HA load profile, using fallback: {exc}")
+        return _load_profile_fallback(config, aurora)
+
+
+async def gather_input_data(config_path: str = "config.yaml") -> dict[str, Any]:
+    """
+    Fetch all planner inputs concurrently.
+
+    HA state reads go through the shared async client; blocking sources
+    (Nordpool, Open-Meteo volatility, HA history, Aurora inference) run in
+    worker threads. Forecast assembly waits for prices, inference and the
+    load profile. Per-source latencies are returned under "input_timings_ms".
+    """
+    config = load_yaml(config_path)
+    timings: dict[str, float] = {}
+    stage_start = time.perf_counter()
 
     # --- FETCH CONTEXT (New in Rev 19, extended in Rev 58) ---
     sensors = config.get("input_sensors", {})
@@ -762,13 +953,78 @@ def get_all_input_data(config_path: str = "config.yaml") -> dict[str, Any]:
     now_local = datetime.now(local_tz)
     horizon_end = now_local + timedelta(hours=48)
 
-    volatility_raw = get_weather_volatility(now_local, horizon_end, config)
+    # --- AUTO-RUN ML INFERENCE IF AURORA IS ACTIVE ---
+    aurora = _uses_aurora(config)
+
+    try:
+        (
+            _,
+            volatility_raw,
+            vacation_mode,
+            alarm_armed,
+            price_data,
+            load_profile,
+            initial_state,
+        ) = await asyncio.gather(
+            _timed(
+                timings,
+                "aurora_inference",
+                _in_thread(_run_aurora_inference, config) if aurora else _none(),
+            ),
+            _timed(
+                timings,
+                "weather_volatility",
+                _in_thread(get_weather_volatility, now_local, horizon_end, config),
+                timeout_s=INPUT_SOURCE_TIMEOUTS_S["weather_volatility"],
+                fallback=dict,
+            ),
+            _timed(
+                timings,
+                "vacation_mode",
+                async_get_home_assistant_bool(vacation_id) if vacation_id else _false(),
+                timeout_s=INPUT_SOURCE_TIMEOUTS_S["ha_state"],
+                fallback=bool,
+            ),
+            _timed(
+                timings,
+                "alarm_state",
+                async_get_home_assistant_bool(alarm_id) if alarm_id else _false(),
+                timeout_s=INPUT_SOURCE_TIMEOUTS_S["ha_state"],
+                fallback=bool,
+            ),
+            _timed(timings, "nordpool", _in_thread(get_nordpool_data, config_path)),
+            _timed(
+                timings,
+                "load_profile",
+                _in_thread(_fetch_load_profile, config, aurora),
+                timeout_s=INPUT_SOURCE_TIMEOUTS_S["load_profile"],
+                fallback=lambda: _load_profile_fallback(config, aurora),
+            ),
+            _timed(timings, "initial_state", async_get_initial_state(config)),
+        )
+
+        # Forecasts read Aurora's output and are aligned to the price slots
+        if aurora:
+            forecast_source = _in_thread(
+                _get_forecast_data_aurora, price_data, config, load_profile
+            )
+        else:
+            forecast_source = _get_forecast_data_async(price_data, config, load_profile)
+        forecast_result = await _timed(timings, "forecast", forecast_source)
+    finally:
+        await close_async_ha_client()
+
+    timings["total"] = round((time.perf_counter() - stage_start) * 1000.0, 1)
+    print(
+        "[inputs] Gathered inputs in "
+        + ", ".join(f"{name}={ms:.0f}ms" for name, ms in timings.items())
+    )
+
     cloud_vol = float(volatility_raw.get("cloud_volatility", 0.0) or 0.0)
     temp_vol = float(volatility_raw.get("temp_volatility", 0.0) or 0.0)
-
     context = {
-        "vacation_mode": get_home_assistant_bool(vacation_id) if vacation_id else False,
-        "alarm_armed": get_home_assistant_bool(alarm_id) if alarm_id else False,
+        "vacation_mode": vacation_mode,
+        "alarm_armed": alarm_armed,
         "weather_volatility": {
             "cloud": max(0.0, min(1.0, cloud_vol)),
             "temp": max(0.0, min(1.0, temp_vol)),
@@ -776,23 +1032,22 @@ def get_all_input_data(config_path: str = "config.yaml") -> dict[str, Any]:
     }
     # -------------------------------------
 
-    price_data = get_nordpool_data(config_path)
-
-    forecast_result = get_forecast_data(price_data, config)
-    forecast_data = forecast_result.get("slots", [])
-    initial_state = get_initial_state(config_path)
-
     return {
         "price_data": price_data,
-        "forecast_data": forecast_data,
+        "forecast_data": forecast_result.get("slots", []),
         "initial_state": initial_state,
         "daily_pv_forecast": forecast_result.get("daily_pv_forecast", {}),
         "daily_load_forecast": forecast_result.get("daily_load_forecast", {}),
         "daily_probabilistic": forecast_result.get("daily_probabilistic", {}),
         "context": context,
+        "input_timings_ms": timings,
     }
 
 
+async def _false() -> bool:
+    return False
+
+
 def get_db_forecast_slots(
     start: datetime, end: datetime, config: dict[str, Any]
 ) -> list[dict[str, Any]]:
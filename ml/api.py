@@ -4,12 +4,12 @@ API router for Aurora-based forecasting and Antares model parameters.
 
 from __future__ import annotations
 
-import sqlite3
 from typing import TYPE_CHECKING, Any, cast
 
 # import aiosqlite # Lazy imported
 import pandas as pd
 
+from backend.core.db import connect as db_connect
 from backend.learning import LearningEngine, get_learning_engine
 
 # Lazy import for experimental simulation module (not included in production Docker)
@@ -47,7 +47,7 @@ def get_forecast_slots(
     engine = _get_engine()
     db_path = str(getattr(engine, "db_path", "data/planner_learning.db"))
 
-    with sqlite3.connect(db_path, timeout=30.0) as conn:
+    with db_connect(db_path) as conn:
         query = """
             SELECT
                 slot_start,
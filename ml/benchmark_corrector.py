@@ -0,0 +1,137 @@
+"""
+Micro-benchmark for Aurora residual-correction inference.
+
+Compares the original per-slot loop (two single-row booster calls plus Python
+clamping per slot) with the vectorized path used by predict_corrections, on
+synthetic boosters and a synthetic horizon, and checks both give identical
+results.
+
+    python -m ml.benchmark_corrector --horizon-hours 48 --repeats 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from ml.corrector import _clamp_correction, _select_corrections
+
+FEATURE_COLS = [
+    "hour",
+    "day_of_week",
+    "month",
+    "is_weekend",
+    "hour_sin",
+    "hour_cos",
+    "temp_c",
+    "cloud_cover_pct",
+    "vacation_mode_flag",
+]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark residual-correction inference.")
+    parser.add_argument("--horizon-hours", type=int, default=48, help="Horizon (default: 48).")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed runs per path.")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def _synthetic_features(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    hour = (np.arange(n) // 4) % 24
+    dow = (np.arange(n) // 96) % 7
+    return pd.DataFrame(
+        {
+            "hour": hour,
+            "day_of_week": dow,
+            "month": np.full(n, 6),
+            "is_weekend": (dow >= 5).astype(int),
+            "hour_sin": np.sin(2 * np.pi * hour / 24),
+            "hour_cos": np.cos(2 * np.pi * hour / 24),
+            "temp_c": rng.normal(15.0, 5.0, n),
+            "cloud_cover_pct": rng.uniform(0.0, 100.0, n),
+            "vacation_mode_flag": np.zeros(n),
+        }
+    )[FEATURE_COLS]
+
+
+def _train_booster(X: pd.DataFrame, rng: np.random.Generator) -> lgb.Booster:
+    y = 0.1 * np.sin(X["hour"].to_numpy() / 3.0) + rng.normal(0.0, 0.05, len(X))
+    params = {"objective": "regression", "verbosity": -1, "num_leaves": 31}
+    return lgb.train(params, lgb.Dataset(X, label=y), num_boost_round=200)
+
+
+def _per_slot(pv_base, load_base, pv_bias, load_bias, models, X):
+    """The pre-vectorization loop from predict_corrections."""
+    pv_out, load_out, sources = [], [], []
+    for idx in range(len(pv_base)):
+        stats_pv = _clamp_correction(pv_base[idx], pv_bias[idx])
+        stats_load = _clamp_correction(load_base[idx], load_bias[idx])
+        pv_corr, load_corr, source = stats_pv, stats_load, "stats"
+        row = X.iloc[[idx]]
+        raw_pv = float(models["pv_residual"].predict(row)[0])
+        ml_pv = _clamp_correction(pv_base[idx], raw_pv)
+        if abs(ml_pv) <= abs(stats_pv) or stats_pv == 0.0:
+            pv_corr, source = ml_pv, "ml"
+        raw_load = float(models["load_residual"].predict(row)[0])
+        ml_load = _clamp_correction(load_base[idx], raw_load)
+        if abs(ml_load) <= abs(stats_load) or stats_load == 0.0:
+            load_corr, source = ml_load, "ml"
+        pv_out.append(pv_corr)
+        load_out.append(load_corr)
+        sources.append(source)
+    return pv_out, load_out, sources
+
+
+def _vectorized(pv_base, load_base, pv_bias, load_bias, models, X):
+    pv_corr, load_corr, used_ml = _select_corrections(
+        pv_base, load_base, pv_bias, load_bias, models, X
+    )
+    return pv_corr.tolist(), load_corr.tolist(), np.where(used_ml, "ml", "stats").tolist()
+
+
+def _time(fn, repeats: int, *args) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    args = _parse_args()
+    rng = np.random.default_rng(args.seed)
+    n = args.horizon_hours * 4
+
+    train_X = _synthetic_features(30 * 96, rng)
+    models = {
+        "pv_residual": _train_booster(train_X, rng),
+        "load_residual": _train_booster(train_X, rng),
+    }
+
+    X = _synthetic_features(n, rng)
+    pv_base = rng.uniform(0.0, 1.5, n)
+    load_base = rng.uniform(0.1, 1.0, n)
+    pv_bias = rng.normal(0.0, 0.1, n)
+    load_bias = rng.normal(0.0, 0.1, n)
+    inputs = (pv_base, load_base, pv_bias, load_bias, models, X)
+
+    if _per_slot(*inputs) != _vectorized(*inputs):
+        raise SystemExit("❌ Vectorized corrections differ from the per-slot loop")
+
+    per_slot_s = _time(_per_slot, args.repeats, *inputs)
+    vectorized_s = _time(_vectorized, args.repeats, *inputs)
+
+    print(f"--- Correction inference ({n} slots, best of {args.repeats}) ---")
+    print(f"Per-slot loop: {per_slot_s * 1000:8.2f} ms")
+    print(f"Vectorized:    {vectorized_s * 1000:8.2f} ms")
+    print(f"Speedup:       {per_slot_s / vectorized_s:8.1f}x (results identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,19 @@ Post-processing and correction logic for Aurora/Antares forecasts.
 from __future__ import annotations
 
 import contextlib
-import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 import lightgbm as lgb
 import numpy as np
 import pandas as pd
 
+from backend.core.db import connect as db_connect
 from backend.learning import LearningEngine, get_learning_engine
 from ml.context_features import get_vacation_mode_series
+from ml.model_registry import model_registry
 from ml.train import _build_time_features
 from ml.weather import get_weather_series
 
@@ -38,15 +40,14 @@ def _count_days_with_data(engine: LearningEngine, max_days: int = 90) -> int:
     """
     Count distinct days where both observations and forecasts exist.
     """
-    tz = engine.timezone
-    cutoff = (datetime.now(tz) - timedelta(days=max_days)).date().isoformat()
+    cutoff = engine.store.cutoff_epoch(max_days)
 
-    with sqlite3.connect(engine.db_path, timeout=30.0) as conn:
+    with db_connect(engine.db_path) as conn:
         query = """
-            SELECT COUNT(DISTINCT DATE(o.slot_start))
+            SELECT COUNT(DISTINCT o.slot_date)
             FROM slot_observations o
             JOIN slot_forecasts f ON o.slot_start = f.slot_start
-            WHERE DATE(o.slot_start) >= ?
+            WHERE o.slot_epoch >= ?
               AND o.load_kwh IS NOT NULL
               AND f.load_forecast_kwh IS NOT NULL
         """
@@ -68,9 +69,9 @@ def _load_training_frame(engine: LearningEngine, days_back: int = 30) -> pd.Data
     Build a training dataframe with actuals, base forecasts, and context features.
     """
     tz = engine.timezone
-    cutoff_date = (datetime.now(tz) - timedelta(days=days_back)).date().isoformat()
+    cutoff = engine.store.cutoff_epoch(days_back)
 
-    with sqlite3.connect(engine.db_path, timeout=30.0) as conn:
+    with db_connect(engine.db_path) as conn:
         query = """
             SELECT
                 o.slot_start,
@@ -80,13 +81,13 @@ def _load_training_frame(engine: LearningEngine, days_back: int = 30) -> pd.Data
                 f.load_forecast_kwh
             FROM slot_observations o
             JOIN slot_forecasts f ON o.slot_start = f.slot_start
-            WHERE DATE(o.slot_start) >= ?
+            WHERE o.slot_epoch >= ?
               AND o.pv_kwh IS NOT NULL
               AND o.load_kwh IS NOT NULL
               AND f.pv_forecast_kwh IS NOT NULL
               AND f.load_forecast_kwh IS NOT NULL
         """
-        df = pd.read_sql_query(query, conn, params=(cutoff_date,))
+        df = pd.read_sql_query(query, conn, params=(cutoff,))
 
     if df.empty:
         return df
@@ -208,6 +209,15 @@ def train(models_dir: str = "ml/models") -> dict[str, Any]:
 
 
 def _load_error_models(models_dir: str = "ml/models") -> dict[str, lgb.Booster]:
+    """Residual boosters from the registry, re-read only after retraining."""
+    return model_registry.get(
+        f"aurora_error:{Path(models_dir).resolve()}",
+        lambda: _read_error_models(models_dir),
+        [f"{models_dir}/pv_error.lgb", f"{models_dir}/load_error.lgb"],
+    )
+
+
+def _read_error_models(models_dir: str = "ml/models") -> dict[str, lgb.Booster]:
     models: dict[str, lgb.Booster] = {}
     with contextlib.suppress(Exception):
         models["pv_residual"] = lgb.Booster(model_file=f"{models_dir}/pv_error.lgb")
@@ -223,7 +233,7 @@ def _compute_stats_bias(
     Compute rolling average residual per (day_of_week, hour) for PV and load.
     """
     tz = engine.timezone
-    cutoff_date = (datetime.now(tz) - timedelta(days=days_back)).date().isoformat()
+    cutoff = engine.store.cutoff_epoch(days_back)
 
     sql = """
         SELECT
@@ -234,7 +244,7 @@ def _compute_stats_bias(
             f.load_forecast_kwh
         FROM slot_observations o
         JOIN slot_forecasts f ON o.slot_start = f.slot_start
-        WHERE DATE(o.slot_start) >= ?
+        WHERE o.slot_epoch >= ?
           AND o.pv_kwh IS NOT NULL
           AND o.load_kwh IS NOT NULL
           AND f.pv_forecast_kwh IS NOT NULL
@@ -242,9 +252,9 @@ def _compute_stats_bias(
     """
 
     buckets: dict[tuple[int, int], list[tuple[float, float]]] = {}
-    with sqlite3.connect(engine.db_path, timeout=30.0) as conn:
+    with db_connect(engine.db_path) as conn:
         for slot_start, pv_kwh, load_kwh, pv_forecast, load_forecast in conn.execute(
-            sql, (cutoff_date,)
+            sql, (cutoff,)
         ):
             try:
                 ts = pd.Timestamp(slot_start)
@@ -282,6 +292,95 @@ def _clamp_correction(base: float, raw_correction: float) -> float:
     return float(max(-max_abs, min(max_abs, raw)))
 
 
+def _clamp_corrections(base: np.ndarray, raw: np.ndarray) -> np.ndarray:
+    """
+    Vectorized _clamp_correction over aligned arrays (same results element-wise).
+    """
+    max_abs = 0.5 * base
+    clamped = np.maximum(-max_abs, np.minimum(max_abs, raw))
+    # Python's min()/max() keep the bound when raw is NaN; np.minimum would propagate it
+    clamped = np.where(np.isnan(raw), max_abs, clamped)
+    return np.where(base <= 0.0, 0.0, clamped)
+
+
+def _base_arrays(base_records: list[dict[str, Any]], key: str) -> np.ndarray:
+    return np.array([float(rec[key] or 0.0) for rec in base_records], dtype=np.float64)
+
+
+def _stats_bias_arrays(
+    base_records: list[dict[str, Any]],
+    stats_bias: dict[tuple[int, int], tuple[float, float]],
+    tz: Any,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Look up the (day_of_week, hour) bias for every slot via a 7x24 table.
+    """
+    table = np.zeros((7 * 24, 2), dtype=np.float64)
+    for (dow, hour), (pv_bias, load_bias) in stats_bias.items():
+        table[dow * 24 + hour] = (pv_bias, load_bias)
+
+    starts = pd.to_datetime([rec["slot_start"] for rec in base_records], utc=True).tz_convert(tz)
+    keys = np.asarray(starts.dayofweek * 24 + starts.hour, dtype=np.intp)
+    return table[keys, 0], table[keys, 1]
+
+
+def _select_corrections(
+    pv_base: np.ndarray,
+    load_base: np.ndarray,
+    pv_bias: np.ndarray,
+    load_bias: np.ndarray,
+    models: dict[str, lgb.Booster],
+    X: pd.DataFrame | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Combine stats and ML corrections for every slot at once.
+
+    Each booster predicts over the whole feature matrix in a single call. Per
+    target, the ML correction wins when it is no larger than the stats one (or
+    the stats one is zero); a slot is tagged "ml" if either target used ML.
+
+    Returns (pv_corrections, load_corrections, used_ml mask).
+    """
+    pv_corr = _clamp_corrections(pv_base, pv_bias)
+    load_corr = _clamp_corrections(load_base, load_bias)
+    used_ml = np.zeros(len(pv_base), dtype=bool)
+    if X is None or len(X) == 0:
+        return pv_corr, load_corr, used_ml
+
+    for target, base, stats_corr in (
+        ("pv_residual", pv_base, pv_corr),
+        ("load_residual", load_base, load_corr),
+    ):
+        if target not in models:
+            continue
+        raw = np.asarray(models[target].predict(X), dtype=np.float64)[: len(base)]
+        ml_corr = _clamp_corrections(base, raw)
+        use_ml = (np.abs(ml_corr) <= np.abs(stats_corr)) | (stats_corr == 0.0)
+        stats_corr[use_ml] = ml_corr[use_ml]
+        used_ml |= use_ml
+
+    return pv_corr, load_corr, used_ml
+
+
+def _corrections_list(
+    base_records: list[dict[str, Any]],
+    pv_corr: np.ndarray,
+    load_corr: np.ndarray,
+    sources: list[str],
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "slot_start": rec["slot_start"],
+            "pv_correction_kwh": pv,
+            "load_correction_kwh": load,
+            "correction_source": source,
+        }
+        for rec, pv, load, source in zip(
+            base_records, pv_corr.tolist(), load_corr.tolist(), sources, strict=True
+        )
+    ]
+
+
 def predict_corrections(
     horizon_hours: int = 48,
     forecast_version: str = "aurora",
@@ -320,61 +419,26 @@ def predict_corrections(
     if not base_records:
         return [], "none"
 
-    corrections: list[dict[str, Any]] = []
-
     if level.level == 0:
         # Infant: no corrections at all.
-        for rec in base_records:
-            corrections.append(
-                {
-                    "slot_start": rec["slot_start"],
-                    "pv_correction_kwh": 0.0,
-                    "load_correction_kwh": 0.0,
-                    "correction_source": "none",
-                }
-            )
-        return corrections, "none"
+        zeros = np.zeros(len(base_records), dtype=np.float64)
+        return _corrections_list(base_records, zeros, zeros, ["none"] * len(base_records)), "none"
 
     # Level 1+ need statistical bias map
     stats_bias = _compute_stats_bias(engine)
-
-    if level.level == 1:
-        # Statistician: rolling average bias only.
-        for rec in base_records:
-            ts = rec["slot_start"].astimezone(tz)
-            key = (ts.weekday(), ts.hour)
-            pv_bias, load_bias = stats_bias.get(key, (0.0, 0.0))
-            pv_corr = _clamp_correction(rec["pv_forecast_kwh"], pv_bias)
-            load_corr = _clamp_correction(rec["load_forecast_kwh"], load_bias)
-            corrections.append(
-                {
-                    "slot_start": rec["slot_start"],
-                    "pv_correction_kwh": pv_corr,
-                    "load_correction_kwh": load_corr,
-                    "correction_source": "stats",
-                }
-            )
-        return corrections, "stats"
+    pv_base = _base_arrays(base_records, "pv_forecast_kwh")
+    load_base = _base_arrays(base_records, "load_forecast_kwh")
+    pv_bias, load_bias = _stats_bias_arrays(base_records, stats_bias, tz)
 
     # Level 2: Graduate - ML error model with stats fallback.
-    models = _load_error_models(models_dir=models_dir)
+    models = _load_error_models(models_dir=models_dir) if level.level >= 2 else {}
     if not models:
-        # If ML models are missing, fall back to Level 1 semantics.
-        for rec in base_records:
-            ts = rec["slot_start"].astimezone(tz)
-            key = (ts.weekday(), ts.hour)
-            pv_bias, load_bias = stats_bias.get(key, (0.0, 0.0))
-            pv_corr = _clamp_correction(rec["pv_forecast_kwh"], pv_bias)
-            load_corr = _clamp_correction(rec["load_forecast_kwh"], load_bias)
-            corrections.append(
-                {
-                    "slot_start": rec["slot_start"],
-                    "pv_correction_kwh": pv_corr,
-                    "load_correction_kwh": load_corr,
-                    "correction_source": "stats",
-                }
-            )
-        return corrections, "stats"
+        # Statistician (or graduate with ML models missing): rolling average bias only.
+        pv_corr, load_corr, _ = _select_corrections(
+            pv_base, load_base, pv_bias, load_bias, {}, None
+        )
+        stats_sources = ["stats"] * len(base_records)
+        return _corrections_list(base_records, pv_corr, load_corr, stats_sources), "stats"
 
     # Build feature frame for the horizon, mirroring forward.py
     df = pd.DataFrame({"slot_start": [rec["slot_start"] for rec in base_records]})
@@ -415,43 +479,8 @@ def predict_corrections(
 
     X = df[feature_cols].fillna(0.0)
 
-    for idx, rec in enumerate(base_records):
-        ts = rec["slot_start"].astimezone(tz)
-        key = (ts.weekday(), ts.hour)
-        pv_bias, load_bias = stats_bias.get(key, (0.0, 0.0))
-
-        # Stats fallback values
-        stats_pv_corr = _clamp_correction(rec["pv_forecast_kwh"], pv_bias)
-        stats_load_corr = _clamp_correction(rec["load_forecast_kwh"], load_bias)
-
-        pv_corr = stats_pv_corr
-        load_corr = stats_load_corr
-        source = "stats"
-
-        # Attempt ML corrections
-        row_features = X.iloc[[idx]]
-
-        if "pv_residual" in models:
-            raw_pv = float(models["pv_residual"].predict(row_features)[0])
-            ml_pv_corr = _clamp_correction(rec["pv_forecast_kwh"], raw_pv)
-            if abs(ml_pv_corr) <= abs(stats_pv_corr) or stats_pv_corr == 0.0:
-                pv_corr = ml_pv_corr
-                source = "ml"
-
-        if "load_residual" in models:
-            raw_load = float(models["load_residual"].predict(row_features)[0])
-            ml_load_corr = _clamp_correction(rec["load_forecast_kwh"], raw_load)
-            if abs(ml_load_corr) <= abs(stats_load_corr) or stats_load_corr == 0.0:
-                load_corr = ml_load_corr
-                source = "ml"
-
-        corrections.append(
-            {
-                "slot_start": rec["slot_start"],
-                "pv_correction_kwh": pv_corr,
-                "load_correction_kwh": load_corr,
-                "correction_source": source,
-            }
-        )
-
-    return corrections, "ml"
+    pv_corr, load_corr, used_ml = _select_corrections(
+        pv_base, load_base, pv_bias, load_bias, models, X
+    )
+    sources = np.where(used_ml, "ml", "stats").tolist()
+    return _corrections_list(base_records, pv_corr, load_corr, sources), "ml"
@@ -5,18 +5,45 @@ Main entry point for calculating forecasted states for the next window (Aurora).
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import lightgbm as lgb
+import numpy as np
 import pandas as pd
 
 from backend.learning import LearningEngine, get_learning_engine
 from ml.context_features import get_alarm_armed_series, get_vacation_mode_series
+from ml.model_registry import model_registry
 from ml.train import _build_time_features
 from ml.weather import get_weather_series
 
+if TYPE_CHECKING:
+    from backend.astro import SunCalculator
+
+
+def _model_files(models_dir: str) -> list[str]:
+    """Every file _read_models may pick up (quantile files and legacy p50 names)."""
+    files = []
+    for target in ("load", "pv"):
+        files.extend(f"{models_dir}/{target}_model_{q}.lgb" for q in ("p10", "p50", "p90"))
+        files.append(f"{models_dir}/{target}_model.lgb")
+    return files
+
 
 def _load_models(models_dir: str = "ml/models") -> dict[str, lgb.Booster]:
+    """
+    Return AURORA forward models from the registry; files are re-read only
+    when one of them changes on disk.
+    """
+    return model_registry.get(
+        f"aurora_forward:{Path(models_dir).resolve()}",
+        lambda: _read_models(models_dir),
+        _model_files(models_dir),
+    )
+
+
+def _read_models(models_dir: str = "ml/models") -> dict[str, lgb.Booster]:
     """Load trained LightGBM models for AURORA forward inference (Probabilistic)."""
     models: dict[str, lgb.Booster] = {}
 
@@ -56,6 +83,36 @@ def _load_models(models_dir: str = "ml/models") -> dict[str, lgb.Booster]:
     return models
 
 
+def _clamp_pv(
+    raw: np.ndarray,
+    slot_starts: pd.Series,
+    radiation: np.ndarray,
+    sun_calc: SunCalculator | None,
+) -> np.ndarray:
+    """
+    Post-process raw PV predictions for all quantiles at once.
+
+    ``raw`` has one column per quantile. Values are floored at zero, zeroed
+    outside daylight (astro clamp, 30 min buffer) and when forecast radiation
+    is below 1 W/m2, then smoothed with a centred 3-slot rolling mean.
+    """
+    if sun_calc is not None:
+        daylight = sun_calc.daylight_mask(slot_starts, buffer_minutes=30)
+    else:
+        # Fallback
+        hours = slot_starts.dt.hour.to_numpy()
+        daylight = (hours >= 5) & (hours < 22)
+
+    # NaN radiation (no weather data) does not clamp
+    dark = ~daylight | (radiation < 1.0)
+    values = np.where(dark[:, None], 0.0, np.maximum(raw, 0.0))
+
+    # 3. Smoothing (Rolling Average)
+    # Apply to all bands to prevent sawtooth
+    smoothed = pd.DataFrame(values).rolling(window=3, center=True, min_periods=1).mean()
+    return smoothed.fillna(0.0).to_numpy()
+
+
 def generate_forward_slots(
     horizon_hours: int = 168,
     forecast_version: str = "aurora",
@@ -165,11 +222,11 @@ def generate_forward_slots(
     for q in quantiles:
         model_key = f"load_{q}"
         if model_key in models:
-            raw_pred = models[model_key].predict(X)
             # Apply guardrails (same for all bands)
             # Floor at 0.01, Ceiling at 16kW
-            cleaned = [max(0.01, min(float(x), 16.0)) for x in raw_pred]
-            predictions[model_key] = pd.Series(cleaned, index=df.index)
+            predictions[model_key] = pd.Series(
+                np.clip(models[model_key].predict(X), 0.01, 16.0), index=df.index
+            )
 
     # --- PV INFERENCE ---
     # Setup Astro Clamping
@@ -183,57 +240,31 @@ def generate_forward_slots(
     except Exception as e:
         print(f"⚠️ Astro init failed: {e}")
 
-    for q in quantiles:
-        model_key = f"pv_{q}"
-        if model_key in models:
-            raw_pred = models[model_key].predict(X)
-
-            series = pd.Series(0.0, index=df.index)
-            for idx, row in df.iterrows():
-                val = float(max(raw_pred[idx], 0.0))
-                slot_ts = row["slot_start"]
-
-                # 1. Astro Clamp
-                is_sun_up = False
-                if sun_calc:
-                    is_sun_up = sun_calc.is_sun_up(slot_ts, buffer_minutes=30)
-                else:
-                    # Fallback
-                    h = slot_ts.hour
-                    is_sun_up = 5 <= h < 22
-
-                if not is_sun_up:
-                    val = 0.0
-
-                # 2. Radiation Clamp
-                rad = row.get("shortwave_radiation_w_m2")
-                if rad is not None and rad < 1.0:
-                    val = 0.0
-
-                series[idx] = val
-
-            # 3. Smoothing (Rolling Average)
-            # Apply to all bands to prevent sawtooth
-            predictions[model_key] = (
-                series.rolling(window=3, center=True, min_periods=1).mean().fillna(0.0)
-            )
+    pv_keys = [f"pv_{q}" for q in quantiles if f"pv_{q}" in models]
+    if pv_keys:
+        raw_pv = np.column_stack([models[key].predict(X) for key in pv_keys])
+        clamped = _clamp_pv(
+            raw_pv, df["slot_start"], df["shortwave_radiation_w_m2"].to_numpy(), sun_calc
+        )
+        for key, column in zip(pv_keys, clamped.T, strict=True):
+            predictions[key] = pd.Series(column, index=df.index)
 
     # --- STORE RESULTS ---
-    forecasts: list[dict[str, Any]] = []
-    for idx, row in df.iterrows():
-        item = {
-            "slot_start": row["slot_start"].isoformat(),
-            "temp_c": row.get("temp_c"),
+    out = pd.DataFrame(
+        {
+            "slot_start": df["slot_start"].map(pd.Timestamp.isoformat),
+            "temp_c": df["temp_c"],
             # Primary (Legacy/p50)
-            "pv_forecast_kwh": float(predictions["pv_p50"][idx]),
-            "load_forecast_kwh": float(predictions["load_p50"][idx]),
+            "pv_forecast_kwh": predictions["pv_p50"],
+            "load_forecast_kwh": predictions["load_p50"],
             # Probabilistic Bands
-            "pv_p10": float(predictions["pv_p10"][idx]),
-            "pv_p90": float(predictions["pv_p90"][idx]),
-            "load_p10": float(predictions["load_p10"][idx]),
-            "load_p90": float(predictions["load_p90"][idx]),
+            "pv_p10": predictions["pv_p10"],
+            "pv_p90": predictions["pv_p90"],
+            "load_p10": predictions["load_p10"],
+            "load_p90": predictions["load_p90"],
         }
-        forecasts.append(item)
+    )
+    forecasts: list[dict[str, Any]] = out.to_dict("records")
 
     if forecasts:
         engine.store_forecasts(forecasts, forecast_version=forecast_version)
@@ -0,0 +1,179 @@
+"""
+Model Registry
+
+Long-lived, in-process cache of loaded ML artifacts: Aurora LightGBM boosters
+and Antares policies. The planner runs inside the FastAPI process, so keeping
+models loaded across cycles saves the parse cost of every forward run.
+
+Each entry has a name and a list of source files, and is fingerprinted by
+their (mtime_ns, size). A lookup costs one stat() per source. A changed
+fingerprint, including a file that appears or disappears, triggers a reload.
+The new object is built off to the side and swapped in with a single
+assignment, so readers see either the complete old version or the complete
+new one. If a reload fails, the previous version keeps being served.
+
+Returned objects are shared between callers and must not be mutated.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+logger = logging.getLogger("darkstar.ml.registry")
+
+Fingerprint = tuple[tuple[str, int | None, int | None], ...]
+
+
+def _fingerprint(sources: list[Path]) -> Fingerprint:
+    parts = []
+    for path in sources:
+        try:
+            st = path.stat()
+        except OSError:
+            parts.append((str(path), None, None))
+            continue
+        parts.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(parts)
+
+
+def _rss_bytes() -> int | None:
+    """Resident set size of this process (Linux only, None elsewhere)."""
+    try:
+        with Path("/proc/self/statm").open(encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    fingerprint: Fingerprint
+    loaded_at: str
+    load_s: float
+    artifact_bytes: int
+    rss_delta_bytes: int | None  # Approximate: other threads allocate too
+    version: int
+
+
+class ModelRegistry:
+    """Named, fingerprint-validated cache of loaded models."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        self._load_locks: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.loads = 0
+        self.failures = 0
+
+    def get[T](self, name: str, loader: Callable[[], T], sources: Iterable[str | Path]) -> T:
+        """
+        Return the loaded model for `name`, calling `loader` only when the
+        source files changed since the last load (or on first use).
+        """
+        paths = [Path(p) for p in sources]
+        entry = self._entries.get(name)
+        if entry is not None and entry.fingerprint == _fingerprint(paths):
+            with self._lock:
+                self.hits += 1
+            return entry.value
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            # Another thread may have loaded this version while we waited
+            entry = self._entries.get(name)
+            fingerprint = _fingerprint(paths)
+            if entry is not None and entry.fingerprint == fingerprint:
+                with self._lock:
+                    self.hits += 1
+                return entry.value
+
+            rss_before = _rss_bytes()
+            t0 = time.perf_counter()
+            try:
+                value = loader()
+            except Exception as e:
+                with self._lock:
+                    self.failures += 1
+                if entry is None:
+                    raise
+                logger.warning("Reloading model %s failed, keeping previous version: %s", name, e)
+                return entry.value
+            load_s = time.perf_counter() - t0
+            rss_after = _rss_bytes()
+
+            new_entry = _Entry(
+                value=value,
+                fingerprint=fingerprint,
+                loaded_at=datetime.now(UTC).isoformat(),
+                load_s=load_s,
+                artifact_bytes=sum(part[2] or 0 for part in fingerprint),
+                rss_delta_bytes=(
+                    rss_after - rss_before
+                    if rss_before is not None and rss_after is not None
+                    else None
+                ),
+                version=entry.version + 1 if entry is not None else 1,
+            )
+            with self._lock:
+                self._entries[name] = new_entry
+                self.loads += 1
+            logger.info(
+                "Loaded model %s v%d in %.1f ms (%d bytes on disk)",
+                name,
+                new_entry.version,
+                load_s * 1000.0,
+                new_entry.artifact_bytes,
+            )
+            return value
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop one entry (or all) so the next lookup reloads from disk."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.loads = 0
+            self.failures = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries = dict(self._entries)
+            totals = {"hits": self.hits, "loads": self.loads, "failures": self.failures}
+        return {
+            **totals,
+            "models": {
+                name: {
+                    "version": e.version,
+                    "loaded_at": e.loaded_at,
+                    "load_ms": round(e.load_s * 1000.0, 2),
+                    "artifact_bytes": e.artifact_bytes,
+                    "rss_delta_bytes": e.rss_delta_bytes,
+                    "sources": [part[0] for part in e.fingerprint if part[1] is not None],
+                }
+                for name, e in sorted(entries.items())
+            },
+        }
+
+
+# Process-wide instance (planner and shadow runs execute in the API process)
+model_registry = ModelRegistry()
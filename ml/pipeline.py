@@ -9,6 +9,7 @@ from typing import Any
 
 import pandas as pd
 
+from backend.core.db import connect as db_connect
 from backend.learning import LearningEngine, get_learning_engine
 from ml.corrector import predict_corrections
 from ml.forward import generate_forward_slots
@@ -29,9 +30,7 @@ def _apply_corrections_to_db(
     if not corrections:
         return
 
-    import sqlite3
-
-    with sqlite3.connect(engine.db_path, timeout=30.0) as conn:
+    with db_connect(engine.db_path) as conn:
         cursor = conn.cursor()
         for row in corrections:
             slot_start = row.get("slot_start")
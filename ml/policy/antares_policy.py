@@ -45,22 +45,24 @@ class AntaresPolicyV1:
             [hour_of_day, load_forecast_kwh, pv_forecast_kwh,
              projected_soc_percent, import_price_sek_kwh, export_price_sek_kwh]
         """
-        x = np.asarray(state, dtype=float).reshape(1, -1)
-        result: dict[str, float] = {}
+        batch = self.predict_batch(np.asarray(state, dtype=float).reshape(1, -1))
+        return {key: float(values[0]) for key, values in batch.items()}
 
-        if self.batt_charge_model is not None:
-            result["battery_charge_kw"] = float(self.batt_charge_model.predict(x)[0])
-        else:
-            result["battery_charge_kw"] = 0.0
-
-        if self.batt_discharge_model is not None:
-            result["battery_discharge_kw"] = float(self.batt_discharge_model.predict(x)[0])
-        else:
-            result["battery_discharge_kw"] = 0.0
-
-        if self.export_model is not None:
-            result["export_kw"] = float(self.export_model.predict(x)[0])
-        else:
-            result["export_kw"] = 0.0
+    def predict_batch(self, states: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Predict control signals for a (n_slots, n_features) state matrix.
 
-        return result
+        One predict call per booster; returns an array per action key.
+        """
+        x = np.atleast_2d(np.asarray(states, dtype=float))
+        zeros = np.zeros(len(x), dtype=float)
+        return {
+            key: np.asarray(model.predict(x), dtype=float)
+            if model is not None and len(x)
+            else zeros.copy()
+            for key, model in (
+                ("battery_charge_kw", self.batt_charge_model),
+                ("battery_discharge_kw", self.batt_discharge_model),
+                ("export_kw", self.export_model),
+            )
+        }
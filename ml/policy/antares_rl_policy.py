@@ -6,6 +6,31 @@ from typing import Any
 
 import numpy as np
 
+_ACTION_KEYS = ("battery_charge_kw", "battery_discharge_kw", "export_kw")
+
+
+def _sanitize_states(states: np.ndarray) -> np.ndarray:
+    """States as a 2-D float array with NaN/inf replaced, so they cannot propagate."""
+    x = np.atleast_2d(np.asarray(states, dtype=float))
+    if not np.isfinite(x).all():
+        x = np.nan_to_num(x, nan=0.0, posinf=1e6, neginf=-1e6)
+    return x
+
+
+def _action_dict(actions: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Split an (n_slots, n_outputs) action matrix into the action dict.
+
+    Rows the network got wrong (fewer than 3 outputs, NaN or inf) fall back
+    to safe zeros, slot by slot.
+    """
+    n = actions.shape[0]
+    if actions.shape[1] < 3:
+        return {key: np.zeros(n, dtype=float) for key in _ACTION_KEYS}
+    valid = np.isfinite(actions).all(axis=1)
+    safe = np.where(valid[:, None], actions[:, :3], 0.0)
+    return {key: safe[:, i].copy() for i, key in enumerate(_ACTION_KEYS)}
+
 
 @dataclass
 class AntaresRLPolicyV1:
@@ -13,8 +38,8 @@ class AntaresRLPolicyV1:
     RL-based Antares policy wrapper (v1).
 
     This loads a trained RL model (e.g. Stable-Baselines3 PPO) from disk and
-    exposes a `.predict(state)` interface compatible with the existing
-    Antares shadow runner (returns a dict with charge/discharge/export).
+    exposes `.predict(state)` / `.predict_batch(states)` interfaces compatible
+    with the existing Antares shadow runner (dict with charge/discharge/export).
     """
 
     model: Any
@@ -31,33 +56,17 @@ class AntaresRLPolicyV1:
         return cls(model=model)
 
     def predict(self, state: np.ndarray) -> dict[str, float]:
-        if self.model is None:
-            return {
-                "battery_charge_kw": 0.0,
-                "battery_discharge_kw": 0.0,
-                "export_kw": 0.0,
-            }
-
-        # Sanitize input state to avoid NaNs propagating through the network.
-        x = np.asarray(state, dtype=float).reshape(1, -1)
-        if not np.isfinite(x).all():
-            x = np.nan_to_num(x, nan=0.0, posinf=1e6, neginf=-1e6)
-
-        action, _ = self.model.predict(x, deterministic=True)
-        action = np.asarray(action, dtype=float).flatten()
-
-        # If network outputs NaNs or infs, fall back to safe zeros.
-        if action.shape[0] < 3 or not np.isfinite(action).all():
-            return {
-                "battery_charge_kw": 0.0,
-                "battery_discharge_kw": 0.0,
-                "export_kw": 0.0,
-            }
-        return {
-            "battery_charge_kw": float(action[0]),
-            "battery_discharge_kw": float(action[1]),
-            "export_kw": float(action[2]),
-        }
+        batch = self.predict_batch(np.asarray(state, dtype=float).reshape(1, -1))
+        return {key: float(values[0]) for key, values in batch.items()}
+
+    def predict_batch(self, states: np.ndarray) -> dict[str, np.ndarray]:
+        """Predict actions for a (n_slots, n_features) state matrix in one forward pass."""
+        x = _sanitize_states(states)
+        if self.model is None or len(x) == 0:
+            return _action_dict(np.zeros((len(x), 3)))
+
+        actions, _ = self.model.predict(x, deterministic=True)
+        return _action_dict(np.asarray(actions, dtype=float).reshape(len(x), -1))
 
 
 @dataclass
@@ -66,8 +75,8 @@ class AntaresRLPolicyOracleBC:
     Oracle-guided Antares policy wrapper (v2, behaviour cloning).
 
     Loads a simple PyTorch MLP trained to imitate the Oracle MILP actions
-    given the Rev 81 8-D state vector and exposes `.predict(state)` with
-    the same action dict as v1.
+    given the Rev 81 8-D state vector and exposes `.predict(state)` /
+    `.predict_batch(states)` with the same action keys as v1.
     """
 
     model: Any
@@ -91,31 +100,19 @@ class AntaresRLPolicyOracleBC:
         return cls(model=net)
 
     def predict(self, state: np.ndarray) -> dict[str, float]:
-        import torch
+        batch = self.predict_batch(np.asarray(state, dtype=float).reshape(1, -1))
+        return {key: float(values[0]) for key, values in batch.items()}
 
-        if self.model is None:
-            return {
-                "battery_charge_kw": 0.0,
-                "battery_discharge_kw": 0.0,
-                "export_kw": 0.0,
-            }
+    def predict_batch(self, states: np.ndarray) -> dict[str, np.ndarray]:
+        """Predict actions for a (n_slots, n_features) state matrix in one forward pass."""
+        import torch
 
-        x = np.asarray(state, dtype=float).reshape(1, -1)
-        if not np.isfinite(x).all():
-            x = np.nan_to_num(x, nan=0.0, posinf=1e6, neginf=-1e6)
+        x = _sanitize_states(states)
+        if self.model is None or len(x) == 0:
+            return _action_dict(np.zeros((len(x), 3)))
 
         with torch.no_grad():
             inp = torch.from_numpy(x.astype(np.float32))
-            out = self.model(inp).cpu().numpy().reshape(-1)
-
-        if out.shape[0] < 3 or not np.isfinite(out).all():
-            return {
-                "battery_charge_kw": 0.0,
-                "battery_discharge_kw": 0.0,
-                "export_kw": 0.0,
-            }
-        return {
-            "battery_charge_kw": float(out[0]),
-            "battery_discharge_kw": float(out[1]),
-            "export_kw": float(out[2]),
-        }
+            out = self.model(inp).cpu().numpy()
+
+        return _action_dict(np.asarray(out, dtype=float).reshape(len(x), -1))
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import sqlite3
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pandas as pd
-from learning import LearningEngine, get_learning_engine
 
+from backend.core.db import connect as db_connect
+from backend.learning import LearningEngine, get_learning_engine
+from ml.model_registry import model_registry
 from ml.policy.antares_policy import AntaresPolicyV1
 from ml.policy.antares_rl_policy import AntaresRLPolicyV1
 
+_SUPERVISED_POLICY_FILES = (
+    "policy_batt_charge_kw.lgb",
+    "policy_batt_discharge_kw.lgb",
+    "policy_export_kw.lgb",
+)
+
 
 @dataclass
 class PolicyRunInfo:
@@ -20,10 +30,8 @@ class PolicyRunInfo:
 
 def _load_latest_supervised_run(engine: LearningEngine) -> PolicyRunInfo | None:
     """Load the most recent supervised (LightGBM) policy run metadata from SQLite."""
-    import sqlite3
-
     try:
-        with sqlite3.connect(engine.db_path, timeout=30.0) as conn:
+        with db_connect(engine.db_path) as conn:
             row = conn.execute(
                 """
                 SELECT run_id, models_dir
@@ -42,10 +50,8 @@ def _load_latest_supervised_run(engine: LearningEngine) -> PolicyRunInfo | None:
 
 def _load_latest_rl_run(engine: LearningEngine) -> PolicyRunInfo | None:
     """Load the most recent RL policy run metadata from SQLite."""
-    import sqlite3
-
     try:
-        with sqlite3.connect(engine.db_path, timeout=30.0) as conn:
+        with db_connect(engine.db_path) as conn:
             row = conn.execute(
                 """
                 SELECT run_id, artifact_dir
@@ -62,50 +68,92 @@ def _load_latest_rl_run(engine: LearningEngine) -> PolicyRunInfo | None:
     return PolicyRunInfo(run_id=str(row[0]), models_dir=str(row[1]), kind="rl")
 
 
-def _build_state_from_row(row: pd.Series, *, hour_of_day: int) -> np.ndarray:
-    """Build policy state vector from a schedule row."""
-    load_forecast = float(row.get("load_forecast_kwh", 0.0) or 0.0)
-    pv_forecast = float(row.get("pv_forecast_kwh", 0.0) or 0.0)
-    projected_soc = float(row.get("projected_soc_percent", 0.0) or 0.0)
-    import_price = float(row.get("import_price_sek_kwh", 0.0) or 0.0)
-    export_price = float(row.get("export_price_sek_kwh", import_price) or import_price)
+def _load_policy(run: PolicyRunInfo) -> Any:
+    """
+    Return the policy for a run from the model registry.
+
+    One entry per policy kind: a newer run in antares_*_runs points at a new
+    directory, which changes the fingerprint and replaces the old policy.
+    """
+    base = Path(run.models_dir)
+    if run.kind == "rl":
+        return model_registry.get(
+            "antares_policy:rl",
+            lambda: AntaresRLPolicyV1.load_from_dir(base),
+            [base / "model.zip"],
+        )
+    return model_registry.get(
+        "antares_policy:supervised",
+        lambda: AntaresPolicyV1.load_from_dir(base),
+        [base / name for name in _SUPERVISED_POLICY_FILES],
+    )
+
+
+def _column_or(df: pd.DataFrame, name: str, default: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `float(row.get(name, default) or default)` over a column.
+
+    Missing columns, None and 0 take the default; NaN passes through (it is truthy).
+    """
+    if name not in df.columns:
+        return default
+    raw = df[name]
+    values = raw.to_numpy(dtype=np.float64, na_value=np.nan)
+    falsy = values == 0.0
+    if raw.dtype == object:
+        falsy |= raw.map(lambda v: v is None).to_numpy(dtype=bool)
+    return np.where(falsy, default, values)
+
+
+def _build_state_matrix(df: pd.DataFrame, hours: np.ndarray) -> np.ndarray:
+    """
+    Build the (n_slots, 6) policy state matrix from a schedule frame.
 
-    state = np.array(
+    Columns follow AntaresMPCEnv: [hour_of_day, load_forecast_kwh,
+    pv_forecast_kwh, projected_soc_percent, import_price_sek_kwh,
+    export_price_sek_kwh]; export price defaults to the import price.
+    """
+    zeros = np.zeros(len(df), dtype=np.float64)
+    import_price = _column_or(df, "import_price_sek_kwh", zeros)
+    return np.column_stack(
         [
-            float(hour_of_day),
-            load_forecast,
-            pv_forecast,
-            projected_soc,
+            np.asarray(hours, dtype=np.float64),
+            _column_or(df, "load_forecast_kwh", zeros),
+            _column_or(df, "pv_forecast_kwh", zeros),
+            _column_or(df, "projected_soc_percent", zeros),
             import_price,
-            export_price,
-        ],
-        dtype=np.float32,
-    )
-    return state
+            _column_or(df, "export_price_sek_kwh", import_price),
+        ]
+    ).astype(np.float32)
 
 
-def _apply_action_clamps(
-    action: dict[str, float],
+def _apply_action_clamps_batch(
+    actions: dict[str, np.ndarray],
     *,
     max_charge_kw: float,
     max_discharge_kw: float,
     max_export_kw: float,
-) -> dict[str, float]:
-    """Clamp raw policy outputs to simple physical limits."""
-    charge = float(action.get("battery_charge_kw", 0.0) or 0.0)
-    discharge = float(action.get("battery_discharge_kw", 0.0) or 0.0)
-    export_kw = float(action.get("export_kw", 0.0) or 0.0)
+) -> dict[str, np.ndarray]:
+    """Clamp raw policy outputs to simple physical limits, for all slots at once."""
+    n = len(next(iter(actions.values()), ()))
 
-    charge = max(0.0, min(charge, max_charge_kw))
-    discharge = max(0.0, min(discharge, max_discharge_kw))
-    export_kw = max(0.0, min(export_kw, max_export_kw))
+    def _bounded(key: str, limit: float) -> np.ndarray:
+        raw = np.asarray(actions.get(key, np.zeros(n)), dtype=np.float64)
+        # NaN outputs become 0.0, matching max(0.0, min(nan, limit)) in Python
+        raw = np.where(np.isnan(raw), 0.0, raw)
+        return np.maximum(0.0, np.minimum(raw, limit))
+
+    charge = _bounded("battery_charge_kw", max_charge_kw)
+    discharge = _bounded("battery_discharge_kw", max_discharge_kw)
+    export_kw = _bounded("export_kw", max_export_kw)
 
     # Simple mutual exclusivity: prefer discharge when both requested.
-    if charge > 0.0 and discharge > 0.0:
-        if discharge >= charge:
-            charge = 0.0
-        else:
-            discharge = 0.0
+    both = (charge > 0.0) & (discharge > 0.0)
+    prefer_discharge = discharge >= charge
+    charge, discharge = (
+        np.where(both & prefer_discharge, 0.0, charge),
+        np.where(both & ~prefer_discharge, 0.0, discharge),
+    )
 
     return {
         "battery_charge_kw": charge,
@@ -143,34 +191,18 @@ def _build_shadow_schedule_df(
 
     df["start_time"] = starts.dt.strftime("%Y-%m-%dT%H:%M:%S%z")
 
-    new_charge: list[float] = []
-    new_discharge: list[float] = []
-    new_export_kwh: list[float] = []
-
-    for idx, row in df.iterrows():
-        start_ts = starts.iloc[idx]
-        hour = int(start_ts.hour)
-        state = _build_state_from_row(row, hour_of_day=hour)
-        raw_action = policy.predict(state)
-        clamped = _apply_action_clamps(
-            raw_action,
-            max_charge_kw=max_charge_kw,
-            max_discharge_kw=max_discharge_kw,
-            max_export_kw=max_export_kw,
-        )
-
-        charge_kw = clamped["battery_charge_kw"]
-        discharge_kw = clamped["battery_discharge_kw"]
-        export_kw = clamped["export_kw"]
-        export_kwh = export_kw * 0.25
-
-        new_charge.append(charge_kw)
-        new_discharge.append(discharge_kw)
-        new_export_kwh.append(export_kwh)
+    # Score the whole schedule in one call per model
+    states = _build_state_matrix(df, starts.dt.hour.to_numpy())
+    clamped = _apply_action_clamps_batch(
+        policy.predict_batch(states),
+        max_charge_kw=max_charge_kw,
+        max_discharge_kw=max_discharge_kw,
+        max_export_kw=max_export_kw,
+    )
 
-    df["battery_charge_kw"] = new_charge
-    df["battery_discharge_kw"] = new_discharge
-    df["export_kwh"] = new_export_kwh
+    df["battery_charge_kw"] = clamped["battery_charge_kw"]
+    df["battery_discharge_kw"] = clamped["battery_discharge_kw"]
+    df["export_kwh"] = clamped["export_kw"] * 0.25
 
     return df
 
@@ -207,14 +239,14 @@ def run_shadow_for_schedule(
         if run is None:
             print("[shadow] No entries in antares_rl_runs; skipping RL shadow plan.")
             return None
-        policy = AntaresRLPolicyV1.load_from_dir(run.models_dir)
+        policy = _load_policy(run)
         effective_suffix = system_suffix or "shadow_rl_v1"
     else:
         run = _load_latest_supervised_run(engine)
         if run is None:
             print("[shadow] No entries in antares_policy_runs; skipping shadow plan.")
             return None
-        policy = AntaresPolicyV1.load_from_dir(run.models_dir)
+        policy = _load_policy(run)
         effective_suffix = system_suffix or "shadow_v1"
 
     shadow_df = _build_shadow_schedule_df(schedule_df, policy, engine)
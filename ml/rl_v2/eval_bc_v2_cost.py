@@ -1,7 +1,7 @@
 """Evaluate BC v2 (sequence) policy vs MPC/Oracle (Rev 84).
 
 Usage:
-    PYTHONPATH=. ./venv/bin/python ml/rl_v2/eval_bc_v2_cost.py --days 10
+    PYTHONPATH=. ./venv/bin/python ml/rl_v2/eval_bc_v2_cost.py --days 10 --workers 4
 """
 
 from __future__ import annotations
@@ -9,6 +9,7 @@ from __future__ import annotations
 import argparse
 import json
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -106,8 +107,7 @@ def _load_eval_days(engine: LearningEngine, max_days: int) -> list[str]:
     return list(reversed(days))
 
 
-def _run_mpc_cost(day: str) -> float:
-    env = AntaresMPCEnv(config_path="config.yaml")
+def _run_mpc_cost(env: AntaresMPCEnv, day: str) -> float:
     env.reset(day)
     total_reward = 0.0
     while True:
@@ -162,6 +162,12 @@ def main() -> int:
         default=10,
         help="Number of recent days to evaluate (default: 10).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the MPC and Oracle solves (default: 1).",
+    )
     args = parser.parse_args()
 
     engine = _get_engine()
@@ -189,12 +195,22 @@ def main() -> int:
     print(f"  run_id:      {bc_run.run_id}")
     print(f"  artifact_dir:{bc_run.artifact_dir}")
 
+    # MPC schedules and Oracle solves do not depend on the policy, so they are
+    # fanned out over worker processes up front; the policy replay stays serial.
+    mpc_env = AntaresMPCEnv(config_path="config.yaml")
+    mpc_env.prepare_days(days, workers=args.workers)
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            oracle_results = list(pool.map(_maybe_run_oracle, days))
+    else:
+        oracle_results = [_maybe_run_oracle(day) for day in days]
+
     rows: list[dict[str, Any]] = []
-    for day in days:
+    for day, oracle_result in zip(days, oracle_results, strict=True):
         print(f"[oracle-bc-v2-cost] Day {day}: running MPC, Oracle-BC v2, Oracle...")
-        mpc_cost = _run_mpc_cost(day)
+        mpc_cost = _run_mpc_cost(mpc_env, day)
         bc_cost = _run_bc_v2_cost(day, model, spec)
-        oracle_cost = _maybe_run_oracle(day)
+        oracle_cost = oracle_result
         rows.append(
             {
                 "day": day,
@@ -7,6 +7,7 @@ exposes a simple reset/step API for downstream RL-style agents.
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -71,6 +72,9 @@ class AntaresMPCEnv:
         self._current_idx: int = 0
         self._current_day: date | None = None
 
+        # Schedules planned ahead by prepare_days(), consumed by reset()
+        self._prepared: dict[date, tuple[pd.DataFrame, dict[str, Any]]] = {}
+
     def _normalize_day(self, day: Any) -> date:
         if isinstance(day, date) and not isinstance(day, datetime):
             return day
@@ -144,10 +148,12 @@ class AntaresMPCEnv:
         # Reward is negative net cost including wear (higher is better).
         return -(cost - revenue + wear_cost)
 
-    def reset(self, day: Any) -> np.ndarray:
-        """Reset the environment to the start of a historical day."""
-        target_day = self._normalize_day(day)
-        start_dt = datetime.combine(target_day, datetime.min.time()).replace(tzinfo=self.timezone)
+    def _day_start(self, target_day: date) -> datetime:
+        return datetime.combine(target_day, datetime.min.time()).replace(tzinfo=self.timezone)
+
+    def _plan_day(self, target_day: date) -> tuple[pd.DataFrame, dict[str, Any]]:
+        """Run the planner for a historical day; returns (schedule, initial_state)."""
+        start_dt = self._day_start(target_day)
 
         # Build inputs and initial state for the day, then generate a full schedule.
         inputs = self.loader.get_window_inputs(start_dt)
@@ -167,6 +173,35 @@ class AntaresMPCEnv:
         )
         if schedule is None or schedule.empty:
             raise RuntimeError(f"No schedule generated for day {target_day}")
+        return schedule, initial_state
+
+    def prepare_days(self, days: list[Any], workers: int | None = None) -> None:
+        """Plan several days up front, fanned out over worker processes.
+
+        Each day's planner run is independent, so a batch of days can be
+        solved in parallel; later ``reset(day)`` calls reuse the prepared
+        schedules instead of running the planner again.
+        """
+        targets = [self._normalize_day(d) for d in days]
+        targets = [d for d in dict.fromkeys(targets) if d not in self._prepared]
+        if not targets:
+            return
+        if workers is not None and workers <= 1:
+            for target_day in targets:
+                self._prepared[target_day] = self._plan_day(target_day)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            planned = pool.map(_plan_day_in_worker, [self.config_path] * len(targets), targets)
+            for target_day, prepared in zip(targets, planned, strict=True):
+                self._prepared[target_day] = prepared
+
+    def reset(self, day: Any) -> np.ndarray:
+        """Reset the environment to the start of a historical day."""
+        target_day = self._normalize_day(day)
+        start_dt = self._day_start(target_day)
+        prepared = self._prepared.pop(target_day, None)
+        schedule, initial_state = prepared if prepared is not None else self._plan_day(target_day)
 
         # Ensure we have explicit start/end time columns for reward computation.
         if (
@@ -391,3 +426,14 @@ class AntaresMPCEnv:
             "projected_soc_percent": float(row.get("projected_soc_percent", 0.0) or 0.0),
         }
         return StepResult(next_state=next_state, reward=reward, done=done, info=info)
+
+
+_worker_envs: dict[str, AntaresMPCEnv] = {}
+
+
+def _plan_day_in_worker(config_path: str, day: date) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """Process-pool entry point for AntaresMPCEnv.prepare_days (one env per worker)."""
+    env = _worker_envs.get(config_path)
+    if env is None:
+        env = _worker_envs[config_path] = AntaresMPCEnv(config_path)
+    return env._plan_day(day)
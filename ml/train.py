@@ -6,7 +6,6 @@ from __future__ import annotations
 
 import argparse
 import os
-import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -15,6 +14,7 @@ import lightgbm as lgb
 import numpy as np
 import pandas as pd
 
+from backend.core.db import connect as db_connect
 from backend.learning import LearningEngine, get_learning_engine
 from ml.context_features import get_alarm_armed_series, get_vacation_mode_series
 from ml.weather import get_weather_series
@@ -68,7 +68,7 @@ def _load_slot_observations(
           AND load_kwh > 0.001
         ORDER BY slot_start ASC
     """
-    with sqlite3.connect(engine.db_path, timeout=30.0) as conn:
+    with db_connect(engine.db_path) as conn:
         df = pd.read_sql_query(
             query,
             conn,
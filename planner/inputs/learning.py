@@ -2,9 +2,10 @@ import contextlib
 import json
 import logging
 from typing import Any
-from sqlalchemy import create_engine, select, desc
+from sqlalchemy import select, desc
 from sqlalchemy.orm import sessionmaker
 
+from backend.core.db import get_engine
 from backend.learning.models import LearningDailyMetric
 
 logger = logging.getLogger("darkstar.planner.inputs.learning")
@@ -28,8 +29,7 @@ def load_learning_overlays(learning_config: dict[str, Any]) -> dict[str, Any]:
 
     path = learning_config.get("sqlite_path", "data/planner_learning.db")
     try:
-        engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 30.0})
-        Session = sessionmaker(bind=engine)
+        Session = sessionmaker(bind=get_engine(path))
         with Session() as session:
             stmt = select(LearningDailyMetric).order_by(desc(LearningDailyMetric.date)).limit(1)
             metric = session.execute(stmt).scalar_one_or_none()
@@ -75,6 +75,7 @@ def generate_debug_payload(
     debug_config: dict[str, Any],
     planner_state: dict[str, Any],
     s_index_debug: dict[str, Any] | None = None,
+    input_timings: dict[str, float] | None = None,
 ) -> dict[str, Any]:
     """
     Generate debug payload with windows, gaps, charging plan, water analysis, and metrics.
@@ -87,6 +88,7 @@ def generate_debug_payload(
                               (cheap_threshold_sek_kwh, smoothing_tolerance_sek_kwh,
                                cheap_slot_count, non_cheap_slot_count)
         s_index_debug (dict, optional): S-Index debug info
+        input_timings (dict, optional): Per-source input fetch latency in ms
 
     Returns:
         dict: Debug payload
@@ -158,6 +160,7 @@ def generate_debug_payload(
             "average_battery_cost": round(avg_batt_cost, 2),
         },
         "s_index": s_index_debug,
+        "input_timings_ms": input_timings or {},
         "sample_schedule": prepare_sample_schedule_for_json(sample_df),
     }
 
@@ -15,6 +15,7 @@ from typing import Any
 
 import pandas as pd
 
+from backend.core.schedule_store import get_schedule_repository
 from planner.observability.logging import record_debug_payload
 from planner.output.debug import generate_debug_payload
 from planner.output.formatter import dataframe_to_json_response
@@ -44,6 +45,7 @@ def save_schedule_to_json(
     window_responsibilities: list[dict[str, Any]],
     planner_state: dict[str, Any],
     output_path: str = "schedule.json",
+    input_timings: dict[str, float] | None = None,
 ) -> None:
     """
     Save the final schedule to schedule.json in the required format.
@@ -58,6 +60,7 @@ def save_schedule_to_json(
         window_responsibilities: List of window responsibilities
         planner_state: Dictionary containing planner state metrics
         output_path: Path to save the JSON file
+        input_timings: Per-source input fetch latency in ms (debug output)
     """
     # Generate new future schedule
     new_future_records = dataframe_to_json_response(schedule_df, now_override=now_slot)
@@ -92,7 +95,12 @@ def save_schedule_to_json(
     debug_config = config.get("debug", {})
     if debug_config.get("enable_planner_debug", False):
         debug_payload = generate_debug_payload(
-            schedule_df, window_responsibilities, debug_config, planner_state, s_index_debug
+            schedule_df,
+            window_responsibilities,
+            debug_config,
+            planner_state,
+            s_index_debug,
+            input_timings,
         )
         output["debug"] = debug_payload
 
@@ -105,5 +113,9 @@ def save_schedule_to_json(
                 return obj.isoformat()
             return super().default(obj)
 
-    with Path(output_path).open("w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, cls=DateTimeEncoder)
+    text = json.dumps(output, indent=2, cls=DateTimeEncoder)
+    Path(output_path).write_text(text, encoding="utf-8")
+
+    # Hand the fresh schedule to in-process readers without another file read.
+    # Publish the serialized form so readers see the same types as after a restart.
+    get_schedule_repository(output_path).publish(json.loads(text))
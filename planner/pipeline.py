@@ -18,6 +18,7 @@ import pytz
 if TYPE_CHECKING:
     from datetime import datetime
 
+from backend.core.schedule_store import get_schedule_repository
 from backend.learning.store import LearningStore
 from planner.inputs.data_prep import apply_safety_margins, prepare_df
 from planner.inputs.learning import load_learning_overlays
@@ -30,6 +31,7 @@ from planner.solver.adapter import (
     planner_to_kepler_input,
 )
 from planner.solver.kepler import KeplerSolver
+from planner.solver.result_cache import result_cache
 from planner.strategy.manual_plan import apply_manual_plan
 from planner.strategy.s_index import (
     calculate_dynamic_s_index,
@@ -169,13 +171,7 @@ class PlannerPipeline:
         # Rev WH2: Load previous schedule to check for active water heating (Mid-block locking)
         previous_schedule = []
         try:
-            import json
-
-            schedule_path = Path("schedule.json")
-            if schedule_path.exists():
-                with schedule_path.open() as f:
-                    data = json.load(f)
-                    previous_schedule = data.get("schedule", [])
+            previous_schedule = get_schedule_repository("schedule.json").get().slots
         except Exception as e:
             logger.warning("Failed to load previous schedule for water locking: %s", e)
 
@@ -358,11 +354,26 @@ class PlannerPipeline:
                 "Kepler: Planning %d future slots starting from %s", len(future_df), now_slot
             )
 
+        # Optional multi-resolution horizon: native slots first, coarser tail
+        kepler_cfg = active_config.get("kepler", {})
+        kepler_input = planner_to_kepler_input(
+            future_df,
+            initial_soc_kwh,
+            full_resolution_hours=float(kepler_cfg.get("full_resolution_hours", 0.0)),
+            aggregate_slot_minutes=int(kepler_cfg.get("aggregate_slot_minutes", 60)),
+        )
+        if len(kepler_input.slots) < len(future_df):
+            logger.info(
+                "Kepler horizon aggregated: %d rows -> %d slots",
+                len(future_df),
+                len(kepler_input.slots),
+            )
+
         # Rev WH2: Map forced timestamps to Kepler indices
         force_water_slots_indices = []
         if force_water_timestamps:
-            for i, (ts, _) in enumerate(future_df.iterrows()):
-                if ts in force_water_timestamps:
+            for i, slot in enumerate(kepler_input.slots):
+                if any(slot.start_time <= ts < slot.end_time for ts in force_water_timestamps):
                     force_water_slots_indices.append(i)
             if force_water_slots_indices:
                 logger.info(
@@ -370,7 +381,6 @@ class PlannerPipeline:
                     len(force_water_slots_indices),
                 )
 
-        kepler_input = planner_to_kepler_input(future_df, initial_soc_kwh)
         kepler_config = config_to_kepler_config(
             active_config,
             overrides,
@@ -480,7 +490,14 @@ class PlannerPipeline:
             risk_appetite = int(s_index_cfg.get("risk_appetite", 3))
             kepler_config.target_soc_penalty_sek = RISK_PENALTY_MAP.get(risk_appetite, 8.0)
 
-        solver = KeplerSolver()
+        cache_size = int(kepler_cfg.get("result_cache_size", 32))
+        result_cache.configure(cache_size, kepler_cfg.get("result_cache_path") or None)
+        solver = KeplerSolver(
+            backend=str(kepler_cfg.get("solver_backend", "auto")),
+            warm_start=bool(kepler_cfg.get("warm_start", True)),
+            warm_start_time_limit_s=float(kepler_cfg.get("warm_start_time_limit_s", 2.0)),
+            use_cache=cache_size > 0,
+        )
         result = solver.solve(kepler_input, kepler_config)
 
         if result.slots:
@@ -500,7 +517,9 @@ class PlannerPipeline:
 
         # Convert result back to DataFrame
         capacity = kepler_config.capacity_kwh
-        result_df = kepler_result_to_dataframe(result, capacity, initial_soc_kwh)
+        result_df = kepler_result_to_dataframe(
+            result, capacity, initial_soc_kwh, index=future_df.index
+        )
 
         logger.info(
             "result_df first projected_soc_kwh: %.3f",
@@ -573,6 +592,7 @@ class PlannerPipeline:
                 s_index_debug,
                 window_responsibilities,
                 planner_state_debug,
+                input_timings=input_data.get("input_timings_ms"),
             )
 
             # Rev UI5: Always store plan to slot_plans for performance tracking
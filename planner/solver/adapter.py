@@ -9,13 +9,96 @@ from typing import Any
 
 import pandas as pd
 
-from .types import KeplerConfig, KeplerInput, KeplerInputSlot, KeplerResult
+from .types import KeplerConfig, KeplerInput, KeplerInputSlot, KeplerResult, KeplerResultSlot
+
+
+def _utc_floor(ts: pd.Timestamp, freq: str) -> pd.Timestamp:
+    """Floor in UTC so DST transitions never hit an ambiguous local time."""
+    if ts.tzinfo is None:
+        return ts.floor(freq)
+    return ts.tz_convert("UTC").floor(freq)
+
+
+def _merge_slots(group: list[KeplerInputSlot]) -> KeplerInputSlot:
+    """One coarse slot: energies summed, prices duration-weighted."""
+    if len(group) == 1:
+        return group[0]
+    hours = [(s.end_time - s.start_time).total_seconds() / 3600.0 for s in group]
+    total_hours = sum(hours) or 1.0
+    return KeplerInputSlot(
+        start_time=group[0].start_time,
+        end_time=group[-1].end_time,
+        load_kwh=sum(s.load_kwh for s in group),
+        pv_kwh=sum(s.pv_kwh for s in group),
+        import_price_sek_kwh=sum(
+            s.import_price_sek_kwh * h for s, h in zip(group, hours, strict=True)
+        )
+        / total_hours,
+        export_price_sek_kwh=sum(
+            s.export_price_sek_kwh * h for s, h in zip(group, hours, strict=True)
+        )
+        / total_hours,
+    )
 
 
-def planner_to_kepler_input(df: pd.DataFrame, initial_soc_kwh: float) -> KeplerInput:
+def aggregate_horizon(
+    slots: list[KeplerInputSlot], full_resolution_hours: float, slot_minutes: int = 60
+) -> list[KeplerInputSlot]:
+    """
+    Coarsen the tail of the horizon (multi-resolution solve).
+
+    Slots in the first `full_resolution_hours` keep their resolution; after
+    the next `slot_minutes` boundary, contiguous slots are merged into one
+    slot per `slot_minutes` block. Use kepler_result_to_dataframe with
+    `index=` to expand the result back onto the original rows.
+    """
+    if not slots or full_resolution_hours <= 0:
+        return slots
+
+    freq = f"{int(slot_minutes)}min"
+    first_start = pd.Timestamp(slots[0].start_time)
+    boundary = first_start + pd.Timedelta(hours=full_resolution_hours)
+    if boundary.tzinfo is None:
+        boundary = boundary.ceil(freq)
+    else:
+        boundary = boundary.tz_convert("UTC").ceil(freq)
+
+    result: list[KeplerInputSlot] = []
+    group: list[KeplerInputSlot] = []
+    group_key = None
+    for slot in slots:
+        start = pd.Timestamp(slot.start_time)
+        if start < boundary:
+            result.append(slot)
+            continue
+        key = _utc_floor(start, freq)
+        if group and (key != group_key or group[-1].end_time != slot.start_time):
+            result.append(_merge_slots(group))
+            group = []
+        group.append(slot)
+        group_key = key
+    if group:
+        result.append(_merge_slots(group))
+    return result
+
+
+def planner_to_kepler_input(
+    df: pd.DataFrame,
+    initial_soc_kwh: float,
+    full_resolution_hours: float = 0.0,
+    aggregate_slot_minutes: int = 60,
+) -> KeplerInput:
     """
     Convert Planner DataFrame to KeplerInput.
     Expects DataFrame index to be timestamps (start_time).
+
+    Args:
+        df: Planner DataFrame (one row per slot)
+        initial_soc_kwh: Battery energy at the start of the horizon
+        full_resolution_hours: If > 0, keep only this many hours at native
+            resolution and aggregate the rest into `aggregate_slot_minutes`
+            slots (see aggregate_horizon). 0 disables aggregation.
+        aggregate_slot_minutes: Resolution of the aggregated tail (30 or 60)
     """
     slots = []
 
@@ -54,6 +137,9 @@ def planner_to_kepler_input(df: pd.DataFrame, initial_soc_kwh: float) -> KeplerI
             )
         )
 
+    if full_resolution_hours > 0:
+        slots = aggregate_horizon(slots, full_resolution_hours, aggregate_slot_minutes)
+
     return KeplerInput(slots=slots, initial_soc_kwh=initial_soc_kwh)
 
 
@@ -195,17 +281,91 @@ def config_to_kepler_config(
     return kepler_cfg
 
 
+def _split_slot(
+    slot: KeplerResultSlot, starts: list[Any], prev_soc_kwh: float
+) -> list[KeplerResultSlot]:
+    """Spread an aggregated result slot over the original rows it covers."""
+    bounds = [*starts[1:], slot.end_time]
+    hours = [
+        (end - start).total_seconds() / 3600.0 for start, end in zip(starts, bounds, strict=True)
+    ]
+    total_hours = sum(hours) or 1.0
+
+    parts = []
+    elapsed = 0.0
+    for start, end, h in zip(starts, bounds, hours, strict=True):
+        share = h / total_hours
+        elapsed += share
+        parts.append(
+            KeplerResultSlot(
+                start_time=start,
+                end_time=end,
+                charge_kwh=slot.charge_kwh * share,
+                discharge_kwh=slot.discharge_kwh * share,
+                grid_import_kwh=slot.grid_import_kwh * share,
+                grid_export_kwh=slot.grid_export_kwh * share,
+                soc_kwh=prev_soc_kwh + (slot.soc_kwh - prev_soc_kwh) * elapsed,
+                cost_sek=slot.cost_sek * share,
+                import_price_sek_kwh=slot.import_price_sek_kwh,
+                export_price_sek_kwh=slot.export_price_sek_kwh,
+                water_heat_kw=slot.water_heat_kw,
+                terminal_credit_sek=slot.terminal_credit_sek * share,
+                is_optimal=slot.is_optimal,
+            )
+        )
+    return parts
+
+
+def disaggregate_result_slots(
+    result: KeplerResult, index: pd.Index, initial_soc_kwh: float = 0.0
+) -> list[KeplerResultSlot]:
+    """
+    Expand aggregated result slots back onto the original slot index.
+
+    Slots covering several index rows (see aggregate_horizon) are split by
+    duration: energies and costs pro rata, power and prices unchanged, SoC
+    interpolated linearly. Slots that match one row are returned as is.
+    """
+    row_starts = list(index)
+    slots: list[KeplerResultSlot] = []
+    prev_soc_kwh = initial_soc_kwh
+    pos = 0
+    for slot in result.slots:
+        covered = []
+        while pos < len(row_starts) and row_starts[pos] < slot.end_time:
+            if row_starts[pos] >= slot.start_time:
+                covered.append(row_starts[pos])
+            pos += 1
+        if len(covered) <= 1:
+            slots.append(slot)
+        else:
+            slots.extend(_split_slot(slot, covered, prev_soc_kwh))
+        prev_soc_kwh = slot.soc_kwh
+    return slots
+
+
 def kepler_result_to_dataframe(
-    result: KeplerResult, capacity_kwh: float = 0.0, initial_soc_kwh: float = 0.0
+    result: KeplerResult,
+    capacity_kwh: float = 0.0,
+    initial_soc_kwh: float = 0.0,
+    index: pd.Index | None = None,
 ) -> pd.DataFrame:
     """
     Convert KeplerResult to a DataFrame suitable for logging/comparison.
     Matches the column structure expected by the UI.
+
+    If `index` (the planner's slot start times) is given, aggregated slots
+    from a multi-resolution solve are expanded back to one row per index
+    entry, so the executor always sees the native slot grid.
     """
     records = []
     prev_soc_kwh = initial_soc_kwh
 
-    for s in result.slots:
+    result_slots = result.slots
+    if index is not None:
+        result_slots = disaggregate_result_slots(result, index, initial_soc_kwh)
+
+    for s in result_slots:
         duration_h = (s.end_time - s.start_time).total_seconds() / 3600.0
         if duration_h <= 0:
             duration_h = 0.25
@@ -0,0 +1,411 @@
+"""
+Kepler Solver Backends
+
+Pluggable MILP backends for the Kepler solver.
+
+In-process backends (HiGHS via highspy, HiGHS via scipy) receive the model as
+arrays (cost vector, sparse constraint matrix, bounds) and never touch the LP
+text format or spawn a subprocess. The legacy command-line backends (GLPK/CBC
+through PuLP) are kept for installations without an in-process solver.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pulp
+from scipy import sparse
+
+logger = logging.getLogger("darkstar.planner.solver")
+
+# Status strings match pulp.LpStatus so callers can treat all backends alike
+STATUS_OPTIMAL = "Optimal"
+STATUS_FEASIBLE = "Feasible"  # Time limit hit with an incumbent (warm re-solve)
+STATUS_INFEASIBLE = "Infeasible"
+STATUS_UNBOUNDED = "Unbounded"
+STATUS_NOT_SOLVED = "Not Solved"
+STATUS_UNDEFINED = "Undefined"
+
+# Backend preference when solver_backend is "auto" (first available wins)
+AUTO_BACKEND_ORDER = ("highs", "scipy", "glpk", "cbc")
+
+
+@dataclass
+class MilpModel:
+    """
+    Array form of a minimisation MILP.
+
+        min  c @ x + offset
+        s.t. row_lower <= A @ x <= row_upper
+             col_lower <= x <= col_upper
+             x[j] integer where integrality[j] == 1
+    """
+
+    c: np.ndarray
+    a_matrix: sparse.csr_matrix
+    row_lower: np.ndarray
+    row_upper: np.ndarray
+    col_lower: np.ndarray
+    col_upper: np.ndarray
+    integrality: np.ndarray
+    offset: float = 0.0
+    col_names: list[str] = field(default_factory=list)
+
+    @property
+    def num_cols(self) -> int:
+        return int(self.c.shape[0])
+
+    @property
+    def num_rows(self) -> int:
+        return int(self.a_matrix.shape[0])
+
+
+@dataclass
+class BackendSolution:
+    """Result of a backend solve."""
+
+    status: str
+    x: np.ndarray | None
+    objective: float
+    solve_time_s: float
+
+    @property
+    def is_optimal(self) -> bool:
+        return self.status == STATUS_OPTIMAL
+
+    @property
+    def has_solution(self) -> bool:
+        return self.x is not None or self.status == STATUS_OPTIMAL
+
+
+class SolverBackend(ABC):
+    """Base class for Kepler MILP backends."""
+
+    name = "base"
+    # In-process backends solve a MilpModel; command backends solve a pulp problem
+    in_process = True
+    # Whether solve() honours initial_solution (MIP start) and time_limit_s
+    supports_warm_start = False
+
+    @abstractmethod
+    def available(self) -> bool:
+        """Whether the solver is installed and usable in this environment."""
+
+    @abstractmethod
+    def solve(
+        self,
+        model: MilpModel,
+        initial_solution: tuple[np.ndarray, np.ndarray] | None = None,
+        time_limit_s: float | None = None,
+    ) -> BackendSolution:
+        """
+        Solve a MilpModel.
+
+        Args:
+            model: Array form of the problem
+            initial_solution: Optional sparse MIP start as (column indices, values)
+            time_limit_s: Optional wall-clock limit; an incumbent found before the
+                limit is returned with status "Feasible"
+        """
+
+
+class HighsBackend(SolverBackend):
+    """HiGHS through the highspy bindings (model passed as CSC arrays)."""
+
+    name = "highs"
+    supports_warm_start = True
+
+    def available(self) -> bool:
+        try:
+            import highspy  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(
+        self,
+        model: MilpModel,
+        initial_solution: tuple[np.ndarray, np.ndarray] | None = None,
+        time_limit_s: float | None = None,
+    ) -> BackendSolution:
+        import highspy
+
+        start = time.perf_counter()
+        h = highspy.Highs()
+        h.setOptionValue("output_flag", False)
+        if time_limit_s is not None:
+            h.setOptionValue("time_limit", float(time_limit_s))
+
+        inf = highspy.kHighsInf
+        csc = model.a_matrix.tocsc()
+
+        lp = highspy.HighsLp()
+        lp.num_col_ = model.num_cols
+        lp.num_row_ = model.num_rows
+        lp.col_cost_ = model.c
+        lp.col_lower_ = np.where(np.isinf(model.col_lower), -inf, model.col_lower)
+        lp.col_upper_ = np.where(np.isinf(model.col_upper), inf, model.col_upper)
+        lp.row_lower_ = np.where(np.isinf(model.row_lower), -inf, model.row_lower)
+        lp.row_upper_ = np.where(np.isinf(model.row_upper), inf, model.row_upper)
+        lp.offset_ = model.offset
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.start_ = csc.indptr
+        lp.a_matrix_.index_ = csc.indices
+        lp.a_matrix_.value_ = csc.data
+        if model.integrality.any():
+            lp.integrality_ = [
+                highspy.HighsVarType.kInteger if flag else highspy.HighsVarType.kContinuous
+                for flag in model.integrality
+            ]
+
+        h.passModel(lp)
+        if initial_solution is not None:
+            idx, vals = initial_solution
+            h.setSolution(len(idx), np.asarray(idx, dtype=np.int32), np.asarray(vals, dtype=float))
+        h.run()
+
+        model_status = h.getModelStatus()
+        info = h.getInfo()
+        if model_status == highspy.HighsModelStatus.kOptimal:
+            status = STATUS_OPTIMAL
+        elif (
+            model_status == highspy.HighsModelStatus.kTimeLimit
+            and info.primal_solution_status == highspy.SolutionStatus.kSolutionStatusFeasible
+        ):
+            status = STATUS_FEASIBLE
+        elif model_status == highspy.HighsModelStatus.kInfeasible:
+            status = STATUS_INFEASIBLE
+        elif model_status in (
+            highspy.HighsModelStatus.kUnbounded,
+            highspy.HighsModelStatus.kUnboundedOrInfeasible,
+        ):
+            status = STATUS_UNBOUNDED
+        else:
+            status = STATUS_UNDEFINED
+
+        x = None
+        objective = 0.0
+        if status in (STATUS_OPTIMAL, STATUS_FEASIBLE):
+            x = np.asarray(h.getSolution().col_value, dtype=float)
+            objective = float(info.objective_function_value)
+
+        return BackendSolution(
+            status=status,
+            x=x,
+            objective=objective,
+            solve_time_s=time.perf_counter() - start,
+        )
+
+
+class ScipyMilpBackend(SolverBackend):
+    """HiGHS bundled with SciPy (scipy.optimize.milp)."""
+
+    name = "scipy"
+
+    def available(self) -> bool:
+        try:
+            from scipy.optimize import milp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(
+        self,
+        model: MilpModel,
+        initial_solution: tuple[np.ndarray, np.ndarray] | None = None,
+        time_limit_s: float | None = None,
+    ) -> BackendSolution:
+        # scipy.optimize.milp has no MIP start; warm hints are ignored
+        from scipy.optimize import Bounds, LinearConstraint, milp
+
+        start = time.perf_counter()
+        constraints = []
+        if model.num_rows > 0:
+            constraints.append(LinearConstraint(model.a_matrix, model.row_lower, model.row_upper))
+
+        options = {}
+        if time_limit_s is not None:
+            options["time_limit"] = float(time_limit_s)
+
+        res = milp(
+            c=model.c,
+            integrality=model.integrality,
+            bounds=Bounds(model.col_lower, model.col_upper),
+            constraints=constraints,
+            options=options,
+        )
+
+        status = {
+            0: STATUS_OPTIMAL,
+            2: STATUS_INFEASIBLE,
+            3: STATUS_UNBOUNDED,
+        }.get(res.status, STATUS_UNDEFINED)
+        if res.status == 1 and res.x is not None:
+            # Time limit hit with an incumbent
+            status = STATUS_FEASIBLE
+
+        x = None
+        objective = 0.0
+        if status in (STATUS_OPTIMAL, STATUS_FEASIBLE) and res.x is not None:
+            x = np.asarray(res.x, dtype=float)
+            objective = float(res.fun) + model.offset
+
+        return BackendSolution(
+            status=status,
+            x=x,
+            objective=objective,
+            solve_time_s=time.perf_counter() - start,
+        )
+
+
+class PulpCmdBackend(SolverBackend):
+    """
+    Legacy PuLP command-line backend (GLPK_CMD or PULP_CBC_CMD).
+
+    Writes an LP file, forks the solver and parses the solution file.
+    """
+
+    in_process = False
+
+    def __init__(self, name: str = "glpk"):
+        self.name = name
+
+    def _command(self) -> Any:
+        if self.name == "glpk":
+            return pulp.GLPK_CMD(msg=False)
+        return pulp.PULP_CBC_CMD(msg=False)
+
+    def available(self) -> bool:
+        try:
+            return bool(self._command().available())
+        except Exception:
+            return False
+
+    def solve(
+        self,
+        model: MilpModel,
+        initial_solution: tuple[np.ndarray, np.ndarray] | None = None,
+        time_limit_s: float | None = None,
+    ) -> BackendSolution:
+        raise TypeError(
+            f"{self.name} is a command-line backend: pass a pulp problem to solve_problem()"
+        )
+
+    def solve_problem(self, prob: pulp.LpProblem) -> BackendSolution:
+        start = time.perf_counter()
+        try:
+            prob.solve(self._command())
+        except Exception:
+            if self.name != "glpk":
+                raise
+            # Fall back to CBC if GLPK is not installed
+            prob.solve(pulp.PULP_CBC_CMD(msg=False))
+
+        objective = pulp.value(prob.objective) if prob.objective is not None else 0.0
+        return BackendSolution(
+            status=pulp.LpStatus[prob.status],
+            x=None,
+            objective=float(objective or 0.0),
+            solve_time_s=time.perf_counter() - start,
+        )
+
+
+_BACKENDS: dict[str, SolverBackend] = {
+    "highs": HighsBackend(),
+    "scipy": ScipyMilpBackend(),
+    "glpk": PulpCmdBackend("glpk"),
+    "cbc": PulpCmdBackend("cbc"),
+}
+
+
+def available_backends() -> list[str]:
+    """Names of the backends usable in this environment."""
+    return [name for name, backend in _BACKENDS.items() if backend.available()]
+
+
+def get_backend(name: str | None = "auto") -> SolverBackend:
+    """
+    Resolve a backend by name.
+
+    "auto" (or an empty/unknown name) picks the first available backend from
+    AUTO_BACKEND_ORDER. A named backend that is not installed also falls back
+    to "auto" with a warning so a misconfigured add-on still plans.
+    """
+    key = (name or "auto").lower()
+    if key != "auto":
+        backend = _BACKENDS.get(key)
+        if backend is not None and backend.available():
+            return backend
+        logger.warning("Kepler backend '%s' not available, falling back to auto", name)
+
+    for candidate in AUTO_BACKEND_ORDER:
+        backend = _BACKENDS[candidate]
+        if backend.available():
+            return backend
+
+    # GLPK_CMD itself falls back to CBC, which ships with PuLP
+    return _BACKENDS["glpk"]
+
+
+def model_from_pulp(prob: pulp.LpProblem) -> tuple[MilpModel, list[pulp.LpVariable]]:
+    """
+    Extract the array form of an in-memory pulp problem.
+
+    Reads coefficients straight from the pulp expressions, so no LP file is
+    written. Returns the model and the variable list matching its columns.
+    """
+    variables = prob.variables()
+    index = {v.name: j for j, v in enumerate(variables)}
+    n = len(variables)
+
+    c = np.zeros(n)
+    offset = 0.0
+    if prob.objective is not None:
+        for var, coef in prob.objective.items():
+            c[index[var.name]] = coef
+        offset = float(prob.objective.constant)
+
+    rows: list[int] = []
+    cols: list[int] = []
+    vals: list[float] = []
+    row_lower: list[float] = []
+    row_upper: list[float] = []
+    for i, con in enumerate(prob.constraints.values()):
+        for var, coef in con.items():
+            rows.append(i)
+            cols.append(index[var.name])
+            vals.append(coef)
+        rhs = -float(con.constant)
+        if con.sense == pulp.LpConstraintEQ:
+            row_lower.append(rhs)
+            row_upper.append(rhs)
+        elif con.sense == pulp.LpConstraintGE:
+            row_lower.append(rhs)
+            row_upper.append(np.inf)
+        else:
+            row_lower.append(-np.inf)
+            row_upper.append(rhs)
+
+    a_matrix = sparse.csr_matrix((vals, (rows, cols)), shape=(len(row_lower), n), dtype=float)
+
+    model = MilpModel(
+        c=c,
+        a_matrix=a_matrix,
+        row_lower=np.asarray(row_lower, dtype=float),
+        row_upper=np.asarray(row_upper, dtype=float),
+        col_lower=np.array(
+            [-np.inf if v.lowBound is None else v.lowBound for v in variables], dtype=float
+        ),
+        col_upper=np.array(
+            [np.inf if v.upBound is None else v.upBound for v in variables], dtype=float
+        ),
+        integrality=np.array([1 if v.cat == pulp.LpInteger else 0 for v in variables]),
+        offset=offset,
+        col_names=[v.name for v in variables],
+    )
+    return model, variables
@@ -6,372 +6,505 @@ Migrated from backend/kepler/solver.py during Rev K13 modularization.
 """
 
 from collections import defaultdict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import timedelta  # Rev WH2
 import logging
+import os
+import time
+from typing import Any
 
+import numpy as np
 import pulp
 
+from .backends import get_backend
+from .matrix_builder import build_kepler_model, water_gap_windows, water_spacing_lookback
+from .result_cache import fingerprint, result_cache
 from .types import KeplerConfig, KeplerInput, KeplerResult, KeplerResultSlot
+from .warm_start import warm_start_cache, water_mip_start
+
+logger = logging.getLogger("darkstar.planner.solver")
+
+
+def build_pulp_problem(
+    input_data: KeplerInput, config: KeplerConfig
+) -> tuple[pulp.LpProblem, dict[str, Any]]:
+    """
+    Build the Kepler MILP as a PuLP problem (one expression per slot).
+
+    Reference formulation used by the command-line backends (GLPK/CBC) and for
+    debugging; the in-process backends use matrix_builder.build_kepler_model,
+    which must stay equivalent.
+
+    Returns:
+        (problem, variables) where variables maps block names to PuLP variable dicts.
+    """
+    slots = input_data.slots
+    T = len(slots)
+
+    # Calculate slot duration in hours
+    slot_hours = []
+    for s in slots:
+        duration = (s.end_time - s.start_time).total_seconds() / 3600.0
+        slot_hours.append(duration)
+
+    # Problem Definition
+    prob = pulp.LpProblem("KeplerSchedule", pulp.LpMinimize)
+
+    # Variables (all in kWh per slot)
+    charge = pulp.LpVariable.dicts("charge_kwh", range(T), lowBound=0.0)
+    discharge = pulp.LpVariable.dicts("discharge_kwh", range(T), lowBound=0.0)
+    grid_import = pulp.LpVariable.dicts("import_kwh", range(T), lowBound=0.0)
+    grid_export = pulp.LpVariable.dicts("export_kwh", range(T), lowBound=0.0)
+    curtailment = pulp.LpVariable.dicts("curtailment_kwh", range(T), lowBound=0.0)
+    load_shedding = pulp.LpVariable.dicts("load_shedding_kwh", range(T), lowBound=0.0)
+
+    # Water heating as deferrable load (Rev K17)
+    water_enabled = config.water_heating_power_kw > 0
+    if water_enabled:
+        water_heat = pulp.LpVariable.dicts("water_heat", range(T), cat="Binary")
+        # Rev K21/PERF1: Spacing and transitions
+        water_start = pulp.LpVariable.dicts("water_start", range(T), cat="Binary")
+        # water_spacing_viol removed in PERF1 (Hard Constraint)
+    else:
+        water_heat = dict.fromkeys(range(T), 0)
+        water_start = dict.fromkeys(range(T), 0)
+
+    # SoC state variables (T+1 states for T slots)
+
+    # SoC state variables (T+1 states for T slots)
+    min_soc_kwh = config.capacity_kwh * config.min_soc_percent / 100.0
+    max_soc_kwh = config.capacity_kwh * config.max_soc_percent / 100.0
+
+    soc = pulp.LpVariable.dicts("soc_kwh", range(T + 1), lowBound=0.0, upBound=config.capacity_kwh)
+
+    # Slack variables
+    soc_violation = pulp.LpVariable.dicts("soc_violation_kwh", range(T + 1), lowBound=0.0)
+    target_under_violation = pulp.LpVariable(
+        "target_under_violation_kwh", lowBound=0.0
+    )  # Penalty for being BELOW target at end of horizon
+    target_over_violation = pulp.LpVariable(
+        "target_over_violation_kwh", lowBound=0.0
+    )  # Penalty for being ABOVE target at end of horizon
+    import_breach = pulp.LpVariable.dicts("import_breach_kwh", range(T), lowBound=0.0)
+    ramp_up = pulp.LpVariable.dicts("ramp_up_kwh", range(T), lowBound=0.0)
+    ramp_down = pulp.LpVariable.dicts("ramp_down_kwh", range(T), lowBound=0.0)
+
+    # Initial SoC Constraint
+    initial_soc = max(0.0, min(config.capacity_kwh, input_data.initial_soc_kwh))
+    prob += soc[0] == initial_soc
+
+    # Objective Function Terms
+    total_cost = []
+
+    # Penalty constants
+    MIN_SOC_PENALTY = 1000.0  # Hard constraint - don't violate min_soc!
+    # Target penalty comes from config (derived from risk_appetite in pipeline)
+    target_soc_penalty = config.target_soc_penalty_sek
+    CURTAILMENT_PENALTY = 0.1
+    LOAD_SHEDDING_PENALTY = 10000.0
+    IMPORT_BREACH_PENALTY = 5000.0
+
+    for t in range(T):
+        s = slots[t]
+        h = slot_hours[t]
+
+        # Water heating load for this slot (kWh)
+        water_load_kwh = water_heat[t] * config.water_heating_power_kw * h if water_enabled else 0
+
+        # Energy Balance Constraint (water load added to demand side)
+        prob += (
+            s.load_kwh + water_load_kwh + charge[t] + grid_export[t] + curtailment[t]
+            == s.pv_kwh + discharge[t] + grid_import[t] + load_shedding[t]
+        )
 
-
-class KeplerSolver:
-    def solve(self, input_data: KeplerInput, config: KeplerConfig) -> KeplerResult:
-        """
-        Solve the energy scheduling problem using MILP.
-        """
-        slots = input_data.slots
-        T = len(slots)
-        if T == 0:
-            return KeplerResult(
-                slots=[],
-                total_cost_sek=0.0,
-                is_optimal=True,
-                status_msg="No slots to schedule",
-            )
-
-        # Calculate slot duration in hours
-        slot_hours = []
-        for s in slots:
-            duration = (s.end_time - s.start_time).total_seconds() / 3600.0
-            slot_hours.append(duration)
-
-        # Problem Definition
-        prob = pulp.LpProblem("KeplerSchedule", pulp.LpMinimize)
-
-        # Variables (all in kWh per slot)
-        charge = pulp.LpVariable.dicts("charge_kwh", range(T), lowBound=0.0)
-        discharge = pulp.LpVariable.dicts("discharge_kwh", range(T), lowBound=0.0)
-        grid_import = pulp.LpVariable.dicts("import_kwh", range(T), lowBound=0.0)
-        grid_export = pulp.LpVariable.dicts("export_kwh", range(T), lowBound=0.0)
-        curtailment = pulp.LpVariable.dicts("curtailment_kwh", range(T), lowBound=0.0)
-        load_shedding = pulp.LpVariable.dicts("load_shedding_kwh", range(T), lowBound=0.0)
-
-        # Water heating as deferrable load (Rev K17)
-        water_enabled = config.water_heating_power_kw > 0
+        # Rev K21: Water start detection
         if water_enabled:
-            water_heat = pulp.LpVariable.dicts("water_heat", range(T), cat="Binary")
-            # Rev K21/PERF1: Spacing and transitions
-            water_start = pulp.LpVariable.dicts("water_start", range(T), cat="Binary")
-            # water_spacing_viol removed in PERF1 (Hard Constraint)
-        else:
-            water_heat = dict.fromkeys(range(T), 0)
-            water_start = dict.fromkeys(range(T), 0)
-
-        # SoC state variables (T+1 states for T slots)
+            if t == 0:
+                prob += water_start[t] == water_heat[t]
+            else:
+                prob += water_start[t] >= water_heat[t] - water_heat[t - 1]
 
-        # SoC state variables (T+1 states for T slots)
-        min_soc_kwh = config.capacity_kwh * config.min_soc_percent / 100.0
-        max_soc_kwh = config.capacity_kwh * config.max_soc_percent / 100.0
+        # Rev WH2: Force specific slots ON (Mid-block locking)
+        if water_enabled and config.force_water_on_slots:
+            for t_idx in config.force_water_on_slots:
+                if 0 <= t_idx < T:
+                    prob += water_heat[t_idx] == 1
 
-        soc = pulp.LpVariable.dicts(
-            "soc_kwh", range(T + 1), lowBound=0.0, upBound=config.capacity_kwh
+        # Battery Dynamics Constraint
+        prob += soc[t + 1] == soc[t] + charge[t] * config.charge_efficiency - discharge[t] / (
+            config.discharge_efficiency if config.discharge_efficiency > 0 else 1.0
         )
 
-        # Slack variables
-        soc_violation = pulp.LpVariable.dicts("soc_violation_kwh", range(T + 1), lowBound=0.0)
-        target_under_violation = pulp.LpVariable(
-            "target_under_violation_kwh", lowBound=0.0
-        )  # Penalty for being BELOW target at end of horizon
-        target_over_violation = pulp.LpVariable(
-            "target_over_violation_kwh", lowBound=0.0
-        )  # Penalty for being ABOVE target at end of horizon
-        import_breach = pulp.LpVariable.dicts("import_breach_kwh", range(T), lowBound=0.0)
-        ramp_up = pulp.LpVariable.dicts("ramp_up_kwh", range(T), lowBound=0.0)
-        ramp_down = pulp.LpVariable.dicts("ramp_down_kwh", range(T), lowBound=0.0)
-
-        # Initial SoC Constraint
-        initial_soc = max(0.0, min(config.capacity_kwh, input_data.initial_soc_kwh))
-        prob += soc[0] == initial_soc
-
-        # Objective Function Terms
-        total_cost = []
-
-        # Penalty constants
-        MIN_SOC_PENALTY = 1000.0  # Hard constraint - don't violate min_soc!
-        # Target penalty comes from config (derived from risk_appetite in pipeline)
-        target_soc_penalty = config.target_soc_penalty_sek
-        CURTAILMENT_PENALTY = 0.1
-        LOAD_SHEDDING_PENALTY = 10000.0
-        IMPORT_BREACH_PENALTY = 5000.0
+        # Power Limits
+        max_chg_kwh = config.max_charge_power_kw * h
+        max_dis_kwh = config.max_discharge_power_kw * h
 
-        for t in range(T):
-            s = slots[t]
-            h = slot_hours[t]
-
-            # Water heating load for this slot (kWh)
-            water_load_kwh = (
-                water_heat[t] * config.water_heating_power_kw * h if water_enabled else 0
-            )
+        prob += charge[t] <= max_chg_kwh
+        prob += discharge[t] <= max_dis_kwh
 
-            # Energy Balance Constraint (water load added to demand side)
-            prob += (
-                s.load_kwh + water_load_kwh + charge[t] + grid_export[t] + curtailment[t]
-                == s.pv_kwh + discharge[t] + grid_import[t] + load_shedding[t]
-            )
+        if config.max_export_power_kw is not None:
+            prob += grid_export[t] <= config.max_export_power_kw * h
 
-            # Rev K21: Water start detection
-            if water_enabled:
-                if t == 0:
-                    prob += water_start[t] == water_heat[t]
-                else:
-                    prob += water_start[t] >= water_heat[t] - water_heat[t - 1]
+        if config.max_import_power_kw is not None:
+            prob += grid_import[t] <= config.max_import_power_kw * h
 
-            # Rev WH2: Force specific slots ON (Mid-block locking)
-            if water_enabled and config.force_water_on_slots:
-                for t_idx in config.force_water_on_slots:
-                    if 0 <= t_idx < T:
-                        prob += water_heat[t_idx] == 1
+        # Soft Grid Import Limit
+        if config.grid_import_limit_kw is not None:
+            limit_kwh = config.grid_import_limit_kw * h
+            prob += grid_import[t] <= limit_kwh + import_breach[t]
 
-            # Battery Dynamics Constraint
-            prob += soc[t + 1] == soc[t] + charge[t] * config.charge_efficiency - discharge[t] / (
-                config.discharge_efficiency if config.discharge_efficiency > 0 else 1.0
-            )
+        # Rev E4: Strict Export Toggle
+        if not config.enable_export:
+            prob += grid_export[t] == 0
 
-            # Power Limits
-            max_chg_kwh = config.max_charge_power_kw * h
-            max_dis_kwh = config.max_discharge_power_kw * h
+        # Ramping Constraints
+        if t > 0:
+            prob += (charge[t] - discharge[t]) - (charge[t - 1] - discharge[t - 1]) == ramp_up[
+                t
+            ] - ramp_down[t]
+        else:
+            prob += ramp_up[t] == 0
+            prob += ramp_down[t] == 0
+
+        # Objective Terms
+        slot_wear_cost = (charge[t] + discharge[t]) * config.wear_cost_sek_per_kwh
+        slot_import_cost = grid_import[t] * s.import_price_sek_kwh
+        effective_export_price = s.export_price_sek_kwh - config.export_threshold_sek_per_kwh
+        slot_export_revenue = grid_export[t] * effective_export_price
+        slot_ramping_cost = ((ramp_up[t] + ramp_down[t]) / h) * config.ramping_cost_sek_per_kw
+        slot_curtailment_cost = curtailment[t] * CURTAILMENT_PENALTY
+        slot_shedding_cost = load_shedding[t] * LOAD_SHEDDING_PENALTY
+        slot_import_breach_cost = import_breach[t] * IMPORT_BREACH_PENALTY
+
+        # NOTE: Rev K20 stored_energy_cost was removed - it incorrectly made
+        # charging unprofitable by adding cost on discharge without offsetting
+        # credit on charge. The terminal_value and wear_cost are sufficient
+        # for arbitrage decisions.
+
+        total_cost.append(
+            slot_import_cost
+            - slot_export_revenue
+            + slot_wear_cost
+            + slot_ramping_cost
+            + slot_curtailment_cost
+            + slot_shedding_cost
+            + slot_import_breach_cost
+        )
 
-            prob += charge[t] <= max_chg_kwh
-            prob += discharge[t] <= max_dis_kwh
+        # Soft Min/Max SoC Constraints
+        prob += soc[t] >= min_soc_kwh - soc_violation[t]
+        prob += soc[t] <= max_soc_kwh
+
+    # Terminal constraints
+    prob += soc[T] >= min_soc_kwh - soc_violation[T]
+    prob += soc[T] <= max_soc_kwh
+
+    # Terminal SoC Target (BIDIRECTIONAL soft constraint)
+    # Penalize both being UNDER target (risk) AND OVER target (missed discharge opportunity)
+    target_soc_kwh = config.target_soc_kwh if config.target_soc_kwh is not None else min_soc_kwh
+
+    # Terminal SoC Target (BIDIRECTIONAL soft constraint)
+    # Penalize both being UNDER target (risk) AND OVER target (missed discharge opportunity)
+    target_soc_kwh = config.target_soc_kwh if config.target_soc_kwh is not None else min_soc_kwh
+
+    if config.target_soc_kwh is not None:
+        # Under target: soc[T] >= target - under_violation
+        prob += soc[T] >= target_soc_kwh - target_under_violation
+        # Over target: soc[T] <= target + over_violation
+        prob += soc[T] <= target_soc_kwh + target_over_violation
+
+        # Penalize UNDER target (important)
+        total_cost.append(target_soc_penalty * target_under_violation)
+        # Penalize OVER target (only if target is > 0 to avoid dumping to 0)
+        if target_soc_kwh > 0:
+            total_cost.append(target_soc_penalty * target_over_violation)
+    else:
+        # If no target, we don't care where we end up (within min_soc limits)
+        pass
+
+    # Water Heating Constraints (Rev K17/K18/K21)
+    gap_violation_penalty = 0.0
+    # spacing_violation_penalty removed in PERF1
+    if water_enabled:
+        water_kwh = [config.water_heating_power_kw * h for h in slot_hours]
+
+        # Constraint 1: Per-day min_kwh requirements
+        # Group slots by date to apply daily minimum constraints
+        # Rev WH2: Smart Deferral - extend buckets into next morning
+        slots_by_day = defaultdict(list)
+        defer_hours = config.defer_up_to_hours
 
-            if config.max_export_power_kw is not None:
-                prob += grid_export[t] <= config.max_export_power_kw * h
+        for t in range(T):
+            dt = slots[t].start_time
+            bucket_date = dt.date()
+            if defer_hours > 0 and dt.hour < defer_hours:
+                bucket_date = bucket_date - timedelta(days=1)
+
+            slots_by_day[bucket_date].append(t)
+
+        # Sort days to identify "today" (first day in horizon)
+        sorted_days = sorted(slots_by_day.keys())
+
+        for i, day in enumerate(sorted_days):
+            day_slot_indices = slots_by_day[day]
+            if i == 0:
+                # First day: reduce by what's already heated today
+                day_min_kwh = max(
+                    0.0,
+                    config.water_heating_min_kwh - config.water_heated_today_kwh,
+                )
+            else:
+                # Future days: full daily requirement
+                day_min_kwh = config.water_heating_min_kwh
 
-            if config.max_import_power_kw is not None:
-                prob += grid_import[t] <= config.max_import_power_kw * h
+            if day_min_kwh > 0:
+                prob += (
+                    pulp.lpSum(water_heat[t] * water_kwh[t] for t in day_slot_indices)
+                    >= day_min_kwh
+                )
 
-            # Soft Grid Import Limit
-            if config.grid_import_limit_kw is not None:
-                limit_kwh = config.grid_import_limit_kw * h
-                prob += grid_import[t] <= limit_kwh + import_breach[t]
+        # Constraint 2: Progressive gap penalty (Rev K18/K21)
+        # Tier 1: Base comfort penalty beyond max_gap_hours
+        if config.water_heating_max_gap_hours > 0 and config.water_comfort_penalty_sek > 0:
+            # Windows are measured in hours so mixed-resolution horizons work too
+            hours_arr = np.asarray(slot_hours, dtype=float)
+            windows = water_gap_windows(hours_arr, config.water_heating_max_gap_hours)
+            gap_violation = pulp.LpVariable.dicts("gap_viol", range(T), lowBound=0.0)
+            for start, width in zip(*windows, strict=True):
+                prob += (
+                    pulp.lpSum(water_heat[t] for t in range(start, start + width))
+                    + gap_violation[start]
+                    >= 1
+                )
 
-            # Rev E4: Strict Export Toggle
-            if not config.enable_export:
-                prob += grid_export[t] == 0
+            # Tier 2: Double penalty for very long gaps (> 1.5x threshold)
+            windows_2 = water_gap_windows(hours_arr, config.water_heating_max_gap_hours * 1.5)
+            gap_violation_2 = pulp.LpVariable.dicts("gap_viol_2", range(T), lowBound=0.0)
+            for start, width in zip(*windows_2, strict=True):
+                prob += (
+                    pulp.lpSum(water_heat[t] for t in range(start, start + width))
+                    + gap_violation_2[start]
+                    >= 1
+                )
 
-            # Ramping Constraints
-            if t > 0:
-                prob += (charge[t] - discharge[t]) - (charge[t - 1] - discharge[t - 1]) == ramp_up[
-                    t
-                ] - ramp_down[t]
-            else:
-                prob += ramp_up[t] == 0
-                prob += ramp_down[t] == 0
-
-            # Objective Terms
-            slot_wear_cost = (charge[t] + discharge[t]) * config.wear_cost_sek_per_kwh
-            slot_import_cost = grid_import[t] * s.import_price_sek_kwh
-            effective_export_price = s.export_price_sek_kwh - config.export_threshold_sek_per_kwh
-            slot_export_revenue = grid_export[t] * effective_export_price
-            slot_ramping_cost = ((ramp_up[t] + ramp_down[t]) / h) * config.ramping_cost_sek_per_kw
-            slot_curtailment_cost = curtailment[t] * CURTAILMENT_PENALTY
-            slot_shedding_cost = load_shedding[t] * LOAD_SHEDDING_PENALTY
-            slot_import_breach_cost = import_breach[t] * IMPORT_BREACH_PENALTY
-
-            # NOTE: Rev K20 stored_energy_cost was removed - it incorrectly made
-            # charging unprofitable by adding cost on discharge without offsetting
-            # credit on charge. The terminal_value and wear_cost are sufficient
-            # for arbitrage decisions.
-
-            total_cost.append(
-                slot_import_cost
-                - slot_export_revenue
-                + slot_wear_cost
-                + slot_ramping_cost
-                + slot_curtailment_cost
-                + slot_shedding_cost
-                + slot_import_breach_cost
+            gap_violation_penalty = config.water_comfort_penalty_sek * (
+                pulp.lpSum(gap_violation[t] for t in windows[0])
+                + pulp.lpSum(gap_violation_2[t] for t in windows_2[0])
             )
 
-            # Soft Min/Max SoC Constraints
-            prob += soc[t] >= min_soc_kwh - soc_violation[t]
-            prob += soc[t] <= max_soc_kwh
-
-        # Terminal constraints
-        prob += soc[T] >= min_soc_kwh - soc_violation[T]
-        prob += soc[T] <= max_soc_kwh
-
-        # Terminal SoC Target (BIDIRECTIONAL soft constraint)
-        # Penalize both being UNDER target (risk) AND OVER target (missed discharge opportunity)
-        target_soc_kwh = config.target_soc_kwh if config.target_soc_kwh is not None else min_soc_kwh
-
-        # Terminal SoC Target (BIDIRECTIONAL soft constraint)
-        # Penalize both being UNDER target (risk) AND OVER target (missed discharge opportunity)
-        target_soc_kwh = config.target_soc_kwh if config.target_soc_kwh is not None else min_soc_kwh
-
-        if config.target_soc_kwh is not None:
-            # Under target: soc[T] >= target - under_violation
-            prob += soc[T] >= target_soc_kwh - target_under_violation
-            # Over target: soc[T] <= target + over_violation
-            prob += soc[T] <= target_soc_kwh + target_over_violation
-
-            # Penalize UNDER target (important)
-            total_cost.append(target_soc_penalty * target_under_violation)
-            # Penalize OVER target (only if target is > 0 to avoid dumping to 0)
-            if target_soc_kwh > 0:
-                total_cost.append(target_soc_penalty * target_over_violation)
-        else:
-            # If no target, we don't care where we end up (within min_soc limits)
-            pass
-
-        # Water Heating Constraints (Rev K17/K18/K21)
-        gap_violation_penalty = 0.0
-        # spacing_violation_penalty removed in PERF1
-        if water_enabled:
-            avg_slot_hours = sum(slot_hours) / len(slot_hours) if slot_hours else 0.25
-            water_kwh_per_slot = config.water_heating_power_kw * avg_slot_hours
-
-            # Constraint 1: Per-day min_kwh requirements
-            # Group slots by date to apply daily minimum constraints
-            # Rev WH2: Smart Deferral - extend buckets into next morning
-            slots_by_day = defaultdict(list)
-            defer_hours = config.defer_up_to_hours
-
+        # Constraint 3: Hard Spacing Constraint (Rev PERF1)
+        # If we start a block, we MUST NOT have processed any heating in the previous window.
+        # Formulation: sum(heat[t-S : t]) + start[t] * S <= S
+        if config.water_min_spacing_hours > 0:
+            lookback = water_spacing_lookback(
+                np.asarray(slot_hours, dtype=float), config.water_min_spacing_hours
+            )
+            M = max(1, int(config.water_min_spacing_hours / min(slot_hours)), int(lookback.max()))
             for t in range(T):
-                dt = slots[t].start_time
-                bucket_date = dt.date()
-                if defer_hours > 0 and dt.hour < defer_hours:
-                    bucket_date = bucket_date - timedelta(days=1)
-
-                slots_by_day[bucket_date].append(t)
-
-            # Sort days to identify "today" (first day in horizon)
-            sorted_days = sorted(slots_by_day.keys())
-
-            for i, day in enumerate(sorted_days):
-                day_slot_indices = slots_by_day[day]
-                if i == 0:
-                    # First day: reduce by what's already heated today
-                    day_min_kwh = max(
-                        0.0,
-                        config.water_heating_min_kwh - config.water_heated_today_kwh,
-                    )
-                else:
-                    # Future days: full daily requirement
-                    day_min_kwh = config.water_heating_min_kwh
-
-                if day_min_kwh > 0:
-                    prob += (
-                        pulp.lpSum(water_heat[t] for t in day_slot_indices) * water_kwh_per_slot
-                        >= day_min_kwh
-                    )
-
-            # Constraint 2: Progressive gap penalty (Rev K18/K21)
-            # Tier 1: Base comfort penalty beyond max_gap_hours
-            if config.water_heating_max_gap_hours > 0 and config.water_comfort_penalty_sek > 0:
-                gap_slots = max(1, int(config.water_heating_max_gap_hours / avg_slot_hours))
-                gap_violation = pulp.LpVariable.dicts("gap_viol", range(T), lowBound=0.0)
-                for start in range(T - gap_slots + 1):
-                    prob += (
-                        pulp.lpSum(water_heat[t] for t in range(start, start + gap_slots))
-                        + gap_violation[start]
-                        >= 1
-                    )
-
-                # Tier 2: Double penalty for very long gaps (> 1.5x threshold)
-                gap_slots_2 = max(1, int(config.water_heating_max_gap_hours * 1.5 / avg_slot_hours))
-                gap_violation_2 = pulp.LpVariable.dicts("gap_viol_2", range(T), lowBound=0.0)
-                for start in range(T - gap_slots_2 + 1):
-                    prob += (
-                        pulp.lpSum(water_heat[t] for t in range(start, start + gap_slots_2))
-                        + gap_violation_2[start]
-                        >= 1
-                    )
-
-                gap_violation_penalty = config.water_comfort_penalty_sek * (
-                    pulp.lpSum(gap_violation[t] for t in range(T - gap_slots + 1))
-                    + pulp.lpSum(gap_violation_2[t] for t in range(T - gap_slots_2 + 1))
+                # Check preceding slots in spacing window
+                start_idx = t - int(lookback[t])
+                prob += (
+                    pulp.lpSum(water_heat[j] for j in range(start_idx, t)) + water_start[t] * M <= M
                 )
 
-            # Constraint 3: Hard Spacing Constraint (Rev PERF1)
-            # If we start a block, we MUST NOT have processed any heating in the previous window.
-            # Formulation: sum(heat[t-S : t]) + start[t] * S <= S
-            if config.water_min_spacing_hours > 0:
-                spacing_slots = max(1, int(config.water_min_spacing_hours / avg_slot_hours))
-                M = spacing_slots
-                for t in range(T):
-                    # Check preceding slots in spacing window
-                    start_idx = max(0, t - spacing_slots)
-                    prob += (
-                        pulp.lpSum(water_heat[j] for j in range(start_idx, t)) + water_start[t] * M
-                        <= M
-                    )
-
-        # Terminal Value
-        terminal_value = (
-            soc[T] * config.terminal_value_sek_kwh if config.terminal_value_sek_kwh != 0 else 0.0
-        )
-
-        # Set Objective
-        # - min_soc violation: HARD penalty (1000 SEK/kWh)
-        # - target violation: SOFT penalty (from config, derived from risk_appetite)
-        #   * UNDER target: Risk penalty (configurable)
-        #   * OVER target: Opportunity cost penalty (same as under)
-        # - gap violation: SOFT comfort penalty (Rev K18)
-        prob += (
-            pulp.lpSum(total_cost)
-            - terminal_value
-            + MIN_SOC_PENALTY * pulp.lpSum(soc_violation)
-            + gap_violation_penalty
-            # + spacing_violation_penalty (Removed in PERF1)
-            + (
-                pulp.lpSum(water_start[t] for t in range(T)) * config.water_block_start_penalty_sek
-                if water_enabled and config.water_block_start_penalty_sek > 0
-                else 0.0
-            )  # Rev WH2: Block start penalty
-        )
+    # Terminal Value
+    terminal_value = (
+        soc[T] * config.terminal_value_sek_kwh if config.terminal_value_sek_kwh != 0 else 0.0
+    )
+
+    # Set Objective
+    # - min_soc violation: HARD penalty (1000 SEK/kWh)
+    # - target violation: SOFT penalty (from config, derived from risk_appetite)
+    #   * UNDER target: Risk penalty (configurable)
+    #   * OVER target: Opportunity cost penalty (same as under)
+    # - gap violation: SOFT comfort penalty (Rev K18)
+    prob += (
+        pulp.lpSum(total_cost)
+        - terminal_value
+        + MIN_SOC_PENALTY * pulp.lpSum(soc_violation)
+        + gap_violation_penalty
+        # + spacing_violation_penalty (Removed in PERF1)
+        + (
+            pulp.lpSum(water_start[t] for t in range(T)) * config.water_block_start_penalty_sek
+            if water_enabled and config.water_block_start_penalty_sek > 0
+            else 0.0
+        )  # Rev WH2: Block start penalty
+    )
+
+    variables = {
+        "charge": charge,
+        "discharge": discharge,
+        "grid_import": grid_import,
+        "grid_export": grid_export,
+        "soc": soc,
+        "water_heat": water_heat if water_enabled else None,
+    }
+    return prob, variables
+
+
+def _pulp_values(variables: dict[str, Any], T: int) -> dict[str, np.ndarray]:
+    """Collect solved PuLP variable values as per-block arrays."""
+    values = {}
+    for name, var_dict in variables.items():
+        if var_dict is None:
+            continue
+        size = T + 1 if name == "soc" else T
+        values[name] = np.array([pulp.value(var_dict[t]) or 0.0 for t in range(size)])
+    return values
+
+
+def _solve_in_worker(backend: str, input_data: KeplerInput, config: KeplerConfig) -> KeplerResult:
+    """Process-pool entry point for KeplerSolver.solve_many (must be module level)."""
+    return KeplerSolver(backend=backend).solve(input_data, config)
 
-        # Solve using GLPK (available in Alpine) or CBC as fallback
-        import time
 
-        build_start = time.time()
-        # Solver setup is fast, but let's track the overhead of calling the solver command
-        # Note: pulp.LpProblem construction happened above, so 'build_time' here is mostly
-        # just the overhead of writing the LP file in prob.solve()
+class KeplerSolver:
+    def __init__(
+        self,
+        backend: str = "auto",
+        warm_start: bool = False,
+        warm_start_time_limit_s: float = 2.0,
+        use_cache: bool = False,
+    ):
+        """
+        Args:
+            backend: MILP backend name ("auto", "highs", "scipy", "glpk", "cbc").
+                See planner.solver.backends.
+            warm_start: Seed the solve with the previous result shifted forward
+                (see planner.solver.warm_start). Falls back to a cold solve when
+                prices, config or the horizon changed.
+            warm_start_time_limit_s: Time budget for a warm re-solve. A result
+                proven optimal within the budget is used as is; otherwise the
+                solve continues without a limit from the best incumbent, so only
+                optimal plans are returned.
+            use_cache: Return a stored result when the exact same problem was
+                solved before (see planner.solver.result_cache).
+        """
+        self.backend_name = backend
+        self.warm_start = warm_start
+        self.warm_start_time_limit_s = warm_start_time_limit_s
+        self.use_cache = use_cache
 
-        try:
-            # Try GLPK first (installed in Alpine Docker image)
-            solver_cmd = pulp.GLPK_CMD(msg=False)
-            prob.solve(solver_cmd)
-        except Exception:
-            # Fall back to CBC if GLPK not available
-            solver_cmd = pulp.PULP_CBC_CMD(msg=False)
-            prob.solve(solver_cmd)
+    def solve(self, input_data: KeplerInput, config: KeplerConfig) -> KeplerResult:
+        """
+        Solve the energy scheduling problem using MILP.
+        """
+        slots = input_data.slots
+        T = len(slots)
+        if T == 0:
+            return KeplerResult(
+                slots=[],
+                total_cost_sek=0.0,
+                is_optimal=True,
+                status_msg="No slots to schedule",
+            )
 
-        solve_end = time.time()
+        # Solve via the configured backend (in-process HiGHS, or GLPK/CBC command line)
+        backend = get_backend(self.backend_name)
+
+        cache_key = None
+        if self.use_cache:
+            lookup_start = time.perf_counter()
+            cache_key = fingerprint(input_data, config, backend.name)
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                cached.from_cache = True
+                logging.getLogger("darkstar.performance").info(
+                    "Kepler cache hit: %d slots in %.1fms | Cost: %.2f SEK",
+                    T,
+                    (time.perf_counter() - lookup_start) * 1000.0,
+                    cached.total_cost_sek,
+                )
+                if self.warm_start:
+                    warm_start_cache.remember(config, cached)
+                return cached
+
+        build_start = time.perf_counter()
+
+        values: dict[str, np.ndarray] = {}
+        warm_started = False
+        if backend.in_process:
+            # Sparse arrays straight to the solver; no PuLP expressions, no LP file
+            model, layout = build_kepler_model(input_data, config)
+            var_count = model.num_cols
+            const_count = model.num_rows
+
+            # Warm start only pays off for the MIP (water heating binaries)
+            mip_start = None
+            if self.warm_start and backend.supports_warm_start and model.integrality.any():
+                heat = warm_start_cache.shifted_water_plan(input_data, config)
+                if heat is not None:
+                    mip_start = water_mip_start(heat, layout)
+
+            build_duration = time.perf_counter() - build_start
+            if mip_start is not None:
+                solution = backend.solve(
+                    model,
+                    initial_solution=mip_start,
+                    time_limit_s=self.warm_start_time_limit_s,
+                )
+                warm_started = True
+                if not solution.is_optimal:
+                    # Never ship an unproven incumbent: keep solving without a limit,
+                    # seeded with the best point found so far (or the shifted plan)
+                    logger.info(
+                        "Kepler warm start not optimal in budget (%s), solving to optimality",
+                        solution.status,
+                    )
+                    if solution.x is not None:
+                        mip_start = (np.arange(model.num_cols), solution.x)
+                    full = backend.solve(model, initial_solution=mip_start)
+                    full.solve_time_s += solution.solve_time_s
+                    solution = full
+            else:
+                solution = backend.solve(model)
+            if solution.x is not None:
+                values = layout.values(solution.x)
+        else:
+            prob, variables = build_pulp_problem(input_data, config)
+            var_count = len(prob.variables())
+            const_count = len(prob.constraints)
+            build_duration = time.perf_counter() - build_start
+            solution = backend.solve_problem(prob)
+            if solution.is_optimal:
+                values = _pulp_values(variables, T)
 
         # Extract Results
-        status = pulp.LpStatus[prob.status]
+        status = solution.status
         is_optimal = status == "Optimal"
+        has_solution = bool(values)
+        solve_duration = solution.solve_time_s
 
-        # Log Performance Metrics
-        solve_duration = solve_end - build_start  # This is just the solve() call duration
-        # Count stats
-        var_count = len(prob.variables())
-        const_count = len(prob.constraints)
-
-        if not is_optimal:
+        if not has_solution:
+            if backend.in_process:
+                prob, _ = build_pulp_problem(input_data, config)
             prob.writeLP("kepler_debug.lp")
             print(f"Solver failed: {status}. LP written to kepler_debug.lp")
 
         result_slots = []
         final_total_cost = 0.0
 
-        if is_optimal:
+        if has_solution:
+            charge = values["charge"]
+            discharge = values["discharge"]
+            grid_import = values["grid_import"]
+            grid_export = values["grid_export"]
+            soc = values["soc"]
+            water_heat = values.get("water_heat")
+
             for t in range(T):
                 s = slots[t]
-                h = slot_hours[t]
 
-                c_val = pulp.value(charge[t])
-                d_val = pulp.value(discharge[t])
-                i_val = pulp.value(grid_import[t])
-                e_val = pulp.value(grid_export[t])
-                soc_val = pulp.value(soc[t + 1])
+                c_val = float(charge[t])
+                d_val = float(discharge[t])
+                i_val = float(grid_import[t])
+                e_val = float(grid_export[t])
+                soc_val = float(soc[t + 1])
 
                 # Water heating power (kW) from binary decision
-                if water_enabled:
-                    w_val = pulp.value(water_heat[t])
-                    w_kw = config.water_heating_power_kw if w_val and w_val > 0.5 else 0.0
+                if water_heat is not None:
+                    w_kw = config.water_heating_power_kw if water_heat[t] > 0.5 else 0.0
                 else:
                     w_kw = 0.0
 
@@ -395,7 +528,7 @@ class KeplerSolver:
                         export_price_sek_kwh=s.export_price_sek_kwh,
                         water_heat_kw=w_kw,
                         terminal_credit_sek=t_credit,
-                        is_optimal=True,
+                        is_optimal=is_optimal,
                     )
                 )
 
@@ -403,17 +536,106 @@ class KeplerSolver:
             logger_perf = logging.getLogger("darkstar.performance")
             logger_perf.setLevel(logging.INFO)  # Ensure we see it
             logger_perf.info(
-                "Kepler Solved: %d slots in %.3fs (Vars: %d, Const: %d) | Cost: %.2f SEK",
+                "Kepler Solved: %d slots via %s%s | build %.3fs, solve %.3fs "
+                "(Vars: %d, Const: %d) | Cost: %.2f SEK",
                 T,
+                backend.name,
+                " (warm)" if warm_started else "",
+                build_duration,
                 solve_duration,
                 var_count,
                 const_count,
                 final_total_cost,
             )
 
-        return KeplerResult(
+        result = KeplerResult(
             slots=result_slots,
             total_cost_sek=final_total_cost,
             is_optimal=is_optimal,
             status_msg=status,
+            solve_time_ms=solve_duration * 1000.0,
+            build_time_ms=build_duration * 1000.0,
+            solver_backend=backend.name,
+            warm_started=warm_started,
+        )
+        if self.warm_start:
+            warm_start_cache.remember(config, result)
+        # Only proven optima are reusable; a time-limited incumbent is not
+        if cache_key is not None and is_optimal:
+            result_cache.put(cache_key, result)
+        return result
+
+    def solve_many(
+        self,
+        inputs: Sequence[KeplerInput],
+        configs: KeplerConfig | Sequence[KeplerConfig],
+        workers: int | None = None,
+        on_result: Callable[[int, KeplerResult], None] | None = None,
+    ) -> list[KeplerResult]:
+        """
+        Solve independent problems, fanned out over a process pool.
+
+        Intended for scenario sweeps and historical replays. Problems are
+        independent, so warm start is not used.
+
+        Args:
+            inputs: One KeplerInput per problem
+            configs: A shared KeplerConfig or one per input
+            workers: Maximum worker processes (default: CPU count). 1 solves
+                in-process, in order.
+            on_result: Called as (index, result) when each problem finishes,
+                in completion order
+
+        Returns:
+            Results in input order.
+        """
+        if isinstance(configs, KeplerConfig):
+            config_list = [configs] * len(inputs)
+        else:
+            config_list = list(configs)
+            if len(config_list) != len(inputs):
+                raise ValueError(
+                    f"solve_many got {len(inputs)} inputs but {len(config_list)} configs"
+                )
+
+        count = len(inputs)
+        max_workers = max(1, min(workers or os.cpu_count() or 1, count))
+        logger_perf = logging.getLogger("darkstar.performance")
+        results: list[KeplerResult | None] = [None] * count
+        start = time.perf_counter()
+
+        def _collect(index: int, result: KeplerResult) -> None:
+            results[index] = result
+            logger_perf.info(
+                "Kepler batch %d/%d: %d slots | build %.0fms, solve %.0fms | %s",
+                index + 1,
+                count,
+                len(result.slots),
+                result.build_time_ms,
+                result.solve_time_ms,
+                result.status_msg,
+            )
+            if on_result is not None:
+                on_result(index, result)
+
+        if max_workers == 1:
+            for index, (input_data, config) in enumerate(zip(inputs, config_list, strict=True)):
+                _collect(index, _solve_in_worker(self.backend_name, input_data, config))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(_solve_in_worker, self.backend_name, input_data, config): index
+                    for index, (input_data, config) in enumerate(
+                        zip(inputs, config_list, strict=True)
+                    )
+                }
+                for future in as_completed(futures):
+                    _collect(futures[future], future.result())
+
+        logger_perf.info(
+            "Kepler batch: %d problems on %d workers in %.2fs",
+            count,
+            max_workers,
+            time.perf_counter() - start,
         )
+        return [r for r in results if r is not None]
@@ -0,0 +1,471 @@
+"""
+Kepler Matrix Builder
+
+Vectorized construction of the Kepler MILP as sparse arrays.
+
+Builds the same formulation as the PuLP model in kepler.py (energy balance,
+SoC dynamics, ramping, water heating gap windows and spacing) but assembles
+each constraint family as one NumPy/SciPy sparse block instead of one Python
+expression per slot. The result feeds the in-process backends directly.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy import sparse
+
+from .backends import MilpModel
+
+if TYPE_CHECKING:
+    from .types import KeplerConfig, KeplerInput
+
+# Penalty constants (must match the PuLP formulation in kepler.py)
+MIN_SOC_PENALTY = 1000.0
+CURTAILMENT_PENALTY = 0.1
+LOAD_SHEDDING_PENALTY = 10000.0
+IMPORT_BREACH_PENALTY = 5000.0
+
+
+@dataclass
+class KeplerModelLayout:
+    """Column layout of a built Kepler model (variable block -> column slice)."""
+
+    num_slots: int
+    blocks: dict[str, slice] = field(default_factory=dict)
+
+    def values(self, x: np.ndarray) -> dict[str, np.ndarray]:
+        """Split a solution vector into named per-block arrays."""
+        return {name: x[block] for name, block in self.blocks.items()}
+
+
+class _ModelAssembler:
+    """Collects column blocks and COO constraint blocks for a MilpModel."""
+
+    def __init__(self) -> None:
+        self.num_cols = 0
+        self.layout_blocks: dict[str, slice] = {}
+        self.col_lower: list[np.ndarray] = []
+        self.col_upper: list[np.ndarray] = []
+        self.cost: list[np.ndarray] = []
+        self.integrality: list[np.ndarray] = []
+        self.rows: list[np.ndarray] = []
+        self.cols: list[np.ndarray] = []
+        self.vals: list[np.ndarray] = []
+        self.row_lower: list[np.ndarray] = []
+        self.row_upper: list[np.ndarray] = []
+        self.num_rows = 0
+
+    def add_vars(
+        self,
+        name: str,
+        size: int,
+        lower: float | np.ndarray = 0.0,
+        upper: float | np.ndarray = np.inf,
+        cost: float | np.ndarray = 0.0,
+        integer: bool = False,
+    ) -> np.ndarray:
+        """Add a block of columns and return their indices."""
+        start = self.num_cols
+        self.num_cols += size
+        self.layout_blocks[name] = slice(start, self.num_cols)
+        self.col_lower.append(np.broadcast_to(np.asarray(lower, dtype=float), (size,)).copy())
+        self.col_upper.append(np.broadcast_to(np.asarray(upper, dtype=float), (size,)).copy())
+        self.cost.append(np.broadcast_to(np.asarray(cost, dtype=float), (size,)).copy())
+        self.integrality.append(np.full(size, 1 if integer else 0, dtype=np.int64))
+        return np.arange(start, self.num_cols)
+
+    def add_rows(
+        self,
+        count: int,
+        terms: list[tuple[np.ndarray, np.ndarray, np.ndarray | float]],
+        lower: float | np.ndarray,
+        upper: float | np.ndarray,
+    ) -> None:
+        """
+        Add `count` constraint rows.
+
+        Each term is (local_row_index, column_index, coefficient) arrays; local
+        row indices are 0..count-1 and are shifted into the global row space.
+        """
+        if count <= 0:
+            return
+        base = self.num_rows
+        for local_rows, cols, coefs in terms:
+            local_rows = np.asarray(local_rows)
+            if local_rows.size == 0:
+                continue
+            self.rows.append(local_rows + base)
+            self.cols.append(np.asarray(cols))
+            self.vals.append(np.broadcast_to(np.asarray(coefs, dtype=float), local_rows.shape))
+        self.row_lower.append(np.broadcast_to(np.asarray(lower, dtype=float), (count,)).copy())
+        self.row_upper.append(np.broadcast_to(np.asarray(upper, dtype=float), (count,)).copy())
+        self.num_rows += count
+
+    def set_cost(self, cols: np.ndarray, cost: float | np.ndarray) -> None:
+        """Add cost to existing columns (objective coefficients accumulate)."""
+        full = np.concatenate(self.cost)
+        np.add.at(full, cols, cost)
+        self.cost = [full]
+
+    def set_lower(self, cols: np.ndarray, lower: float | np.ndarray) -> None:
+        full = np.concatenate(self.col_lower)
+        full[cols] = lower
+        self.col_lower = [full]
+
+    def build(self, offset: float = 0.0) -> MilpModel:
+        if self.rows:
+            rows = np.concatenate(self.rows)
+            cols = np.concatenate(self.cols)
+            vals = np.concatenate(self.vals)
+        else:
+            rows = cols = np.zeros(0, dtype=np.int64)
+            vals = np.zeros(0)
+        a_matrix = sparse.csr_matrix(
+            (vals, (rows, cols)), shape=(self.num_rows, self.num_cols), dtype=float
+        )
+        # Duplicate (row, col) entries are summed, as PuLP does when terms repeat
+        a_matrix.sum_duplicates()
+
+        return MilpModel(
+            c=np.concatenate(self.cost),
+            a_matrix=a_matrix,
+            row_lower=np.concatenate(self.row_lower) if self.row_lower else np.zeros(0),
+            row_upper=np.concatenate(self.row_upper) if self.row_upper else np.zeros(0),
+            col_lower=np.concatenate(self.col_lower),
+            col_upper=np.concatenate(self.col_upper),
+            integrality=np.concatenate(self.integrality),
+            offset=offset,
+        )
+
+
+# Tolerance when comparing slot boundaries against window lengths (hours)
+_HOURS_EPS = 1e-9
+
+
+def water_gap_windows(slot_hours: np.ndarray, hours: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Forward windows of `hours` used by the water gap constraints.
+
+    For each slot t the window holds the slots t..j whose end lies within
+    `hours` of slot t's start (at least slot t itself). Windows cut short by
+    the horizon end are dropped. With uniform slots this is the classic
+    sliding window of int(hours / slot_hours) slots; it also holds for
+    mixed-resolution horizons (see adapter.planner_to_kepler_input).
+
+    Returns:
+        (first_slot, width) arrays, one entry per full window.
+    """
+    T = slot_hours.size
+    if T == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(slot_hours)
+    starts = ends - slot_hours
+    first = np.arange(T)
+    last = np.searchsorted(ends, starts + hours + _HOURS_EPS, side="right") - 1
+    last = np.maximum(last, first)
+    covered = ends[last] - starts
+    full = (last < T - 1) | (hours - covered < slot_hours[-1] - _HOURS_EPS)
+    return first[full], (last - first + 1)[full]
+
+
+def water_spacing_lookback(slot_hours: np.ndarray, hours: float) -> np.ndarray:
+    """
+    Number of preceding slots that start within `hours` of each slot's start.
+
+    Used by the hard spacing constraint: a block may only start at t if none
+    of these slots heat (always at least the previous slot). Uniform slots
+    give min(t, max(1, int(hours / slot_hours))).
+    """
+    idx = np.arange(slot_hours.size)
+    starts = np.cumsum(slot_hours) - slot_hours
+    first = np.searchsorted(starts, starts - hours - _HOURS_EPS, side="left")
+    return np.maximum(idx - first, np.minimum(idx, 1))
+
+
+def _window_terms(
+    first_slot: np.ndarray, width: np.ndarray, first_col: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """(row, col) pairs for rows r = sum(first_col[first_slot[r] : first_slot[r] + width[r]])."""
+    rows = np.repeat(np.arange(first_slot.size), width)
+    offsets = np.arange(rows.size) - np.repeat(np.cumsum(width) - width, width)
+    cols = first_col[np.repeat(first_slot, width) + offsets]
+    return rows, cols
+
+
+def build_kepler_model(
+    input_data: KeplerInput, config: KeplerConfig
+) -> tuple[MilpModel, KeplerModelLayout]:
+    """
+    Build the Kepler MILP as a MilpModel.
+
+    Args:
+        input_data: Slots and initial SoC
+        config: Solver configuration
+
+    Returns:
+        (model, layout) where layout maps variable blocks to solution columns.
+    """
+    slots = input_data.slots
+    T = len(slots)
+
+    slot_hours = np.array(
+        [(s.end_time - s.start_time).total_seconds() / 3600.0 for s in slots], dtype=float
+    )
+    load = np.array([s.load_kwh for s in slots], dtype=float)
+    pv = np.array([s.pv_kwh for s in slots], dtype=float)
+    import_price = np.array([s.import_price_sek_kwh for s in slots], dtype=float)
+    export_price = np.array([s.export_price_sek_kwh for s in slots], dtype=float)
+
+    min_soc_kwh = config.capacity_kwh * config.min_soc_percent / 100.0
+    max_soc_kwh = config.capacity_kwh * config.max_soc_percent / 100.0
+    initial_soc = max(0.0, min(config.capacity_kwh, input_data.initial_soc_kwh))
+    discharge_eff = config.discharge_efficiency if config.discharge_efficiency > 0 else 1.0
+    water_enabled = config.water_heating_power_kw > 0
+
+    m = _ModelAssembler()
+    slot_idx = np.arange(T)
+
+    # Power limits and hard grid limits become column bounds
+    export_upper: float | np.ndarray = np.inf
+    if config.max_export_power_kw is not None:
+        export_upper = config.max_export_power_kw * slot_hours
+    if not config.enable_export:
+        export_upper = 0.0
+    import_upper: float | np.ndarray = np.inf
+    if config.max_import_power_kw is not None:
+        import_upper = config.max_import_power_kw * slot_hours
+
+    # Per-slot continuous variables (kWh) with their objective coefficients
+    charge = m.add_vars(
+        "charge",
+        T,
+        upper=config.max_charge_power_kw * slot_hours,
+        cost=config.wear_cost_sek_per_kwh,
+    )
+    discharge = m.add_vars(
+        "discharge",
+        T,
+        upper=config.max_discharge_power_kw * slot_hours,
+        cost=config.wear_cost_sek_per_kwh,
+    )
+    grid_import = m.add_vars("grid_import", T, upper=import_upper, cost=import_price)
+    grid_export = m.add_vars(
+        "grid_export",
+        T,
+        upper=export_upper,
+        cost=-(export_price - config.export_threshold_sek_per_kwh),
+    )
+    curtailment = m.add_vars("curtailment", T, cost=CURTAILMENT_PENALTY)
+    load_shedding = m.add_vars("load_shedding", T, cost=LOAD_SHEDDING_PENALTY)
+    import_breach = m.add_vars("import_breach", T, cost=IMPORT_BREACH_PENALTY)
+
+    ramp_cost = config.ramping_cost_sek_per_kw / slot_hours
+    ramp_upper = np.full(T, np.inf)
+    ramp_upper[:1] = 0.0  # No ramp into the first slot
+    ramp_up = m.add_vars("ramp_up", T, upper=ramp_upper, cost=ramp_cost)
+    ramp_down = m.add_vars("ramp_down", T, upper=ramp_upper, cost=ramp_cost)
+
+    # SoC states (T+1) with soft min via violation slack, max as bound
+    soc = m.add_vars("soc", T + 1, upper=min(config.capacity_kwh, max_soc_kwh))
+    soc_violation = m.add_vars("soc_violation", T + 1, cost=MIN_SOC_PENALTY)
+    if config.terminal_value_sek_kwh != 0:
+        m.set_cost(soc[T : T + 1], -config.terminal_value_sek_kwh)
+
+    if water_enabled:
+        water_heat = m.add_vars("water_heat", T, upper=1.0, integer=True)
+        water_start = m.add_vars("water_start", T, upper=1.0, integer=True)
+        if config.water_block_start_penalty_sek > 0:
+            m.set_cost(water_start, config.water_block_start_penalty_sek)
+        if config.force_water_on_slots:
+            forced = np.array(
+                [t for t in config.force_water_on_slots if 0 <= t < T], dtype=np.int64
+            )
+            if forced.size:
+                m.set_lower(water_heat[forced], 1.0)
+
+    # Initial SoC
+    m.add_rows(1, [(np.zeros(1, dtype=np.int64), soc[:1], 1.0)], initial_soc, initial_soc)
+
+    # Energy balance:
+    # charge - discharge - import + export + curtail - shed + P*h*heat == pv - load
+    balance_terms = [
+        (slot_idx, charge, 1.0),
+        (slot_idx, discharge, -1.0),
+        (slot_idx, grid_import, -1.0),
+        (slot_idx, grid_export, 1.0),
+        (slot_idx, curtailment, 1.0),
+        (slot_idx, load_shedding, -1.0),
+    ]
+    if water_enabled:
+        balance_terms.append((slot_idx, water_heat, config.water_heating_power_kw * slot_hours))
+    m.add_rows(T, balance_terms, pv - load, pv - load)
+
+    # Battery dynamics: soc[t+1] - soc[t] - eff_c*charge + discharge/eff_d == 0
+    m.add_rows(
+        T,
+        [
+            (slot_idx, soc[1:], 1.0),
+            (slot_idx, soc[:-1], -1.0),
+            (slot_idx, charge, -config.charge_efficiency),
+            (slot_idx, discharge, 1.0 / discharge_eff),
+        ],
+        0.0,
+        0.0,
+    )
+
+    # Soft grid import limit: import - breach <= limit*h
+    if config.grid_import_limit_kw is not None:
+        m.add_rows(
+            T,
+            [(slot_idx, grid_import, 1.0), (slot_idx, import_breach, -1.0)],
+            -np.inf,
+            config.grid_import_limit_kw * slot_hours,
+        )
+
+    # Ramping: net[t] - net[t-1] - ramp_up[t] + ramp_down[t] == 0 for t >= 1
+    if T > 1:
+        r = np.arange(T - 1)
+        m.add_rows(
+            T - 1,
+            [
+                (r, charge[1:], 1.0),
+                (r, discharge[1:], -1.0),
+                (r, charge[:-1], -1.0),
+                (r, discharge[:-1], 1.0),
+                (r, ramp_up[1:], -1.0),
+                (r, ramp_down[1:], 1.0),
+            ],
+            0.0,
+            0.0,
+        )
+
+    # Soft min SoC: soc[t] + violation[t] >= min_soc (all T+1 states)
+    states = np.arange(T + 1)
+    m.add_rows(
+        T + 1,
+        [(states, soc, 1.0), (states, soc_violation, 1.0)],
+        min_soc_kwh,
+        np.inf,
+    )
+
+    # Terminal SoC target (bidirectional soft constraint)
+    if config.target_soc_kwh is not None:
+        target = config.target_soc_kwh
+        under = m.add_vars("target_under", 1, cost=config.target_soc_penalty_sek)
+        over = m.add_vars(
+            "target_over",
+            1,
+            cost=config.target_soc_penalty_sek if target > 0 else 0.0,
+        )
+        zero = np.zeros(1, dtype=np.int64)
+        m.add_rows(1, [(zero, soc[T:], 1.0), (zero, under, 1.0)], target, np.inf)
+        m.add_rows(1, [(zero, soc[T:], 1.0), (zero, over, -1.0)], -np.inf, target)
+
+    if water_enabled and T > 0:
+        _add_water_constraints(m, input_data, config, slot_hours, water_heat, water_start)
+
+    model = m.build()
+    return model, KeplerModelLayout(num_slots=T, blocks=m.layout_blocks)
+
+
+def _add_water_constraints(
+    m: _ModelAssembler,
+    input_data: KeplerInput,
+    config: KeplerConfig,
+    slot_hours: np.ndarray,
+    water_heat: np.ndarray,
+    water_start: np.ndarray,
+) -> None:
+    """Water heating start detection, daily minimum, gap windows and spacing."""
+    slots = input_data.slots
+    T = len(slots)
+    slot_idx = np.arange(T)
+    water_kwh = config.water_heating_power_kw * slot_hours
+
+    # Start detection: start[0] == heat[0]; start[t] - heat[t] + heat[t-1] >= 0
+    zero = np.zeros(1, dtype=np.int64)
+    m.add_rows(1, [(zero, water_start[:1], 1.0), (zero, water_heat[:1], -1.0)], 0.0, 0.0)
+    if T > 1:
+        r = np.arange(T - 1)
+        m.add_rows(
+            T - 1,
+            [
+                (r, water_start[1:], 1.0),
+                (r, water_heat[1:], -1.0),
+                (r, water_heat[:-1], 1.0),
+            ],
+            0.0,
+            np.inf,
+        )
+
+    # Per-day minimum energy (Rev WH2: deferral extends buckets into next morning)
+    slots_by_day: dict[object, list[int]] = defaultdict(list)
+    defer_hours = config.defer_up_to_hours
+    for t, s in enumerate(slots):
+        bucket_date = s.start_time.date()
+        if defer_hours > 0 and s.start_time.hour < defer_hours:
+            bucket_date = bucket_date - timedelta(days=1)
+        slots_by_day[bucket_date].append(t)
+
+    day_rows: list[np.ndarray] = []
+    day_cols: list[np.ndarray] = []
+    day_min: list[float] = []
+    for i, day in enumerate(sorted(slots_by_day)):
+        if i == 0:
+            required = max(0.0, config.water_heating_min_kwh - config.water_heated_today_kwh)
+        else:
+            required = config.water_heating_min_kwh
+        if required > 0:
+            idx = np.asarray(slots_by_day[day], dtype=np.int64)
+            day_rows.append(np.full(idx.size, len(day_min)))
+            day_cols.append(idx)
+            day_min.append(required)
+    if day_min:
+        day_idx = np.concatenate(day_cols)
+        m.add_rows(
+            len(day_min),
+            [(np.concatenate(day_rows), water_heat[day_idx], water_kwh[day_idx])],
+            np.asarray(day_min),
+            np.inf,
+        )
+
+    # Progressive gap penalty (Rev K18/K21): every window must contain a heating slot
+    if config.water_heating_max_gap_hours > 0 and config.water_comfort_penalty_sek > 0:
+        for factor, name in ((1.0, "gap_violation"), (1.5, "gap_violation_2")):
+            first_slot, width = water_gap_windows(
+                slot_hours, config.water_heating_max_gap_hours * factor
+            )
+            num_windows = first_slot.size
+            if num_windows == 0:
+                continue
+            violation = m.add_vars(name, num_windows, cost=config.water_comfort_penalty_sek)
+            rows, cols = _window_terms(first_slot, width, water_heat)
+            m.add_rows(
+                num_windows,
+                [(rows, cols, 1.0), (np.arange(num_windows), violation, 1.0)],
+                1.0,
+                np.inf,
+            )
+
+    # Hard spacing (Rev PERF1): sum(heat[t-S : t]) + S*start[t] <= S
+    if config.water_min_spacing_hours > 0:
+        lookback = water_spacing_lookback(slot_hours, config.water_min_spacing_hours)
+        spacing = max(
+            1, int(config.water_min_spacing_hours / slot_hours.min()), int(lookback.max())
+        )
+        lag = np.arange(1, int(lookback.max()) + 1)
+        t_grid = slot_idx[:, None]
+        prev = t_grid - lag[None, :]
+        valid = lag[None, :] <= lookback[:, None]
+        rows = np.broadcast_to(t_grid, prev.shape)[valid]
+        m.add_rows(
+            T,
+            [(rows, water_heat[prev[valid]], 1.0), (slot_idx, water_start, float(spacing))],
+            -np.inf,
+            float(spacing),
+        )
@@ -0,0 +1,187 @@
+"""
+Kepler Result Cache
+
+Bounded LRU cache of solved KeplerResults, keyed by a fingerprint of the
+problem (slot arrays, initial SoC and every KeplerConfig field).
+
+The planner is triggered from the scheduler loop, manual API triggers, smart
+retries and simulation replays, which often hand the solver the exact same
+problem. A hit returns a copy of the stored result without building or
+solving anything. Entries can optionally be persisted to a directory so the
+cache survives restarts.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .types import KeplerConfig, KeplerInput, KeplerResult
+
+logger = logging.getLogger("darkstar.planner.solver")
+
+# Inputs are rounded to this many decimals before hashing (solver tolerance)
+_FINGERPRINT_DECIMALS = 6
+# Bump when the model formulation changes so persisted entries are not reused
+_CACHE_VERSION = 2
+
+
+def _round_value(value: Any) -> Any:
+    if isinstance(value, float):
+        return round(value, _FINGERPRINT_DECIMALS)
+    if isinstance(value, list | tuple):
+        return [_round_value(v) for v in value]
+    return value
+
+
+def fingerprint(input_data: KeplerInput, config: KeplerConfig, backend: str = "") -> str:
+    """
+    Stable hash of a Kepler problem.
+
+    Floats are rounded to solver tolerance so noise far below anything the
+    MILP can distinguish does not defeat the cache.
+    """
+    slots = input_data.slots
+    digest = hashlib.sha256()
+    digest.update(f"v{_CACHE_VERSION}|{backend}|".encode())
+
+    times = np.array(
+        [(s.start_time.timestamp(), s.end_time.timestamp()) for s in slots], dtype=np.int64
+    )
+    values = np.round(
+        np.array(
+            [(s.load_kwh, s.pv_kwh, s.import_price_sek_kwh, s.export_price_sek_kwh) for s in slots],
+            dtype=np.float64,
+        ),
+        _FINGERPRINT_DECIMALS,
+    )
+    # -0.0 and 0.0 must hash alike
+    values += 0.0
+    digest.update(times.tobytes())
+    digest.update(values.tobytes())
+    digest.update(repr(round(input_data.initial_soc_kwh, _FINGERPRINT_DECIMALS)).encode())
+
+    config_fields = {k: _round_value(v) for k, v in asdict(config).items()}
+    digest.update(json.dumps(config_fields, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class SolveResultCache:
+    """Thread-safe LRU of KeplerResults with optional disk backing."""
+
+    def __init__(self, max_entries: int = 64, disk_path: str | Path | None = None) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, KeplerResult] = OrderedDict()
+        self.max_entries = max_entries
+        self.disk_path = Path(disk_path) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def configure(self, max_entries: int, disk_path: str | Path | None = None) -> None:
+        """Apply settings from config (called by the pipeline before each solve)."""
+        with self._lock:
+            self.max_entries = max(0, int(max_entries))
+            self.disk_path = Path(disk_path) if disk_path else None
+            self._evict()
+
+    def get(self, key: str) -> KeplerResult | None:
+        """Return a copy of the cached result, or None (counted as a miss)."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+        result = self._load(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._entries[key] = result
+            self._evict()
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: KeplerResult) -> None:
+        """Store a solved result (empty results are not cached)."""
+        if not result.slots or self.max_entries <= 0:
+            return
+        stored = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            self._evict()
+        self._save(key, stored)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "disk_path": str(self.disk_path) if self.disk_path else None,
+            }
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> KeplerResult | None:
+        if self.disk_path is None:
+            return None
+        path = self.disk_path / f"{key}.pkl"
+        try:
+            with path.open("rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Dropping unreadable Kepler cache entry %s: %s", path.name, e)
+            path.unlink(missing_ok=True)
+            return None
+
+    def _save(self, key: str, result: KeplerResult) -> None:
+        if self.disk_path is None:
+            return
+        try:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+            tmp = self.disk_path / f"{key}.tmp"
+            with tmp.open("wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(self.disk_path / f"{key}.pkl")
+
+            # Keep the directory bounded like the in-memory LRU (oldest first)
+            files = sorted(self.disk_path.glob("*.pkl"), key=lambda p: p.stat().st_mtime_ns)
+            for stale in files[: max(0, len(files) - self.max_entries)]:
+                stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Failed to persist Kepler cache entry: %s", e)
+
+
+# Process-wide instance (planner runs in-process in the FastAPI server)
+result_cache = SolveResultCache()
@@ -101,3 +101,7 @@ class KeplerResult:
     is_optimal: bool
     status_msg: str
     solve_time_ms: float = 0.0
+    build_time_ms: float = 0.0  # Model construction (pulp/arrays) before the solver runs
+    solver_backend: str = ""
+    warm_started: bool = False  # Seeded from the previous result (see warm_start.py)
+    from_cache: bool = False  # Returned from the result cache (see result_cache.py)
@@ -0,0 +1,159 @@
+"""
+Kepler Warm Start
+
+Keeps the last solved KeplerResult so the next replan can start from it.
+
+Between scheduler ticks usually only the current SoC and a few near-term
+forecasts move. When the new horizon is the tail of the previous one (same
+end, same prices, same solver config), the previous water heating plan is
+shifted forward by the elapsed slots and handed to the backend as a MIP
+start. Anything else falls back to a cold solve.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .matrix_builder import KeplerModelLayout
+    from .types import KeplerConfig, KeplerInput, KeplerResult
+
+logger = logging.getLogger("darkstar.planner.solver")
+
+# Config fields that legitimately change between ticks without invalidating the plan
+_VOLATILE_CONFIG_FIELDS = ("water_heated_today_kwh", "force_water_on_slots")
+_PRICE_TOLERANCE = 1e-6
+
+
+def _config_key(config: KeplerConfig) -> tuple[Any, ...]:
+    fields = asdict(config)
+    for name in _VOLATILE_CONFIG_FIELDS:
+        fields.pop(name, None)
+    return tuple(sorted(fields.items()))
+
+
+class WarmStartCache:
+    """Thread-safe holder for the last solved horizon."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._result: KeplerResult | None = None
+        self._config_key: tuple[Any, ...] | None = None
+        self.warm_count = 0
+        self.cold_count = 0
+        self.last_reason = "empty"
+
+    def remember(self, config: KeplerConfig, result: KeplerResult) -> None:
+        """Store a solved result as the base for the next re-solve."""
+        if not result.slots:
+            return
+        with self._lock:
+            self._result = result
+            self._config_key = _config_key(config)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._result = None
+            self._config_key = None
+            self.last_reason = "cleared"
+
+    def shifted_water_plan(
+        self, input_data: KeplerInput, config: KeplerConfig
+    ) -> np.ndarray | None:
+        """
+        Previous water heating plan shifted onto the new horizon.
+
+        Returns a 0/1 array (one entry per new slot), or None when the
+        previous result cannot seed this problem (reason in last_reason).
+        """
+        with self._lock:
+            previous = self._result
+            previous_key = self._config_key
+
+        reason = None
+        elapsed = 0
+        if previous is None:
+            reason = "no previous result"
+        elif previous_key != _config_key(config):
+            reason = "config changed"
+        else:
+            previous_starts = [s.start_time for s in previous.slots]
+            first = input_data.slots[0].start_time
+            if first not in previous_starts:
+                reason = "horizon start not in previous plan"
+            else:
+                elapsed = previous_starts.index(first)
+                tail = previous.slots[elapsed:]
+                if len(tail) != len(input_data.slots) or any(
+                    old.start_time != new.start_time
+                    for old, new in zip(tail, input_data.slots, strict=True)
+                ):
+                    reason = "horizon length changed"
+                else:
+                    old_prices = np.array(
+                        [(s.import_price_sek_kwh, s.export_price_sek_kwh) for s in tail]
+                    )
+                    new_prices = np.array(
+                        [(s.import_price_sek_kwh, s.export_price_sek_kwh) for s in input_data.slots]
+                    )
+                    if not np.allclose(old_prices, new_prices, atol=_PRICE_TOLERANCE, rtol=0.0):
+                        reason = "prices changed"
+
+        if reason is not None or previous is None:
+            with self._lock:
+                self.cold_count += 1
+                self.last_reason = reason or "no previous result"
+            return None
+
+        with self._lock:
+            self.warm_count += 1
+            self.last_reason = f"shifted {elapsed} slots"
+        heat = np.array(
+            [1.0 if s.water_heat_kw > 0 else 0.0 for s in previous.slots[elapsed:]], dtype=float
+        )
+        if config.force_water_on_slots:
+            forced = [t for t in config.force_water_on_slots if 0 <= t < heat.size]
+            heat[forced] = 1.0
+        return heat
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "warm": self.warm_count,
+                "cold": self.cold_count,
+                "last_reason": self.last_reason,
+            }
+
+
+def water_mip_start(
+    heat: np.ndarray, layout: KeplerModelLayout
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Sparse MIP start (column indices, values) for the water heating binaries.
+
+    Block starts are recomputed from the shifted heating plan so the start
+    satisfies the start-detection rows; the solver completes the continuous part.
+    """
+    heat_block = layout.blocks.get("water_heat")
+    start_block = layout.blocks.get("water_start")
+    if heat_block is None or start_block is None:
+        return None
+
+    starts = heat.copy()
+    starts[1:] = np.maximum(heat[1:] - heat[:-1], 0.0)
+    idx = np.concatenate(
+        [
+            np.arange(heat_block.start, heat_block.stop),
+            np.arange(start_block.start, start_block.stop),
+        ]
+    )
+    return idx, np.concatenate([heat, starts])
+
+
+# Process-wide instance (planner runs in-process in the FastAPI server)
+warm_start_cache = WarmStartCache()
@@ -9,8 +9,9 @@ Rev K19: Anti-legionella cycle tracking.
 
 import logging
 from datetime import datetime
-from sqlalchemy import create_engine, select, text
+from sqlalchemy import select, text
 from sqlalchemy.orm import sessionmaker
+from backend.core.db import get_engine
 from backend.learning.models import VacationState
 
 logger = logging.getLogger("darkstar.planner.vacation")
@@ -18,8 +19,7 @@ logger = logging.getLogger("darkstar.planner.vacation")
 
 def _get_session(sqlite_path: str):
     """Get a SQLAlchemy session for the given database path."""
-    engine = create_engine(f"sqlite:///{sqlite_path}", connect_args={"timeout": 30.0})
-    Session = sessionmaker(bind=engine)
+    Session = sessionmaker(bind=get_engine(sqlite_path))
     return Session()
 
 
@@ -65,3 +65,11 @@ def test_debug_soc(client):
     assert response.status_code == 200
     data = response.json()
     assert "slots" in data
+
+
+def test_solver_stats(client):
+    response = client.get("/api/performance/solver")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"hits", "misses", "entries"} <= set(data["result_cache"])
+    assert "warm" in data["warm_start"]
@@ -1,6 +1,7 @@
 import unittest
 from datetime import datetime
 
+import pandas as pd
 import pytz
 
 from backend.astro import SunCalculator
@@ -53,6 +54,20 @@ class TestSunCalculator(unittest.TestCase):
         # With 30 min buffer, should be True (14:48 + 30m = 15:18)
         self.assertTrue(self.astro.is_sun_up(dt, buffer_minutes=30))
 
+    def test_daylight_mask_matches_is_sun_up(self):
+        # A week across the spring DST switch, 15-minute slots
+        slots = pd.date_range("2024-03-28", periods=7 * 96, freq="15min", tz=self.tz)
+        for buffer in (0, 30):
+            mask = self.astro.daylight_mask(slots, buffer_minutes=buffer)
+            expected = [self.astro.is_sun_up(ts, buffer_minutes=buffer) for ts in slots]
+            self.assertEqual(mask.tolist(), expected)
+
+    def test_daylight_mask_polar_night(self):
+        # Tromsø in December: sun never rises
+        astro = SunCalculator(69.6492, 18.9553, "Europe/Oslo")
+        slots = pd.date_range("2024-12-20", periods=96, freq="15min", tz="Europe/Oslo")
+        self.assertFalse(astro.daylight_mask(slots).any())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,73 @@
+"""
+Tests for the async I/O layer used by FastAPI handlers.
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.core import async_io
+from backend.core.async_io import aload_config, load_config_cached
+
+# Max acceptable event-loop stall while a slow upstream call is in flight
+MAX_LOOP_LAG_S = 0.1
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+@pytest.mark.anyio
+async def test_slow_ha_fallback_does_not_block_event_loop():
+    from backend.api.routers.services import get_ha_average
+
+    def slow_load_profile(_config):
+        time.sleep(0.5)  # Simulates a slow HA history request
+        return [1.0] * 96
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+
+    with (
+        patch("backend.api.routers.services._fetch_ha_history_avg", AsyncMock(return_value=0.0)),
+        patch("backend.api.routers.services.aload_config", AsyncMock(return_value={})),
+        patch("inputs.get_load_profile_from_ha", slow_load_profile),
+    ):
+        result = await get_ha_average(entity_id="sensor.lag_probe", hours=1)
+
+    stop.set()
+    worst_lag = await lag_task
+
+    assert result["average_load_kw"] == 1.0
+    assert worst_lag < MAX_LOOP_LAG_S, f"event loop stalled for {worst_lag:.3f}s"
+
+
+@pytest.mark.anyio
+async def test_config_parsed_once_per_mtime(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("timezone: Europe/Stockholm\n", encoding="utf-8")
+    async_io.invalidate_config_cache()
+
+    with patch.object(async_io, "_parse_yaml", wraps=async_io._parse_yaml) as parse:
+        first = await aload_config(path)
+        first["timezone"] = "mutated"  # Callers get private copies
+        assert load_config_cached(path) == {"timezone": "Europe/Stockholm"}
+        assert parse.call_count == 1
+
+        path.write_text("timezone: UTC\n", encoding="utf-8")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert (await aload_config(path))["timezone"] == "UTC"
+        assert parse.call_count == 2
+
+    assert await aload_config(tmp_path / "missing.yaml") == {}
+    async_io.invalidate_config_cache()
@@ -0,0 +1,50 @@
+import pytest
+import pytz
+from sqlalchemy import text
+
+from backend.core import db
+from backend.learning.store import LearningStore
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    db.dispose_engines()
+    yield
+    db.dispose_engines()
+
+
+def test_engine_is_shared_per_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = db.get_engine("learning.db")
+
+    assert db.get_engine(tmp_path / "learning.db") is engine
+    assert db.get_engine(tmp_path / "other.db") is not engine
+    assert LearningStore("learning.db", pytz.UTC).engine is engine
+
+
+def test_pragmas_applied_to_pooled_and_raw_connections(tmp_path):
+    path = tmp_path / "learning.db"
+    with db.get_engine(path).connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 30000
+
+    with db.connect(path) as raw:
+        assert raw.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert raw.execute("PRAGMA cache_size").fetchone()[0] == -db.CACHE_SIZE_KIB
+
+
+def test_reader_not_blocked_by_open_write_transaction(tmp_path):
+    path = tmp_path / "learning.db"
+    with db.connect(path) as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    with db.get_engine(path).begin() as writer:
+        writer.execute(text("INSERT INTO t VALUES (2)"))
+        # WAL readers see the last committed snapshot instead of waiting
+        with db.connect(path) as reader:
+            assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+    with db.connect(path) as reader:
+        assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
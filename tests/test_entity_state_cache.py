@@ -0,0 +1,67 @@
+"""
+Tests for the WebSocket-fed HA entity state cache and the executor's
+cache-first state reads.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.core.entity_cache import EntityStateCache, entity_state_cache
+from executor.engine import ExecutorEngine
+
+
+@pytest.fixture
+def shared_cache():
+    entity_state_cache.clear()
+    yield entity_state_cache
+    entity_state_cache.clear()
+
+
+def test_cache_serves_only_while_live():
+    cache = EntityStateCache()
+    cache.track(["sensor.soc", None, ""])
+    assert cache.is_tracked("sensor.soc")
+    assert not cache.is_tracked("sensor.other")
+
+    cache.update("sensor.soc", {"state": "55"})
+    assert cache.get("sensor.soc") is None  # Feed not live yet
+
+    cache.set_live(True)
+    cache.update("sensor.soc", {"state": "55"})
+    assert cache.get("sensor.soc") == {"state": "55"}
+
+    # Disconnect drops entries: events may be missed while reconnecting
+    cache.set_live(False)
+    cache.set_live(True)
+    assert cache.get("sensor.soc") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_cache_entry_goes_stale():
+    cache = EntityStateCache(max_age_s=0.0)
+    cache.set_live(True)
+    cache.update("sensor.pv", {"state": "1200"})
+    assert cache.get("sensor.pv") is None
+    assert cache.get("sensor.pv", max_age_s=60.0) == {"state": "1200"}
+
+    cache.update("sensor.pv", None)
+    assert cache.age_s("sensor.pv") is None
+
+
+def test_engine_prefers_cache_and_falls_back_to_rest(shared_cache):
+    engine = ExecutorEngine.__new__(ExecutorEngine)
+    engine.ha_client = MagicMock()
+    engine.ha_client.get_state_value.return_value = "rest"
+
+    shared_cache.set_live(True)
+    shared_cache.update("sensor.load", {"state": "cached"})
+
+    assert engine._get_state_value("sensor.load") == "cached"
+    engine.ha_client.get_state_value.assert_not_called()
+
+    assert engine._get_state_value("sensor.missing") == "rest"
+    engine.ha_client.get_state_value.assert_called_once_with("sensor.missing")
@@ -4,11 +4,20 @@ Tests for Executor Actions (HAClient and ActionDispatcher)
 Tests with mocked HTTP requests to avoid needing a live Home Assistant instance.
 """
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
-from executor.actions import ActionDispatcher, ActionResult, HAClient
+from backend.core.entity_cache import entity_state_cache
+from executor.actions import (
+    ActionDispatcher,
+    ActionResult,
+    AsyncHAClient,
+    DispatchStats,
+    HAClient,
+)
 from executor.config import (
     ControllerConfig,
     ExecutorConfig,
@@ -398,3 +407,226 @@ class TestActionDispatcherExecute:
         assert (
             "max_export_power" in action_types
         )  # Still called as it doesn't have a write flag yet
+
+
+class FakeAsyncHA:
+    """Async client stand-in that records service calls and peak concurrency."""
+
+    def __init__(self, states):
+        self.states = states
+        self.stats = DispatchStats()
+        self.max_concurrency = 4
+        self.retries = 1
+        self.fetched = []
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get_state_values(self, entity_ids):
+        self.fetched.append(list(entity_ids))
+        return {e: self.states.get(e) for e in entity_ids}
+
+    async def call_service(self, domain, service, entity_id=None, data=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        self.calls.append(("start", entity_id))
+        await asyncio.sleep(0.01)
+        self.calls.append(("end", entity_id))
+        self.in_flight -= 1
+        return entity_id != "input_number.vvbtemp"
+
+    async def aclose(self):
+        pass
+
+
+class TestActionDispatcherConcurrent:
+    """Test the snapshot + concurrent dispatch path."""
+
+    @pytest.fixture
+    def executor_config(self):
+        return ExecutorConfig(
+            soc_target_entity="input_number.master_soc_target",
+            inverter=InverterConfig(
+                work_mode_entity="select.inverter_work_mode",
+                grid_charging_entity="switch.inverter_battery_grid_charging",
+                max_charging_current_entity="number.inverter_battery_max_charging_current",
+                max_discharging_current_entity="number.inverter_battery_max_discharging_current",
+                grid_max_export_power_entity="number.inverter_grid_max_export_power",
+            ),
+            water_heater=WaterHeaterConfig(target_entity="input_number.vvbtemp"),
+            notifications=NotificationConfig(on_charge_start=False, on_export_start=False),
+            controller=ControllerConfig(),
+        )
+
+    @pytest.fixture
+    def decision(self):
+        return ControllerDecision(
+            work_mode="Export First",
+            grid_charging=False,
+            charge_value=0,
+            discharge_value=190,
+            soc_target=50,
+            water_temp=60,
+            export_power_w=5000.0,
+            write_charge_current=False,
+            write_discharge_current=True,
+        )
+
+    def test_one_snapshot_skips_noops_and_orders_work_mode_first(self, executor_config, decision):
+        fake = FakeAsyncHA(
+            {
+                "select.inverter_work_mode": "Zero Export To CT",
+                "switch.inverter_battery_grid_charging": "off",
+                "input_number.master_soc_target": "50",
+                "number.inverter_grid_max_export_power": "0",
+            }
+        )
+        sync_ha = MagicMock(spec=HAClient)
+        dispatcher = ActionDispatcher(sync_ha, executor_config, async_client=fake)
+        try:
+            results = dispatcher.execute(decision)
+        finally:
+            dispatcher.close()
+
+        # One batched read, no per-action REST reads
+        assert len(fake.fetched) == 1
+        sync_ha.get_state_value.assert_not_called()
+
+        by_type = {r.action_type: r for r in results}
+        assert [r.action_type for r in results] == [
+            "work_mode",
+            "grid_charging",
+            "discharge_limit",
+            "soc_target",
+            "water_temp",
+            "max_export_power",
+        ]
+        assert by_type["soc_target"].skipped
+        assert by_type["water_temp"].success is False
+
+        written = {e for phase, e in fake.calls if phase == "start"}
+        assert written == {
+            "select.inverter_work_mode",
+            # Equal to the snapshot, but the mode change may have reset it
+            "switch.inverter_battery_grid_charging",
+            "number.inverter_battery_max_discharging_current",
+            "input_number.vvbtemp",
+            "number.inverter_grid_max_export_power",
+        }
+        # Inverter limits only start after the work mode call finished
+        order = fake.calls.index
+        work_mode_end = order(("end", "select.inverter_work_mode"))
+        assert order(("start", "number.inverter_grid_max_export_power")) > work_mode_end
+        # ...while the water heater ran alongside the work mode change
+        assert order(("start", "input_number.vvbtemp")) < work_mode_end
+        assert fake.peak >= 2
+
+        stats = fake.stats.as_dict()
+        assert stats["entities"]["input_number.master_soc_target"]["noop_skips"] == 1
+
+    @pytest.mark.parametrize("mode", ["Zero Export To CT", "Export First"])
+    def test_limit_equal_to_snapshot_rewritten_only_on_mode_change(
+        self, executor_config, decision, mode
+    ):
+        fake = FakeAsyncHA(
+            {
+                "select.inverter_work_mode": mode,
+                "switch.inverter_battery_grid_charging": "off",
+                "number.inverter_battery_max_discharging_current": "190",
+                "number.inverter_grid_max_export_power": "5000",
+            }
+        )
+        dispatcher = ActionDispatcher(MagicMock(spec=HAClient), executor_config, async_client=fake)
+        try:
+            results = dispatcher.execute(decision)
+        finally:
+            dispatcher.close()
+
+        by_type = {r.action_type: r for r in results}
+        written = {e for phase, e in fake.calls if phase == "start"}
+        mode_changes = mode != decision.work_mode
+        assert ("number.inverter_battery_max_discharging_current" in written) is mode_changes
+        assert ("number.inverter_grid_max_export_power" in written) is mode_changes
+        assert by_type["discharge_limit"].skipped is not mode_changes
+        if mode_changes:
+            order = fake.calls.index
+            assert order(("start", "number.inverter_battery_max_discharging_current")) > order(
+                ("end", "select.inverter_work_mode")
+            )
+
+    def test_snapshot_prefers_websocket_cache(self, executor_config, decision):
+        fake = FakeAsyncHA({})
+        entity_state_cache.set_live(True)
+        entity_state_cache.update("select.inverter_work_mode", {"state": "Export First"})
+        try:
+            dispatcher = ActionDispatcher(
+                MagicMock(spec=HAClient), executor_config, async_client=fake
+            )
+            results = dispatcher.execute(decision)
+            dispatcher.close()
+        finally:
+            entity_state_cache.clear()
+
+        assert "select.inverter_work_mode" not in fake.fetched[0]
+        assert results[0].skipped is True
+        assert fake.stats.as_dict()["snapshot_cache_hits"] == 1
+
+    def test_shadow_mode_sends_nothing(self, executor_config, decision):
+        fake = FakeAsyncHA({})
+        dispatcher = ActionDispatcher(
+            MagicMock(spec=HAClient), executor_config, shadow_mode=True, async_client=fake
+        )
+        results = dispatcher.execute(decision)
+        dispatcher.close()
+
+        assert fake.calls == []
+        assert all("[SHADOW]" in r.message for r in results)
+
+
+def _call_service(client, *args):
+    async def main():
+        try:
+            return await client.call_service(*args)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+class TestAsyncHAClient:
+    """Test AsyncHAClient retries and stats."""
+
+    def test_retries_transient_failure_and_records_stats(self):
+        responses = iter([503, 200])
+        client = AsyncHAClient(
+            "http://ha:8123",
+            "token",
+            retry_backoff_s=0.0,
+            transport=httpx.MockTransport(lambda req: httpx.Response(next(responses))),
+        )
+
+        ok = _call_service(client, "number", "set_value", "number.x", {"value": 1})
+
+        assert ok is True
+        entry = client.stats.as_dict()["entities"]["number.x"]
+        assert entry["calls"] == 1
+        assert entry["retries"] == 1
+        assert entry["failures"] == 0
+        assert entry["latency_ms"]["count"] == 1
+
+    def test_client_error_is_not_retried(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(400)
+
+        client = AsyncHAClient(
+            "http://ha:8123", "token", retry_backoff_s=0.0, transport=httpx.MockTransport(handler)
+        )
+
+        ok = _call_service(client, "select", "select_option", "select.x")
+
+        assert ok is False
+        assert len(requests_seen) == 1
+        assert client.stats.as_dict()["entities"]["select.x"]["failures"] == 1
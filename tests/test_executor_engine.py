@@ -4,6 +4,7 @@ Tests for Executor Engine Integration
 Integration tests for the full ExecutorEngine with mocked HA client and schedule.json.
 """
 
+import asyncio
 import contextlib
 import json
 import tempfile
@@ -13,8 +14,10 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 import pytz
+from sqlalchemy import create_engine
 
-from executor.actions import HAClient
+from backend.learning.models import Base
+from executor.actions import ActionDispatcher, DispatchStats, HAClient
 from executor.config import (
     ControllerConfig,
     ExecutorConfig,
@@ -23,8 +26,6 @@ from executor.config import (
     WaterHeaterConfig,
 )
 from executor.engine import ExecutorEngine, ExecutorStatus
-from sqlalchemy import create_engine
-from backend.learning.models import Base
 
 
 @pytest.fixture
@@ -44,7 +45,7 @@ def temp_db():
     """Create a temporary database file."""
     with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
         db_path = f.name
-    
+
     # Create schema
     engine = create_engine(f"sqlite:///{db_path}")
     Base.metadata.create_all(engine)
@@ -467,3 +468,147 @@ class TestRunOnce:
         # Check history has the record
         records = engine.history.get_history()
         assert len(records) >= 1
+
+    def test_run_once_records_phase_timings(self, engine, temp_schedule):
+        """Each tick exposes per-phase timings and reuses the battery cost tracker."""
+        tz = pytz.timezone("Europe/Stockholm")
+        schedule = make_schedule([make_slot(datetime.now(tz) - timedelta(minutes=5))])
+        with Path(temp_schedule).open("w", encoding="utf-8") as f:
+            json.dump(schedule, f)
+
+        with patch.object(engine, "_refresh_prices"):
+            engine.run_once()
+            tracker = engine._battery_cost_tracker
+            engine.run_once()
+
+        phases = engine.status.last_tick_phases_ms
+        assert {"toggle", "load_slot", "gather_state", "decide", "dispatch", "history"} <= set(
+            phases
+        )
+        assert engine.status.last_tick_ms is not None
+        assert engine.get_status()["last_tick_phases_ms"] == phases
+        assert tracker is not None
+        assert engine._battery_cost_tracker is tracker
+
+
+class TestTickBudget:
+    """Config and price data are reused across ticks instead of rebuilt."""
+
+    @pytest.fixture
+    def engine(self, tmp_path, temp_db):
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("executor: {}\n", encoding="utf-8")
+        with (
+            patch("executor.engine.load_executor_config") as mock_config,
+            patch("executor.engine.load_yaml", return_value={}),
+            patch.object(ExecutorEngine, "_get_db_path", return_value=temp_db),
+        ):
+            mock_config.return_value = ExecutorConfig(timezone="Europe/Stockholm")
+            engine = ExecutorEngine(str(config_file))
+            engine.mock_config = mock_config
+            engine.config_file = config_file
+            yield engine
+
+    def test_config_reloaded_only_when_file_changes(self, engine):
+        calls = engine.mock_config.call_count
+
+        assert engine.reload_config_if_changed() is False
+        assert engine.mock_config.call_count == calls
+
+        engine.config_file.write_text("executor: {enabled: true}\n", encoding="utf-8")
+        assert engine.reload_config_if_changed() is True
+        assert engine.mock_config.call_count == calls + 1
+        assert engine.status.config_reloads == 1
+
+        # Explicit reloads (API config saves) always re-read
+        engine.reload_config()
+        assert engine.mock_config.call_count == calls + 2
+
+    def test_import_price_looked_up_from_cached_slots(self, engine):
+        tz = pytz.timezone("Europe/Stockholm")
+        start = tz.localize(datetime(2025, 1, 1, 10, 0))
+        prices = [
+            {
+                "start_time": start + timedelta(minutes=15 * i),
+                "end_time": start + timedelta(minutes=15 * (i + 1)),
+                "import_price_sek_kwh": 1.0 + i,
+            }
+            for i in range(4)
+        ]
+
+        with patch("inputs.get_nordpool_data", return_value=prices) as fetch:
+            assert engine._current_import_price(start + timedelta(minutes=20)) == 2.0
+            assert engine._current_import_price(start + timedelta(minutes=59)) == 4.0
+            assert fetch.call_count == 1
+
+            # Outside the cached range: default, and no refetch storm
+            assert engine._current_import_price(start + timedelta(hours=2)) == 0.5
+            assert engine._current_import_price(start + timedelta(hours=2)) == 0.5
+            assert fetch.call_count == 1
+
+
+class _RecordingAsyncHA:
+    """Async HA client stand-in: every entity reads as unknown, writes are recorded."""
+
+    def __init__(self):
+        self.stats = DispatchStats()
+        self.max_concurrency = 4
+        self.retries = 1
+        self.written = []
+
+    async def get_state_values(self, entity_ids):
+        return dict.fromkeys(entity_ids)
+
+    async def call_service(self, domain, service, entity_id=None, data=None):
+        self.written.append(entity_id)
+        return True
+
+    async def aclose(self):
+        pass
+
+
+class TestPauseFromEventLoop:
+    """pause() is called from async API handlers, on the server's event loop."""
+
+    @pytest.fixture
+    def engine(self, tmp_path, temp_db):
+        config = ExecutorConfig(
+            timezone="Europe/Stockholm",
+            inverter=InverterConfig(
+                work_mode_entity="select.inverter_work_mode",
+                grid_charging_entity="switch.inverter_battery_grid_charging",
+            ),
+            water_heater=WaterHeaterConfig(target_entity="input_number.vvbtemp"),
+        )
+        with (
+            patch("executor.engine.load_executor_config", return_value=config),
+            patch("executor.engine.load_yaml", return_value={}),
+            patch.object(ExecutorEngine, "_get_db_path", return_value=temp_db),
+        ):
+            engine = ExecutorEngine(str(tmp_path / "config.yaml"))
+        engine.ha_client = MagicMock(spec=HAClient)
+        engine.fake_ha = _RecordingAsyncHA()
+        engine.dispatcher = ActionDispatcher(engine.ha_client, config, async_client=engine.fake_ha)
+        yield engine
+        engine.dispatcher.close()
+
+    def test_pause_applies_idle_mode_inside_running_loop(self, engine):
+        async def handler():
+            return engine.pause(30)
+
+        assert asyncio.run(handler())["success"] is True
+
+        assert set(engine.fake_ha.written) >= {
+            "select.inverter_work_mode",
+            "switch.inverter_battery_grid_charging",
+            "input_number.vvbtemp",
+        }
+
+    def test_stop_inside_running_loop_closes_dispatcher(self, engine):
+        engine.pause(30)  # Opens the dispatcher's loop
+
+        async def shutdown():
+            engine.stop()
+
+        asyncio.run(shutdown())
+        assert engine.dispatcher._loop is None
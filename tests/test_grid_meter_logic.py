@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
+from backend.events import LiveMetricsCoalescer
 from backend.ha_socket import HAWebSocketClient
 from backend.recorder import record_observation_from_current_state
 
@@ -92,16 +93,19 @@ def test_ha_socket_dual_logic():
         "sensor.export": "grid_export_kw",
     }
 
-    # Mock emit_live_metrics
-    with patch("backend.events.emit_live_metrics") as mock_emit:
+    # Capture the coalesced frames instead of flushing them to Socket.IO
+    coalescer = LiveMetricsCoalescer()
+    with (
+        patch("backend.events.live_metrics_publisher", coalescer),
+        patch.object(coalescer, "_arm"),
+    ):
         # 1. Receive Import = 2.5 kW
         client._handle_state_change(
             "sensor.import", {"state": "2500", "attributes": {"unit_of_measurement": "W"}}
         )
 
-        # Check emit (import)
-        args, _ = mock_emit.call_args
-        payload = args[0]
+        # Check frame (import)
+        payload = coalescer.take_frame()
         assert payload["grid_import_kw"] == 2.5
         # Grid kw should be 2.5 - 0 = 2.5
         assert payload["grid_kw"] == 2.5
@@ -111,9 +115,8 @@ def test_ha_socket_dual_logic():
             "sensor.export", {"state": "500", "attributes": {"unit_of_measurement": "W"}}
         )
 
-        # Check emit (export)
-        args, _ = mock_emit.call_args
-        payload = args[0]
+        # Check frame (export)
+        payload = coalescer.take_frame()
         assert payload["grid_export_kw"] == 0.5
         # Grid kw should be 2.5 - 0.5 = 2.0
         assert payload["grid_kw"] == 2.0
@@ -0,0 +1,167 @@
+"""
+Tests for server-side entity filtering in the HA WebSocket client
+(subscribe_entities with compressed state events).
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.entity_cache import entity_state_cache
+from backend.events import live_metrics_publisher
+from backend.ha_socket import CompressedStateDecoder, HAWebSocketClient
+
+
+class FakeWS:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+def _fake_load_config(self):
+    self.url = "ws://ha.local/api/websocket"
+    self.token = "token"
+
+
+@pytest.fixture
+def client():
+    entity_state_cache.clear()
+    with (
+        patch.object(HAWebSocketClient, "_load_config", _fake_load_config),
+        patch.object(
+            HAWebSocketClient,
+            "_get_monitored_entities",
+            return_value={"sensor.pv": "pv_kw", "sensor.soc": "soc"},
+        ),
+    ):
+        yield HAWebSocketClient()
+    entity_state_cache.clear()
+
+
+def test_decoder_rebuilds_full_states():
+    decoder = CompressedStateDecoder()
+    added = decoder.apply(
+        {"a": {"sensor.pv": {"s": "1200", "a": {"unit_of_measurement": "W"}, "lc": 0.0}}}
+    )
+    first = added[0][1]
+    assert first["state"] == "1200"
+    assert first["last_updated"] == first["last_changed"] == "1970-01-01T00:00:00+00:00"
+
+    changed = decoder.apply(
+        {
+            "c": {
+                "sensor.pv": {
+                    "+": {"s": "900", "a": {"friendly_name": "PV"}, "lu": 60.0},
+                    "-": {"a": ["unit_of_measurement"]},
+                },
+                "sensor.unknown": {"+": {"s": "1"}},
+            }
+        }
+    )
+    assert len(changed) == 1
+    state = changed[0][1]
+    assert state["state"] == "900"
+    assert state["attributes"] == {"friendly_name": "PV"}
+    assert state["last_changed"] == "1970-01-01T00:00:00+00:00"
+    assert state["last_updated"] == "1970-01-01T00:01:00+00:00"
+    # Earlier state dicts are never mutated in place
+    assert first["state"] == "1200"
+
+    assert decoder.apply({"r": ["sensor.pv"]}) == [("sensor.pv", None)]
+
+
+@pytest.mark.anyio
+async def test_subscribes_only_to_monitored_and_tracked_entities(client):
+    entity_state_cache.track(["switch.export"])
+    ws = FakeWS()
+    await client._subscribe(ws)
+
+    (msg,) = ws.sent
+    assert msg["type"] == "subscribe_entities"
+    assert msg["entity_ids"] == ["sensor.pv", "sensor.soc", "switch.export"]
+    assert client.stats["subscription"]["entities"] == 3
+
+    entity_state_cache.set_live(True)
+    with patch.object(live_metrics_publisher, "publish") as publish:
+        await client._handle_message(
+            ws,
+            {
+                "id": msg["id"],
+                "type": "event",
+                "event": {
+                    "a": {
+                        "sensor.pv": {"s": "1500", "a": {"unit_of_measurement": "W"}},
+                        "switch.export": {"s": "on", "a": {}},
+                    }
+                },
+            },
+        )
+    publish.assert_called_once_with({"pv_kw": 1.5})
+    assert entity_state_cache.get("switch.export")["state"] == "on"
+
+
+@pytest.mark.anyio
+async def test_resubscribes_when_entity_set_changes(client):
+    ws = FakeWS()
+    await client._subscribe(ws)
+    old_id = ws.sent[0]["id"]
+
+    entity_state_cache.track(["sensor.grid"])
+    assert client._sub_key != (client._entities_version, entity_state_cache.tracked_version)
+    await client._subscribe(ws)
+
+    unsubscribe, subscribe = ws.sent[1:]
+    assert unsubscribe["type"] == "unsubscribe_events"
+    assert unsubscribe["subscription"] == old_id
+    assert "sensor.grid" in subscribe["entity_ids"]
+    assert client.stats["subscription"]["resubscribes"] == 1
+
+    # Late events from the replaced subscription are ignored
+    with patch.object(client, "_dispatch_state") as dispatch:
+        await client._handle_message(
+            ws, {"id": old_id, "type": "event", "event": {"a": {"sensor.pv": {"s": "1"}}}}
+        )
+    dispatch.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_falls_back_to_state_changed_on_old_ha(client):
+    ws = FakeWS()
+    await client._subscribe(ws)
+    sub_id = ws.sent[0]["id"]
+
+    await client._handle_message(
+        ws, {"id": sub_id, "type": "result", "success": False, "error": {"code": "unknown_command"}}
+    )
+
+    assert client.subscription_mode == "state_changed"
+    assert [m["type"] for m in ws.sent[1:]] == ["subscribe_events", "get_states"]
+
+    entity_state_cache.set_live(True)
+    with patch.object(live_metrics_publisher, "publish") as publish:
+        await client._handle_message(
+            ws,
+            {
+                "id": ws.sent[1]["id"],
+                "type": "event",
+                "event": {
+                    "data": {
+                        "entity_id": "sensor.other",
+                        "new_state": {"state": "5", "attributes": {}},
+                    }
+                },
+            },
+        )
+        await client._handle_message(
+            ws,
+            {
+                "id": ws.sent[2]["id"],
+                "type": "result",
+                "success": True,
+                "result": [{"entity_id": "sensor.soc", "state": "55", "attributes": {}}],
+            },
+        )
+    publish.assert_called_once_with({"soc": 55.0})
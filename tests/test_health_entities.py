@@ -0,0 +1,105 @@
+"""
+Tests for concurrent entity validation and cached health status.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from backend import health
+from backend.health import HealthChecker, HealthStatus
+
+
+def _checker(entities: list[str]) -> HealthChecker:
+    checker = HealthChecker("config.yaml")
+    checker._config = {"input_sensors": {f"s{i}": e for i, e in enumerate(entities)}}
+    checker._secrets = {"home_assistant": {"url": "http://ha.local", "token": "t"}}
+    return checker
+
+
+@pytest.mark.anyio
+async def test_check_entities_runs_bounded_and_keeps_order():
+    entities = [f"sensor.e{i}" for i in range(20)]
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        entity_id = request.url.path.rsplit("/", 1)[-1]
+        if entity_id in ("sensor.e3", "sensor.e15"):
+            return httpx.Response(404)
+        if entity_id == "sensor.e7":
+            return httpx.Response(200, json={"state": "unavailable"})
+        return httpx.Response(200, json={"state": "1"})
+
+    real_client = httpx.AsyncClient
+
+    def make_client(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    with patch("backend.health.httpx.AsyncClient", side_effect=make_client):
+        issues = await _checker(entities).check_entities()
+
+    assert [(i.entity_id, i.severity) for i in issues] == [
+        ("sensor.e3", "critical"),
+        ("sensor.e7", "warning"),
+        ("sensor.e15", "critical"),
+    ]
+    assert 1 < peak <= health.ENTITY_CHECK_CONCURRENCY
+
+
+@pytest.mark.anyio
+async def test_get_health_status_serves_cache_and_refreshes_in_background():
+    calls = 0
+
+    async def fake_check_all(self):
+        nonlocal calls
+        calls += 1
+        return HealthStatus(healthy=True, checked_at=str(calls))
+
+    health.invalidate_health_cache()
+    with patch.object(HealthChecker, "check_all", fake_check_all):
+        first = await health.get_health_status("cfg.yaml")
+        assert await health.get_health_status("cfg.yaml") is first
+        assert calls == 1
+
+        with patch.object(health, "HEALTH_CACHE_TTL_S", -1.0):
+            # Stale: the old result is returned immediately, refresh runs behind it
+            assert await health.get_health_status("cfg.yaml") is first
+            await health._refresh_tasks["cfg.yaml"]
+        assert calls == 2
+        assert (await health.get_health_status("cfg.yaml")).checked_at == "2"
+    health.invalidate_health_cache()
+
+
+@pytest.mark.anyio
+async def test_invalidate_discards_refresh_already_in_flight():
+    release = asyncio.Event()
+    calls = 0
+
+    async def fake_check_all(self):
+        nonlocal calls
+        calls += 1
+        call = calls
+        if call == 1:
+            await release.wait()
+        return HealthStatus(healthy=True, checked_at=str(call))
+
+    health.invalidate_health_cache()
+    with patch.object(HealthChecker, "check_all", fake_check_all):
+        stale = health._start_refresh("cfg.yaml")
+        await asyncio.sleep(0)
+        # Config changed while the first check was still running
+        health.invalidate_health_cache()
+        release.set()
+        await stale
+        assert "cfg.yaml" not in health._cached_status
+
+        assert (await health.get_health_status("cfg.yaml")).checked_at == "2"
+    health.invalidate_health_cache()
@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+import yaml
+
+import inputs
+
+DELAY_S = 0.3
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "timezone": "Europe/Stockholm",
+                "input_sensors": {
+                    "battery_soc": "sensor.soc",
+                    "vacation_mode": "input_boolean.vacation",
+                    "alarm_state": "alarm_control_panel.home",
+                },
+                "forecasting": {"active_forecast_version": "baseline_7_day_avg"},
+            }
+        )
+    )
+    return str(path)
+
+
+@pytest.fixture
+def slow_sources(monkeypatch):
+    """Every upstream source takes DELAY_S; sync ones block their thread."""
+
+    def volatility(*_args):
+        time.sleep(DELAY_S)
+        return {"cloud_volatility": 0.4, "temp_volatility": 2.0}
+
+    def prices(_config_path):
+        time.sleep(DELAY_S)
+        return [{"start_time": "2025-01-01T00:00:00+01:00", "import_price_sek_kwh": 1.0}]
+
+    def load_profile(_config):
+        time.sleep(DELAY_S)
+        return [0.5] * 96
+
+    async def entity_state(entity_id):
+        await asyncio.sleep(DELAY_S)
+        return {"entity_id": entity_id, "state": "on"}
+
+    async def sensor_float(_entity_id):
+        await asyncio.sleep(DELAY_S)
+        return 64.0
+
+    async def forecast(price_slots, _config, load_profile=None):
+        return {"slots": [{"load_forecast_kwh": load_profile[0]}] * len(price_slots)}
+
+    monkeypatch.setattr(inputs, "get_weather_volatility", volatility)
+    monkeypatch.setattr(inputs, "get_nordpool_data", prices)
+    monkeypatch.setattr(inputs, "get_load_profile_from_ha", load_profile)
+    monkeypatch.setattr(inputs, "async_get_ha_entity_state", entity_state)
+    monkeypatch.setattr(inputs, "async_get_ha_sensor_float", sensor_float)
+    monkeypatch.setattr(inputs, "_get_forecast_data_async", forecast)
+
+
+def test_sources_are_fetched_concurrently(config_path, slow_sources):
+    start = time.perf_counter()
+    data = inputs.get_all_input_data(config_path)
+    elapsed = time.perf_counter() - start
+
+    # Six sources of DELAY_S each: serial would take ~1.8s
+    assert elapsed < DELAY_S * 3
+    assert data["initial_state"]["battery_soc_percent"] == 64.0
+    assert data["context"]["vacation_mode"] is True
+    assert data["context"]["weather_volatility"] == {"cloud": 0.4, "temp": 1.0}
+    assert data["forecast_data"] == [{"load_forecast_kwh": 0.5}]
+
+    timings = data["input_timings_ms"]
+    for name in ("nordpool", "load_profile", "weather_volatility", "initial_state"):
+        assert timings[name] >= DELAY_S * 1000 * 0.9
+    assert timings["total"] < sum(v for k, v in timings.items() if k != "total")
+
+
+def test_optional_source_timeout_uses_fallback(config_path, slow_sources, monkeypatch):
+    def hung_volatility(*_args):
+        time.sleep(DELAY_S * 5)
+        return {"cloud_volatility": 1.0}
+
+    monkeypatch.setattr(inputs, "get_weather_volatility", hung_volatility)
+    monkeypatch.setitem(inputs.INPUT_SOURCE_TIMEOUTS_S, "ha_state", 0.05)
+    monkeypatch.setitem(inputs.INPUT_SOURCE_TIMEOUTS_S, "weather_volatility", 0.05)
+
+    start = time.perf_counter()
+    data = inputs.get_all_input_data(config_path)
+
+    # The hung worker thread must not hold up the stage
+    assert time.perf_counter() - start < DELAY_S * 3
+
+    assert data["context"]["vacation_mode"] is False
+    assert data["context"]["alarm_armed"] is False
+    assert data["context"]["weather_volatility"] == {"cloud": 0.0, "temp": 0.0}
+    assert data["input_timings_ms"]["vacation_mode"] < DELAY_S * 1000
+
+
+def test_missing_soc_still_aborts(config_path, slow_sources, monkeypatch):
+    async def no_reading(_entity_id):
+        return None
+
+    monkeypatch.setattr(inputs, "async_get_ha_sensor_float", no_reading)
+
+    with pytest.raises(RuntimeError, match="battery SoC"):
+        inputs.get_all_input_data(config_path)
@@ -0,0 +1,116 @@
+import pandas as pd
+import pytest
+
+from planner.solver.adapter import (
+    aggregate_horizon,
+    kepler_result_to_dataframe,
+    planner_to_kepler_input,
+)
+from planner.solver.kepler import KeplerSolver
+from planner.solver.matrix_builder import build_kepler_model
+from planner.solver.types import KeplerConfig, KeplerInput
+
+
+def _planner_df(hours: int = 24) -> pd.DataFrame:
+    index = pd.date_range(
+        "2025-01-01 00:00", periods=hours * 4, freq="15min", tz="Europe/Stockholm"
+    )
+    hour = index.hour
+    return pd.DataFrame(
+        {
+            "load_forecast_kwh": 0.4,
+            "pv_forecast_kwh": [0.6 if 10 <= h <= 14 else 0.0 for h in hour],
+            "import_price_sek_kwh": [
+                0.3 + 0.05 * (i % 4) if h < 6 else (2.0 if 17 <= h <= 20 else 1.0)
+                for i, h in enumerate(hour)
+            ],
+            "export_price_sek_kwh": 0.2,
+        },
+        index=index,
+    )
+
+
+def _config(water: bool = True) -> KeplerConfig:
+    return KeplerConfig(
+        capacity_kwh=10.0,
+        min_soc_percent=10.0,
+        max_soc_percent=95.0,
+        max_charge_power_kw=5.0,
+        max_discharge_power_kw=5.0,
+        charge_efficiency=0.95,
+        discharge_efficiency=0.95,
+        wear_cost_sek_per_kwh=0.05,
+        water_heating_power_kw=3.0 if water else 0.0,
+        water_heating_min_kwh=6.0 if water else 0.0,
+        water_heating_max_gap_hours=8.0 if water else 0.0,
+        water_min_spacing_hours=3.0 if water else 0.0,
+    )
+
+
+def test_aggregation_keeps_head_and_conserves_energy():
+    df = _planner_df(24)
+    full = planner_to_kepler_input(df.copy(), 5.0)
+    agg = planner_to_kepler_input(
+        df.copy(), 5.0, full_resolution_hours=6, aggregate_slot_minutes=60
+    )
+
+    # 6h at 15 min + 18 hourly slots
+    assert len(agg.slots) == 24 + 18
+    assert all(s.end_time - s.start_time == pd.Timedelta(minutes=15) for s in agg.slots[:24])
+    assert all(s.end_time - s.start_time == pd.Timedelta(hours=1) for s in agg.slots[24:])
+    assert agg.slots[-1].end_time == full.slots[-1].end_time
+    assert sum(s.load_kwh for s in agg.slots) == pytest.approx(sum(s.load_kwh for s in full.slots))
+    assert sum(s.pv_kwh for s in agg.slots) == pytest.approx(sum(s.pv_kwh for s in full.slots))
+
+    # Prices are averaged over the merged quarter hours
+    first_coarse = agg.slots[24]
+    quarters = [s.import_price_sek_kwh for s in full.slots[24:28]]
+    assert first_coarse.import_price_sek_kwh == pytest.approx(sum(quarters) / 4)
+
+
+def test_aggregation_boundary_snaps_to_coarse_grid():
+    slots = planner_to_kepler_input(_planner_df(12), 5.0).slots[1:]  # starts at 00:15
+    agg = aggregate_horizon(slots, full_resolution_hours=1, slot_minutes=30)
+
+    coarse = [s for s in agg if s.end_time - s.start_time > pd.Timedelta(minutes=15)]
+    assert coarse[0].start_time.minute in (0, 30)
+    assert all(s.end_time - s.start_time == pd.Timedelta(minutes=30) for s in coarse)
+
+
+def test_aggregated_solve_disaggregates_to_native_rows():
+    df = _planner_df(24)
+    config = _config()
+    full = planner_to_kepler_input(df.copy(), 5.0)
+    agg = planner_to_kepler_input(df.copy(), 5.0, full_resolution_hours=6)
+
+    full_model, _ = build_kepler_model(full, config)
+    agg_model, _ = build_kepler_model(agg, config)
+    assert agg_model.num_cols < full_model.num_cols * 0.6
+    assert agg_model.integrality.sum() < full_model.integrality.sum() * 0.6
+
+    result = KeplerSolver().solve(agg, config)
+    assert result.is_optimal
+
+    out = kepler_result_to_dataframe(result, config.capacity_kwh, 5.0, index=df.index)
+    assert list(out.index) == list(df.index)
+    assert out["kepler_charge_kwh"].sum() == pytest.approx(sum(s.charge_kwh for s in result.slots))
+    assert out["water_heating_kw"].sum() * 0.25 >= config.water_heating_min_kwh - 1e-6
+    assert out["projected_soc_kwh"].iloc[-1] == pytest.approx(result.slots[-1].soc_kwh)
+
+    # Power stays constant across the quarters of an aggregated hour
+    hour_rows = out.iloc[24:28]
+    assert hour_rows["battery_charge_kw"].nunique() == 1
+
+
+def test_disaggregation_is_identity_for_native_resolution():
+    df = _planner_df(6)
+    input_data = planner_to_kepler_input(df.copy(), 5.0)
+    result = KeplerSolver().solve(input_data, _config(water=False))
+
+    plain = kepler_result_to_dataframe(result, 10.0, 5.0)
+    indexed = kepler_result_to_dataframe(result, 10.0, 5.0, index=df.index)
+    pd.testing.assert_frame_equal(plain, indexed)
+
+
+def test_empty_input_is_not_aggregated():
+    assert aggregate_horizon(KeplerInput(slots=[], initial_soc_kwh=0.0).slots, 6) == []
@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+
+import pulp
+import pytest
+
+from planner.solver.backends import available_backends, get_backend, model_from_pulp
+from planner.solver.kepler import KeplerSolver, build_pulp_problem
+from planner.solver.matrix_builder import build_kepler_model
+from planner.solver.types import KeplerConfig, KeplerInput, KeplerInputSlot
+
+
+def _make_input(count: int = 48) -> KeplerInput:
+    start = datetime(2025, 1, 1, 0, 0)
+    slots = []
+    for i in range(count):
+        s = start + timedelta(minutes=15 * i)
+        price = 0.2 if s.hour < 6 else (2.5 if 17 <= s.hour <= 20 else 0.8)
+        slots.append(
+            KeplerInputSlot(
+                start_time=s,
+                end_time=s + timedelta(minutes=15),
+                load_kwh=0.3,
+                pv_kwh=0.5 if 9 <= s.hour <= 15 else 0.0,
+                import_price_sek_kwh=price,
+                export_price_sek_kwh=price - 0.1,
+            )
+        )
+    return KeplerInput(slots=slots, initial_soc_kwh=4.0)
+
+
+def _make_config(water: bool = False) -> KeplerConfig:
+    return KeplerConfig(
+        capacity_kwh=10.0,
+        min_soc_percent=10.0,
+        max_soc_percent=95.0,
+        max_charge_power_kw=5.0,
+        max_discharge_power_kw=5.0,
+        charge_efficiency=0.95,
+        discharge_efficiency=0.95,
+        wear_cost_sek_per_kwh=0.05,
+        ramping_cost_sek_per_kw=0.01,
+        water_heating_power_kw=3.0 if water else 0.0,
+        water_heating_min_kwh=3.0 if water else 0.0,
+        water_heating_max_gap_hours=6.0 if water else 0.0,
+        water_min_spacing_hours=2.0 if water else 0.0,
+    )
+
+
+def test_model_from_pulp_extracts_matrix():
+    prob = pulp.LpProblem("t", pulp.LpMinimize)
+    x = pulp.LpVariable("x", lowBound=0.0, upBound=4.0)
+    y = pulp.LpVariable("y", cat="Binary")
+    prob += 2 * x - y + 3
+    prob += x + y >= 1
+    prob += x - 2 * y <= 5
+    prob += x == 2
+
+    model, variables = model_from_pulp(prob)
+
+    assert [v.name for v in variables] == model.col_names
+    assert model.num_rows == 3
+    assert model.num_cols == 2
+    assert model.offset == pytest.approx(3.0)
+    assert list(model.integrality) == [0, 1]
+    assert model.row_lower[0] == pytest.approx(1.0)
+    assert model.row_upper[1] == pytest.approx(5.0)
+    assert model.row_lower[2] == model.row_upper[2] == pytest.approx(2.0)
+
+
+def test_get_backend_unknown_falls_back_to_auto():
+    backend = get_backend("does-not-exist")
+    assert backend.name == get_backend("auto").name
+
+
+@pytest.mark.parametrize("water", [False, True])
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_agree_on_optimum(backend, water):
+    input_data = _make_input()
+    config = _make_config(water=water)
+
+    reference = KeplerSolver(backend="cbc").solve(input_data, config)
+    result = KeplerSolver(backend=backend).solve(input_data, config)
+
+    assert result.is_optimal
+    assert result.solver_backend == backend
+    assert len(result.slots) == len(reference.slots)
+    assert result.total_cost_sek == pytest.approx(reference.total_cost_sek, abs=0.05)
+    assert sum(s.water_heat_kw for s in result.slots) == pytest.approx(
+        sum(s.water_heat_kw for s in reference.slots)
+    )
+
+
+def test_scipy_backend_honours_time_limit():
+    backend = get_backend("scipy")
+    if backend.name != "scipy":
+        pytest.skip("SciPy milp not installed")
+    model, _ = build_kepler_model(_make_input(96), _make_config(water=True))
+
+    solution = backend.solve(model, time_limit_s=1e-6)
+
+    assert not solution.is_optimal
+
+
+def test_result_reports_build_and_solve_time():
+    result = KeplerSolver().solve(_make_input(8), _make_config())
+    assert result.build_time_ms > 0.0
+    assert result.solve_time_ms > 0.0
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"target_soc_kwh": 6.0, "target_soc_penalty_sek": 8.0},
+        {"grid_import_limit_kw": 2.0, "max_import_power_kw": 8.0, "max_export_power_kw": 3.0},
+        {"enable_export": False, "terminal_value_sek_kwh": 0.5},
+        {"force_water_on_slots": [0, 1], "water_block_start_penalty_sek": 0.3},
+        {"defer_up_to_hours": 4.0, "water_heated_today_kwh": 1.0},
+    ],
+)
+def test_matrix_builder_matches_pulp_formulation(overrides):
+    input_data = _make_input(48)
+    config = _make_config(water=True)
+    for key, value in overrides.items():
+        setattr(config, key, value)
+
+    backend = get_backend("auto")
+    if not backend.in_process:
+        pytest.skip("No in-process backend installed")
+
+    prob, _ = build_pulp_problem(input_data, config)
+    pulp_model, _ = model_from_pulp(prob)
+    matrix_model, layout = build_kepler_model(input_data, config)
+
+    reference = backend.solve(pulp_model)
+    vectorized = backend.solve(matrix_model)
+
+    assert reference.is_optimal and vectorized.is_optimal
+    assert vectorized.objective == pytest.approx(reference.objective, rel=1e-4, abs=1e-3)
+    assert layout.values(vectorized.x)["soc"][0] == pytest.approx(input_data.initial_soc_kwh)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_many_returns_results_in_input_order(workers):
+    inputs = [_make_input(count) for count in (8, 16, 12)]
+    configs = [_make_config(), _make_config(water=True), _make_config()]
+    seen = []
+
+    results = KeplerSolver().solve_many(
+        inputs, configs, workers=workers, on_result=lambda i, r: seen.append(i)
+    )
+
+    assert [len(r.slots) for r in results] == [8, 16, 12]
+    assert sorted(seen) == [0, 1, 2]
+    for input_data, config, result in zip(inputs, configs, results, strict=True):
+        single = KeplerSolver().solve(input_data, config)
+        assert result.total_cost_sek == pytest.approx(single.total_cost_sek, abs=0.05)
+
+
+def test_solve_many_rejects_mismatched_configs():
+    with pytest.raises(ValueError, match="2 inputs but 1 configs"):
+        KeplerSolver().solve_many([_make_input(8), _make_input(8)], [_make_config()])
@@ -0,0 +1,128 @@
+import copy
+import dataclasses
+from datetime import datetime, timedelta
+
+import pytest
+
+from planner.solver import kepler
+from planner.solver.backends import get_backend
+from planner.solver.kepler import KeplerSolver
+from planner.solver.result_cache import SolveResultCache, fingerprint, result_cache
+from planner.solver.types import KeplerConfig, KeplerInput, KeplerInputSlot
+
+
+def _make_input(count: int = 16) -> KeplerInput:
+    start = datetime(2025, 1, 1, 0, 0)
+    slots = [
+        KeplerInputSlot(
+            start_time=start + timedelta(minutes=15 * i),
+            end_time=start + timedelta(minutes=15 * (i + 1)),
+            load_kwh=0.3,
+            pv_kwh=0.0,
+            import_price_sek_kwh=0.5 + 0.1 * (i % 4),
+            export_price_sek_kwh=0.4,
+        )
+        for i in range(count)
+    ]
+    return KeplerInput(slots=slots, initial_soc_kwh=4.0)
+
+
+def _make_config() -> KeplerConfig:
+    return KeplerConfig(
+        capacity_kwh=10.0,
+        min_soc_percent=10.0,
+        max_soc_percent=95.0,
+        max_charge_power_kw=5.0,
+        max_discharge_power_kw=5.0,
+        charge_efficiency=0.95,
+        discharge_efficiency=0.95,
+        wear_cost_sek_per_kwh=0.05,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    result_cache.configure(32)
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+def test_fingerprint_ignores_noise_below_tolerance():
+    base = fingerprint(_make_input(), _make_config())
+
+    noisy = _make_input()
+    noisy.slots[3].load_kwh += 1e-9
+    assert fingerprint(noisy, _make_config()) == base
+
+    changed = _make_input()
+    changed.slots[3].import_price_sek_kwh += 0.01
+    assert fingerprint(changed, _make_config()) != base
+
+    config = _make_config()
+    config.water_heated_today_kwh = 1.5
+    assert fingerprint(_make_input(), config) != base
+    assert fingerprint(_make_input(), _make_config(), backend="cbc") != base
+
+
+def test_repeated_solve_is_served_from_cache():
+    solver = KeplerSolver(use_cache=True)
+
+    first = solver.solve(_make_input(), _make_config())
+    second = solver.solve(_make_input(), _make_config())
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.total_cost_sek == pytest.approx(first.total_cost_sek)
+    assert result_cache.stats()["hits"] == 1
+    assert result_cache.stats()["misses"] == 1
+
+    # Callers mutating a returned result must not corrupt the cache
+    second.slots.clear()
+    assert len(solver.solve(_make_input(), _make_config()).slots) == 16
+
+
+def test_lru_eviction_and_disk_backing(tmp_path):
+    input_data = _make_input()
+    result = KeplerSolver().solve(input_data, _make_config())
+
+    cache = SolveResultCache(max_entries=2, disk_path=tmp_path)
+    for key in ("a", "b", "c"):
+        cache.put(key, copy.deepcopy(result))
+
+    assert cache.stats()["entries"] == 2
+    assert sorted(p.stem for p in tmp_path.glob("*.pkl")) == ["b", "c"]
+
+    # A fresh cache (e.g. after restart) reads entries back from disk
+    restarted = SolveResultCache(max_entries=2, disk_path=tmp_path)
+    loaded = restarted.get("c")
+    assert loaded is not None
+    assert loaded.total_cost_sek == pytest.approx(result.total_cost_sek)
+    assert restarted.stats()["disk_hits"] == 1
+    assert restarted.get("a") is None
+    assert restarted.stats()["misses"] == 1
+
+
+def test_non_optimal_result_is_not_cached(monkeypatch):
+    real = get_backend("auto")
+
+    class _FeasibleOnly:
+        name = real.name
+        in_process = real.in_process
+        supports_warm_start = False
+
+        def solve(self, model, **kwargs):
+            return dataclasses.replace(real.solve(model, **kwargs), status="Feasible")
+
+        def solve_problem(self, prob):
+            return dataclasses.replace(real.solve_problem(prob), status="Feasible")
+
+    monkeypatch.setattr(kepler, "get_backend", lambda name: _FeasibleOnly())
+    solver = KeplerSolver(use_cache=True)
+
+    first = solver.solve(_make_input(), _make_config())
+    second = solver.solve(_make_input(), _make_config())
+
+    assert not first.is_optimal
+    assert not second.from_cache
+    assert result_cache.stats()["entries"] == 0
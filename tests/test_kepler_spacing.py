@@ -16,7 +16,9 @@ def create_mock_slots(count=24, start_hour=12):
             start_time=s,
             end_time=s + timedelta(minutes=30),
             load_kwh=0.5,
-            pv_kwh=1.0 if 8 <= s.hour <= 16 else 0.0,
+            # No PV (and no initial charge in the tests): every kWh is bought, so
+            # heating has a unique cheapest slot instead of many zero-cost optima
+            pv_kwh=0.0,
             import_price_sek_kwh=1.0,  # expensive default
             export_price_sek_kwh=0.0
         ))
@@ -31,7 +33,7 @@ def get_base_config():
         max_discharge_power_kw=5,
         charge_efficiency=1.0,
         discharge_efficiency=1.0,
-        wear_cost_sek_per_kwh=0.0,
+        wear_cost_sek_per_kwh=0.05,  # Heating via the battery costs more, well above the MIP gap
 
         # Water enabled
         water_heating_power_kw=2.0,
@@ -46,14 +48,14 @@ def get_base_config():
 def test_strict_spacing_enforced():
     """Verify that heater cannot restart within the strict spacing window."""
     solver = KeplerSolver()
-    input_data = KeplerInput(slots=create_mock_slots(count=24), initial_soc_kwh=5.0)
+    input_data = KeplerInput(slots=create_mock_slots(count=24), initial_soc_kwh=0.0)
     slots = input_data.slots
 
     # Manipulate prices to force heating at specific times if allowed
     # T=0 (12:00) -> Cheap (Should Heat)
     slots[0].import_price_sek_kwh = 0.1
-    # T=4 (14:00) -> Cheap (Should Heat if allowed)
-    slots[4].import_price_sek_kwh = 0.1
+    # T=4 (14:00) -> Cheap (Should Heat if allowed), tilted so T=0 is the unique optimum
+    slots[4].import_price_sek_kwh = 0.15
 
     # Config: Spacing 4 hours (8 slots)
     # T=0 to T=4 is only 2 hours. Should be BLOCKED.
@@ -88,7 +90,7 @@ def test_strict_spacing_enforced():
 def test_spacing_disabled():
     """Verify normal operation when spacing is disabled (0h)."""
     solver = KeplerSolver()
-    input_data = KeplerInput(slots=create_mock_slots(count=24), initial_soc_kwh=5.0)
+    input_data = KeplerInput(slots=create_mock_slots(count=24), initial_soc_kwh=0.0)
     slots = input_data.slots
 
     # Scenario: Cheap at T=0 and T=1.
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from planner.solver.backends import get_backend
+from planner.solver.kepler import KeplerSolver
+from planner.solver.types import KeplerConfig, KeplerInput, KeplerInputSlot
+from planner.solver.warm_start import warm_start_cache
+
+pytestmark = pytest.mark.skipif(
+    not get_backend("auto").supports_warm_start, reason="No warm-start capable backend"
+)
+
+
+def _slots(count: int = 48) -> list[KeplerInputSlot]:
+    start = datetime(2025, 1, 1, 0, 0)
+    slots = []
+    for i in range(count):
+        s = start + timedelta(minutes=15 * i)
+        price = 0.3 if s.hour < 5 else (2.0 if 7 <= s.hour <= 9 else 1.0)
+        slots.append(
+            KeplerInputSlot(
+                start_time=s,
+                end_time=s + timedelta(minutes=15),
+                load_kwh=0.4,
+                pv_kwh=0.0,
+                import_price_sek_kwh=price + (i % 3) * 0.01,
+                export_price_sek_kwh=price - 0.1,
+            )
+        )
+    return slots
+
+
+def _config() -> KeplerConfig:
+    return KeplerConfig(
+        capacity_kwh=10.0,
+        min_soc_percent=10.0,
+        max_soc_percent=95.0,
+        max_charge_power_kw=5.0,
+        max_discharge_power_kw=5.0,
+        charge_efficiency=0.95,
+        discharge_efficiency=0.95,
+        wear_cost_sek_per_kwh=0.05,
+        water_heating_power_kw=3.0,
+        water_heating_min_kwh=3.0,
+        water_heating_max_gap_hours=6.0,
+        water_min_spacing_hours=2.0,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    warm_start_cache.clear()
+    yield
+    warm_start_cache.clear()
+
+
+def test_shifted_horizon_is_warm_started():
+    slots = _slots()
+    solver = KeplerSolver(warm_start=True)
+
+    first = solver.solve(KeplerInput(slots=slots, initial_soc_kwh=5.0), _config())
+    assert first.is_optimal
+    assert not first.warm_started
+
+    # Two slots later: same horizon end and prices, SoC moved
+    shifted = KeplerInput(slots=slots[2:], initial_soc_kwh=4.6)
+    second = solver.solve(shifted, _config())
+    cold = KeplerSolver(warm_start=False).solve(shifted, _config())
+
+    assert second.warm_started
+    assert warm_start_cache.last_reason == "shifted 2 slots"
+    assert len(second.slots) == len(slots) - 2
+    assert second.total_cost_sek == pytest.approx(cold.total_cost_sek, abs=0.05)
+
+
+def test_price_change_falls_back_to_cold():
+    slots = _slots()
+    solver = KeplerSolver(warm_start=True)
+    solver.solve(KeplerInput(slots=slots, initial_soc_kwh=5.0), _config())
+
+    changed = _slots()[1:]
+    changed[5].import_price_sek_kwh += 0.5
+    result = solver.solve(KeplerInput(slots=changed, initial_soc_kwh=5.0), _config())
+
+    assert not result.warm_started
+    assert warm_start_cache.last_reason == "prices changed"
+
+
+def test_config_or_horizon_change_falls_back_to_cold():
+    slots = _slots()
+    solver = KeplerSolver(warm_start=True)
+    solver.solve(KeplerInput(slots=slots, initial_soc_kwh=5.0), _config())
+
+    config = _config()
+    config.wear_cost_sek_per_kwh = 0.2
+    result = solver.solve(KeplerInput(slots=slots[1:], initial_soc_kwh=5.0), config)
+    assert not result.warm_started
+    assert warm_start_cache.last_reason == "config changed"
+
+    # New day-ahead prices extend the horizon
+    longer = _slots(56)[1:]
+    result = solver.solve(KeplerInput(slots=longer, initial_soc_kwh=5.0), config)
+    assert not result.warm_started
+    assert warm_start_cache.last_reason == "horizon length changed"
+
+
+def test_warm_start_out_of_budget_still_returns_optimal_plan():
+    slots = _slots()
+    # A budget too small to prove optimality (or even find an incumbent)
+    solver = KeplerSolver(warm_start=True, warm_start_time_limit_s=1e-6)
+    solver.solve(KeplerInput(slots=slots, initial_soc_kwh=5.0), _config())
+
+    shifted = KeplerInput(slots=slots[2:], initial_soc_kwh=4.6)
+    result = solver.solve(shifted, _config())
+    cold = KeplerSolver(warm_start=False).solve(shifted, _config())
+
+    assert result.warm_started
+    assert result.is_optimal
+    assert result.total_cost_sek == pytest.approx(cold.total_cost_sek, abs=0.05)
@@ -0,0 +1,116 @@
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import pytest
+import pytz
+
+from backend.learning import store as store_module
+from backend.learning.models import Base
+from backend.learning.store import LearningStore
+
+TZ = pytz.timezone("Europe/Stockholm")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "bulk.db")
+
+
+@pytest.fixture
+def store(db_path, monkeypatch):
+    # Small chunks so multi-batch writes are exercised
+    monkeypatch.setattr(store_module, "UPSERT_CHUNK_SIZE", 7)
+    store = LearningStore(db_path, TZ)
+    Base.metadata.create_all(store.engine)
+    return store
+
+
+def _rows(db_path, query):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(query).fetchall()
+
+
+def test_observations_upsert_and_coalesce(store, db_path):
+    index = pd.date_range("2025-03-29 22:00", periods=20, freq="15min", tz="UTC")
+    df = pd.DataFrame(
+        {
+            "slot_start": index,
+            "slot_end": index + pd.Timedelta(minutes=15),
+            "load_kwh": 0.5,
+            "soc_end_percent": 40.0,
+        }
+    )
+    store.store_slot_observations(df)
+
+    # Second write without SoC keeps the stored value, energy is replaced
+    df2 = df.drop(columns=["soc_end_percent"]).assign(load_kwh=0.8)
+    store.store_slot_observations(df2)
+
+    rows = _rows(
+        db_path,
+        "SELECT slot_start, load_kwh, soc_end_percent FROM slot_observations ORDER BY slot_start",
+    )
+    assert len(rows) == 20
+    assert rows[0][0] == "2025-03-29T23:00:00+01:00"
+    # Across the DST switch
+    assert rows[-1][0] == "2025-03-30T04:45:00+02:00"
+    assert all(load == 0.8 and soc == 40.0 for _, load, soc in rows)
+
+
+def test_prices_merge_into_observations(store, db_path):
+    index = pd.date_range("2025-01-01", periods=10, freq="15min", tz=TZ)
+    store.store_slot_observations(
+        pd.DataFrame(
+            {"slot_start": index, "slot_end": index + pd.Timedelta(minutes=15), "pv_kwh": 1.0}
+        )
+    )
+    store.store_slot_prices(
+        [
+            {
+                "start_time": ts.isoformat(),
+                "end_time": (ts + pd.Timedelta(minutes=15)).isoformat(),
+                "import_price_sek_kwh": 1.5,
+            }
+            for ts in index
+        ]
+        + [{"slot_start": None, "import_price_sek_kwh": 9.9}]
+    )
+
+    rows = _rows(
+        db_path, "SELECT pv_kwh, import_price_sek_kwh, export_price_sek_kwh FROM slot_observations"
+    )
+    assert len(rows) == 10
+    assert all(pv == 1.0 and imp == 1.5 and exp is None for pv, imp, exp in rows)
+
+
+def test_forecasts_and_plan_update_in_place(store, db_path):
+    index = pd.date_range("2025-01-01", periods=15, freq="15min", tz=TZ)
+    forecasts = [{"slot_start": ts.isoformat(), "pv_forecast_kwh": 0.1} for ts in index]
+    store.store_forecasts(forecasts, "aurora")
+    store.store_forecasts([{**f, "pv_forecast_kwh": 0.3} for f in forecasts], "aurora")
+    store.store_forecasts(forecasts, "baseline")
+
+    plan = pd.DataFrame({"start_time": index, "kepler_charge_kwh": 1.0, "water_heating_kw": 2.0})
+    store.store_plan(plan)
+    store.store_plan(plan.assign(kepler_charge_kwh=2.0))
+
+    forecast_rows = _rows(db_path, "SELECT forecast_version, pv_forecast_kwh FROM slot_forecasts")
+    assert len(forecast_rows) == 30
+    assert {pv for version, pv in forecast_rows if version == "aurora"} == {0.3}
+
+    plan_rows = _rows(
+        db_path, "SELECT planned_charge_kwh, planned_water_heating_kwh FROM slot_plans"
+    )
+    assert plan_rows == [(2.0, 0.5)] * 15
+
+
+def test_naive_timestamps_are_system_local(store):
+    naive = datetime(2025, 7, 1, 12, 0)
+    aware = TZ.localize(datetime(2025, 7, 1, 12, 0))
+
+    converted = store._iso_timestamps([naive, naive.isoformat(), aware, "2025-07-01T10:00:00Z"])
+
+    # Same as the per-row datetime.astimezone() the store used before batching
+    expected = naive.astimezone(TZ).isoformat()
+    assert converted == [expected, expected, aware.isoformat(), "2025-07-01T12:00:00+02:00"]
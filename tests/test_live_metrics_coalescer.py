@@ -0,0 +1,55 @@
+"""
+Tests for coalesced live_metrics broadcasting.
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.core.websockets import ws_manager
+from backend.events import LiveMetricsCoalescer
+
+
+@pytest.mark.anyio
+async def test_burst_of_updates_becomes_one_frame():
+    publisher = LiveMetricsCoalescer(interval_s=0.05)
+    emit = AsyncMock()
+
+    with (
+        patch.object(ws_manager, "loop", asyncio.get_running_loop()),
+        patch.object(ws_manager, "emit", emit),
+    ):
+        # The HA WebSocket publishes from its own thread
+        def burst():
+            for i in range(10):
+                publisher.publish({"pv_kw": float(i)})
+            publisher.publish({"load_kw": 1.5})
+
+        thread = threading.Thread(target=burst)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.15)
+
+        emit.assert_awaited_once_with("live_metrics", {"pv_kw": 9.0, "load_kw": 1.5})
+
+        # Unchanged values are dropped without arming another flush
+        publisher.publish({"pv_kw": 9.0, "load_kw": 1.5})
+        publisher.publish({"load_kw": 2.0})
+        await asyncio.sleep(0.15)
+
+    assert emit.await_args_list[-1].args == ("live_metrics", {"load_kw": 2.0})
+    stats = publisher.stats()
+    assert stats["events_in"] == 13
+    assert stats["frames_out"] == 2
+    assert stats["values_dropped"] == 2
+    assert stats["pending"] == 0
+
+
+def test_flushes_inline_without_server_loop():
+    publisher = LiveMetricsCoalescer(interval_s=10.0)
+    with patch.object(ws_manager, "loop", None), patch.object(ws_manager, "emit_sync") as emit:
+        publisher.publish({"soc": 55.0})
+
+    emit.assert_called_once_with("live_metrics", {"soc": 55.0})
@@ -0,0 +1,78 @@
+"""
+Tests for the in-process ML model registry (load once, reload on change).
+"""
+
+import os
+
+import pytest
+
+from ml.model_registry import ModelRegistry
+
+
+def _bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_loads_once_and_reloads_when_source_changes(tmp_path):
+    model_file = tmp_path / "load_model.lgb"
+    model_file.write_text("v1")
+    registry = ModelRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"model": model_file.read_text()}
+
+    first = registry.get("aurora", loader, [model_file])
+    assert registry.get("aurora", loader, [model_file]) is first
+    assert len(calls) == 1
+
+    model_file.write_text("v2!")
+    _bump_mtime(model_file)
+    second = registry.get("aurora", loader, [model_file])
+
+    assert second == {"model": "v2!"}
+    assert len(calls) == 2
+
+    stats = registry.stats()
+    assert stats["hits"] == 1
+    assert stats["loads"] == 2
+    model = stats["models"]["aurora"]
+    assert model["version"] == 2
+    assert model["artifact_bytes"] == 3
+    assert model["sources"] == [str(model_file)]
+
+
+def test_new_file_appearing_triggers_reload(tmp_path):
+    legacy = tmp_path / "pv_model.lgb"
+    quantile = tmp_path / "pv_model_p90.lgb"
+    legacy.write_text("legacy")
+    registry = ModelRegistry()
+
+    def loader():
+        return sorted(p.name for p in tmp_path.iterdir())
+
+    assert registry.get("pv", loader, [legacy, quantile]) == ["pv_model.lgb"]
+    quantile.write_text("p90")
+    assert registry.get("pv", loader, [legacy, quantile]) == ["pv_model.lgb", "pv_model_p90.lgb"]
+
+
+def test_failed_reload_keeps_previous_version(tmp_path):
+    model_file = tmp_path / "policy_export_kw.lgb"
+    model_file.write_text("good")
+    registry = ModelRegistry()
+
+    good = registry.get("policy", lambda: "good", [model_file])
+
+    def broken():
+        raise ValueError("truncated model file")
+
+    model_file.write_text("partial")
+    _bump_mtime(model_file)
+    assert registry.get("policy", broken, [model_file]) is good
+    assert registry.stats()["failures"] == 1
+
+    # Nothing to fall back to on the first load
+    with pytest.raises(ValueError):
+        registry.get("other", broken, [model_file])
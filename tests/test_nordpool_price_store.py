@@ -0,0 +1,129 @@
+from datetime import UTC, datetime, timedelta
+from typing import ClassVar
+
+import pytest
+import pytz
+import yaml
+
+import inputs
+from backend.core.cache import cache_sync
+from backend.learning.models import Base
+from backend.learning.store import LearningStore
+
+TZ = pytz.timezone("Europe/Stockholm")
+TODAY = datetime(2025, 3, 10).date()
+TOMORROW = TODAY + timedelta(days=1)
+
+
+def _day_values(day, price_per_mwh, hours=24):
+    start = TZ.localize(datetime.combine(day, datetime.min.time())).astimezone(UTC)
+    return [
+        {
+            "start": start + timedelta(hours=h),
+            "end": start + timedelta(hours=h + 1),
+            "value": price_per_mwh + h,
+        }
+        for h in range(hours)
+    ]
+
+
+class FakePrices:
+    """Nordpool client double: end_date fetches today, latest fetch returns tomorrow."""
+
+    calls: ClassVar[list[str]] = []
+
+    def __init__(self, currency):
+        self.currency = currency
+
+    def fetch(self, end_date=None, areas=None, resolution=None):
+        day = TODAY if end_date else TOMORROW
+        FakePrices.calls.append(day.isoformat())
+        return {"areas": {areas[0]: {"values": _day_values(day, 500.0)}}}
+
+
+def _frozen_datetime(hour):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return TZ.localize(datetime.combine(TODAY, datetime.min.time())).replace(hour=hour)
+
+    return FrozenDatetime
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "prices.db")
+    Base.metadata.create_all(LearningStore(db_path, TZ).engine)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                "timezone": "Europe/Stockholm",
+                "nordpool": {"price_area": "SE4", "currency": "SEK", "resolution_minutes": 60},
+                "learning": {"sqlite_path": db_path},
+            }
+        )
+    )
+    FakePrices.calls = []
+    monkeypatch.setattr(inputs, "Prices", FakePrices)
+    cache_sync.invalidate("nordpool_data")
+    yield str(config_path), LearningStore(db_path, TZ)
+    cache_sync.invalidate("nordpool_data")
+
+
+def test_cold_start_reads_published_days_from_store(setup, monkeypatch):
+    config_path, store = setup
+    monkeypatch.setattr(inputs, "datetime", _frozen_datetime(14))
+
+    first = inputs.get_nordpool_data(config_path)
+    assert FakePrices.calls == ["2025-03-10", "2025-03-11"]
+    assert len(store.get_day_ahead_prices("SE4", "SEK", 60, TOMORROW)) == 24
+
+    # Simulated restart: in-process cache is gone, store has both days
+    cache_sync.invalidate("nordpool_data")
+    second = inputs.get_nordpool_data(config_path)
+
+    assert FakePrices.calls == ["2025-03-10", "2025-03-11"]
+    assert second == first
+
+
+def test_only_missing_tomorrow_is_fetched_after_publication(setup, monkeypatch):
+    config_path, _ = setup
+    monkeypatch.setattr(inputs, "datetime", _frozen_datetime(9))
+    morning = inputs.get_nordpool_data(config_path)
+    assert FakePrices.calls == ["2025-03-10"]
+    assert len(morning) == 24
+
+    cache_sync.invalidate("nordpool_data")
+    monkeypatch.setattr(inputs, "datetime", _frozen_datetime(14))
+    afternoon = inputs.get_nordpool_data(config_path)
+
+    assert FakePrices.calls == ["2025-03-10", "2025-03-11"]
+    assert len(afternoon) == 48
+
+
+def test_partial_day_is_not_persisted(setup):
+    _, store = setup
+    partial = _day_values(TODAY, 100.0)[:12]
+    inputs._store_published_prices(store, ("SE4", "SEK", 60), TODAY, partial, TZ)
+    assert store.get_day_ahead_prices("SE4", "SEK", 60, TODAY) == []
+
+    full = _day_values(TODAY, 100.0)
+    inputs._store_published_prices(store, ("SE4", "SEK", 60), TODAY, full, TZ)
+    # Published days are immutable: a later write does not replace them
+    inputs._store_published_prices(store, ("SE4", "SEK", 60), TODAY, _day_values(TODAY, 9.0), TZ)
+
+    stored = store.get_day_ahead_prices("SE4", "SEK", 60, TODAY)
+    assert [v["value"] for v in stored] == [v["value"] for v in full]
+    assert stored[0]["start"] == full[0]["start"]
+
+
+def test_short_dst_day_is_persisted(setup):
+    _, store = setup
+    # Clocks go forward: the delivery day has 23 hours
+    dst_day = datetime(2025, 3, 30).date()
+    values = _day_values(dst_day, 100.0, hours=23)
+
+    inputs._store_published_prices(store, ("SE4", "SEK", 60), dst_day, values, TZ)
+
+    assert len(store.get_day_ahead_prices("SE4", "SEK", 60, dst_day)) == 23
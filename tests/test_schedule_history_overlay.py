@@ -1,12 +1,14 @@
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiosqlite
 import pytest
 import pytz
 
 from backend.api.routers.schedule import schedule_today_with_history
+from backend.core.schedule_store import ScheduleRepository
 
 
 @pytest.mark.anyio
@@ -82,12 +84,18 @@ async def test_today_with_history_includes_planned_actions(tmp_path):
     # Mock config to point to temp DB
     mock_config = {"learning": {"sqlite_path": str(db_path)}, "timezone": "UTC"}
 
-    # Patch load_yaml to return our mock config
-    with patch("backend.api.routers.schedule.load_yaml", return_value=mock_config):
+    # Patch the config loader to return our mock config
+    with patch("backend.api.routers.schedule.aload_config", AsyncMock(return_value=mock_config)):
         # Patch Path to hide schedule.json so we rely on DB + Plans
         # We need to preserve behavior for db_path so aiosqlite can open it
         real_Path = Path
-        with patch("backend.api.routers.schedule.Path") as MockPath:
+        with (
+            patch("backend.api.routers.schedule.Path") as MockPath,
+            patch(
+                "backend.api.routers.schedule.get_schedule_repository",
+                return_value=ScheduleRepository("/nonexistent/schedule.json"),
+            ),
+        ):
 
             def side_effect(arg):
                 if str(arg) == "schedule.json":
@@ -198,8 +206,12 @@ async def test_today_with_history_sets_executed_flag(tmp_path):
     from unittest.mock import MagicMock, patch
 
     with (
-        patch("backend.api.routers.schedule.load_yaml", return_value=mock_config),
+        patch("backend.api.routers.schedule.aload_config", AsyncMock(return_value=mock_config)),
         patch("backend.api.routers.schedule.Path") as MockPath,
+        patch(
+            "backend.api.routers.schedule.get_schedule_repository",
+            return_value=ScheduleRepository("/nonexistent/schedule.json"),
+        ),
     ):
         # Hide schedule.json so we rely on DB
         def side_effect(arg):
@@ -229,3 +241,63 @@ async def test_today_with_history_sets_executed_flag(tmp_path):
                 assert slot.get("actual_charge_kw") == 2.0
 
     assert found_executed, "Did not find is_executed=True for historical slot"
+
+
+def test_localize_iso_handles_offsets_naive_and_garbage():
+    import pandas as pd
+
+    from backend.api.routers.schedule import _local_keys, _localize_iso
+
+    tz = pytz.timezone("Europe/Stockholm")
+    values = pd.Series(
+        ["2025-01-01T10:00:00+01:00", "2025-01-01T09:15:00+00:00", "2025-01-01T11:30:00", "nope"]
+    )
+    local = _localize_iso(values, tz)
+
+    assert local.isna().tolist() == [False, False, False, True]
+    assert _local_keys(local[local.notna()]) == [
+        datetime(2025, 1, 1, 10, 0),
+        datetime(2025, 1, 1, 10, 15),
+        datetime(2025, 1, 1, 11, 30),
+    ]
+
+
+@pytest.mark.anyio
+async def test_today_with_history_cached_until_db_changes(tmp_path):
+    db_path = tmp_path / "planner_learning.db"
+    async with aiosqlite.connect(db_path) as conn:
+        await conn.execute(
+            "CREATE TABLE slot_plans (slot_start TEXT PRIMARY KEY, planned_charge_kwh REAL, "
+            "planned_discharge_kwh REAL, planned_soc_percent REAL, planned_export_kwh REAL, "
+            "planned_water_heating_kwh REAL)"
+        )
+        await conn.commit()
+
+    mock_config = {"learning": {"sqlite_path": str(db_path)}, "timezone": "UTC"}
+    today_start = datetime.now(pytz.UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    with (
+        patch("backend.api.routers.schedule.aload_config", AsyncMock(return_value=mock_config)),
+        patch(
+            "backend.api.routers.schedule.get_schedule_repository",
+            return_value=ScheduleRepository("/nonexistent/schedule.json"),
+        ),
+    ):
+        first = await schedule_today_with_history()
+        assert await schedule_today_with_history() is first
+        assert first["slots"] == []
+
+        async with aiosqlite.connect(db_path) as conn:
+            await conn.execute(
+                "INSERT INTO slot_plans VALUES (?, 0.5, 0.0, 50.0, 0.0, 0.0)",
+                (today_start.replace(hour=23).isoformat(),),
+            )
+            await conn.commit()
+        # Force a distinct mtime even on coarse-grained filesystems
+        st = db_path.stat()
+        os.utime(db_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        second = await schedule_today_with_history()
+
+    assert second is not first
+    assert [s["battery_charge_kw"] for s in second["slots"]] == [2.0]
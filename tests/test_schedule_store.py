@@ -0,0 +1,101 @@
+"""
+Tests for the mtime-invalidated schedule repository.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytz
+
+from backend.core.schedule_store import ScheduleRepository, get_schedule_repository
+from planner.output.schedule import save_schedule_to_json
+
+TZ = pytz.timezone("Europe/Stockholm")
+
+
+def _write(path, slots):
+    path.write_text(json.dumps({"schedule": slots, "meta": {}}), encoding="utf-8")
+
+
+def _slot(start: datetime, **extra):
+    return {
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=15)).isoformat(),
+        **extra,
+    }
+
+
+def test_parses_once_until_file_changes(tmp_path):
+    path = tmp_path / "schedule.json"
+    base = TZ.localize(datetime(2025, 1, 1, 12, 0))
+    _write(path, [_slot(base)])
+
+    repo = ScheduleRepository(path)
+    first = repo.get()
+    assert repo.get() is first
+    assert repo.loads == 1
+
+    _write(path, [_slot(base), _slot(base + timedelta(minutes=15))])
+    # Force a distinct mtime even on coarse-grained filesystems
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert len(repo.get().slots) == 2
+    assert repo.loads == 2
+
+
+def test_slot_at_and_between_use_sorted_index(tmp_path):
+    path = tmp_path / "schedule.json"
+    base = TZ.localize(datetime(2025, 1, 1, 12, 0))
+    # Written out of order; a naive start is localized to the index timezone
+    slots = [
+        _slot(base + timedelta(minutes=30), n=3),
+        {"start_time": base.replace(tzinfo=None).isoformat(), "n": 1},
+        _slot(base + timedelta(minutes=15), n=2),
+    ]
+    _write(path, slots)
+
+    index = ScheduleRepository(path).get().index("Europe/Stockholm")
+    assert [s["n"] for s in index.slots] == [1, 2, 3]
+
+    slot, start = index.slot_at(base + timedelta(minutes=20))
+    assert slot["n"] == 2
+    assert start == base + timedelta(minutes=15)
+    assert index.slot_at(base - timedelta(minutes=1)) is None
+    assert index.slot_at(base + timedelta(minutes=45)) is None
+
+    window = index.between(base + timedelta(minutes=15), base + timedelta(hours=1))
+    assert [s["n"] for _, s in window] == [2, 3]
+
+
+def test_publish_skips_reparse_and_missing_file_is_empty(tmp_path):
+    path = tmp_path / "schedule.json"
+    repo = get_schedule_repository(path)
+    assert repo is get_schedule_repository(str(path))
+    assert repo.get().slots == []
+
+    payload = {"schedule": [_slot(TZ.localize(datetime(2025, 1, 1)))], "meta": {}}
+    _write(path, payload["schedule"])
+    repo.publish(payload)
+
+    assert repo.get().payload is payload
+    assert repo.loads == 0
+
+
+def test_saved_schedule_is_published_as_stored_json(tmp_path):
+    path = tmp_path / "schedule.json"
+    start = pd.Timestamp("2025-01-01 12:00", tz="Europe/Stockholm")
+    records = [{"start_time": start, "end_time": start + pd.Timedelta(minutes=15)}]
+
+    with (
+        patch("planner.output.schedule.dataframe_to_json_response", return_value=records),
+        patch("planner.output.schedule.get_git_version", return_value="test"),
+    ):
+        save_schedule_to_json(pd.DataFrame(), {}, None, {}, None, [], {}, output_path=str(path))
+
+    published = get_schedule_repository(path).get().payload
+    assert published == json.loads(path.read_text(encoding="utf-8"))
+    assert published["schedule"][0]["start_time"] == start.isoformat()
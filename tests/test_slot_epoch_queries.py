@@ -0,0 +1,70 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+import pytz
+
+from backend.learning.models import Base
+from backend.learning.store import LearningStore
+
+TZ = pytz.timezone("Europe/Stockholm")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LearningStore(str(tmp_path / "epoch.db"), TZ)
+    Base.metadata.create_all(store.engine)
+    return store
+
+
+def test_derived_columns_follow_local_time(store):
+    # 00:30 local on Jan 1 is still Dec 31 in UTC
+    store.store_slot_observations(
+        pd.DataFrame(
+            {
+                "slot_start": [pd.Timestamp("2025-01-01 00:30", tz=TZ)],
+                "slot_end": [pd.Timestamp("2025-01-01 00:45", tz=TZ)],
+            }
+        )
+    )
+    with sqlite3.connect(store.db_path) as conn:
+        row = conn.execute(
+            "SELECT slot_epoch, slot_date, slot_hour FROM slot_observations"
+        ).fetchone()
+
+    assert row == (int(pd.Timestamp("2024-12-31 23:30", tz="UTC").timestamp()), "2025-01-01", 0)
+
+
+def test_cutoff_queries_use_epoch_index(store):
+    with sqlite3.connect(store.db_path) as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM slot_observations WHERE slot_epoch >= ?",
+            (store.cutoff_epoch(7),),
+        ).fetchall()
+    assert "ix_slot_observations_slot_epoch" in plan[0][-1]
+
+
+def test_cutoff_is_local_midnight(store):
+    now = datetime.now(TZ)
+    cutoff = datetime.fromtimestamp(store.cutoff_epoch(3), TZ)
+    assert (cutoff.hour, cutoff.minute) == (0, 0)
+    assert cutoff.date() == (now - timedelta(days=3)).date()
+
+
+def test_low_soc_events_filter_on_local_hours(store):
+    today = datetime.now(TZ).replace(minute=0, second=0, microsecond=0)
+    starts = [today.replace(hour=h) for h in (10, 16, 19, 20)]
+    store.store_slot_observations(
+        pd.DataFrame(
+            {
+                "slot_start": starts,
+                "slot_end": [s + timedelta(minutes=15) for s in starts],
+                "soc_end_percent": 2.0,
+            }
+        )
+    )
+
+    events = store.get_low_soc_events(days_back=1, peak_hours=(16, 20))
+    assert sorted(e["slot_start"][11:13] for e in events) == ["16", "19"]
+    assert all(e["date"] == today.date().isoformat() for e in events)
@@ -0,0 +1,136 @@
+"""
+Tests for the stream-integrated slot energy recorder.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend import stream_recorder
+from backend.stream_recorder import SLOT_S, SlotEnergyIntegrator, StreamRecorder
+
+T0 = 1_750_000_500  # 100 s into a slot
+SLOT = T0 - T0 % SLOT_S
+
+
+def _watts(value, unit="W"):
+    return {"state": str(value), "attributes": {"unit_of_measurement": unit}}
+
+
+def test_trapezoid_split_at_slot_boundary():
+    integrator = SlotEnergyIntegrator()
+    integrator.observe("load", SLOT - 100, 1.0)  # Started mid-slot: dropped
+    integrator.observe("load", SLOT + 300, 3.0)
+    # Ramp 3 kW -> 1 kW across the next boundary
+    integrator.observe("load", SLOT + SLOT_S + 300, 1.0)
+
+    rows = integrator.close_slots(SLOT + 2 * SLOT_S + 5)
+
+    assert [r["slot_start"].timestamp() for r in rows] == [SLOT, SLOT + SLOT_S]
+    # Slot 1: 1.5 -> 3.0 kW over 300 s, then 3.0 -> 5/3 kW (interpolated at the boundary)
+    boundary_kw = 3.0 - 2.0 * 600 / 900
+    assert rows[0]["load_kwh"] == pytest.approx(
+        ((1.5 + 3.0) / 2 * 300 + (3.0 + boundary_kw) / 2 * 600) / 3600
+    )
+    # Slot 2: 5/3 -> 1.0 kW over 300 s, then held at 1.0 kW
+    assert rows[1]["load_kwh"] == pytest.approx(((boundary_kw + 1.0) / 2 * 300 + 1.0 * 600) / 3600)
+    assert json.loads(rows[1]["quality_flags"]) == {"source": "ha_stream", "samples": 1}
+
+
+def test_signed_channels_split_at_zero_crossing():
+    integrator = SlotEnergyIntegrator()
+    integrator.observe("battery", SLOT, 2.0)
+    integrator.observe("battery", SLOT + 400, -2.0)  # Discharge -> charge, zero at 200 s
+    integrator.observe("grid_net", SLOT, -1.0)
+
+    (row,) = integrator.close_slots(SLOT + SLOT_S)
+
+    assert row["batt_discharge_kwh"] == pytest.approx(2.0 * 200 / 2 / 3600)
+    assert row["batt_charge_kwh"] == pytest.approx((2.0 * 200 / 2 + 2.0 * 500) / 3600)
+    assert row["export_kwh"] == pytest.approx(0.25)
+    assert row["import_kwh"] == 0.0
+
+
+def test_soc_start_and_end_carry_across_quiet_slots():
+    integrator = SlotEnergyIntegrator()
+    integrator.observe("pv", SLOT, 0.0)
+    integrator.observe_soc(SLOT + 10, 40.0)
+    integrator.observe_soc(SLOT + 800, 45.0)
+
+    rows = integrator.close_slots(SLOT + 2 * SLOT_S)
+
+    assert [(r["soc_start_percent"], r["soc_end_percent"]) for r in rows] == [
+        (None, 45.0),
+        (45.0, 45.0),
+    ]
+
+
+@pytest.fixture
+def config():
+    return {
+        "input_sensors": {
+            "pv_power": "sensor.pv_power",
+            "load_power": "sensor.load_power",
+            "grid_power": "sensor.grid_power",
+            "battery_soc": "sensor.battery_soc",
+        },
+        "system": {"grid_meter_type": "net"},
+    }
+
+
+def test_recorder_flushes_closed_slots_in_one_batch(config):
+    now = [float(SLOT)]
+    store = MagicMock()
+    recorder = StreamRecorder(config, store=store, clock=lambda: now[0])
+
+    recorder.on_state("sensor.pv_power", _watts(2000))
+    recorder.on_state("sensor.load_power", _watts(0.5, unit="kW"))
+    recorder.on_state("sensor.grid_power", _watts("unavailable"))
+    recorder.on_state("sensor.battery_soc", {"state": "55"})
+    recorder.on_state("sensor.other", _watts(9999))
+
+    # Nothing closes inside the grace period
+    now[0] = SLOT + SLOT_S + 5
+    assert recorder.flush() == 0
+
+    now[0] = SLOT + 3 * SLOT_S + 60
+    assert recorder.flush() == 3
+
+    (df,), _ = store.store_slot_observations.call_args
+    assert store.store_slot_observations.call_count == 1
+    assert df["pv_kwh"].tolist() == pytest.approx([0.5, 0.5, 0.5])
+    assert df["load_kwh"].tolist() == pytest.approx([0.125, 0.125, 0.125])
+    assert df["soc_end_percent"].tolist() == [55.0, 55.0, 55.0]
+    assert recorder.status()["samples"] == 3
+
+
+def test_failed_write_is_retried_with_next_batch(config):
+    now = [float(SLOT)]
+    store = MagicMock()
+    store.store_slot_observations.side_effect = [OSError("database is locked"), None]
+    recorder = StreamRecorder(config, store=store, clock=lambda: now[0])
+    recorder.on_state("sensor.load_power", _watts(1000))
+
+    now[0] = SLOT + SLOT_S + 60
+    assert recorder.flush() == 0
+    assert recorder.status()["pending_rows"] == 1
+
+    now[0] = SLOT + 2 * SLOT_S + 60
+    assert recorder.flush() == 2
+    (df,), _ = store.store_slot_observations.call_args
+    assert [ts.timestamp() for ts in df["slot_start"]] == [SLOT, SLOT + SLOT_S]
+
+
+def test_stop_flushes_closed_slots(config, monkeypatch):
+    now = [float(SLOT)]
+    store = MagicMock()
+    recorder = StreamRecorder(config, store=store, clock=lambda: now[0])
+    monkeypatch.setattr(stream_recorder, "_stream_recorder", recorder)
+    recorder.on_state("sensor.load_power", _watts(1000))
+
+    now[0] = SLOT + SLOT_S + 60
+    stream_recorder.stop_stream_recorder()
+
+    assert store.store_slot_observations.call_count == 1
+    assert recorder.status()["rows_written"] == 1